@@ -0,0 +1,181 @@
+"""
+Gesture-to-action bindings for AI Virtual Mouse.
+
+The gesture pipeline recognizes gestures and poses; what each one does is
+looked up in a binding table from ``config.yaml``:
+
+    gestures:
+      bindings:
+        left_click: click
+        thumbs_up: {keys: ctrl+z}
+        swipe_left: {keys: alt+left}
+        swipe_right: [{keys: ctrl+l}, {text: "https://example.com\\n"}]
+        pinch_hold: drag
+
+An action is one of
+
+- a built-in name: ``click``, ``double_click``, ``right_click``,
+  ``mouse_down``, ``mouse_up``, ``scroll``, ``drag`` (only for
+  ``pinch_hold``: press while held, release when the pinch opens) or
+  ``none``
+- ``{keys: ctrl+shift+t}``: a key chord
+- ``{text: "..."}``: a typed text macro
+- ``{scroll: 5}``: a fixed scroll amount
+- ``{call: package.module:function}`` or ``{call: name}`` for a callable
+  registered in code; it is called as ``function(output, gesture, amount)``
+- a list of actions, run in order
+
+The table is compiled once into a dictionary of callables, so dispatching
+a gesture per frame is a single dictionary lookup. Errors in the table are
+reported when it is loaded, not when the gesture first happens.
+"""
+
+import importlib
+
+
+# Gestures the pipeline can dispatch
+GESTURES = (
+    'left_click', 'double_click', 'right_click', 'pinch_hold', 'scroll',
+    'thumbs_up', 'swipe_left', 'swipe_right',
+    'palm_swipe_left', 'palm_swipe_right', 'flick_up', 'flick_down', 'dwell',
+)
+
+DEFAULT_BINDINGS = {
+    'left_click': 'click',
+    'double_click': 'double_click',
+    'right_click': 'right_click',
+    'pinch_hold': 'drag',
+    'scroll': 'scroll',
+    'thumbs_up': 'none',
+    'swipe_left': 'none',
+    'swipe_right': 'none',
+    'palm_swipe_left': 'none',
+    'palm_swipe_right': 'none',
+    'flick_up': 'none',
+    'flick_down': 'none',
+    'dwell': 'click',
+}
+
+_BUILTINS = {
+    'click': lambda output, gesture, amount: output.click(),
+    'double_click': lambda output, gesture, amount: output.double_click(),
+    'right_click': lambda output, gesture, amount: output.right_click(),
+    'mouse_down': lambda output, gesture, amount: output.mouse_down(),
+    'mouse_up': lambda output, gesture, amount: output.mouse_up(),
+    'scroll': lambda output, gesture, amount: output.scroll(amount),
+}
+
+
+def _resolve_callable(target, callables):
+    if target in callables:
+        return callables[target]
+    module_name, _, attribute = target.partition(':')
+    if not attribute:
+        raise ValueError(f"Unknown callable '{target}' (use module:function or a registered name)")
+    try:
+        function = getattr(importlib.import_module(module_name), attribute)
+    except (ImportError, AttributeError) as e:
+        raise ValueError(f"Cannot load callable '{target}': {e}") from e
+    if not callable(function):
+        raise ValueError(f"'{target}' is not callable")
+    return function
+
+
+def compile_action(spec, callables=None):
+    """
+    Compile one action spec into ``action(output, gesture, amount)``.
+
+    Args:
+        spec: Action spec (see module docstring)
+        callables: Dictionary of named callables for ``{call: name}``
+
+    Returns:
+        Callable, or None for ``none``
+
+    Raises:
+        ValueError: If the spec is invalid
+    """
+    callables = callables or {}
+    if spec is None or spec == 'none':
+        return None
+    if isinstance(spec, str):
+        if spec not in _BUILTINS:
+            raise ValueError(f"Unknown action '{spec}'")
+        return _BUILTINS[spec]
+    if isinstance(spec, list):
+        steps = [compile_action(step, callables) for step in spec]
+        steps = [step for step in steps if step is not None]
+
+        def sequence(output, gesture, amount):
+            for step in steps:
+                step(output, gesture, amount)
+        return sequence
+    if isinstance(spec, dict) and len(spec) == 1:
+        (kind, value), = spec.items()
+        if kind == 'keys':
+            keys = [key.strip() for key in str(value).split('+') if key.strip()]
+            if not keys:
+                raise ValueError(f"Empty key chord in {spec}")
+            return lambda output, gesture, amount: output.hotkey(*keys)
+        if kind == 'text':
+            text = str(value)
+            return lambda output, gesture, amount: output.write(text)
+        if kind == 'scroll':
+            fixed = int(value)
+            return lambda output, gesture, amount: output.scroll(fixed)
+        if kind == 'call':
+            return _resolve_callable(str(value), callables)
+    raise ValueError(f"Invalid action {spec!r}")
+
+
+class ActionBindings:
+    """Compiled gesture -> action dispatch table."""
+
+    def __init__(self, table=None, callables=None):
+        """
+        Args:
+            table: Gesture -> action spec; missing gestures use DEFAULT_BINDINGS
+            callables: Named callables for ``{call: name}`` actions
+
+        Raises:
+            ValueError: For unknown gestures or invalid actions
+        """
+        merged = dict(DEFAULT_BINDINGS)
+        merged.update(table or {})
+        self.drag_gestures = set()
+        self._actions = {}
+        for gesture, spec in merged.items():
+            if gesture not in GESTURES:
+                raise ValueError(f"Unknown gesture '{gesture}' in bindings (one of: {', '.join(GESTURES)})")
+            if spec == 'drag':
+                if gesture != 'pinch_hold':
+                    raise ValueError("'drag' can only be bound to pinch_hold")
+                self.drag_gestures.add(gesture)
+                continue
+            try:
+                action = compile_action(spec, callables)
+            except ValueError as e:
+                raise ValueError(f"Binding for '{gesture}': {e}") from e
+            if action is not None:
+                self._actions[gesture] = action
+
+    def is_bound(self, gesture):
+        """True if the gesture does something (an action or drag)."""
+        return gesture in self._actions or gesture in self.drag_gestures
+
+    def is_drag(self, gesture):
+        """True if the gesture is bound to press-and-hold dragging."""
+        return gesture in self.drag_gestures
+
+    def dispatch(self, gesture, output, amount=0):
+        """
+        Run the action bound to a gesture.
+
+        Returns:
+            True if an action ran
+        """
+        action = self._actions.get(gesture)
+        if action is None:
+            return False
+        action(output, gesture, amount)
+        return True
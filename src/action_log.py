@@ -0,0 +1,310 @@
+"""
+Structured binary action log for AI Virtual Mouse.
+
+Every mouse or keyboard action (and pause/resume or hand found/lost
+event) becomes a fixed-size 24-byte record:
+
+    timestamp  float64  seconds since the epoch
+    event      uint16   index into EVENTS
+    amount     int16    scroll amount (0 otherwise)
+    x, y       float32  cursor position in screen pixels
+    latency    float32  milliseconds from frame capture to the action
+
+The frame loop only appends a tuple to a bounded deque, which needs no lock
+and never waits on disk. A background writer drains it in batches, writes
+them with one ``write`` call and rotates files by size like
+``RotatingFileHandler`` (``actions.bin``, ``actions.bin.1``, ...). If the
+writer falls behind, the oldest pending records are dropped and counted.
+
+Each file starts with a header (magic, version, record size), so a
+decoder can check what it reads:
+
+    python src/action_log.py logs/actions.bin
+    python src/action_log.py logs/actions.bin --all --event click right_click --csv
+"""
+
+import argparse
+import collections
+import struct
+import sys
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+
+try:
+    from output_backend import OutputBackend
+except ImportError:
+    sys.path.append(str(Path(__file__).parent))
+    from output_backend import OutputBackend
+
+
+EVENTS = (
+    'move', 'click', 'double_click', 'right_click', 'mouse_down', 'mouse_up', 'scroll',
+    'pause', 'resume', 'hand_found', 'hand_lost', 'hotkey', 'write',
+)
+EVENT_CODES = {name: code for code, name in enumerate(EVENTS)}
+
+MAGIC = b'AVMACTN\0'
+VERSION = 1
+HEADER = struct.Struct('<8sHH')
+RECORD = struct.Struct('<dHhfff')
+
+ActionRecord = namedtuple('ActionRecord', ['time', 'event', 'amount', 'x', 'y', 'latency_ms'])
+
+
+class ActionLog:
+    """Non-blocking writer for binary action records."""
+
+    def __init__(self, path, max_bytes=5242880, backup_count=3, flush_interval=0.5,
+                 max_pending=65536, clock=time.time):
+        """
+        Args:
+            path: Log file path
+            max_bytes: File size that triggers rotation
+            backup_count: Rotated files to keep
+            flush_interval: Seconds between batched writes
+            max_pending: Records buffered before the oldest are dropped
+            clock: Callable returning the timestamp for ``record``
+        """
+        self.path = Path(path)
+        self.max_bytes = max(max_bytes, HEADER.size + RECORD.size)
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self._pending = collections.deque(maxlen=max_pending)
+        self._submitted = 0
+        self.written = 0
+        self.rotations = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = None
+        self._size = 0
+        self._open()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='action-log', daemon=True)
+        self._thread.start()
+
+    @property
+    def dropped(self):
+        """Records lost because the writer fell behind."""
+        return self._submitted - self.written - len(self._pending)
+
+    def record(self, event, x=0.0, y=0.0, amount=0, latency_ms=0.0, timestamp=None):
+        """
+        Queue one record. Safe to call from any thread; never blocks.
+
+        Args:
+            event: Name from EVENTS
+            x, y: Cursor position
+            amount: Scroll amount
+            latency_ms: Frame-to-action latency
+            timestamp: Record time (default: the clock)
+        """
+        self._submitted += 1
+        self._pending.append((self.clock() if timestamp is None else timestamp,
+                              EVENT_CODES[event], amount, x, y, latency_ms))
+
+    def _open(self):
+        self._file = open(self.path, 'ab')
+        self._size = self._file.tell()
+        if self._size == 0:
+            self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+            self._size = HEADER.size
+            self._file.flush()
+
+    def _rotate(self):
+        self._file.close()
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                source = Path(f"{self.path}.{i}")
+                if source.exists():
+                    source.replace(f"{self.path}.{i + 1}")
+            self.path.replace(f"{self.path}.1")
+        else:
+            self.path.unlink()
+        self.rotations += 1
+        self._open()
+
+    def flush(self):
+        """Write out all pending records (called by the writer thread)."""
+        while self._pending:
+            room = max(1, (self.max_bytes - self._size) // RECORD.size)
+            batch = bytearray()
+            count = 0
+            while count < room and self._pending:
+                batch += RECORD.pack(*self._pending.popleft())
+                count += 1
+            if self._size + len(batch) > self.max_bytes and self._size > HEADER.size:
+                # Full file: start a new one and write the batch there
+                self._rotate()
+            self._file.write(batch)
+            self._size += len(batch)
+            self.written += count
+        self._file.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        """Stop the writer and write out everything still pending."""
+        if self._file is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self.flush()
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ActionLoggingBackend(OutputBackend):
+    """Output backend that forwards to another backend and logs each action."""
+
+    def __init__(self, output, action_log, log_moves=True, clock=time.time):
+        """
+        Args:
+            output: Backend that performs the actions
+            action_log: ActionLog receiving the records
+            log_moves: Also log cursor moves (one record per frame)
+            clock: Callable returning the time compared with ``frame_time``
+        """
+        self.output = output
+        self.action_log = action_log
+        self.log_moves = log_moves
+        self.clock = clock
+        self.frame_time = None
+        self.position = (0.0, 0.0)
+
+    def mark_frame(self, frame_time):
+        """Set the capture time of the frame whose actions follow."""
+        self.frame_time = frame_time
+
+    def _log(self, event, amount=0):
+        now = self.clock()
+        latency = (now - self.frame_time) * 1000.0 if self.frame_time is not None else 0.0
+        x, y = self.position
+        self.action_log.record(event, x, y, amount, latency, now)
+
+    def size(self):
+        return self.output.size()
+
+    def move_to(self, x, y):
+        self.output.move_to(x, y)
+        self.position = (x, y)
+        if self.log_moves:
+            self._log('move')
+
+    def click(self):
+        self.output.click()
+        self._log('click')
+
+    def double_click(self):
+        self.output.double_click()
+        self._log('double_click')
+
+    def right_click(self):
+        self.output.right_click()
+        self._log('right_click')
+
+    def mouse_down(self):
+        self.output.mouse_down()
+        self._log('mouse_down')
+
+    def mouse_up(self):
+        self.output.mouse_up()
+        self._log('mouse_up')
+
+    def scroll(self, amount):
+        self.output.scroll(amount)
+        self._log('scroll', amount)
+
+    def hotkey(self, *keys):
+        self.output.hotkey(*keys)
+        self._log('hotkey')
+
+    def write(self, text):
+        self.output.write(text)
+        self._log('write')
+
+
+def read_records(path):
+    """
+    Yield the ActionRecords of one log file.
+
+    Raises:
+        ValueError: If the file is not an action log of this version
+    """
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            return
+        magic, version, record_size = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            raise ValueError(f"{path} is not a version {VERSION} action log")
+        data = f.read()
+    usable = len(data) - len(data) % RECORD.size  # Ignore a torn last record
+    for fields in RECORD.iter_unpack(data[:usable]):
+        time_, code, amount, x, y, latency = fields
+        event = EVENTS[code] if code < len(EVENTS) else f'unknown_{code}'
+        yield ActionRecord(time_, event, amount, x, y, latency)
+
+
+def log_files(path):
+    """The log file and its rotated backups, oldest first."""
+    path = Path(path)
+    backups = []
+    i = 1
+    while Path(f"{path}.{i}").exists():
+        backups.append(Path(f"{path}.{i}"))
+        i += 1
+    files = list(reversed(backups))
+    if path.exists():
+        files.append(path)
+    return files
+
+
+def main():
+    """Decode action logs from the command line."""
+    parser = argparse.ArgumentParser(description="Decode AI Virtual Mouse binary action logs")
+    parser.add_argument('log', help="Action log file")
+    parser.add_argument('--all', action='store_true', help="Include rotated backups, oldest first")
+    parser.add_argument('--event', nargs='+', choices=EVENTS, help="Only these events")
+    parser.add_argument('--csv', action='store_true', help="CSV output")
+    parser.add_argument('--summary', action='store_true', help="Only counts and latency per event")
+    args = parser.parse_args()
+
+    files = log_files(args.log) if args.all else [Path(args.log)]
+    events = set(args.event) if args.event else None
+    summary = collections.OrderedDict()
+
+    if args.csv and not args.summary:
+        print("time,event,amount,x,y,latency_ms")
+    for path in files:
+        for r in read_records(path):
+            if events is not None and r.event not in events:
+                continue
+            if args.summary:
+                count, total = summary.get(r.event, (0, 0.0))
+                summary[r.event] = (count + 1, total + r.latency_ms)
+            elif args.csv:
+                print(f"{r.time:.6f},{r.event},{r.amount},{r.x:.1f},{r.y:.1f},{r.latency_ms:.2f}")
+            else:
+                stamp = time.strftime('%H:%M:%S', time.localtime(r.time)) + f".{int(r.time % 1 * 1000):03d}"
+                amount = f" amount={r.amount}" if r.event == 'scroll' else ''
+                print(f"{stamp} {r.event:<12} ({r.x:7.1f}, {r.y:7.1f}){amount} {r.latency_ms:6.1f}ms")
+
+    if args.summary:
+        print(f"{'event':<12} {'count':>8} {'latency':>9}")
+        for event, (count, total) in summary.items():
+            print(f"{event:<12} {count:>8} {total / count:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+Offline auto-calibration for AI Virtual Mouse.
+
+Fits gesture thresholds from recorded landmark traces instead of a handful
+of live samples. For every gesture distance (index+thumb, middle+thumb,
+middle+ring) the frames are split into a "closed" and an "open" class at
+the threshold that maximizes the between-class variance (Otsu's method on
+a histogram, fully vectorized). Short runs are treated as noise when
+segmenting, then enter/exit thresholds are derived from the two classes
+and the resulting false-trigger and miss rates are estimated on the same
+data.
+
+Usage:
+    python src/auto_calibrate.py traces/*.trace
+    python src/auto_calibrate.py traces/*.trace --apply
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+try:
+    from landmark_trace import read_trace, hand_present
+except ImportError:
+    sys.path.append(str(Path(__file__).parent))
+    from landmark_trace import read_trace, hand_present
+
+
+# Gesture name -> (landmark a, landmark b, config key for enter, config key for exit)
+GESTURES = {
+    'left_click': (8, 4, 'clicks.left_click_distance', 'clicks.left_click_release_distance'),
+    'right_click': (12, 4, 'clicks.right_click_distance', 'clicks.right_click_release_distance'),
+    'scroll': (12, 16, 'scroll.activation_distance', 'scroll.release_distance'),
+}
+
+HISTOGRAM_BINS = 256
+MIN_SEGMENT_FRAMES = 3      # Runs shorter than this are treated as noise
+MIN_CLASS_FRACTION = 0.02   # Each class needs at least this share of frames
+
+logger = logging.getLogger("auto_calibrate")
+
+
+def load_distances(trace_paths):
+    """
+    Load gesture distances (in source pixels) from trace files.
+
+    Frames without a hand are dropped; a NaN gap is inserted between files
+    so segments never span two recordings.
+
+    Returns:
+        Dictionary of gesture name -> 1-D float array
+    """
+    chunks = {name: [] for name in GESTURES}
+    for path in trace_paths:
+        info, records = read_trace(path, mmap=True)
+        landmarks = records['landmarks'][hand_present(records)]
+        scale = np.array([info.width or 1, info.height or 1], dtype=np.float32)
+
+        for name, (a, b, _, _) in GESTURES.items():
+            delta = (landmarks[:, a, :2] - landmarks[:, b, :2]) * scale
+            chunks[name].append(np.hypot(delta[:, 0], delta[:, 1]))
+            chunks[name].append(np.array([np.nan], dtype=np.float32))
+
+    return {
+        name: np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+        for name, parts in chunks.items()
+    }
+
+
+def otsu_threshold(values, bins=HISTOGRAM_BINS):
+    """
+    Find the split maximizing between-class variance.
+
+    Returns:
+        Tuple of (threshold, separation) where separation is the fraction
+        of total variance explained by the split (0..1)
+    """
+    hist, edges = np.histogram(values, bins=bins)
+    centers = (edges[:-1] + edges[1:]) / 2
+    weights = hist.astype(np.float64)
+
+    w0 = np.cumsum(weights)
+    w1 = w0[-1] - w0
+    m0 = np.cumsum(weights * centers)
+    m1 = m0[-1] - m0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        between = w0 * w1 * (m0 / w0 - m1 / w1) ** 2
+    between[~np.isfinite(between)] = 0
+
+    index = int(np.argmax(between))
+    total_variance = np.var(values) * w0[-1] ** 2
+    separation = between[index] / total_variance if total_variance > 0 else 0.0
+    return float(edges[index + 1]), float(separation)
+
+
+def segment_runs(closed, min_frames=MIN_SEGMENT_FRAMES, gaps=None):
+    """
+    Split a boolean sequence into runs, absorbing runs shorter than
+    ``min_frames`` into their predecessor.
+
+    Args:
+        closed: Per-frame boolean sequence
+        min_frames: Minimum length of a run that is not noise
+        gaps: Optional boolean mask of gap frames (between recordings);
+            each gap is its own run, and runs never merge across it
+
+    Returns:
+        Tuple of (starts, labels) arrays describing each run (gap runs are
+        labelled False)
+    """
+    if len(closed) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool)
+
+    key = closed.astype(np.int8)
+    if gaps is not None:
+        key = np.where(gaps, 2, key)
+    starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+    lengths = np.diff(np.r_[starts, len(closed)])
+    run_key = key[starts]
+
+    # Relabel noise runs with the previous run's label, then merge equal
+    # neighbours. Gaps are never noise, and a run right after a gap has no
+    # predecessor to join.
+    short = (lengths < min_frames) & (run_key != 2)
+    short[0] = False
+    short[1:] &= run_key[:-1] != 2
+    keep_index = np.maximum.accumulate(np.where(short, 0, np.arange(len(starts))))
+    run_key = run_key[keep_index]
+    merged = np.r_[True, run_key[1:] != run_key[:-1]]
+    return starts[merged], run_key[merged] == 1
+
+
+def fit_gesture(values, min_frames=MIN_SEGMENT_FRAMES):
+    """
+    Fit enter/exit thresholds for one gesture distance.
+
+    Args:
+        values: Per-frame distances (NaN marks a gap between recordings)
+        min_frames: Minimum run length of a real gesture segment
+
+    Returns:
+        Result dictionary, or None if the data has no usable closed class
+    """
+    valid = np.isfinite(values)
+    finite = values[valid]
+    if len(finite) < 2 * min_frames:
+        return None
+
+    threshold, separation = otsu_threshold(finite)
+    closed = np.zeros(len(values), dtype=bool)
+    closed[valid] = values[valid] < threshold
+
+    starts, labels = segment_runs(closed, min_frames, gaps=~valid)
+    bounds = np.r_[starts, len(values)]
+    segment_id = np.repeat(np.arange(len(starts)), np.diff(bounds))
+    segment_closed = labels[segment_id] & valid
+
+    closed_values = values[segment_closed]
+    open_values = values[~segment_closed & valid]
+    if min(len(closed_values), len(open_values)) < MIN_CLASS_FRACTION * len(finite):
+        return None
+
+    # Enter at the best split; exit above it by the closed-class jitter so a
+    # held pinch does not chatter, but stay below most open frames
+    jitter = np.abs(np.diff(closed_values)).mean() if len(closed_values) > 1 else 0.0
+    enter = threshold
+    exit_ = min(enter + 2.0 * jitter, float(np.percentile(open_values, 5)))
+    exit_ = float(max(exit_, enter))
+
+    # Segment-level minima/maxima for event rates (NaNs are gaps, ignore them)
+    filled_low = np.where(valid, values, np.inf)
+    filled_high = np.where(valid, values, -np.inf)
+    segment_min = np.minimum.reduceat(filled_low, starts)
+    segment_max = np.maximum.reduceat(filled_high, starts)
+    open_segments = ~labels & valid[starts]      # Gap runs are neither
+    closed_segments = labels
+
+    return {
+        'enter': enter,
+        'exit': exit_,
+        'separation': separation,
+        'closed_mean': float(closed_values.mean()),
+        'open_mean': float(open_values.mean()),
+        'frames': int(len(finite)),
+        'closed_segments': int(closed_segments.sum()),
+        'open_segments': int(open_segments.sum()),
+        # Open frames / segments that would engage the gesture
+        'false_trigger_frame_rate': float(np.mean(open_values < enter)),
+        'false_trigger_rate': float(np.mean(segment_min[open_segments] < enter))
+        if open_segments.any() else 0.0,
+        # Closed segments that never engage, or release in the middle
+        'miss_rate': float(np.mean(segment_min[closed_segments] >= enter)),
+        'early_release_rate': float(np.mean(segment_max[closed_segments] >= exit_)),
+    }
+
+
+def calibrate(trace_paths, min_frames=MIN_SEGMENT_FRAMES):
+    """
+    Calibrate all gestures from trace files.
+
+    Returns:
+        Tuple of (config patch dictionary, per-gesture report dictionary)
+    """
+    distances = load_distances(trace_paths)
+    patch = {}
+    report = {}
+
+    for name, (_, _, enter_key, exit_key) in GESTURES.items():
+        result = fit_gesture(distances[name], min_frames)
+        report[name] = result
+        if result is None:
+            logger.warning(f"Not enough separable data to calibrate {name}")
+            continue
+        _set_nested(patch, enter_key, int(round(result['enter'])))
+        _set_nested(patch, exit_key, int(round(result['exit'])))
+
+    return patch, report
+
+
+def _set_nested(target, key, value):
+    keys = key.split('.')
+    for k in keys[:-1]:
+        target = target.setdefault(k, {})
+    target[keys[-1]] = value
+
+
+def apply_patch(config_manager, patch):
+    """Merge a config patch into a ConfigManager and save it."""
+    def walk(prefix, node):
+        for key, value in node.items():
+            path = f"{prefix}.{key}" if prefix else key
+            if isinstance(value, dict):
+                walk(path, value)
+            else:
+                config_manager.set(path, value)
+
+    walk('', patch)
+    config_manager.save_config()
+
+
+def run_calibration(trace_paths, min_frames=MIN_SEGMENT_FRAMES, output=None,
+                    apply=False, config_path=None):
+    """
+    Calibrate, print a report and optionally write or apply the patch.
+
+    Returns:
+        The config patch dictionary
+    """
+    start = time.perf_counter()
+    patch, report = calibrate(trace_paths, min_frames)
+    elapsed = time.perf_counter() - start
+
+    print("=" * 60)
+    for name, result in report.items():
+        if result is None:
+            print(f"{name}: not enough data")
+            continue
+        print(f"{name}: enter {result['enter']:.1f}px, exit {result['exit']:.1f}px "
+              f"(separation {result['separation']:.2f}, {result['closed_segments']} gestures)")
+        print(f"  false triggers: {result['false_trigger_rate']:.1%} of open segments, "
+              f"{result['false_trigger_frame_rate']:.2%} of open frames")
+        print(f"  misses: {result['miss_rate']:.1%}, early releases: {result['early_release_rate']:.1%}")
+    frames = max((r['frames'] for r in report.values() if r), default=0)
+    print(f"Calibrated from {frames} frames in {elapsed:.2f}s")
+    print("=" * 60)
+    print(yaml.dump(patch, default_flow_style=False, sort_keys=False))
+
+    if output:
+        with open(output, 'w') as f:
+            yaml.dump(patch, f, default_flow_style=False, sort_keys=False)
+    if apply and patch:
+        try:
+            from config_manager import ConfigManager
+        except ImportError:
+            sys.path.append(str(Path(__file__).parent))
+            from config_manager import ConfigManager
+        apply_patch(ConfigManager(config_path), patch)
+        print("Configuration updated")
+
+    return patch
+
+
+def main():
+    """Run offline calibration from the command line."""
+    parser = argparse.ArgumentParser(description="Fit gesture thresholds from recorded landmark traces")
+    parser.add_argument('traces', nargs='+', help="Trace files")
+    parser.add_argument('--min-frames', type=int, default=MIN_SEGMENT_FRAMES,
+                        help="Minimum frames in a gesture segment")
+    parser.add_argument('--output', default=None, help="Write the config patch to this YAML file")
+    parser.add_argument('--apply', action='store_true', help="Merge the patch into config.yaml")
+    parser.add_argument('--config', default=None, help="Config file used with --apply")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    run_calibration(args.traces, args.min_frames, args.output, args.apply, args.config)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""
+Batch landmark extraction for offline video datasets.
+
+Runs hand detection over a directory of recorded session videos using a
+pool of worker processes with one detector per worker. Each video is
+handled start to finish by a single worker, so frames stay in temporal
+order and the detector can track between frames (``static_image_mode``
+off). Results are streamed to one landmark trace per video.
+
+Finished videos are recorded in a checkpoint file next to the traces, so
+an interrupted run picks up where it stopped when started again. A video
+that fails (e.g. cannot be opened) is recorded there with its error and
+does not stop the other videos; later runs skip it unless
+``--retry-failed`` is given.
+
+Usage:
+    python src/batch_extract.py videos/ traces/ --workers 8
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import sys
+import time
+from pathlib import Path
+
+import cv2
+
+try:
+    from frame_preprocess import FramePreprocessor
+    from hand_detector import BACKENDS, create_detector
+    from landmark_trace import TraceWriter
+except ImportError:
+    sys.path.append(str(Path(__file__).parent))
+    from frame_preprocess import FramePreprocessor
+    from hand_detector import BACKENDS, create_detector
+    from landmark_trace import TraceWriter
+
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.webm')
+CHECKPOINT_NAME = 'checkpoint.json'
+PROGRESS_EVERY = 100  # Frames between progress messages from a worker
+
+logger = logging.getLogger("batch_extract")
+
+# Per-worker state, set up by _init_worker
+_detector = None
+_progress_queue = None
+
+
+def find_videos(input_dir):
+    """Return video files under ``input_dir`` in a stable order."""
+    input_dir = Path(input_dir)
+    return sorted(
+        path for path in input_dir.rglob('*')
+        if path.is_file() and path.suffix.lower() in VIDEO_EXTENSIONS
+    )
+
+
+def trace_path_for(video, input_dir, output_dir):
+    """Mirror the video's relative path under the output directory."""
+    relative = Path(video).relative_to(input_dir)
+    return Path(output_dir) / relative.with_suffix('.trace')
+
+
+def load_checkpoint(output_dir):
+    """Load the checkpoint of finished videos (relative path -> stats, or {'error': message})."""
+    path = Path(output_dir) / CHECKPOINT_NAME
+    if not path.exists():
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_checkpoint(output_dir, completed):
+    """Atomically rewrite the checkpoint file."""
+    path = Path(output_dir) / CHECKPOINT_NAME
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(completed, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def extract_video(detector, video_path, trace_path, mirror=True, progress=None):
+    """
+    Extract landmarks from one video into a trace file.
+
+    The trace is written to a ``.part`` file and renamed when complete, so
+    a killed run never leaves a truncated trace that looks finished.
+
+    Args:
+        detector: Callable taking an RGB frame, returning (21, 3) array or None
+        video_path: Input video
+        trace_path: Output trace file
+        mirror: Flip frames horizontally like the live loop does
+        progress: Optional callable receiving the number of new frames
+
+    Returns:
+        Dictionary with frame count, hand frames, wall and CPU seconds
+    """
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    cap = cv2.VideoCapture(str(video_path))
+    if not cap.isOpened():
+        raise RuntimeError(f"Cannot open video {video_path}")
+
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+
+    trace_path = Path(trace_path)
+    part_path = trace_path.with_name(trace_path.name + '.part')
+    frames = hand_frames = 0
+    pending = 0
+    preprocessor = FramePreprocessor(mirror=mirror)
+
+    try:
+        with TraceWriter(part_path, width, height, fps) as writer:
+            while True:
+                success, frame = cap.read()
+                if not success:
+                    break
+
+                landmarks = detector(preprocessor.inference_frame(frame))
+
+                # Prefer the container timestamp; fall back to frame index / fps
+                timestamp = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+                if timestamp <= 0 and fps > 0:
+                    timestamp = frames / fps
+
+                writer.write(timestamp, frames, landmarks)
+                frames += 1
+                if landmarks is not None:
+                    hand_frames += 1
+
+                pending += 1
+                if progress is not None and pending >= PROGRESS_EVERY:
+                    progress(pending)
+                    pending = 0
+    finally:
+        cap.release()
+
+    if progress is not None and pending:
+        progress(pending)
+    os.replace(part_path, trace_path)
+
+    return {
+        'frames': frames,
+        'hand_frames': hand_frames,
+        'wall_seconds': time.perf_counter() - wall_start,
+        'cpu_seconds': time.process_time() - cpu_start,
+    }
+
+
+def create_mediapipe_detector(settings):
+    """Default detector factory used by the worker processes."""
+    return create_detector(settings)
+
+
+def _init_worker(detector_factory, detector_settings, progress_queue):
+    global _detector, _progress_queue
+    _detector = detector_factory(detector_settings)
+    _progress_queue = progress_queue
+
+
+def _report_progress(frames):
+    _progress_queue.put(frames)
+
+
+def _run_job(job):
+    relative, video_path, trace_path, mirror = job
+    reset = getattr(_detector, 'reset', None)
+    if reset is not None:
+        reset()
+    stats = extract_video(_detector, video_path, trace_path, mirror, _report_progress)
+    stats['worker_pid'] = os.getpid()
+    return relative, stats
+
+
+def run_batch(input_dir, output_dir, workers=None, mirror=True,
+              detector_factory=create_mediapipe_detector, detector_settings=None,
+              show_progress=True, retry_failed=False):
+    """
+    Extract landmarks from every video under ``input_dir``.
+
+    Args:
+        input_dir: Directory searched recursively for videos
+        output_dir: Directory receiving traces and the checkpoint file
+        workers: Number of worker processes (defaults to all cores)
+        mirror: Flip frames horizontally like the live loop does
+        detector_factory: Picklable callable building one detector per worker
+        detector_settings: Keyword settings passed to the factory
+        show_progress: Print a progress line to stderr
+        retry_failed: Process videos that failed in an earlier run again
+
+    Returns:
+        Summary dictionary with throughput figures and the videos that
+        failed (relative path -> error message)
+    """
+    input_dir = Path(input_dir)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    completed = load_checkpoint(output_dir)
+    jobs = []
+    skipped = 0
+    for video in find_videos(input_dir):
+        relative = video.relative_to(input_dir).as_posix()
+        trace_path = trace_path_for(video, input_dir, output_dir)
+        done = completed.get(relative)
+        if done is not None and (trace_path.exists() or ('error' in done and not retry_failed)):
+            skipped += 1
+            continue
+        trace_path.parent.mkdir(parents=True, exist_ok=True)
+        jobs.append((relative, str(video), str(trace_path), mirror))
+
+    logger.info(f"{len(jobs)} videos to process, {skipped} already done, {workers} workers")
+
+    summary = {'videos': 0, 'frames': 0, 'hand_frames': 0, 'cpu_seconds': 0.0,
+               'wall_seconds': 0.0, 'workers': workers, 'skipped': skipped, 'failed': {}}
+    if not jobs:
+        return summary
+
+    progress_queue = multiprocessing.Queue()
+    wall_start = time.perf_counter()
+    frames_done = 0
+    pending = set()
+
+    with multiprocessing.Pool(
+        processes=min(workers, len(jobs)),
+        initializer=_init_worker,
+        initargs=(detector_factory, detector_settings or {}, progress_queue),
+    ) as pool:
+        results = [pool.apply_async(_run_job, (job,)) for job in jobs]
+        pending = set(range(len(results)))
+
+        while pending:
+            try:
+                frames_done += progress_queue.get(timeout=0.5)
+            except queue.Empty:
+                pass
+
+            for index in [i for i in pending if results[i].ready()]:
+                pending.discard(index)
+                relative = jobs[index][0]
+                try:
+                    _, stats = results[index].get()
+                except Exception as e:
+                    # One unreadable video must not abort the batch
+                    logger.error(f"Failed to extract {relative}: {e}")
+                    completed[relative] = {'error': str(e)}
+                    summary['failed'][relative] = str(e)
+                    save_checkpoint(output_dir, completed)
+                    continue
+                completed[relative] = stats
+                save_checkpoint(output_dir, completed)
+
+                summary['videos'] += 1
+                summary['frames'] += stats['frames']
+                summary['hand_frames'] += stats['hand_frames']
+                summary['cpu_seconds'] += stats['cpu_seconds']
+
+            if show_progress:
+                elapsed = time.perf_counter() - wall_start
+                fps = frames_done / elapsed if elapsed > 0 else 0.0
+                sys.stderr.write(
+                    f"\r[{summary['videos']}/{len(jobs)} videos] {frames_done} frames "
+                    f"{fps:.1f} fps ({fps / workers:.1f} fps/core)   ")
+                sys.stderr.flush()
+
+    if show_progress:
+        sys.stderr.write("\n")
+
+    summary['wall_seconds'] = time.perf_counter() - wall_start
+    used_workers = min(workers, len(jobs))
+    summary['fps'] = summary['frames'] / summary['wall_seconds'] if summary['wall_seconds'] > 0 else 0.0
+    summary['fps_per_core'] = summary['fps'] / used_workers
+    summary['fps_per_cpu_second'] = (
+        summary['frames'] / summary['cpu_seconds'] if summary['cpu_seconds'] > 0 else 0.0)
+    return summary
+
+
+def main():
+    """Run batch extraction from the command line."""
+    parser = argparse.ArgumentParser(description="Extract hand landmarks from a directory of videos")
+    parser.add_argument('input_dir', help="Directory with recorded videos")
+    parser.add_argument('output_dir', help="Directory for trace files and the checkpoint")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument('--no-mirror', action='store_true', help="Do not flip frames horizontally")
+    parser.add_argument('--retry-failed', action='store_true', help="Process videos that failed before again")
+    parser.add_argument('--backend', default='solutions', choices=BACKENDS, help="Hand detector backend")
+    parser.add_argument('--tasks-model', help="hand_landmarker.task bundle for the tasks backend")
+    parser.add_argument('--landmark-model', help=".onnx / .tflite model for the onnx and tflite backends")
+    parser.add_argument('--threads', type=int, default=1, help="CPU threads per worker for onnx/tflite")
+    parser.add_argument('--model-complexity', type=int, default=1, choices=(0, 1))
+    parser.add_argument('--min-detection-confidence', type=float, default=0.7)
+    parser.add_argument('--min-tracking-confidence', type=float, default=0.7)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    summary = run_batch(
+        args.input_dir,
+        args.output_dir,
+        workers=args.workers,
+        mirror=not args.no_mirror,
+        detector_settings={
+            'backend': args.backend,
+            'tasks_model': args.tasks_model,
+            'landmark_model': args.landmark_model,
+            'num_threads': args.threads,
+            'model_complexity': args.model_complexity,
+            'min_detection_confidence': args.min_detection_confidence,
+            'min_tracking_confidence': args.min_tracking_confidence,
+        },
+        retry_failed=args.retry_failed,
+    )
+
+    print("=" * 60)
+    print(f"Videos processed:  {summary['videos']} ({summary['skipped']} skipped from checkpoint)")
+    print(f"Frames:            {summary['frames']} ({summary['hand_frames']} with a hand)")
+    if summary['failed']:
+        print(f"Failed:            {len(summary['failed'])} (retry with --retry-failed)")
+        for relative, error in summary['failed'].items():
+            print(f"  {relative}: {error}")
+    if summary['videos']:
+        print(f"Wall time:         {summary['wall_seconds']:.1f} s")
+        print(f"Throughput:        {summary['fps']:.1f} fps total, "
+              f"{summary['fps_per_core']:.1f} fps/core, "
+              f"{summary['fps_per_cpu_second']:.1f} frames per CPU-second")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+"""
+Camera configuration for AI Virtual Mouse.
+
+Opens the camera and negotiates its capture mode instead of accepting the
+driver defaults. Many UVC webcams fall back to uncompressed YUYV at 5-15 fps
+in dim rooms, because YUYV at 640x480 saturates USB 2.0 and auto exposure
+stretches the frame time. This module:
+
+1. Probes the modes the camera supports (pixel format, size, frame rates)
+2. Picks the best match for the configured size and FPS, preferring MJPG
+3. Applies FOURCC, size, FPS, ``CAP_PROP_BUFFERSIZE``, exposure and focus
+   in the order V4L2 drivers expect
+4. Reads every property back, measures the delivered frame rate and logs
+   the negotiated mode and anything the driver refused
+
+Probing is pluggable: ``V4L2CtlProber`` parses ``v4l2-ctl`` on Linux and
+``StaticProber`` returns a fixed list.
+
+Exposure is only touched when ``exposure`` is configured; otherwise the
+driver's own exposure settings are left alone.
+"""
+
+import logging
+import re
+import subprocess
+import time
+from collections import namedtuple
+
+import cv2
+
+
+logger = logging.getLogger("camera_setup")
+
+CameraMode = namedtuple('CameraMode', ['fourcc', 'width', 'height', 'fps'])
+
+# CAP_PROP_AUTO_EXPOSURE values (manual, automatic) per capture backend
+AUTO_EXPOSURE_VALUES = {
+    'V4L2': (1, 3),
+    'DSHOW': (0.25, 0.75),
+}
+DEFAULT_AUTO_EXPOSURE = AUTO_EXPOSURE_VALUES['V4L2']
+
+FPS_TOLERANCE = 0.5       # Reported FPS within this of the target counts as applied
+
+
+def fourcc_code(name):
+    """Four-character code string (e.g. 'MJPG') to its integer value."""
+    name = (name + '    ')[:4]
+    return ord(name[0]) | (ord(name[1]) << 8) | (ord(name[2]) << 16) | (ord(name[3]) << 24)
+
+
+def fourcc_name(code):
+    """Integer FOURCC (as returned by ``cap.get``) to its string."""
+    code = int(code)
+    return ''.join(chr((code >> (8 * i)) & 0xFF) for i in range(4)).strip('\x00 ')
+
+
+def default_camera_settings():
+    """Settings used when no configuration file is available."""
+    return {
+        'device_id': 0,
+        'width': 640,
+        'height': 480,
+        'fps': 30,
+        'fourcc': 'MJPG',
+        'buffer_size': 1,
+        'exposure': None,
+        'autofocus': True,
+        'focus': None,
+        'probe': True,
+        'verify_frames': 20,
+        'fallback_devices': [],
+        'max_read_failures': 5,
+        'stall_timeout': 2.0,
+        'reconnect_backoff': 5.0,
+        'max_outage': 0.0,
+    }
+
+
+# --- Capability probing -------------------------------------------------
+
+_FORMAT_RE = re.compile(r"\[\d+\]:\s*'(\w{1,4})'")
+_SIZE_RE = re.compile(r"Size:\s*Discrete\s*(\d+)x(\d+)")
+_INTERVAL_RE = re.compile(r"Interval:\s*Discrete\s*[\d.]+s\s*\(([\d.]+)\s*fps\)")
+
+
+def parse_v4l2_formats(text):
+    """
+    Parse ``v4l2-ctl --list-formats-ext`` output.
+
+    Returns:
+        List of CameraMode, one per format/size/frame rate combination
+    """
+    modes = []
+    fourcc = size = None
+    for line in text.splitlines():
+        match = _FORMAT_RE.search(line)
+        if match:
+            fourcc, size = match.group(1), None
+            continue
+        match = _SIZE_RE.search(line)
+        if match:
+            size = (int(match.group(1)), int(match.group(2)))
+            continue
+        match = _INTERVAL_RE.search(line)
+        if match and fourcc and size:
+            modes.append(CameraMode(fourcc, size[0], size[1], float(match.group(1))))
+    return modes
+
+
+class V4L2CtlProber:
+    """List camera modes with ``v4l2-ctl`` (Linux, v4l-utils package)."""
+
+    def __init__(self, device, runner=subprocess.run):
+        """
+        Args:
+            device: Device index or path (e.g. 0 or '/dev/video0')
+            runner: ``subprocess.run`` compatible callable
+        """
+        self.device = f"/dev/video{device}" if isinstance(device, int) else str(device)
+        self.runner = runner
+
+    def probe(self, cap):
+        try:
+            result = self.runner(
+                ['v4l2-ctl', '-d', self.device, '--list-formats-ext'],
+                capture_output=True, text=True, timeout=5,
+            )
+        except (OSError, subprocess.SubprocessError):
+            return []
+        if result.returncode != 0:
+            return []
+        return parse_v4l2_formats(result.stdout)
+
+
+class StaticProber:
+    """Report a fixed list of modes."""
+
+    def __init__(self, modes):
+        self.modes = list(modes)
+
+    def probe(self, cap):
+        return list(self.modes)
+
+
+def choose_mode(modes, width, height, fps, fourcc='MJPG'):
+    """
+    Pick the supported mode closest to the request.
+
+    Sizes closest to the requested one win. Among those, modes reaching the
+    requested FPS come first, then the requested pixel format, then the
+    highest frame rate.
+
+    Args:
+        modes: Supported CameraMode list (may be empty)
+        width, height, fps: Requested capture mode
+        fourcc: Preferred pixel format
+
+    Returns:
+        CameraMode, or the request itself when no modes are known
+    """
+    if not modes:
+        return CameraMode(fourcc, width, height, float(fps))
+
+    def size_distance(mode):
+        return abs(mode.width * mode.height - width * height) + abs(mode.width - width)
+
+    best_size = min(size_distance(m) for m in modes)
+    candidates = [m for m in modes if size_distance(m) == best_size]
+    return max(candidates, key=lambda m: (m.fps >= fps - FPS_TOLERANCE, m.fourcc == fourcc, m.fps))
+
+
+# --- Negotiation --------------------------------------------------------
+
+class CameraReport:
+    """Requested versus negotiated camera properties."""
+
+    def __init__(self, requested, actual, refused, measured_fps=None):
+        self.requested = requested
+        self.actual = actual
+        self.refused = refused
+        self.measured_fps = measured_fps
+
+    @property
+    def ok(self):
+        return not self.refused
+
+    def describe(self):
+        """One-line summary of the negotiated mode."""
+        a = self.actual
+        text = f"{a['fourcc'] or '?'} {a['width']}x{a['height']} @ {a['fps']:.1f} fps"
+        if self.measured_fps is not None:
+            text += f" (measured {self.measured_fps:.1f})"
+        text += f", buffer {a['buffer_size']}"
+        if 'exposure' in a:
+            text += f", exposure {a['exposure']:g}"
+        if 'autofocus' in a:
+            text += f", autofocus {'on' if a['autofocus'] else 'off'}"
+        return text
+
+
+def _backend_name(cap):
+    try:
+        return cap.getBackendName()
+    except Exception:
+        return ''
+
+
+def _read_back(cap, wanted):
+    """Read the negotiated properties of the keys in ``wanted``."""
+    actual = {
+        'fourcc': fourcc_name(cap.get(cv2.CAP_PROP_FOURCC)),
+        'width': int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        'height': int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        'fps': float(cap.get(cv2.CAP_PROP_FPS)),
+        'buffer_size': int(cap.get(cv2.CAP_PROP_BUFFERSIZE)),
+    }
+    if 'exposure' in wanted:
+        actual['exposure'] = float(cap.get(cv2.CAP_PROP_EXPOSURE))
+    if 'autofocus' in wanted:
+        actual['autofocus'] = bool(cap.get(cv2.CAP_PROP_AUTOFOCUS))
+    if 'focus' in wanted:
+        actual['focus'] = float(cap.get(cv2.CAP_PROP_FOCUS))
+    return actual
+
+
+def _matches(key, wanted, actual):
+    if key == 'fps':
+        return abs(actual - wanted) <= FPS_TOLERANCE
+    if key in ('exposure', 'focus'):
+        return abs(actual - wanted) < 1
+    return actual == wanted
+
+
+def negotiate(cap, settings, prober=None):
+    """
+    Configure an opened capture and verify the result.
+
+    Args:
+        cap: cv2.VideoCapture (or compatible) object
+        settings: Camera settings (see ``default_camera_settings``)
+        prober: Optional object with ``probe(cap)`` returning CameraMode list
+
+    Returns:
+        CameraReport
+    """
+    modes = prober.probe(cap) if prober is not None else []
+    mode = choose_mode(modes, settings['width'], settings['height'], settings['fps'],
+                       settings.get('fourcc') or 'MJPG')
+    if modes and mode.fps < settings['fps'] - FPS_TOLERANCE:
+        logger.warning(f"Camera supports at most {mode.fps:g} fps at {mode.width}x{mode.height}")
+
+    wanted = {
+        'width': mode.width,
+        'height': mode.height,
+        'fps': mode.fps,
+        'buffer_size': settings.get('buffer_size', 1),
+    }
+    if settings.get('fourcc'):
+        wanted['fourcc'] = mode.fourcc
+
+    # V4L2 applies the pixel format before the size, and the frame rate last
+    if 'fourcc' in wanted:
+        cap.set(cv2.CAP_PROP_FOURCC, fourcc_code(wanted['fourcc']))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, wanted['width'])
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, wanted['height'])
+    cap.set(cv2.CAP_PROP_FPS, wanted['fps'])
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, wanted['buffer_size'])
+
+    if settings.get('exposure') is not None:
+        # Manual exposure only sticks once auto exposure is off
+        manual, _ = AUTO_EXPOSURE_VALUES.get(_backend_name(cap), DEFAULT_AUTO_EXPOSURE)
+        cap.set(cv2.CAP_PROP_AUTO_EXPOSURE, manual)
+        cap.set(cv2.CAP_PROP_EXPOSURE, settings['exposure'])
+        wanted['exposure'] = float(settings['exposure'])
+
+    if settings.get('autofocus') is not None:
+        wanted['autofocus'] = bool(settings['autofocus'])
+        cap.set(cv2.CAP_PROP_AUTOFOCUS, 1 if wanted['autofocus'] else 0)
+    if settings.get('focus') is not None and not settings.get('autofocus'):
+        cap.set(cv2.CAP_PROP_FOCUS, settings['focus'])
+        wanted['focus'] = float(settings['focus'])
+
+    actual = _read_back(cap, wanted)
+    refused = [key for key, value in wanted.items() if not _matches(key, value, actual[key])]
+    for key in refused:
+        logger.warning(f"Camera did not accept {key}={wanted[key]} (got {actual[key]})")
+    return CameraReport(wanted, actual, refused)
+
+
+def measure_fps(cap, frames=20, clock=time.perf_counter):
+    """
+    Measure the delivered frame rate by reading frames.
+
+    Returns:
+        Frames per second, or None if reading failed
+    """
+    if frames < 2:
+        return None
+    start = None
+    for i in range(frames + 1):
+        success, _ = cap.read()
+        if not success:
+            return None
+        if i == 0:
+            start = clock()  # The first read may include stream start-up
+    elapsed = clock() - start
+    return frames / elapsed if elapsed > 0 else None
+
+
+def create_prober(device):
+    """Default prober for a camera device (v4l2-ctl on Linux)."""
+    return V4L2CtlProber(device)
+
+
+def open_camera(settings=None, capture_factory=cv2.VideoCapture, prober=None, clock=time.perf_counter):
+    """
+    Open and configure the camera.
+
+    Args:
+        settings: Camera settings (see ``default_camera_settings``); missing
+            keys use the defaults
+        capture_factory: Creates the capture from a device id
+        prober: Mode prober; by default ``v4l2-ctl`` when ``probe`` is set
+        clock: Callable returning seconds, for measuring the delivered frame rate
+
+    Returns:
+        (capture, CameraReport)
+
+    Raises:
+        RuntimeError: If the camera cannot be opened
+    """
+    merged = default_camera_settings()
+    merged.update(settings or {})
+    settings = merged
+
+    cap = capture_factory(settings['device_id'])
+    if not cap.isOpened():
+        raise RuntimeError(f"Cannot access camera {settings['device_id']}")
+
+    if prober is None and settings['probe']:
+        prober = create_prober(settings['device_id'])
+    report = negotiate(cap, settings, prober)
+    if settings['verify_frames']:
+        report.measured_fps = measure_fps(cap, settings['verify_frames'], clock)
+        if report.measured_fps is not None and report.measured_fps < settings['fps'] * 0.75:
+            logger.warning(
+                f"Camera delivers {report.measured_fps:.1f} fps (requested {settings['fps']}); "
+                f"try more light, a manual exposure or the MJPG format"
+            )
+
+    logger.info(f"Camera {settings['device_id']}: {report.describe()}")
+    return cap, report
@@ -0,0 +1,221 @@
+"""
+Camera disconnect and reconnect handling for AI Virtual Mouse.
+
+USB hubs drop cameras. ``cap.read()`` then fails (or blocks for a while)
+and the camera loop used to exit. ``CaptureSupervisor`` sits between the
+loop and the capture:
+
+- a read that fails ``max_read_failures`` times in a row, or no good frame
+  for ``stall_timeout`` seconds, counts as a lost camera
+- the capture is released and ``on_lost`` runs, so the loop can release a
+  held mouse button while keeping the cursor and pause state
+- the device is reopened with exponential backoff, cycling through the
+  configured fallback devices (a device that opens but delivers no frame
+  is skipped on the next loss); reopening skips the startup frame rate
+  check, so it takes as long as the driver needs to open the device
+- ``on_restored`` runs with the outage length once the device is reopened
+
+The hand detector and output backend are not touched, so they stay warm
+and the first frame after a reconnect is processed like any other.
+"""
+
+import logging
+import time
+
+
+logger = logging.getLogger("capture_supervisor")
+
+
+class CaptureStats:
+    """Disconnect/reconnect counters for one session."""
+
+    def __init__(self):
+        self.disconnects = 0
+        self.reconnects = 0
+        self.failed_opens = 0
+        self.stalls = 0              # Reads that took longer than stall_timeout
+        self.longest_outage = 0.0
+        self.last_reopen = 0.0       # Seconds the last successful open took
+
+
+class CaptureSupervisor:
+    """Reads frames through a FramePool and reopens the camera when it fails."""
+
+    def __init__(self, open_capture, devices=(0,), pool=None, max_read_failures=5,
+                 stall_timeout=2.0, backoff_initial=0.1, backoff_max=5.0, max_outage=0.0,
+                 on_lost=None, on_restored=None, clock=time.monotonic):
+        """
+        Args:
+            open_capture: ``open_capture(device, reconnect)`` returns an opened
+                capture or raises (e.g. RuntimeError)
+            devices: Device ids to try, primary first
+            pool: FramePool the frames are read into (None = plain reads)
+            max_read_failures: Consecutive failed reads that mean the camera is gone
+            stall_timeout: Seconds without a good frame that mean the camera is gone
+            backoff_initial: First delay between reopen attempts
+            backoff_max: Longest delay between reopen attempts
+            max_outage: Give up after this many seconds without a camera
+                (0 = keep trying)
+            on_lost: Called with the reason when the camera is lost
+            on_restored: Called with (device, outage seconds) after a reconnect
+            clock: Time source in seconds
+        """
+        self.open_capture = open_capture
+        self.devices = list(devices)
+        self.pool = pool
+        self.max_read_failures = max_read_failures
+        self.stall_timeout = stall_timeout
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.max_outage = max_outage
+        self.on_lost = on_lost
+        self.on_restored = on_restored
+        self.clock = clock
+
+        self.stats = CaptureStats()
+        self.capture = None
+        self.device = None
+        self.failed = False          # max_outage passed without a camera
+        self._failures = 0
+        self._delivered = False      # A frame was read since the capture was opened
+        self._last_frame = None
+        self._lost_at = None
+        self._attempt = 0
+        self._next_attempt = 0.0
+        self._backoff = backoff_initial
+
+    @classmethod
+    def from_settings(cls, camera_settings, open_capture, pool=None, **kwargs):
+        """Create from ConfigManager camera settings."""
+        devices = [camera_settings['device_id']] + list(camera_settings.get('fallback_devices') or [])
+        return cls(
+            open_capture,
+            devices=devices,
+            pool=pool,
+            max_read_failures=camera_settings.get('max_read_failures', 5),
+            stall_timeout=camera_settings.get('stall_timeout', 2.0),
+            backoff_max=camera_settings.get('reconnect_backoff', 5.0),
+            max_outage=camera_settings.get('max_outage', 0.0),
+            **kwargs
+        )
+
+    @property
+    def connected(self):
+        """True while a capture is open."""
+        return self.capture is not None
+
+    @property
+    def outage(self):
+        """Seconds since the camera was lost (0 while connected)."""
+        return 0.0 if self._lost_at is None else self.clock() - self._lost_at
+
+    def open(self):
+        """
+        Open the first device that works (at startup).
+
+        Raises:
+            RuntimeError: If no device can be opened
+        """
+        errors = []
+        for device in self.devices:
+            try:
+                self.capture = self.open_capture(device, False)
+            except Exception as e:
+                errors.append(f"{device}: {e}")
+                continue
+            self.device = device
+            self._delivered = False
+            self._last_frame = self.clock()
+            return self.capture
+        raise RuntimeError(f"No camera could be opened ({'; '.join(errors)})")
+
+    def read(self):
+        """
+        Read the next frame, handling failures and reconnects.
+
+        Returns:
+            Tuple of (success, frame); while the camera is lost (or being
+            reopened) success is False and frame is None
+        """
+        if self.capture is None:
+            if not self._reconnect():
+                return False, None
+
+        start = self.clock()
+        try:
+            success, frame = self.pool.read(self.capture) if self.pool is not None else self.capture.read()
+        except Exception:             # Some backends raise once the device is gone
+            success, frame = False, None
+        now = self.clock()
+
+        if success and frame is not None:
+            if now - start > self.stall_timeout:
+                self.stats.stalls += 1
+                logger.warning(f"Camera read blocked for {now - start:.1f}s")
+            self._failures = 0
+            self._delivered = True
+            self._last_frame = now
+            return True, frame
+
+        self._failures += 1
+        if self._failures >= self.max_read_failures or now - self._last_frame > self.stall_timeout:
+            reason = 'stall' if self._failures < self.max_read_failures else 'read_failures'
+            self._lose(reason, now)
+        return False, None
+
+    def _lose(self, reason, now):
+        try:
+            self.capture.release()
+        except Exception:
+            pass
+        self.capture = None
+        self._lost_at = now
+        # Retry the same device first, unless it never delivered a frame
+        self._attempt = self.devices.index(self.device) + (0 if self._delivered else 1)
+        self._backoff = self.backoff_initial
+        self._next_attempt = now
+        self.stats.disconnects += 1
+        logger.warning(f"Camera {self.device} lost ({reason}); reconnecting")
+        if self.on_lost is not None:
+            self.on_lost(reason)
+
+    def _reconnect(self):
+        now = self.clock()
+        if self.max_outage and now - self._lost_at > self.max_outage:
+            self.failed = True
+            return False
+        if now < self._next_attempt:
+            return False
+
+        device = self.devices[self._attempt % len(self.devices)]
+        self._attempt += 1
+        try:
+            capture = self.open_capture(device, True)
+        except Exception as e:
+            self.stats.failed_opens += 1
+            self._next_attempt = self.clock() + self._backoff
+            self._backoff = min(self._backoff * 2, self.backoff_max)
+            logger.debug(f"Reopening camera {device} failed: {e}")
+            return False
+
+        opened = self.clock()
+        outage = opened - self._lost_at
+        self.capture = capture
+        self.device = device
+        self._failures = 0
+        self._delivered = False
+        self._last_frame = opened
+        self._lost_at = None
+        self.stats.reconnects += 1
+        self.stats.last_reopen = opened - now
+        self.stats.longest_outage = max(self.stats.longest_outage, outage)
+        logger.info(f"Camera {device} reconnected after {outage:.1f}s (open took {(opened - now) * 1000:.0f} ms)")
+        if self.on_restored is not None:
+            self.on_restored(device, outage)
+        return True
+
+    def release(self):
+        """Release the current capture."""
+        if self.capture is not None:
+            self.capture.release()
+            self.capture = None
@@ -0,0 +1,277 @@
+"""
+Pinch onset detection for AI Virtual Mouse.
+
+A left click fires once the index-thumb distance drops below
+``click_distance``, late in the pinch. By then the index fingertip, which
+drives the cursor, has already travelled towards the thumb, and the
+smoothed cursor has drifted off the target the user aimed at.
+
+``PinchOnset`` watches how fast the 3D (x, y, z) index-thumb distance
+closes. MediaPipe's z has roughly the x scale, so pinches along the camera
+axis are seen as well. From the smoothed closing speed it predicts when the
+3D distance will cross ``click_distance``. The 2D distance the click
+threshold uses is never larger, so the click is due no later than that:
+
+- onset: the crossing is due within ``lead_time``. The cursor freezes, so
+  the click lands where the user aimed.
+- early click: the crossing is due within ``click_lead`` and the fingers are
+  already within ``commit_ratio`` of the click distance. The click fires
+  now instead of a frame later.
+- cancel: the smoothed closing speed drops to zero (the fingers stop closing
+  or open again), or the pinch does not complete in time. The cursor is
+  released. A click that already fired early cannot be taken back; those
+  are counted as ``unconfirmed``.
+
+Usage (click latency and wrong-target rate on replayed synthetic clicks):
+    python src/click_onset.py
+    python src/click_onset.py --pinch-time 0.15 --noise 2
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+INDEX_TIP = 8
+THUMB_TIP = 4
+
+
+class PinchOnset:
+    """Predict a left pinch from the closing speed of the index-thumb distance."""
+
+    def __init__(self, click_distance=30, lead_time=0.15, click_lead=0.04, commit_ratio=1.2,
+                 min_speed=150.0, smoothing=0.6, max_gap=0.1):
+        """
+        Args:
+            click_distance: Pixel distance at which the pinch is a click
+            lead_time: Predicted seconds to the crossing that freeze the cursor
+            click_lead: Predicted seconds to the crossing that fire the click
+            commit_ratio: Fingers must be within this multiple of the click
+                distance before an early click
+            min_speed: Closing speed (pixels per second) that counts as a
+                pinch starting
+            smoothing: Weight of the newest speed sample (0-1)
+            max_gap: Seconds between frames after which the speed restarts
+        """
+        self.click_distance = click_distance
+        self.lead_time = lead_time
+        self.click_lead = click_lead
+        self.commit_ratio = commit_ratio
+        self.min_speed = min_speed
+        self.smoothing = smoothing
+        self.max_gap = max_gap
+        self.onsets = 0
+        self.early_clicks = 0
+        self.cancels = 0
+        self.unconfirmed = 0
+        self._previous = None        # (time, 3D distance)
+        self.speed = 0.0
+        self.reset()
+
+    @classmethod
+    def from_settings(cls, settings):
+        """Create from GesturePipeline settings."""
+        return cls(
+            click_distance=settings['click_distance'],
+            lead_time=settings.get('onset_lead_time', 0.15),
+            click_lead=settings.get('onset_click_lead', 0.04),
+            min_speed=settings.get('onset_min_speed', 150.0),
+        )
+
+    def reset(self):
+        """Drop a pending onset, e.g. once the pinch is held or the hand was lost."""
+        self.frozen = False
+        self.committed = False
+        self._onset_time = None
+
+    def _cancel(self):
+        self.cancels += 1
+        if self.committed:
+            self.unconfirmed += 1
+        self.reset()
+        return 'cancel'
+
+    def update(self, landmarks, w, h, now, distance):
+        """
+        Add a frame of an open (not yet pinched) hand.
+
+        Args:
+            landmarks: (21, 3) normalized landmark array
+            w: Frame width in pixels
+            h: Frame height in pixels
+            now: Frame time in seconds
+            distance: 2D index-thumb distance in pixels, as the click
+                threshold sees it
+
+        Returns:
+            'onset', 'click' (fire the click now), 'pinch' (the pinch
+            crossed the click distance), 'cancel' or None
+        """
+        dx = (float(landmarks[INDEX_TIP, 0]) - float(landmarks[THUMB_TIP, 0])) * w
+        dy = (float(landmarks[INDEX_TIP, 1]) - float(landmarks[THUMB_TIP, 1])) * h
+        dz = (float(landmarks[INDEX_TIP, 2]) - float(landmarks[THUMB_TIP, 2])) * w
+        distance_3d = (dx * dx + dy * dy + dz * dz) ** 0.5
+        previous = self._previous
+        self._previous = (now, distance_3d)
+        if previous is None or not 0 < now - previous[0] <= self.max_gap:
+            self.speed = 0.0
+            if self.frozen:
+                return self._cancel()
+            return None
+        closing = (previous[1] - distance_3d) / (now - previous[0])
+        self.speed = self.smoothing * closing + (1 - self.smoothing) * self.speed
+
+        if distance <= self.click_distance:
+            # Reached: the pipeline's own pinch check takes over (and does
+            # not click again if the click already fired early)
+            return 'pinch'
+        speed = self.speed
+        # Distance and speed both in 3D; the 2D crossing comes no later
+        remaining = (distance_3d - self.click_distance) / speed if speed > 0 else float('inf')
+
+        if not self.frozen:
+            if speed >= self.min_speed and remaining <= self.lead_time:
+                self.frozen = True
+                self._onset_time = now
+                self.onsets += 1
+                return 'onset'
+            return None
+
+        # Smoothed speed, so one jittery frame does not release the cursor
+        if speed <= 0 or now - self._onset_time > 2 * self.lead_time:
+            return self._cancel()
+        if (not self.committed and remaining <= self.click_lead
+                and distance_3d <= self.click_distance * self.commit_ratio):
+            self.committed = True
+            self.early_clicks += 1
+            return 'click'
+        return None
+
+    def as_dict(self):
+        return {
+            'onsets': self.onsets,
+            'early_clicks': self.early_clicks,
+            'cancels': self.cancels,
+            'unconfirmed': self.unconfirmed,
+        }
+
+
+def click_session(targets=20, seed=0, pinch_time=0.2, near_misses=5):
+    """
+    Point-and-click movements with some pinches that stop short.
+
+    Args:
+        targets: Clicks, each after a move to a random target
+        seed: Random seed for the targets
+        pinch_time: Seconds the fingers take to close
+        near_misses: Pinches that open again before the fingers meet
+
+    Returns:
+        SyntheticSequence ready to ``build``
+    """
+    try:
+        from synthetic_hands import SyntheticSequence
+    except ImportError:
+        sys.path.append(str(Path(__file__).parent))
+        from synthetic_hands import SyntheticSequence
+
+    rng = np.random.default_rng(seed)
+    seq = SyntheticSequence(transition=pinch_time)
+    seq.hold(1.0)
+    misses = set(rng.choice(targets, min(near_misses, targets), replace=False).tolist())
+    for i in range(targets):
+        target = rng.uniform((0.25, 0.3), (0.75, 0.7))
+        seq.move(target, float(rng.uniform(0.3, 0.6))).hold(0.8)
+        if i in misses:
+            seq.near_click(closeness=0.5).hold(0.4)
+        seq.click().hold(0.6)
+    return seq
+
+
+def evaluate(trace, settings=None, pinch_time=0.2, target_radius=15.0):
+    """
+    Replay a click session and score the clicks.
+
+    Args:
+        trace: SyntheticTrace of ``click_session``
+        settings: Pipeline settings overrides
+        pinch_time: Pinch duration the session was built with
+        target_radius: Screen pixels a click may land from the aimed point
+
+    Returns:
+        Result dictionary: latency from the fingers starting to close to
+        the click, click error, wrong-target and miss rates, and clicks
+        during pinches that stopped short
+    """
+    try:
+        from gesture_benchmark import SCREEN_SIZE, replay
+    except ImportError:
+        sys.path.append(str(Path(__file__).parent))
+        from gesture_benchmark import SCREEN_SIZE, replay
+
+    backend, _, _, _ = replay(trace, settings)
+    margin = (settings or {}).get('frame_reduction', 100)
+    clicks = [a for a in backend.actions if a.name in ('click', 'double_click')]
+    used = set()
+    latencies, errors, missed = [], [], 0
+    near_clicks = 0
+    for label in trace.labels:
+        begin = label.start - pinch_time
+        window = [a for a in clicks if begin <= a.time <= label.end + 0.1 and id(a) not in used]
+        if label.kind == 'near_click':
+            near_clicks += bool(window)
+            used.update(id(a) for a in window)
+            continue
+        if label.kind != 'click':
+            continue
+        if not window:
+            missed += 1
+            continue
+        action = window[0]
+        used.add(id(action))
+        aim_x = np.interp(label.x * trace.width, (margin, trace.width - margin), (0, SCREEN_SIZE[0]))
+        aim_y = np.interp(label.y * trace.height, (margin, trace.height - margin), (0, SCREEN_SIZE[1]))
+        latencies.append(action.time - begin)
+        errors.append(float(np.hypot(action.x - aim_x, action.y - aim_y)))
+
+    labels = sum(label.kind == 'click' for label in trace.labels)
+    near = sum(label.kind == 'near_click' for label in trace.labels)
+    errors = np.array(errors)
+    return {
+        'clicks': labels,
+        'latency_ms': float(np.mean(latencies) * 1000) if latencies else None,
+        'error_px': float(errors.mean()) if len(errors) else None,
+        'wrong_target_rate': float(np.mean(errors > target_radius)) if len(errors) else None,
+        'miss_rate': missed / labels if labels else 0.0,
+        'near_miss_click_rate': near_clicks / near if near else 0.0,
+        'extra_clicks': len(clicks) - len(used),
+    }
+
+
+def main():
+    """Compare clicks with and without onset detection on replayed traces."""
+    parser = argparse.ArgumentParser(description="Click latency and wrong-target rate with pinch onset detection")
+    parser.add_argument('--targets', type=int, default=30)
+    parser.add_argument('--pinch-time', type=float, default=0.2, help="Seconds the fingers take to close")
+    parser.add_argument('--noise', type=float, default=1.5, help="Landmark jitter in pixels")
+    parser.add_argument('--target-radius', type=float, default=15.0, help="Screen pixels around the aimed point")
+    parser.add_argument('--seeds', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{args.targets} clicks x {args.seeds} seeds, pinch {args.pinch_time * 1000:.0f} ms, "
+          f"noise {args.noise} px, target radius {args.target_radius:g} px")
+    print(f"{'onset':<6} {'latency':>9} {'error':>8} {'wrong':>6} {'missed':>7} {'near':>5} {'extra':>6}")
+    for onset in (False, True):
+        results = []
+        for seed in range(args.seeds):
+            trace = click_session(args.targets, seed, args.pinch_time).build(noise_px=args.noise, seed=seed)
+            results.append(evaluate(trace, {'onset_detection': onset}, args.pinch_time, args.target_radius))
+        mean = {key: float(np.mean([r[key] for r in results])) for key in results[0] if key != 'clicks'}
+        print(f"{'on' if onset else 'off':<6} {mean['latency_ms']:>7.0f}ms {mean['error_px']:>6.1f}px "
+              f"{mean['wrong_target_rate']:>6.0%} {mean['miss_rate']:>7.0%} "
+              f"{mean['near_miss_click_rate']:>5.0%} {mean['extra_clicks']:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
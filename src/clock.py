@@ -0,0 +1,53 @@
+"""
+Clocks for AI Virtual Mouse.
+
+Every timing-based gesture (double click, drag hold, pause fist, thumbs-up
+hold, swipes, tracking grace periods) measures time through the timestamp
+handed to ``GesturePipeline.process``; when none is given the pipeline
+reads its clock. The camera loop uses ``MonotonicClock``, so NTP or manual
+wall-clock changes cannot fire or suppress gestures. Tests and replays use
+``SimulatedClock``, set from frame timestamps, so recorded sessions replay
+as fast as the CPU allows and always produce the same actions.
+"""
+
+import time
+
+
+class MonotonicClock:
+    """Production clock: seconds from ``time.monotonic``."""
+
+    def __call__(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class SimulatedClock:
+    """Clock that only moves when told to; ``sleep`` returns immediately."""
+
+    def __init__(self, start=0.0):
+        self.now = float(start)
+
+    def __call__(self):
+        return self.now
+
+    def set(self, now):
+        """
+        Jump to a timestamp, e.g. the next frame of a trace.
+
+        Raises:
+            ValueError: If the timestamp is earlier than the current time
+        """
+        now = float(now)
+        if now < self.now:
+            raise ValueError(f"Clock cannot go back from {self.now} to {now}")
+        self.now = now
+
+    def advance(self, seconds):
+        """Move forward by ``seconds``."""
+        self.set(self.now + seconds)
+
+    def sleep(self, seconds):
+        self.now += max(0.0, float(seconds))
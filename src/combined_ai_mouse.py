@@ -12,56 +12,67 @@ Combined AI Virtual Mouse with all features:
 """
 
 import cv2
-import mediapipe as mp
-import pyautogui
+import gc
 import numpy as np
 import time
 import logging
+import signal
 from pathlib import Path
 import sys
 
 # Import custom modules
 try:
     from config_manager import ConfigManager
-    from logger_setup import setup_logger, PerformanceLogger
+    from logger_setup import setup_logger, PerformanceLogger, StartupTimer
+    from landmark_ring import LandmarkRing
+    from landmark_utils import draw_landmark_array
+    # calculate_distance and is_fist_gesture are re-exported for existing callers
+    from gesture_pipeline import GesturePipeline, calculate_distance, is_fist_gesture
+    from output_backend import PyAutoGUIBackend, ThreadedBackend
+    from display_topology import DisplayTargeting
+    from camera_setup import open_camera, default_camera_settings
+    from capture_supervisor import CaptureSupervisor
+    from frame_preprocess import FramePreprocessor
+    from frame_pool import FramePool
+    from hand_detector import create_detector
+    from detector_warmup import DetectorWarmup, DetectorSwap
+    from performance_governor import PerformanceGovernor
+    from tracking_continuity import TrackingContinuity
+    from idle_monitor import IdleMonitor
+    from action_log import ActionLog, ActionLoggingBackend
+    from clock import MonotonicClock
+    from frame_profiler import FrameProfiler, SamplingProfiler
+    from flight_recorder import FlightRecorder, AnomalyTrigger, gesture_state
 except ImportError:
     # Fallback if modules not in same directory
     sys.path.append(str(Path(__file__).parent))
     from config_manager import ConfigManager
-    from logger_setup import setup_logger, PerformanceLogger
-
-
-def calculate_distance(x1, y1, x2, y2):
-    """Calculate Euclidean distance between two points."""
-    return ((x1 - x2)**2 + (y1 - y2)**2) ** 0.5
-
-
-def is_fist_gesture(landmarks, w, h):
-    """
-    Detect fist gesture for pause/resume.
-    Returns True if all fingertips are close to palm.
-    """
-    # Get palm center (landmark 0)
-    palm_x = landmarks[0].x * w
-    palm_y = landmarks[0].y * h
-    
-    # Check if all fingertips (8, 12, 16, 20) are close to palm
-    fingertips = [8, 12, 16, 20]  # Index, middle, ring, pinky
-    threshold = 80  # Distance threshold for fist detection
-    
-    for tip_id in fingertips:
-        tip_x = landmarks[tip_id].x * w
-        tip_y = landmarks[tip_id].y * h
-        distance = calculate_distance(palm_x, palm_y, tip_x, tip_y)
-        if distance > threshold:
-            return False
-    
-    return True
+    from logger_setup import setup_logger, PerformanceLogger, StartupTimer
+    from landmark_ring import LandmarkRing
+    from landmark_utils import draw_landmark_array
+    from gesture_pipeline import GesturePipeline, calculate_distance, is_fist_gesture
+    from output_backend import PyAutoGUIBackend, ThreadedBackend
+    from display_topology import DisplayTargeting
+    from camera_setup import open_camera, default_camera_settings
+    from capture_supervisor import CaptureSupervisor
+    from frame_preprocess import FramePreprocessor
+    from frame_pool import FramePool
+    from hand_detector import create_detector
+    from detector_warmup import DetectorWarmup, DetectorSwap
+    from performance_governor import PerformanceGovernor
+    from tracking_continuity import TrackingContinuity
+    from idle_monitor import IdleMonitor
+    from action_log import ActionLog, ActionLoggingBackend
+    from clock import MonotonicClock
+    from frame_profiler import FrameProfiler, SamplingProfiler
+    from flight_recorder import FlightRecorder, AnomalyTrigger, gesture_state
 
 
 def main():
     """Main function to run the combined AI Virtual Mouse application with all features."""
     
+    startup = StartupTimer()
+    
     # Load configuration
     try:
         config = ConfigManager()
@@ -70,7 +81,8 @@ def main():
             level=config.get('logging.level', 'INFO'),
             max_bytes=config.get('logging.max_file_size', 10485760),
             backup_count=config.get('logging.backup_count', 3),
-            console=config.get('logging.console', True)
+            console=config.get('logging.console', True),
+            use_queue=config.get('logging.async', True)
         )
         logger.info("=" * 60)
         logger.info("AI Virtual Mouse starting...")
@@ -84,147 +96,326 @@ def main():
     
     # Performance logger
     perf_logger = PerformanceLogger(logger)
+    startup.mark('config')
     
     # Load settings from config or use defaults
     if config:
-        cursor_settings = config.get_cursor_settings()
-        click_settings = config.get_click_settings()
-        scroll_settings = config.get_scroll_settings()
-        drag_settings = config.get_drag_settings()
         camera_settings = config.get_camera_settings()
         hand_settings = config.get_hand_detection_settings()
         visual_settings = config.get_visual_settings()
         perf_settings = config.get_performance_settings()
-        accessibility_settings = config.get_accessibility_settings()
-        
-        smoothening = cursor_settings['smoothening']
-        frame_reduction = cursor_settings['frame_reduction']
-        click_distance = click_settings['left_click_distance']
-        right_click_distance = click_settings['right_click_distance']
-        double_click_time = click_settings['double_click_time']
-        scroll_threshold = scroll_settings['threshold']
-        scroll_sensitivity = scroll_settings['sensitivity']
-        scroll_activation_distance = scroll_settings['activation_distance']
-        drag_hold_duration = drag_settings['hold_duration']
+        capture_settings = config.get_capture_settings()
     else:
         # Default values
-        smoothening = 5
-        frame_reduction = 100
-        click_distance = 30
-        right_click_distance = 40
-        double_click_time = 0.3
-        scroll_threshold = 20
-        scroll_sensitivity = 10
-        scroll_activation_distance = 30
-        drag_hold_duration = 1.0
         perf_settings = {'enable_fps_counter': True}
         visual_settings = {'show_landmarks': True, 'show_active_area': True, 'show_instructions': True}
-        accessibility_settings = {'enable_pause_gesture': True, 'pause_detection_time': 2.0}
+        capture_settings = {'source': 'camera', 'ring_name': 'ai_mouse_ring'}
     
-    logger.info(f"Settings loaded - Smoothening: {smoothening}, Frame reduction: {frame_reduction}")
-
-    logger.info(f"Settings loaded - Smoothening: {smoothening}, Frame reduction: {frame_reduction}")
+    # Mouse output and gesture recognition
+    mouse = PyAutoGUIBackend()
+    threaded_output = None
+    if perf_settings.get('threaded_output', True):
+        # PyAutoGUI sleeps after every call; keep that off the frame loop
+        mouse = threaded_output = ThreadedBackend(mouse)
+    # Gesture timing runs on a monotonic clock, read once per frame
+    clock = MonotonicClock()
 
-    # Variables for smoothing logic
-    plocX, plocY = 0, 0      # Previous Location
-    clocX, clocY = 0, 0      # Current Location
-
-    # Variables for double click logic
-    last_click_time = 0      # Time of last click
-
-    # Variables for scroll logic
-    prev_scroll_y = None
-    scroll_mode_active = False  # Flag to indicate if we're in scroll mode
-
-    # Variables for drag and drop logic
-    pinch_start_time = None
-    is_dragging = False
+    action_log = None
+    event_logs = []      # Receive hand found/lost and pause/resume events
+    frame_loggers = []   # (backend, on the pipeline clock) told each frame's capture time
+    if config and config.get('logging.action_log', ''):
+        try:
+            action_log = ActionLog(
+                config.get('logging.action_log'),
+                max_bytes=config.get('logging.action_log_max_size', 5242880),
+                backup_count=config.get('logging.backup_count', 3)
+            )
+            mouse = ActionLoggingBackend(mouse, action_log, log_moves=config.get('logging.action_log_moves', True))
+            event_logs.append(action_log)
+            frame_loggers.append((mouse, False))      # Wall-clock log file
+            logger.info(f"Logging actions to {action_log.path}")
+        except OSError as e:
+            logger.warning(f"Action log disabled: {e}")
     
-    # Variables for click state tracking
-    left_click_prev = False  # Track if left click was triggered in previous frame
-    right_click_prev = False  # Track if right click was triggered in previous frame
+    # Last seconds of frames, landmarks, gesture states and actions, kept
+    # in memory and dumped as a replayable trace on demand or on an anomaly
+    flight = FlightRecorder.from_config(config, fps=camera_settings['fps'] if config else 30, clock=clock)
+    flight_settings = config.get_flight_recorder_settings() if config else {'auto_dump': False}
+    anomalies = None
+    if flight.enabled:
+        # Same time base as the recorded frames, so actions line up with them
+        mouse = flight.wrap_output(mouse)
+        event_logs.append(flight)
+        frame_loggers.append((mouse, True))
+        if flight_settings['auto_dump']:
+            anomalies = AnomalyTrigger(flight_settings['stuck_drag_time'], flight_settings['min_dump_interval'])
+    dump_requested = []
+    if flight.enabled and hasattr(signal, 'SIGUSR1'):
+        # kill -USR1 <pid> asks the loop for a dump
+        signal.signal(signal.SIGUSR1, lambda signum, frame: dump_requested.append('signal'))
+    
+    def dump_flight(reason):
+        path = flight.dump(reason)
+        if path is not None:
+            logger.warning(f"Flight recorder dump ({reason}): {path}")
+    
+    display = None
+    if config:
+        try:
+            display = DisplayTargeting.from_config(config)
+            logger.info(f"Display target: {display.target} ({display.region.name} "
+                        f"{display.region.width}x{display.region.height}+{display.region.x}+{display.region.y}), "
+                        f"{len(display.topology.monitors)} monitor(s)")
+        except Exception as e:
+            logger.warning(f"Monitor layout unavailable ({e}); mapping onto the primary screen")
+    pipeline = GesturePipeline.from_config(config, mouse, display=display, clock=clock)
+    continuity = TrackingContinuity.from_config(pipeline, config)
+    frame_reduction = pipeline.settings['frame_reduction']
+    pause_gesture_enabled = pipeline.settings['pause_gesture_enabled']
     
-    # Variables for pause/resume functionality
-    is_paused = False
-    fist_start_time = None
-    pause_gesture_enabled = accessibility_settings.get('enable_pause_gesture', True)
-    pause_detection_time = accessibility_settings.get('pause_detection_time', 2.0)
+    logger.info(f"Settings loaded - Smoothening: {pipeline.settings['smoothening']}, Frame reduction: {frame_reduction}")
+    if pipeline.dwell is not None:
+        logger.info(f"Dwell click: hold the cursor within {pipeline.dwell.radius}px for {pipeline.dwell.dwell_time}s")
+    logger.info(f"Screen resolution: {pipeline.screen_width}x{pipeline.screen_height}")
+    startup.mark('output')
     
     # Variables for FPS calculation
     fps = 0
-    frame_time = 0
     prev_time = time.time()
+    had_hand = False
 
-    # 1. Setup Camera
-    try:
-        if config:
-            camera_id = camera_settings['device_id']
-            cam_width = camera_settings['width']
-            cam_height = camera_settings['height']
-        else:
-            camera_id = 0
-            cam_width = 640
-            cam_height = 480
-        
-        cap = cv2.VideoCapture(camera_id)
-        
-        if not cap.isOpened():
-            logger.error(f"Failed to open camera with ID {camera_id}")
-            raise RuntimeError(f"Cannot access camera {camera_id}")
+    # 1. Setup Hand Detector (the producer runs it when reading from a ring)
+    ring = None
+    cap = None
+    detector = None
+    warmup = None
+    # Landmarks are normalized, so they map onto the full-resolution frame
+    # and the screen regardless of the inference resolution
+    preprocessor = FramePreprocessor(hand_settings['inference_width'] if config else 320)
+    if capture_settings['source'] != 'shared_ring':
+        if not config:
+            camera_settings = default_camera_settings()
+        try:
+            detector = create_detector(hand_settings if config else {})
+            logger.info(f"Hand detector initialized successfully ({detector.name} backend)")
+        except Exception as e:
+            logger.error(f"Hand detector initialization error: {e}")
+            raise
+        startup.mark('detector')
+        # The first detector calls are slow (graph setup, lazy allocations);
+        # make them on synthetic frames while the camera opens
+        warmup = DetectorWarmup.from_settings(
+            detector, hand_settings if config else {},
+            preprocessor.inference_size(camera_settings['width'], camera_settings['height'])
+        ).start()
+
+    # 2. Setup Camera (or attach to a shared landmark producer)
+    # Camera frames are decoded into reused buffers and mirrored in place,
+    # so the steady-state loop allocates no frame-sized arrays
+    frame_pool = FramePool()
+    if capture_settings['source'] == 'shared_ring':
+        try:
+            ring = LandmarkRing.attach(capture_settings['ring_name'])
+        except FileNotFoundError:
+            logger.error(f"Landmark ring '{capture_settings['ring_name']}' not found - is the producer running?")
+            raise
+        logger.info(f"Reading frames from landmark ring '{ring.name}' ({ring.width}x{ring.height})")
+        logger.info("Using landmarks published by the producer")
+    else:
+        def open_device(device, reconnect):
+            settings = dict(camera_settings, device_id=device)
+            if reconnect:
+                # The mode was negotiated at startup; skip the slow FPS check
+                settings['verify_frames'] = 0
+            return open_camera(settings)[0]
         
-        # Set camera resolution explicitly for better performance
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, cam_width)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, cam_height)
+        def camera_lost(reason):
+            nonlocal had_hand
+            # Release a held button; the cursor and pause state are kept
+            pipeline.reset_gestures()
+            if had_hand:
+                for event_log in event_logs:
+                    event_log.record('hand_lost')
+                had_hand = False
         
-        logger.info(f"Camera initialized: {cam_width}x{cam_height}")
-    except Exception as e:
-        logger.error(f"Camera initialization error: {e}")
-        raise
+        try:
+            # Applies format, FPS, buffer size, exposure and focus, and logs
+            # the negotiated mode. The supervisor reopens the camera (or a
+            # fallback device) when it disconnects; the detector and mouse
+            # output stay as they are
+            cap = CaptureSupervisor.from_settings(camera_settings, open_device, frame_pool, on_lost=camera_lost)
+            cap.open()
+        except Exception as e:
+            logger.error(f"Camera initialization error: {e}")
+            warmup.wait()
+            detector.close()
+            raise
+        startup.mark('camera')
+        warmup.wait()
+        startup.add('warm-up', warmup.seconds)
+        startup.mark('warm-up wait')
+        if warmup.latencies:
+            logger.info(f"Detector warm-up: {len(warmup.latencies)} calls, first {warmup.latencies[0]:.0f} ms, "
+                        f"last {warmup.latencies[-1]:.0f} ms")
 
-    screen_width, screen_height = pyautogui.size()
-    logger.info(f"Screen resolution: {screen_width}x{screen_height}")
-
-    # 2. Setup Hand Detector
-    try:
-        mp_hands = mp.solutions.hands
-        if config:
-            hands = mp_hands.Hands(
-                static_image_mode=False,
-                max_num_hands=hand_settings['max_num_hands'],
-                min_detection_confidence=hand_settings['min_detection_confidence'],
-                min_tracking_confidence=hand_settings['min_tracking_confidence']
-            )
-        else:
-            hands = mp_hands.Hands(
-                static_image_mode=False,
-                max_num_hands=1,
-                min_detection_confidence=0.7,
-                min_tracking_confidence=0.7
-            )
-        mp_draw = mp.solutions.drawing_utils
-        logger.info("Hand detector initialized successfully")
-    except Exception as e:
-        logger.error(f"Hand detector initialization error: {e}")
-        cap.release()
-        raise
+    # Shared frames are copied into a private buffer before drawing on them;
+    # landmarks are copied out of the slot and validated with is_current
+    landmark_array = np.empty((21, 3), dtype=np.float32)
+    if ring is not None:
+        ring_seq = 0
+        shared_frame = np.empty((ring.height, ring.width, 3), dtype=np.uint8)
 
+    placeholder = None   # Shown while the camera is reconnecting
+    
+    # Without a hand in view, drop to low-rate motion checks of the active area
+    idle = IdleMonitor.from_config(config, frame_reduction)
+    
+    # Opt-in slow-frame incidents and session-wide stack sampling
+    profiler = FrameProfiler.from_config(config)
+    if profiler.enabled:
+        logger.info(f"Frame budget {profiler.budget * 1000:.0f} ms, incidents in {profiler.incident_dir}")
+    # Steps quality down (preview rate, overlay, inference width, model)
+    # when frames cost more than the target, and back up when there is room
+    governor = PerformanceGovernor.from_config(config, detector_knobs=ring is None)
+    quality = governor.quality
+    detector_swap = None
+    frame_index = 0
+    if governor.enabled:
+        logger.info(f"Performance governor: target {governor.target()}, {len(governor.levels)} quality levels")
+    
+    def swap_detector(complexity, frame_size):
+        # Built and warmed up on a thread; swapped in once ready
+        return DetectorSwap(lambda: create_detector(dict(hand_settings, model_complexity=complexity)),
+                            frame_size)
+    
+    profile_settings = config.get_profiling_settings() if config else {'sampling': False}
+    sampler = None
+    if profile_settings['sampling']:
+        sampler = SamplingProfiler(profile_settings['sample_interval']).start()
+        logger.info(f"Sampling stacks every {profile_settings['sample_interval'] * 1000:.0f} ms")
+    
+    # Startup objects (models, config, modules) never become garbage; moving
+    # them out of the collector's generations keeps full collections short
+    gc.collect()
+    gc.freeze()
+    
     logger.info("Starting main loop...")
     
     try:
         while True:
             loop_start_time = time.time()
+            now = clock()
+            profiler.start_frame()
             
-            success, frame = cap.read()
-            if not success:
-                logger.warning("Failed to read frame from camera")
-                break
-            
-            # Flip frame for mirror effect
-            frame = cv2.flip(frame, 1)
+            if ring is not None:
+                ring_frame = ring.wait_next(ring_seq, timeout=2.0)
+                if ring_frame is None:
+                    logger.warning("Landmark producer stopped publishing frames")
+                    break
+                ring_seq = ring_frame.seq
+                np.copyto(shared_frame, ring_frame.frame)
+                np.copyto(landmark_array, ring_frame.landmarks)
+                has_hand = ring_frame.has_hand and ring.is_current(ring_frame)
+                frame = shared_frame  # Producer already mirrored it
+            else:
+                success, camera_frame = cap.read()
+                if not success:
+                    if cap.failed:
+                        logger.error(f"Camera did not come back within {cap.max_outage:.0f}s")
+                        break
+                    if not cap.connected:
+                        warmup.keep_warm(now)
+                        governor.reset_window(now)
+                        if placeholder is None:
+                            placeholder = np.zeros((camera_settings['height'], camera_settings['width'], 3),
+                                                   dtype=np.uint8)
+                        placeholder[:] = 0
+                        cv2.putText(placeholder, f"Camera disconnected - reconnecting ({cap.outage:.0f}s)",
+                                    (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+                        cv2.imshow('AI Virtual Mouse - All Features', placeholder)
+                    if cv2.waitKey(100 if not cap.connected else 1) & 0xFF == ord('q'):
+                        logger.info("User requested quit")
+                        break
+                    continue
+                
+                # Mirror the pooled frame in place for the preview; the
+                # detector gets a reduced-resolution RGB copy
+                frame = preprocessor.preview_frame(camera_frame, in_place=True)
             h, w, _ = frame.shape
-        
-            # Display pause status
-            if is_paused:
+            profiler.mark('capture')
+            work_start = time.perf_counter()
+            governed = ring is not None   # Frames that ran the full pipeline
+            
+            if ring is None:
+                if detector_swap is not None and detector_swap.ready:
+                    try:
+                        replacement = detector_swap.take()
+                    except Exception as e:
+                        logger.warning(f"Could not switch the detector model: {e}")
+                    else:
+                        detector.close()
+                        detector = warmup.detector = replacement
+                    detector_swap = None
+                    governor.end_settling(now)   # Measure the new model from here
+                if idle.idle and not idle.motion_seen(camera_frame, now):
+                    has_hand = False  # Idle: no detection until motion in the active area
+                    warmup.keep_warm(now)  # So the wake-up frame is not a cold call
+                else:
+                    governed = True
+                    landmarks = detector.detect(preprocessor.inference_frame(camera_frame, mirrored=True), now)
+                    warmup.mark_used(now)
+                    has_hand = landmarks is not None
+                    if has_hand:
+                        np.copyto(landmark_array, landmarks)
+                    if idle.hand_seen(has_hand, now, camera_frame):
+                        logger.info("No hand in view - idle mode")
+                profiler.mark('detect')
+            if startup is not None:
+                startup.mark('first frame')
+                logger.info(f"Startup: {startup.summary()}")
+                startup = None
+            
+            for frame_logger, pipeline_clock in frame_loggers:
+                frame_logger.mark_frame(now if pipeline_clock else loop_start_time)
+            if has_hand != had_hand:
+                for event_log in event_logs:
+                    event_log.record('hand_found' if has_hand else 'hand_lost')
+            had_hand = has_hand
+            
+            # Draw landmarks if enabled
+            frame_index += 1
+            show_preview = frame_index % quality.preview_interval == 0
+            if has_hand and visual_settings.get('show_landmarks', True) and quality.draw_landmarks and show_preview:
+                draw_landmark_array(frame, landmark_array)
+            
+            # Gestures follow the first detected hand; short dropouts are
+            # bridged by the continuity layer instead of being skipped
+            was_paused = pipeline.is_paused
+            feedback = continuity.update(landmark_array if has_hand else None, w, h, now)
+            profiler.mark('gestures')
+            if pipeline.is_paused != was_paused:
+                logger.info(f"Application {'paused' if pipeline.is_paused else 'resumed'}")
+                for event_log in event_logs:
+                    event_log.record('pause' if pipeline.is_paused else 'resume')
+            flight.record_frame(now, frame, landmark_array if has_hand else None,
+                                gesture_state(pipeline, continuity.is_coasting, idle.idle))
+            if flight.frame_count == 1:
+                logger.info(f"Flight recorder: last {flight.capacity} frames, {flight.nbytes / 1e6:.1f} MB")
+                if ring is None:
+                    logger.info(f"Frame pool: {frame_pool.slots} buffers, {frame_pool.nbytes / 1e6:.1f} MB")
+            
+            for x, y, radius, color in feedback:
+                cv2.circle(frame, (x, y), radius, color, cv2.FILLED)
+            if pipeline.dwell_ring is not None:
+                # Dwell click progress: the ring closes as the dwell completes
+                x, y, radius, progress, color = pipeline.dwell_ring
+                cv2.ellipse(frame, (x, y), (radius, radius), -90, 0, 360 * progress, color, 3)
+            
+            # Display pause and idle status
+            if ring is None and idle.idle:
+                cv2.putText(frame, "IDLE - Move a hand into the box to wake", (10, 60), 
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+            if pipeline.is_paused:
                 cv2.putText(frame, "PAUSED - Make fist for 2 sec to resume", (10, 30), 
                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
             
@@ -237,194 +428,6 @@ def main():
                     tuple(visual_settings.get('colors', {}).get('active_area', [255, 0, 255])),
                     2
                 )
-            
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            output = hands.process(rgb_frame)
-            
-            if output.multi_hand_landmarks:
-                for hand_landmarks in output.multi_hand_landmarks:
-                    # Draw landmarks if enabled
-                    if visual_settings.get('show_landmarks', True):
-                        mp_draw.draw_landmarks(
-                            frame, 
-                            hand_landmarks, 
-                            mp_hands.HAND_CONNECTIONS
-                        )
-                    
-                    landmarks = hand_landmarks.landmark
-                    
-                    # Check for fist gesture (pause/resume)
-                    if pause_gesture_enabled:
-                        if is_fist_gesture(landmarks, w, h):
-                            if fist_start_time is None:
-                                fist_start_time = time.time()
-                            elif time.time() - fist_start_time >= pause_detection_time:
-                                is_paused = not is_paused
-                                fist_start_time = None
-                                logger.info(f"Application {'paused' if is_paused else 'resumed'}")
-                                # Release mouse if paused while dragging
-                                if is_paused and is_dragging:
-                                    pyautogui.mouseUp()
-                                    is_dragging = False
-                        else:
-                            fist_start_time = None
-                    
-                    # Skip gesture processing if paused
-                    if is_paused:
-                        continue
-                    
-                    # Get coordinates for all relevant fingers
-                    index_x = landmarks[8].x * w
-                index_y = landmarks[8].y * h
-                thumb_x = landmarks[4].x * w
-                thumb_y = landmarks[4].y * h
-                middle_x = landmarks[12].x * w
-                middle_y = landmarks[12].y * h
-                ring_x = landmarks[16].x * w
-                ring_y = landmarks[16].y * h
-                
-                # Calculate distances between fingers
-                index_thumb_distance = calculate_distance(index_x, index_y, thumb_x, thumb_y)
-                middle_thumb_distance = calculate_distance(middle_x, middle_y, thumb_x, thumb_y)
-                middle_ring_distance = calculate_distance(middle_x, middle_y, ring_x, ring_y)
-                
-                current_time = time.time()
-                
-                # Check if scroll mode should be activated (middle + ring fingers together)
-                if middle_ring_distance < scroll_activation_distance:  # Close together to activate scroll mode
-                    scroll_mode_active = True
-                    # Disable drag when in scroll mode
-                    if is_dragging:
-                        pyautogui.mouseUp()
-                        is_dragging = False
-                        pinch_start_time = None
-                    
-                    # Visual feedback for scroll mode (Yellow circle)
-                    avg_x = int((middle_x + ring_x) / 2)
-                    avg_y = int((middle_y + ring_y) / 2)
-                    cv2.circle(frame, (avg_x, avg_y), 15, (0, 255, 255), cv2.FILLED)
-                    
-                    # Handle scrolling
-                    if prev_scroll_y is not None:
-                        scroll_delta = prev_scroll_y - middle_y  # Positive = upward movement
-                        
-                        # Only scroll if movement exceeds threshold
-                        if abs(scroll_delta) > scroll_threshold:
-                            scroll_amount = int(scroll_delta / scroll_sensitivity)
-                            if scroll_amount != 0:
-                                pyautogui.scroll(scroll_amount)
-                
-                    # Update previous position for next scroll calculation
-                    prev_scroll_y = middle_y
-                else:
-                    scroll_mode_active = False
-                    prev_scroll_y = None  # Reset for next scroll session
-                
-                # If not in scroll mode, handle cursor movement and clicks/drag
-                if not scroll_mode_active:
-                    # --- 1. Convert Coordinates (Mapping) ---
-                    # Map coordinates from camera frame to screen
-                    x3 = np.interp(
-                        index_x,
-                        (frame_reduction, w - frame_reduction),
-                        (0, screen_width)
-                    )
-                    y3 = np.interp(
-                        index_y,
-                        (frame_reduction, h - frame_reduction),
-                        (0, screen_height)
-                    )
-                    
-                    # --- 2. Apply Smoothing ---
-                    # Current = Previous + (Target - Previous) / Smoothing Amount
-                    clocX = plocX + (x3 - plocX) / smoothening
-                    clocY = plocY + (y3 - plocY) / smoothening
-                    
-                    # --- 3. Move Mouse ---
-                    pyautogui.moveTo(clocX, clocY)
-                    
-                    # Update Previous Location for next loop
-                    plocX, plocY = clocX, clocY
-
-                    # Handle drag and drop functionality
-                    if index_thumb_distance < click_distance:
-                        # Visual feedback for pinch (Green Circle)
-                        cv2.circle(
-                            frame, 
-                            (int(index_x), int(index_y)), 
-                            15, 
-                            (0, 255, 0), 
-                            cv2.FILLED
-                        )
-                        
-                        if pinch_start_time is None:
-                            # Start timing the pinch
-                            pinch_start_time = current_time
-                        elif not is_dragging and (current_time - pinch_start_time) >= drag_hold_duration:
-                            # Initiate drag
-                            pyautogui.mouseDown()
-                            is_dragging = True
-                            # Change visual feedback to indicate drag (Blue Circle)
-                            cv2.circle(
-                                frame, 
-                                (int(index_x), int(index_y)), 
-                                20, 
-                                (255, 0, 0), 
-                                cv2.FILLED
-                            )
-                    else:
-                        # Not pinching anymore
-                        if is_dragging:
-                            # Release the drag
-                            pyautogui.mouseUp()
-                            is_dragging = False
-                        pinch_start_time = None
-
-                    # Track right-click state to avoid repeated triggering
-                    # Handle right click (only when not dragging)
-                    if middle_thumb_distance < right_click_distance and not is_dragging and not right_click_prev:
-                        # Visual feedback for right click (Red Circle)
-                        cv2.circle(
-                            frame,
-                            (int(middle_x), int(middle_y)),
-                            15,
-                            (0, 0, 255),  # Red color
-                            cv2.FILLED
-                        )
-                        pyautogui.rightClick()
-                        right_click_prev = True  # Mark as triggered to prevent repeated triggering
-                    elif middle_thumb_distance >= right_click_distance:
-                        right_click_prev = False  # Reset when fingers are apart
-
-                    # Handle left click (only when not dragging and not right clicking)
-                    if index_thumb_distance < click_distance and not is_dragging and middle_thumb_distance >= right_click_distance and not left_click_prev:
-                        # Check for double click
-                        current_time = pyautogui.time.time()
-                        if current_time - last_click_time < double_click_time:
-                            # Visual feedback for double click (Blue Circle)
-                            cv2.circle(
-                                frame,
-                                (int(index_x), int(index_y)),
-                                15,
-                                (255, 0, 0),
-                                cv2.FILLED
-                            )
-                            pyautogui.doubleClick()
-                            last_click_time = 0  # Reset to prevent triple-click
-                        else:
-                            # Visual feedback for single click (Green Circle)
-                            cv2.circle(
-                                frame,
-                                (int(index_x), int(index_y)),
-                                15,
-                                (0, 255, 0),
-                                cv2.FILLED
-                            )
-                            pyautogui.click()
-                            last_click_time = current_time
-                        left_click_prev = True  # Mark as triggered
-                    elif index_thumb_distance >= click_distance:
-                        left_click_prev = False  # Reset when fingers are apart
 
             # Draw FPS counter
             if perf_settings.get('enable_fps_counter', True):
@@ -433,6 +436,9 @@ def main():
                 prev_time = curr_time
                 cv2.putText(frame, f"FPS: {int(fps)}", (w-120, 30), 
                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+                if governor.level:
+                    cv2.putText(frame, f"Quality -{governor.level}", (w-120, 55),
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
             
             # Draw instructions on frame
             if visual_settings.get('show_instructions', True):
@@ -449,15 +455,57 @@ def main():
             if perf_settings.get('log_performance', False):
                 perf_logger.log_frame(time.time() - loop_start_time)
 
-            cv2.imshow('AI Virtual Mouse - All Features', frame)
+            profiler.mark('draw')
+            if show_preview:
+                cv2.imshow('AI Virtual Mouse - All Features', frame)
+            
+            if governed:
+                changed = governor.frame(time.perf_counter() - work_start, now)
+                if changed is not None:
+                    preprocessor.set_inference_width(changed.inference_width)
+                    if ring is None and changed.model_complexity != quality.model_complexity:
+                        if detector_swap is not None:
+                            try:
+                                detector_swap.take().close()
+                            except Exception:
+                                pass
+                        detector_swap = swap_detector(changed.model_complexity,
+                                                      preprocessor.inference_size(w, h))
+                        governor.hold_settling()      # The old model still runs until the swap
+                    quality = changed
+                    perf_logger.log_governor(governor.as_dict())
+            else:
+                governor.reset_window(now)
             
-            key = cv2.waitKey(1) & 0xFF
+            # While idle the wait also throttles capture to the idle rate
+            delay = idle.frame_delay(time.time() - loop_start_time) if ring is None else 0.0
+            profiler.allow(delay)
+            key = cv2.waitKey(max(1, int(delay * 1000))) & 0xFF
+            profiler.mark('display')
+            incident = profiler.end_frame(
+                frame, landmark_array if has_hand else None,
+                {'has_hand': bool(has_hand), 'paused': pipeline.is_paused, 'idle': idle.idle,
+                 'dragging': pipeline.is_dragging, 'coasting': continuity.is_coasting,
+                 'quality_level': governor.level}
+            )
+            if incident is not None:
+                logger.warning(f"Frame over budget - incident written to {incident}")
+            if dump_requested:
+                dump_flight(dump_requested.pop())
+            if anomalies is not None:
+                reason = anomalies.update(now, pipeline, continuity, incident is not None)
+                if reason is not None:
+                    dump_flight(reason)
             if key == ord('q'):
                 logger.info("User requested quit")
                 break
             elif key == ord('p') and not pause_gesture_enabled:
-                is_paused = not is_paused
-                logger.info(f"Application {'paused' if is_paused else 'resumed'} (keyboard)")
+                pipeline.toggle_pause()
+                logger.info(f"Application {'paused' if pipeline.is_paused else 'resumed'} (keyboard)")
+                for event_log in event_logs:
+                    event_log.record('pause' if pipeline.is_paused else 'resume')
+            elif key == ord('f'):
+                dump_flight('hotkey')
     
     except KeyboardInterrupt:
         logger.info("Application interrupted by user")
@@ -465,17 +513,86 @@ def main():
         logger.error(f"Unexpected error in main loop: {e}", exc_info=True)
     finally:
         # Make sure to release mouse if still dragging when quitting
-        if is_dragging:
+        try:
+            pipeline.release_all()
+        except Exception:
+            pass
+        if threaded_output is not None:
+            threaded_output.close()
+        
+        stats = continuity.stats
+        logger.info(
+            f"Tracking dropouts: {stats.dropouts} (mean {stats.mean_duration * 1000:.0f}ms, "
+            f"longest {stats.longest * 1000:.0f}ms), coasted frames: {stats.coasted_frames}, "
+            f"button releases on timeout: {stats.timeouts}"
+        )
+        profiler.close()
+        if profiler.slow_frames:
+            logger.info(
+                f"Slow frames: {profiler.slow_frames} of {profiler.frames} over "
+                f"{profiler.budget * 1000:.0f} ms (worst {profiler.worst * 1000:.0f} ms), "
+                f"{profiler.incidents} incident file(s)"
+            )
+        if sampler is not None:
+            sampler.stop()
             try:
-                pyautogui.mouseUp()
-            except:
-                pass
+                sampler.write_collapsed(profile_settings['collapsed_file'])
+                logger.info(f"{sampler.samples} stack samples written to {profile_settings['collapsed_file']}")
+            except OSError as e:
+                logger.warning(f"Could not write stack samples: {e}")
+        if cap is not None and cap.stats.disconnects:
+            capture_stats = cap.stats
+            logger.info(
+                f"Camera disconnects: {capture_stats.disconnects}, reconnects: {capture_stats.reconnects} "
+                f"(longest outage {capture_stats.longest_outage:.1f}s, last reopen "
+                f"{capture_stats.last_reopen * 1000:.0f} ms), stalled reads: {capture_stats.stalls}"
+            )
+        if frame_pool.reallocations:
+            logger.info(f"Capture backend ignored the frame pool on {frame_pool.reallocations} "
+                        f"of {frame_pool.reads} reads")
+        idle.close(clock())
+        idle_stats = idle.stats
+        if idle_stats.idle_entries:
+            logger.info(
+                f"Idle periods: {idle_stats.idle_entries}, idle time {idle_stats.idle_seconds:.0f}s, "
+                f"wake-ups: {idle_stats.wakeups} ({idle_stats.false_wakeups} without a hand)"
+            )
+        if governor.enabled:
+            governor_stats = governor.stats
+            logger.info(
+                f"Governor: final quality level {governor.level} of {len(governor.levels) - 1}, "
+                f"{governor_stats.downgrades} downgrades, {governor_stats.upgrades} upgrades, seconds per level: "
+                f"{[round(seconds) for seconds in governor_stats.seconds_at_level]}"
+            )
+        if pipeline.onset is not None and pipeline.onset.onsets:
+            onset = pipeline.onset
+            logger.info(
+                f"Pinch onsets: {onset.onsets}, early clicks: {onset.early_clicks} "
+                f"({onset.unconfirmed} not completed), cancelled: {onset.cancels}"
+            )
+        if pipeline.dwell is not None and pipeline.dwell.clicks:
+            logger.info(f"Dwell clicks: {pipeline.dwell.clicks}, cancelled dwells: {pipeline.dwell.cancels}")
+        if warmup is not None and warmup.rewarms:
+            logger.info(f"Detector keep-warm passes while unused: {warmup.rewarms}")
         
         # Cleanup resources
         try:
-            cap.release()
+            if cap is not None:
+                cap.release()
+            if detector is not None:
+                detector.close()
+            if detector_swap is not None and detector_swap.ready and detector_swap.detector is not None:
+                detector_swap.detector.close()
+            if ring is not None:
+                ring.close()
+            flight.wait(timeout=5.0)
+            if action_log is not None:
+                action_log.close()
+                if action_log.dropped:
+                    logger.warning(f"Action log dropped {action_log.dropped} records")
+            if display is not None:
+                display.topology.close()
             cv2.destroyAllWindows()
-            hands.close()
             logger.info("Application closed successfully")
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
@@ -489,5 +606,6 @@ if __name__ == "__main__":
     print("- Pinch middle finger and thumb for right click")
     print("- Bring middle and ring fingers together for scroll mode")
     print("- Pinch and hold index finger and thumb for 1 second to drag")
+    print("- Press 'f' to save the last seconds for a bug report")
     print("- Press 'q' to quit")
     main()
\ No newline at end of file
@@ -64,6 +64,7 @@ class ConfigGUI:
         self.create_slider(clicks_frame, "Left Click Distance:", "clicks.left_click_distance", 20, 50, 0)
         self.create_slider(clicks_frame, "Right Click Distance:", "clicks.right_click_distance", 30, 60, 1)
         self.create_slider(clicks_frame, "Double Click Time (sec):", "clicks.double_click_time", 0.1, 0.5, 2, resolution=0.01)
+        self.create_checkbox(clicks_frame, "Freeze Cursor at Pinch Onset", "clicks.onset_detection", 3)
         
         # === SCROLL TAB ===
         self.create_slider(scroll_frame, "Scroll Threshold:", "scroll.threshold", 10, 40, 0)
@@ -88,6 +89,9 @@ class ConfigGUI:
         # === ACCESSIBILITY TAB ===
         self.create_checkbox(accessibility_frame, "Enable Pause Gesture", "accessibility.enable_pause_gesture", 0)
         self.create_slider(accessibility_frame, "Pause Detection Time:", "accessibility.pause_detection_time", 1.0, 3.0, 1, resolution=0.1)
+        self.create_checkbox(accessibility_frame, "Enable Dwell Click", "accessibility.dwell_click", 2)
+        self.create_slider(accessibility_frame, "Dwell Time:", "accessibility.dwell_time", 0.4, 3.0, 3, resolution=0.1)
+        self.create_slider(accessibility_frame, "Dwell Radius:", "accessibility.dwell_radius", 10, 80, 4)
         
         # === BUTTONS ===
         button_frame = ttk.Frame(self.root)
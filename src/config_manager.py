@@ -70,15 +70,48 @@ class ConfigManager:
     def _validate_config(self) -> None:
         """Validate configuration values are within acceptable ranges."""
         validations = [
+            ('camera.buffer_size', 1, 4),
+            ('camera.stall_timeout', 0.5, 10),
+            ('hand_detection.warmup_frames', 0, 60),
             ('cursor.smoothening', 1, 15),
             ('cursor.frame_reduction', 50, 200),
+            ('cursor.pointer_gain', 0.25, 4.0),
             ('clicks.left_click_distance', 20, 50),
             ('clicks.right_click_distance', 30, 60),
             ('clicks.double_click_time', 0.1, 0.5),
+            ('clicks.onset_lead_time', 0.05, 0.3),
+            ('clicks.onset_click_lead', 0, 0.1),
+            ('clicks.onset_min_speed', 50, 500),
             ('scroll.threshold', 10, 40),
             ('scroll.sensitivity', 5, 20),
             ('scroll.activation_distance', 20, 50),
             ('drag.hold_duration', 0.5, 2.0),
+            ('tracking.grace_period', 0.05, 0.3),
+            ('tracking.release_timeout', 0.2, 2.0),
+            ('tracking.denoise_min_cutoff', 0.1, 5.0),
+            ('tracking.denoise_beta', 0, 200),
+            ('display.edge_switch_time', 0.2, 2.0),
+            ('governor.target_fps', 5, 120),
+            ('governor.target_cpu_percent', 5, 400),
+            ('governor.window', 0.5, 10),
+            ('governor.upgrade_margin', 0.3, 0.95),
+            ('governor.upgrade_windows', 1, 20),
+            ('governor.memory', 0, 600),
+            ('profiling.frame_budget_ms', 30, 1000),
+            ('profiling.sample_interval', 0.005, 0.5),
+            ('flight_recorder.seconds', 2, 60),
+            ('flight_recorder.frame_width', 0, 640),
+            ('idle.idle_after', 2, 60),
+            ('idle.idle_fps', 1, 10),
+            ('idle.motion_threshold', 5, 40),
+            ('gestures.pose_hold_time', 0.2, 2.0),
+            ('gestures.swipe_distance', 0.1, 0.6),
+            ('accessibility.dwell_time', 0.4, 3.0),
+            ('accessibility.dwell_radius', 10, 80),
+            ('gestures.palm_swipe_distance', 0.15, 0.6),
+            ('gestures.palm_swipe_time', 0.08, 0.4),
+            ('gestures.flick_distance', 0.08, 0.4),
+            ('gestures.flick_time', 0.06, 0.3),
         ]
         
         for key, min_val, max_val in validations:
@@ -136,6 +169,10 @@ class ConfigManager:
         return {
             'smoothening': self.get('cursor.smoothening', 5),
             'frame_reduction': self.get('cursor.frame_reduction', 100),
+            'mode': self.get('cursor.mode', 'absolute'),
+            'acceleration_curve': self.get('cursor.acceleration_curve', 'precision'),
+            'pointer_gain': self.get('cursor.pointer_gain', 1.0),
+            'clutch_enabled': self.get('cursor.clutch_enabled', True),
         }
     
     def get_click_settings(self) -> Dict[str, Any]:
@@ -144,6 +181,12 @@ class ConfigManager:
             'left_click_distance': self.get('clicks.left_click_distance', 30),
             'right_click_distance': self.get('clicks.right_click_distance', 40),
             'double_click_time': self.get('clicks.double_click_time', 0.3),
+            'onset_detection': self.get('clicks.onset_detection', True),
+            'onset_lead_time': self.get('clicks.onset_lead_time', 0.15),
+            'onset_click_lead': self.get('clicks.onset_click_lead', 0.04),
+            'onset_min_speed': self.get('clicks.onset_min_speed', 150),
+            'left_click_release_distance': self.get('clicks.left_click_release_distance'),
+            'right_click_release_distance': self.get('clicks.right_click_release_distance'),
         }
     
     def get_scroll_settings(self) -> Dict[str, Any]:
@@ -152,6 +195,7 @@ class ConfigManager:
             'threshold': self.get('scroll.threshold', 20),
             'sensitivity': self.get('scroll.sensitivity', 10),
             'activation_distance': self.get('scroll.activation_distance', 30),
+            'release_distance': self.get('scroll.release_distance'),
         }
     
     def get_drag_settings(self) -> Dict[str, Any]:
@@ -167,6 +211,45 @@ class ConfigManager:
             'width': self.get('camera.width', 640),
             'height': self.get('camera.height', 480),
             'fps': self.get('camera.fps', 30),
+            'fourcc': self.get('camera.fourcc', 'MJPG'),
+            'buffer_size': self.get('camera.buffer_size', 1),
+            'exposure': self.get('camera.exposure', None),
+            'autofocus': self.get('camera.autofocus', True),
+            'focus': self.get('camera.focus', None),
+            'probe': self.get('camera.probe', True),
+            'verify_frames': self.get('camera.verify_frames', 20),
+            'fallback_devices': list(self.get('camera.fallback_devices', []) or []),
+            'max_read_failures': self.get('camera.max_read_failures', 5),
+            'stall_timeout': self.get('camera.stall_timeout', 2.0),
+            'reconnect_backoff': self.get('camera.reconnect_backoff', 5.0),
+            'max_outage': self.get('camera.max_outage', 0),
+        }
+    
+    def get_capture_settings(self) -> Dict[str, Any]:
+        """Get frame source settings."""
+        return {
+            'source': self.get('capture.source', 'camera'),
+            'ring_name': self.get('capture.ring_name', 'ai_mouse_ring'),
+        }
+    
+    def get_tracking_settings(self) -> Dict[str, Any]:
+        """Get tracking continuity and landmark denoising settings."""
+        return {
+            'enable_coasting': self.get('tracking.enable_coasting', True),
+            'grace_period': self.get('tracking.grace_period', 0.15),
+            'release_timeout': self.get('tracking.release_timeout', 0.5),
+            'denoise': self.get('tracking.denoise', True),
+            'denoise_min_cutoff': self.get('tracking.denoise_min_cutoff', 1.0),
+            'denoise_beta': self.get('tracking.denoise_beta', 40.0),
+        }
+    
+    def get_display_settings(self) -> Dict[str, Any]:
+        """Get multi-monitor display settings."""
+        return {
+            'target': self.get('display.target', 'primary'),
+            'provider': self.get('display.provider', 'auto'),
+            'edge_switch_time': self.get('display.edge_switch_time', 0.5),
+            'scale_overrides': self.get('display.scale_overrides', None) or {},
         }
     
     def get_hand_detection_settings(self) -> Dict[str, Any]:
@@ -175,6 +258,15 @@ class ConfigManager:
             'max_num_hands': self.get('hand_detection.max_num_hands', 1),
             'min_detection_confidence': self.get('hand_detection.min_detection_confidence', 0.7),
             'min_tracking_confidence': self.get('hand_detection.min_tracking_confidence', 0.7),
+            'inference_width': self.get('hand_detection.inference_width', 320),
+            'backend': self.get('hand_detection.backend', 'solutions'),
+            'model_complexity': self.get('hand_detection.model_complexity', 1),
+            'tasks_model': self.get('hand_detection.tasks_model', 'models/hand_landmarker.task'),
+            'live_stream': self.get('hand_detection.live_stream', False),
+            'landmark_model': self.get('hand_detection.landmark_model', 'models/hand_landmark_full.onnx'),
+            'num_threads': self.get('hand_detection.num_threads', 2),
+            'warmup_frames': self.get('hand_detection.warmup_frames', 10),
+            'keep_warm_interval': self.get('hand_detection.keep_warm_interval', 2.0),
         }
     
     def get_visual_settings(self) -> Dict[str, Any]:
@@ -192,6 +284,72 @@ class ConfigManager:
         return {
             'enable_fps_counter': self.get('performance.enable_fps_counter', True),
             'log_performance': self.get('performance.log_performance', False),
+            'threaded_output': self.get('performance.threaded_output', True),
+        }
+    
+    def get_governor_settings(self) -> Dict[str, Any]:
+        """Get performance governor settings."""
+        return {
+            'enabled': self.get('governor.enabled', False),
+            'mode': self.get('governor.mode', 'fps'),
+            'target_fps': self.get('governor.target_fps', 30),
+            'target_cpu_percent': self.get('governor.target_cpu_percent', 50),
+            'window': self.get('governor.window', 2.0),
+            'upgrade_margin': self.get('governor.upgrade_margin', 0.75),
+            'upgrade_windows': self.get('governor.upgrade_windows', 2),
+            'memory': self.get('governor.memory', 60.0),
+            'min_inference_width': self.get('governor.min_inference_width', 160),
+        }
+    
+    def get_profiling_settings(self) -> Dict[str, Any]:
+        """Get slow-frame incident and sampling profiler settings."""
+        return {
+            'enabled': self.get('profiling.enabled', False),
+            'frame_budget_ms': self.get('profiling.frame_budget_ms', 100),
+            'incident_dir': self.get('profiling.incident_dir', 'logs/incidents'),
+            'max_incidents': self.get('profiling.max_incidents', 20),
+            'cooldown': self.get('profiling.cooldown', 5.0),
+            'sampling': self.get('profiling.sampling', False),
+            'sample_interval': self.get('profiling.sample_interval', 0.02),
+            'collapsed_file': self.get('profiling.collapsed_file', 'logs/profile.collapsed'),
+        }
+    
+    def get_flight_recorder_settings(self) -> Dict[str, Any]:
+        """Get flight recorder history and dump settings."""
+        return {
+            'enabled': self.get('flight_recorder.enabled', True),
+            'seconds': self.get('flight_recorder.seconds', 10),
+            'frame_width': self.get('flight_recorder.frame_width', 160),
+            'dump_dir': self.get('flight_recorder.dump_dir', 'logs/flight'),
+            'auto_dump': self.get('flight_recorder.auto_dump', True),
+            'stuck_drag_time': self.get('flight_recorder.stuck_drag_time', 8.0),
+            'min_dump_interval': self.get('flight_recorder.min_dump_interval', 30.0),
+        }
+    
+    def get_idle_settings(self) -> Dict[str, Any]:
+        """Get idle power saving settings."""
+        return {
+            'enabled': self.get('idle.enabled', True),
+            'idle_after': self.get('idle.idle_after', 10.0),
+            'idle_fps': self.get('idle.idle_fps', 4),
+            'wake_grace': self.get('idle.wake_grace', 2.0),
+            'motion_threshold': self.get('idle.motion_threshold', 12),
+            'motion_area': self.get('idle.motion_area', 0.01),
+        }
+    
+    def get_gesture_settings(self) -> Dict[str, Any]:
+        """Get pose/swipe/flick gesture settings and the gesture-to-action bindings."""
+        return {
+            'pose_hold_time': self.get('gestures.pose_hold_time', 0.5),
+            'swipe_distance': self.get('gestures.swipe_distance', 0.25),
+            'swipe_time': self.get('gestures.swipe_time', 0.5),
+            'palm_swipe_distance': self.get('gestures.palm_swipe_distance', 0.3),
+            'palm_swipe_time': self.get('gestures.palm_swipe_time', 0.15),
+            'flick_distance': self.get('gestures.flick_distance', 0.18),
+            'flick_time': self.get('gestures.flick_time', 0.12),
+            'flick_scroll': self.get('gestures.flick_scroll', 5),
+            'motion_cooldown': self.get('gestures.motion_cooldown', 0.5),
+            'bindings': dict(self.get('gestures.bindings', {}) or {}),
         }
     
     def get_accessibility_settings(self) -> Dict[str, Any]:
@@ -200,6 +358,9 @@ class ConfigManager:
             'enable_sound_feedback': self.get('accessibility.enable_sound_feedback', False),
             'enable_pause_gesture': self.get('accessibility.enable_pause_gesture', True),
             'pause_detection_time': self.get('accessibility.pause_detection_time', 2.0),
+            'dwell_click': self.get('accessibility.dwell_click', False),
+            'dwell_time': self.get('accessibility.dwell_time', 1.0),
+            'dwell_radius': self.get('accessibility.dwell_radius', 30),
         }
     
     def reset_to_defaults(self) -> None:
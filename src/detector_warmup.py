@@ -0,0 +1,348 @@
+"""
+Detector warm-up for AI Virtual Mouse.
+
+The first calls into a freshly created hand detector are much slower than
+steady state: MediaPipe builds its graph and allocates tensors lazily,
+ONNX Runtime and TFLite plan memory on the first run, and thread pools
+spin up. Without a warm-up those calls land on the first camera frames,
+so the first gesture after launch lags or is missed. ``DetectorWarmup``
+runs the detector on synthetic frames instead:
+
+- at startup, on a background thread while the camera is being opened
+  (which takes a second or more itself), so the warm-up is mostly free
+- while the detector is not in use (idle mode, camera reconnecting), one
+  short keep-warm pass every ``keep_warm_interval`` seconds, so the
+  detector does not go cold again before detection resumes
+- when the detector is replaced (the performance governor switching to a
+  lighter model), ``DetectorSwap`` builds and warms up the new one on a
+  background thread and the frame loop swaps it in once it is ready
+
+The synthetic frames show a drawn open hand at the inference resolution,
+so backends that always run their landmark model (onnx, tflite) exercise
+the full path; whether MediaPipe's palm detector accepts the drawing
+varies. Every pass ends on a blank frame, so no backend is left tracking
+the synthetic hand when real frames arrive.
+
+Usage (first-call latency with and without warm-up):
+    python src/detector_warmup.py --backend solutions
+    python src/detector_warmup.py --backend onnx --landmark-model models/hand_landmark_full.onnx --video videos/session.mp4
+"""
+
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+try:
+    from landmark_utils import HAND_CONNECTIONS
+    from synthetic_hands import OPEN_HAND
+except ImportError:
+    sys.path.append(str(Path(__file__).parent))
+    from landmark_utils import HAND_CONNECTIONS
+    from synthetic_hands import OPEN_HAND
+
+
+logger = logging.getLogger("detector_warmup")
+
+RESULTS_PATH = Path(__file__).parent.parent / 'benchmarks' / 'results' / 'warmup_latest.json'
+
+SKIN_RGB = (224, 172, 138)
+BACKGROUND_RGB = (96, 104, 112)
+
+
+def warmup_frames(width=320, height=240, count=10):
+    """
+    Synthetic RGB detector inputs: a drawn open hand, then a blank frame.
+
+    Args:
+        width: Frame width (the detector's inference width)
+        height: Frame height
+        count: Number of frames; the last one is always blank
+
+    Returns:
+        List of (height, width, 3) uint8 RGB frames
+    """
+    count = max(1, count)
+    scale = min(width, height) / 480.0 * 0.9
+    frames = []
+    for i in range(count - 1):
+        frame = np.full((height, width, 3), BACKGROUND_RGB, dtype=np.uint8)
+        # Drift a little between frames, like a real hand
+        wrist = np.array([width * (0.5 + 0.02 * (i % 3 - 1)), height * 0.9])
+        points = np.round(wrist + OPEN_HAND * scale).astype(np.int32)
+        palm = points[[0, 1, 5, 9, 13, 17]]
+        cv2.fillConvexPoly(frame, cv2.convexHull(palm), SKIN_RGB)
+        thickness = max(2, int(round(18 * scale)))
+        for start, end in HAND_CONNECTIONS:
+            cv2.line(frame, tuple(points[start]), tuple(points[end]), SKIN_RGB, thickness)
+        frames.append(frame)
+    frames.append(np.full((height, width, 3), BACKGROUND_RGB, dtype=np.uint8))
+    return frames
+
+
+class DetectorWarmup:
+    """Runs a detector on synthetic frames at startup and while it is unused."""
+
+    def __init__(self, detector, frame_size=(320, 240), frames=10, keep_warm_interval=2.0):
+        """
+        Args:
+            detector: HandLandmarkDetector to warm up
+            frame_size: (width, height) of the detector input
+            frames: Synthetic frames in the startup warm-up (0 = none)
+            keep_warm_interval: Seconds without detection before a keep-warm
+                pass (0 = never)
+        """
+        self.detector = detector
+        self.frame_count = frames
+        self.keep_warm_interval = keep_warm_interval
+        self.frames = warmup_frames(frame_size[0], frame_size[1], frames) if frames else []
+        # Keep-warm passes use the first hand frame and the blank frame
+        self._keep_warm_frames = warmup_frames(frame_size[0], frame_size[1], 2)
+        self.latencies = []          # Milliseconds per startup warm-up call
+        self.seconds = 0.0
+        self.error = None
+        self.rewarms = 0
+        self._last_used = None
+        self._thread = None
+
+    @classmethod
+    def from_settings(cls, detector, hand_settings, frame_size):
+        """
+        Create from ConfigManager hand detection settings.
+
+        Args:
+            detector: HandLandmarkDetector to warm up
+            hand_settings: Settings with ``warmup_frames`` and ``keep_warm_interval``
+            frame_size: (width, height) of the detector input
+        """
+        return cls(detector, frame_size,
+                   frames=hand_settings.get('warmup_frames', 10),
+                   keep_warm_interval=hand_settings.get('keep_warm_interval', 2.0))
+
+    def run(self):
+        """
+        Run the startup warm-up on the calling thread.
+
+        Timestamps start at 0, before any camera frame, so backends that
+        need increasing timestamps accept the real frames afterwards.
+
+        Returns:
+            List of per-call latencies in milliseconds
+        """
+        start = time.perf_counter()
+        try:
+            for i, frame in enumerate(self.frames):
+                call_start = time.perf_counter()
+                self.detector.detect(frame, i / 30.0)
+                self.latencies.append((time.perf_counter() - call_start) * 1000)
+        except Exception as e:
+            # A broken backend shows up on the first real frame; startup goes on
+            self.error = e
+            logger.warning(f"Detector warm-up failed: {e}")
+        self.seconds = time.perf_counter() - start
+        return self.latencies
+
+    def start(self):
+        """Run the startup warm-up on a background thread; ``wait`` joins it."""
+        self._thread = threading.Thread(target=self.run, name="detector-warmup", daemon=True)
+        self._thread.start()
+        return self
+
+    def wait(self, timeout=None):
+        """
+        Wait for a warm-up started with ``start``.
+
+        Returns:
+            True if the warm-up finished
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                return False
+            self._thread = None
+        return True
+
+    def mark_used(self, now):
+        """Record that the detector ran on a real frame."""
+        self._last_used = now
+
+    def keep_warm(self, now):
+        """
+        Run a keep-warm pass if the detector has been unused for too long.
+
+        Call on frames where detection is skipped. Must run on the thread
+        that calls the detector.
+
+        Returns:
+            True if a pass ran
+        """
+        if not self.keep_warm_interval:
+            return False
+        if self._last_used is None:
+            self._last_used = now
+            return False
+        if now - self._last_used < self.keep_warm_interval:
+            return False
+        for i, frame in enumerate(self._keep_warm_frames):
+            self.detector.detect(frame, now + i * 0.001)
+        self._last_used = now
+        self.rewarms += 1
+        return True
+
+
+class DetectorSwap:
+    """Create and warm up a replacement detector on a background thread."""
+
+    def __init__(self, factory, frame_size=(320, 240), frames=5):
+        """
+        Args:
+            factory: Callable returning the new HandLandmarkDetector
+            frame_size: (width, height) of the detector input
+            frames: Warm-up frames run on the new detector
+        """
+        self.factory = factory
+        self.frame_size = frame_size
+        self.frames = frames
+        self.detector = None
+        self.error = None
+        self._thread = threading.Thread(target=self._build, name="detector-swap", daemon=True)
+        self._thread.start()
+
+    def _build(self):
+        try:
+            detector = self.factory()
+            DetectorWarmup(detector, self.frame_size, self.frames).run()
+            self.detector = detector
+        except Exception as e:
+            self.error = e
+
+    @property
+    def ready(self):
+        """True once the replacement is built (or failed)."""
+        return not self._thread.is_alive()
+
+    def take(self):
+        """
+        Return the warmed-up replacement; call once ``ready``.
+
+        Raises:
+            Exception: The error raised while creating the detector
+        """
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+        return self.detector
+
+
+def first_call_latencies(detector, frames, count=50, warmup=None):
+    """
+    Time the first detector calls on real frames.
+
+    Args:
+        detector: Freshly created HandLandmarkDetector
+        frames: RGB detector inputs (repeated if fewer than ``count``)
+        count: Calls to time
+        warmup: Optional DetectorWarmup to run before the timed calls
+
+    Returns:
+        Array of per-call latencies in milliseconds
+    """
+    if warmup is not None:
+        warmup.run()
+    latencies = np.empty(count)
+    for i in range(count):
+        start = time.perf_counter()
+        detector.detect(frames[i % len(frames)], 10.0 + i / 30.0)
+        latencies[i] = (time.perf_counter() - start) * 1000
+    return latencies
+
+
+def summarize_latencies(latencies):
+    """First-call, percentile and worst-case latencies of one run (ms)."""
+    latencies = np.asarray(latencies, dtype=np.float64)
+    steady = latencies[len(latencies) // 2:]
+    return {
+        'first_ms': float(latencies[0]),
+        'first5_mean_ms': float(latencies[:5].mean()),
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p95_ms': float(np.percentile(latencies, 95)),
+        'max_ms': float(latencies.max()),
+        'steady_p50_ms': float(np.percentile(steady, 50)),
+        'latencies_ms': [round(float(value), 3) for value in latencies],
+    }
+
+
+def main():
+    """Compare the first-call latency of cold and warmed-up detectors."""
+    try:
+        from frame_preprocess import FramePreprocessor
+        from hand_detector import BACKENDS, create_detector
+        from inference_benchmark import load_frames
+    except ImportError:
+        sys.path.append(str(Path(__file__).parent))
+        from frame_preprocess import FramePreprocessor
+        from hand_detector import BACKENDS, create_detector
+        from inference_benchmark import load_frames
+
+    parser = argparse.ArgumentParser(description="First-call detector latency with and without warm-up")
+    parser.add_argument('--backend', default='solutions', choices=BACKENDS)
+    parser.add_argument('--tasks-model', default='models/hand_landmarker.task')
+    parser.add_argument('--landmark-model', default='models/hand_landmark_full.onnx')
+    parser.add_argument('--video', help="Recorded video for the timed frames (default: synthetic frames)")
+    parser.add_argument('--inference-width', type=int, default=320)
+    parser.add_argument('--frames', type=int, default=50, help="Timed calls per run")
+    parser.add_argument('--warmup-frames', type=int, default=10)
+    parser.add_argument('--runs', type=int, default=3, help="Cold/warm pairs, each on a new detector")
+    parser.add_argument('--output', default=str(RESULTS_PATH), help="JSON results file")
+    args = parser.parse_args()
+
+    preprocessor = FramePreprocessor(args.inference_width)
+    if args.video:
+        frames = [preprocessor.inference_frame(f).copy() for f in load_frames(args.video, args.frames)]
+    else:
+        width, height = preprocessor.inference_size(640, 480)
+        frames = warmup_frames(width, height, args.frames)
+    if not frames:
+        print(f"{args.video}: no frames")
+        return
+    height, width = frames[0].shape[:2]
+    settings = {'backend': args.backend, 'tasks_model': args.tasks_model,
+                'landmark_model': args.landmark_model}
+    try:
+        create_detector(settings).close()
+    except Exception as e:
+        print(f"{args.backend}: unavailable: {e}")
+        return
+
+    # The first cold run also pays for process-wide lazy setup, which the
+    # application pays once at startup as well
+    results = {'cold': [], 'warm': []}
+    for _ in range(args.runs):
+        for mode in ('cold', 'warm'):
+            with create_detector(settings) as detector:
+                warmup = DetectorWarmup(detector, (width, height), args.warmup_frames) if mode == 'warm' else None
+                results[mode].append(summarize_latencies(first_call_latencies(detector, frames, args.frames, warmup)))
+
+    print(f"{args.backend}: first {args.frames} calls at {width}x{height}, {args.runs} run(s)")
+    print(f"{'mode':<6} {'run':>3} {'first':>9} {'first 5':>9} {'p50':>8} {'p95':>8} {'max':>9}")
+    for mode, runs in results.items():
+        for i, r in enumerate(runs):
+            print(f"{mode:<6} {i:>3} {r['first_ms']:>7.1f}ms {r['first5_mean_ms']:>7.1f}ms "
+                  f"{r['p50_ms']:>6.1f}ms {r['p95_ms']:>6.1f}ms {r['max_ms']:>7.1f}ms")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({'backend': args.backend, 'video': args.video, 'frame_size': [width, height],
+                   'warmup_frames': args.warmup_frames, 'results': results}, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
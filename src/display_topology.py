@@ -0,0 +1,307 @@
+"""
+Display topology for AI Virtual Mouse.
+
+Enumerates monitors, caches the layout and decides which part of the
+desktop the active area maps onto:
+
+- ``primary``: the primary monitor
+- ``desktop``: the bounding box of all monitors
+- ``focus``: the monitor the user is working on. It starts on the primary
+  monitor; holding the fingertip past the left/right edge of the
+  active area moves it to the neighbouring monitor, and an external gaze
+  tracker can set it with ``DisplayTargeting.set_focus_point``
+- a monitor name (``HDMI-1``) or index (``1``)
+
+Monitors come from a provider. ``XRandRProvider`` uses Xlib/XRandR and
+listens for screen change events and ``PyAutoGUIProvider`` reports a single
+screen on other platforms. Any object with ``monitors()``, ``changed()`` and
+``close()`` works as a provider (tests use an in-memory one).
+The layout is only re-read when the provider reports a change, so the
+per-frame cost is a cached lookup.
+"""
+
+import os
+from collections import namedtuple
+
+
+Monitor = namedtuple('Monitor', ['name', 'x', 'y', 'width', 'height', 'scale', 'primary'])
+
+# A rectangle of the desktop the cursor maps onto
+Region = namedtuple('Region', ['name', 'x', 'y', 'width', 'height', 'scale'])
+
+REFERENCE_DPI = 96.0
+
+
+def scale_from_dpi(width_px, width_mm):
+    """DPI scale factor (1.0 = 96 DPI), rounded to quarter steps."""
+    if not width_mm:
+        return 1.0
+    dpi = width_px / (width_mm / 25.4)
+    return max(1.0, round(dpi / REFERENCE_DPI * 4) / 4)
+
+
+class PyAutoGUIProvider:
+    """Single-screen provider based on ``pyautogui.size()``."""
+
+    def __init__(self):
+        import pyautogui
+        self._pyautogui = pyautogui
+
+    def monitors(self):
+        width, height = self._pyautogui.size()
+        return [Monitor('screen', 0, 0, width, height, 1.0, True)]
+
+    def changed(self):
+        return False
+
+    def close(self):
+        pass
+
+
+class XRandRProvider:
+    """Monitors of an X11 display through the XRandR extension."""
+
+    def __init__(self, display_name=None):
+        """
+        Args:
+            display_name: X display (default: $DISPLAY)
+
+        Raises:
+            ImportError: If python-xlib is not installed
+            RuntimeError: If the display has no RANDR extension
+        """
+        from Xlib import display as xdisplay
+        from Xlib.ext import randr
+
+        self._display = xdisplay.Display(display_name)
+        if not self._display.has_extension('RANDR'):
+            self._display.close()
+            raise RuntimeError("X display has no RANDR extension")
+        self._root = self._display.screen().root
+        self._root.xrandr_select_input(
+            randr.RRScreenChangeNotifyMask
+            | randr.RRCrtcChangeNotifyMask
+            | randr.RROutputChangeNotifyMask
+        )
+        self._display.flush()
+
+    def monitors(self):
+        display = self._display
+        resources = self._root.xrandr_get_screen_resources()
+        timestamp = resources.config_timestamp
+        primary = self._root.xrandr_get_output_primary().output
+
+        monitors = []
+        for crtc in resources.crtcs:
+            info = display.xrandr_get_crtc_info(crtc, timestamp)
+            if not info.mode or not info.outputs:
+                continue    # Disabled CRTC
+            output = display.xrandr_get_output_info(info.outputs[0], timestamp)
+            monitors.append(Monitor(
+                name=output.name,
+                x=info.x,
+                y=info.y,
+                width=info.width,
+                height=info.height,
+                scale=scale_from_dpi(info.width, output.mm_width),
+                primary=primary in info.outputs,
+            ))
+        if monitors and not any(m.primary for m in monitors):
+            monitors[0] = monitors[0]._replace(primary=True)
+        return monitors
+
+    def changed(self):
+        # Only RandR events are selected on this private connection, so any
+        # pending event means the layout changed; drain them all
+        changed = False
+        while self._display.pending_events():
+            self._display.next_event()
+            changed = True
+        return changed
+
+    def close(self):
+        self._display.close()
+
+
+def create_provider(name='auto'):
+    """
+    Create a topology provider.
+
+    Args:
+        name: ``xrandr``, ``pyautogui`` or ``auto`` (XRandR when an X display
+            and python-xlib are available, PyAutoGUI otherwise)
+    """
+    if name == 'xrandr':
+        return XRandRProvider()
+    if name == 'pyautogui':
+        return PyAutoGUIProvider()
+    if name != 'auto':
+        raise ValueError(f"Unknown display provider '{name}' (auto, xrandr or pyautogui)")
+
+    if os.environ.get('DISPLAY'):
+        try:
+            return XRandRProvider()
+        except Exception:
+            pass
+    return PyAutoGUIProvider()
+
+
+class DisplayTopology:
+    """Cached monitor layout, refreshed only on change events."""
+
+    def __init__(self, provider, scale_overrides=None):
+        """
+        Args:
+            provider: Topology provider
+            scale_overrides: Optional monitor name -> DPI scale
+        """
+        self.provider = provider
+        self.scale_overrides = dict(scale_overrides or {})
+        self.version = 0
+        self.refresh()
+
+    def refresh(self):
+        """Re-read the layout from the provider."""
+        monitors = self.provider.monitors()
+        if not monitors:
+            raise RuntimeError("No monitors found")
+        self.monitors = [
+            m._replace(scale=self.scale_overrides.get(m.name, m.scale)) for m in monitors
+        ]
+        # Left to right, then top to bottom, for edge switching
+        self.monitors.sort(key=lambda m: (m.x, m.y))
+        self.primary = next((m for m in self.monitors if m.primary), self.monitors[0])
+
+        left = min(m.x for m in self.monitors)
+        top = min(m.y for m in self.monitors)
+        right = max(m.x + m.width for m in self.monitors)
+        bottom = max(m.y + m.height for m in self.monitors)
+        self.desktop = Region('desktop', left, top, right - left, bottom - top, self.primary.scale)
+        self.version += 1
+
+    def poll(self):
+        """Refresh if the provider reported a change; returns True if it did."""
+        if self.provider.changed():
+            self.refresh()
+            return True
+        return False
+
+    def find(self, key):
+        """Find a monitor by name or index (as int or digit string)."""
+        if isinstance(key, int) or (isinstance(key, str) and key.isdigit()):
+            index = int(key)
+            return self.monitors[index] if index < len(self.monitors) else None
+        return next((m for m in self.monitors if m.name == key), None)
+
+    def monitor_at(self, x, y):
+        """Monitor containing a desktop point, or the nearest one."""
+        def distance(m):
+            dx = max(m.x - x, 0, x - (m.x + m.width - 1))
+            dy = max(m.y - y, 0, y - (m.y + m.height - 1))
+            return dx * dx + dy * dy
+        return min(self.monitors, key=distance)
+
+    def close(self):
+        self.provider.close()
+
+
+def monitor_region(monitor):
+    return Region(monitor.name, monitor.x, monitor.y, monitor.width, monitor.height, monitor.scale)
+
+
+class DisplayTargeting:
+    """Choose the desktop region the active area maps onto."""
+
+    def __init__(self, topology, target='primary', edge_switch_time=0.5, poll_interval=0.5):
+        """
+        Args:
+            topology: DisplayTopology
+            target: ``primary``, ``desktop``, ``focus``, or a monitor name/index
+            edge_switch_time: ``focus`` target: seconds the fingertip must stay
+                past the left/right edge of the active area to switch monitor
+            poll_interval: Seconds between checks for layout changes
+        """
+        self.topology = topology
+        self.target = str(target)
+        self.edge_switch_time = edge_switch_time
+        self.poll_interval = poll_interval
+
+        self._last_poll = None
+        self._edge = None          # (direction, since) while pushing an edge
+        self._focus_name = topology.primary.name
+        self._version = None
+        self.region = None
+        self._resolve()
+
+    @classmethod
+    def from_config(cls, config, provider=None):
+        """Create from the ``display`` section of a ConfigManager."""
+        settings = config.get_display_settings()
+        topology = DisplayTopology(
+            provider or create_provider(settings['provider']),
+            settings['scale_overrides'],
+        )
+        return cls(topology, settings['target'], settings['edge_switch_time'])
+
+    def _resolve(self):
+        topology = self.topology
+        if self.target == 'desktop':
+            region = topology.desktop
+        elif self.target == 'focus':
+            monitor = topology.find(self._focus_name) or topology.primary
+            self._focus_name = monitor.name
+            region = monitor_region(monitor)
+        elif self.target == 'primary':
+            region = monitor_region(topology.primary)
+        else:
+            region = monitor_region(topology.find(self.target) or topology.primary)
+
+        if region != self.region:
+            self.region = region
+        self._version = topology.version
+
+    def set_focus_point(self, x, y):
+        """Focus the monitor under a desktop point (cursor or gaze position)."""
+        monitor = self.topology.monitor_at(x, y)
+        if monitor.name != self._focus_name:
+            self._focus_name = monitor.name
+            self._resolve()
+
+    def _neighbour(self, direction):
+        monitors = self.topology.monitors
+        names = [m.name for m in monitors]
+        index = names.index(self._focus_name) + direction
+        return monitors[index].name if 0 <= index < len(monitors) else None
+
+    def update(self, fx, now):
+        """
+        Return the region for this frame.
+
+        Args:
+            fx: Fingertip x relative to the active area (0 = left edge,
+                1 = right edge; outside 0-1 means past an edge)
+            now: Frame timestamp in seconds
+
+        Returns:
+            Region; the same object until the layout or focus changes
+        """
+        if self._last_poll is None or now - self._last_poll >= self.poll_interval:
+            self._last_poll = now
+            self.topology.poll()
+        if self._version != self.topology.version:
+            self._resolve()
+
+        if self.target == 'focus':
+            direction = -1 if fx < 0 else 1 if fx > 1 else 0
+            if direction == 0:
+                self._edge = None
+            elif self._edge is None or self._edge[0] != direction:
+                self._edge = (direction, now)
+            elif now - self._edge[1] >= self.edge_switch_time:
+                neighbour = self._neighbour(direction)
+                self._edge = None
+                if neighbour is not None:
+                    self._focus_name = neighbour
+                    self._resolve()
+
+        return self.region
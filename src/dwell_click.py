@@ -0,0 +1,143 @@
+"""
+Dwell clicking for AI Virtual Mouse.
+
+An accessibility mode for users who cannot pinch reliably: holding the
+cursor still within ``radius`` screen pixels for ``dwell_time`` seconds
+runs the ``dwell`` binding (a left click by default).
+
+Stillness is judged with Welford running statistics over the cursor
+positions of the current dwell. Each frame adds one position, so the cost
+per frame is constant however long the dwell is. A position further than
+``radius`` from the running mean is movement: the dwell restarts from that
+position, so the window always covers the positions since the cursor last
+moved. Averaging makes the center robust to landmark jitter, which a
+fixed anchor at the first position would not be. The mean follows a slow
+drift, though, so a position further than ``radius`` from the dwell's
+first position is movement as well.
+
+After a dwell click (or a pinch click) the cursor has to move before the
+next dwell can start, so resting the hand does not click repeatedly.
+"""
+
+
+class RunningStats:
+    """Welford mean and variance of 2D points."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget all points."""
+        self.count = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self._m2 = 0.0             # Summed squared deviations, both axes
+
+    def add(self, x, y):
+        """Add a point in O(1)."""
+        self.count += 1
+        dx = x - self.mean_x
+        dy = y - self.mean_y
+        self.mean_x += dx / self.count
+        self.mean_y += dy / self.count
+        self._m2 += dx * (x - self.mean_x) + dy * (y - self.mean_y)
+
+    @property
+    def spread(self):
+        """Root mean square distance of the points from their mean."""
+        return (self._m2 / self.count) ** 0.5 if self.count else 0.0
+
+    def distance(self, x, y):
+        """Distance of a point from the mean."""
+        return ((x - self.mean_x) ** 2 + (y - self.mean_y) ** 2) ** 0.5
+
+
+def _distance(a, b):
+    return ((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2) ** 0.5
+
+
+class DwellClicker:
+    """Fire when the cursor stays within a radius for a dwell time."""
+
+    def __init__(self, radius=30.0, dwell_time=1.0):
+        """
+        Args:
+            radius: Screen pixels the cursor may wander from the dwell center
+            dwell_time: Seconds the cursor has to stay within the radius
+        """
+        self.radius = radius
+        self.dwell_time = dwell_time
+        self.stats = RunningStats()
+        self.start = None          # Time the current dwell began
+        self.first = None          # Position the current dwell began at
+        self.armed = True          # False after a click until the cursor moves
+        self.progress = 0.0        # 0..1 of the current dwell (0 when disarmed)
+        self.clicks = 0
+        self.cancels = 0
+
+    @classmethod
+    def from_settings(cls, settings):
+        """Create from GesturePipeline settings."""
+        return cls(settings.get('dwell_radius', 30), settings.get('dwell_time', 1.0))
+
+    def cancel(self, until_moved=False):
+        """
+        Abandon the current dwell.
+
+        Args:
+            until_moved: Also wait for the cursor to move before the next
+                dwell (e.g. after a pinch click at this position)
+        """
+        self.start = None
+        self.progress = 0.0
+        if until_moved:
+            self.armed = False
+
+    def update(self, x, y, now):
+        """
+        Add a cursor position.
+
+        Args:
+            x: Cursor x in screen pixels
+            y: Cursor y in screen pixels
+            now: Frame time in seconds
+
+        Returns:
+            True if the dwell completed on this frame
+        """
+        stats = self.stats
+        moved = self.start is not None and stats.distance(x, y) > self.radius
+        if moved or self.start is not None and _distance((x, y), self.first) > self.radius:
+            # Moved or drifted: an unfinished dwell is cancelled, and a
+            # finished one re-arms only on a move (not the cursor settling)
+            if self.armed and self.progress > 0:
+                self.cancels += 1
+            self.armed = self.armed or moved
+            self.start = None
+        if self.start is None:
+            stats.reset()
+            stats.add(x, y)
+            self.start = now
+            self.first = (x, y)
+            self.progress = 0.0
+            return False
+
+        stats.add(x, y)
+        if not self.armed:
+            return False
+        elapsed = now - self.start
+        if elapsed < self.dwell_time - 1e-6:      # Frame times are not exact
+            self.progress = elapsed / self.dwell_time
+            return False
+        self.clicks += 1
+        self.armed = False
+        self.progress = 0.0
+        return True
+
+    def as_dict(self):
+        return {
+            'clicks': self.clicks,
+            'cancels': self.cancels,
+            'progress': self.progress,
+            'armed': self.armed,
+        }
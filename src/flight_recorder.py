@@ -0,0 +1,313 @@
+"""
+In-memory flight recorder for AI Virtual Mouse.
+
+The recorder keeps the last few seconds of the camera loop in fixed-size
+NumPy ring buffers allocated once:
+
+- landmark trace records (timestamp, frame index, hand flag, gesture state
+  bits, landmarks) in the ``landmark_trace`` record layout
+- downscaled preview frames, resized straight into their slot
+- emitted actions in the ``action_log`` record layout
+
+Recording a frame copies into the next slot and allocates no arrays. On a
+hotkey, a signal or an anomaly (a drag held far too long, buttons released
+because the hand vanished, a slow-frame incident) the buffers are copied
+out and written by a background thread:
+
+    flight-<time>.trace         replay with session_replay.py
+    flight-<time>.frames.npy    (N, h, w, 3) uint8 preview frames
+    flight-<time>.actions.bin   decode with action_log.py
+    flight-<time>.json          reason, time span and state bit names
+
+Actions reach the recorder through ``ActionLoggingBackend``, which calls
+``record`` like it does for an ``ActionLog``. The recorder is not locked:
+frames and actions must be recorded from the loop thread.
+"""
+
+import json
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+try:
+    from action_log import EVENT_CODES, HEADER, MAGIC, RECORD, VERSION, ActionLoggingBackend
+    from landmark_trace import FLAG_HAND, RECORD_DTYPE, TraceWriter
+except ImportError:
+    sys.path.append(str(Path(__file__).parent))
+    from action_log import EVENT_CODES, HEADER, MAGIC, RECORD, VERSION, ActionLoggingBackend
+    from landmark_trace import FLAG_HAND, RECORD_DTYPE, TraceWriter
+
+
+# Bits of the per-frame gesture state stored in the trace 'gesture' field
+STATE_BITS = ('paused', 'dragging', 'scrolling', 'pinch_held', 'coasting', 'idle')
+
+# Same layout as action_log.RECORD ('<dHhfff'), so the buffer is written as is
+ACTION_DTYPE = np.dtype([
+    ('time', '<f8'),
+    ('event', '<u2'),
+    ('amount', '<i2'),
+    ('x', '<f4'),
+    ('y', '<f4'),
+    ('latency', '<f4'),
+])
+assert ACTION_DTYPE.itemsize == RECORD.size
+
+
+def gesture_state(pipeline, coasting=False, idle=False):
+    """Pack the pipeline's gesture state into STATE_BITS flags."""
+    return int(
+        bool(pipeline.is_paused)
+        | bool(pipeline.is_dragging) << 1
+        | bool(pipeline.scroll_mode_active) << 2
+        | bool(pipeline.left_pinch_held) << 3
+        | bool(coasting) << 4
+        | bool(idle) << 5
+    )
+
+
+def state_names(code):
+    """Names of the STATE_BITS set in a state code."""
+    return [name for bit, name in enumerate(STATE_BITS) if code & (1 << bit)]
+
+
+class FlightRecorder:
+    """Fixed-memory ring of recent frames, landmarks, gesture states and actions."""
+
+    def __init__(self, seconds=10.0, fps=30, frame_width=160, actions_per_frame=4,
+                 dump_dir='logs/flight', enabled=True, clock=time.time):
+        """
+        Args:
+            seconds: Length of history kept
+            fps: Expected loop rate, used to size the buffers
+            frame_width: Width of the stored preview frames (0 = no frames)
+            actions_per_frame: Action slots per frame slot
+            dump_dir: Directory for dumps
+            enabled: Disabled recorders keep and write nothing
+            clock: Clock the frames are stamped with (the pipeline's); it
+                also stamps actions, so both share one time base
+        """
+        self.clock = clock
+        self.capacity = max(1, int(round(seconds * fps)))
+        self.frame_width = frame_width
+        self.dump_dir = Path(dump_dir)
+        self.enabled = enabled
+
+        self.records = np.zeros(self.capacity if enabled else 0, dtype=RECORD_DTYPE)
+        self.actions = np.zeros(self.capacity * actions_per_frame if enabled else 0, dtype=ACTION_DTYPE)
+        self.frames = None           # Allocated once the capture size is known
+        self.width = self.height = 0
+        self.frame_count = 0
+        self.action_count = 0
+        self.dumps = 0
+        self._writer = None
+
+    @classmethod
+    def from_config(cls, config, fps=30, clock=time.time):
+        """Create from the ``flight_recorder`` section of a ConfigManager (or None)."""
+        if config is None:
+            return cls(enabled=False, clock=clock)
+        settings = config.get_flight_recorder_settings()
+        return cls(
+            seconds=settings['seconds'],
+            fps=fps,
+            frame_width=settings['frame_width'],
+            dump_dir=settings['dump_dir'],
+            enabled=settings['enabled'],
+            clock=clock,
+        )
+
+    def wrap_output(self, output):
+        """
+        Record the actions of an output backend, stamped with this recorder's clock.
+
+        Returns:
+            ActionLoggingBackend; mark its frames with the pipeline time
+        """
+        return ActionLoggingBackend(output, self, clock=self.clock)
+
+    @property
+    def nbytes(self):
+        """Memory held by the ring buffers in bytes."""
+        frames = self.frames.nbytes if self.frames is not None else 0
+        return self.records.nbytes + self.actions.nbytes + frames
+
+    def _allocate_frames(self, height, width):
+        self.height, self.width = height, width
+        if self.frame_width:
+            small_height = max(1, int(round(height * self.frame_width / width)))
+            self.frames = np.zeros((self.capacity, small_height, self.frame_width, 3), dtype=np.uint8)
+
+    def record_frame(self, timestamp, frame, landmarks, state=0):
+        """
+        Store one loop iteration.
+
+        Args:
+            timestamp: Time the pipeline saw the frame (its clock)
+            frame: BGR preview frame
+            landmarks: (21, 3) normalized landmarks, or None if no hand
+            state: Gesture state bits from ``gesture_state``
+        """
+        if not self.enabled:
+            return
+        height, width = frame.shape[:2]
+        if (height, width) != (self.height, self.width):
+            self._allocate_frames(height, width)
+            self.frame_count = 0
+
+        slot = self.frame_count % self.capacity
+        record = self.records[slot]
+        record['timestamp'] = timestamp
+        record['frame'] = self.frame_count
+        record['gesture'] = state
+        if landmarks is None:
+            record['flags'] = 0
+            record['landmarks'] = 0
+        else:
+            record['flags'] = FLAG_HAND
+            record['landmarks'] = landmarks
+        if self.frames is not None:
+            small = self.frames[slot]
+            cv2.resize(frame, (small.shape[1], small.shape[0]), dst=small, interpolation=cv2.INTER_LINEAR)
+        self.frame_count += 1
+
+    def record(self, event, x=0.0, y=0.0, amount=0, latency_ms=0.0, timestamp=None):
+        """Store one action (same signature as ``ActionLog.record``)."""
+        if not self.enabled:
+            return
+        slot = self.action_count % len(self.actions)
+        self.actions[slot] = (self.clock() if timestamp is None else timestamp,
+                              EVENT_CODES[event], amount, x, y, latency_ms)
+        self.action_count += 1
+
+    @staticmethod
+    def _ordered(ring, count):
+        if count <= len(ring):
+            return ring[:count].copy()
+        start = count % len(ring)
+        return np.concatenate((ring[start:], ring[:start]))
+
+    def snapshot(self):
+        """
+        Copy the buffers out in chronological order.
+
+        Returns:
+            Tuple of (trace records, preview frames or None, action records)
+        """
+        records = self._ordered(self.records, self.frame_count)
+        frames = None if self.frames is None else self._ordered(self.frames, self.frame_count)
+        actions = self._ordered(self.actions, self.action_count)
+        return records, frames, actions
+
+    def dump(self, reason='manual'):
+        """
+        Write the current history to ``dump_dir`` in the background.
+
+        The buffers are copied before returning, so recording continues
+        immediately. A dump started while the previous one is still being
+        written waits for it first.
+
+        Returns:
+            Path of the dump's .trace file, or None if nothing was recorded
+        """
+        if not self.enabled or self.frame_count == 0:
+            return None
+        records, frames, actions = self.snapshot()
+        stem = self.dump_dir / f"flight-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{self.dumps:03d}"
+        meta = {
+            'reason': reason,
+            'time': datetime.now().isoformat(timespec='milliseconds'),
+            'frames': len(records),
+            'seconds': float(records['timestamp'][-1] - records['timestamp'][0]),
+            'width': self.width,
+            'height': self.height,
+            'actions': len(actions),
+            'state_bits': list(STATE_BITS),
+            # Add to the trace and action timestamps to get wall-clock time
+            'clock_offset': time.time() - self.clock(),
+        }
+        self.dumps += 1
+        self.wait()
+        self._writer = threading.Thread(target=self._write, args=(stem, records, frames, actions, meta),
+                                        name='FlightRecorderDump', daemon=True)
+        self._writer.start()
+        return stem.with_suffix('.trace')
+
+    def _write(self, stem, records, frames, actions, meta):
+        stem.parent.mkdir(parents=True, exist_ok=True)
+        fps = len(records) / meta['seconds'] if meta['seconds'] > 0 else 0.0
+        with TraceWriter(stem.with_suffix('.trace'), self.width, self.height, fps) as writer:
+            writer.write_records(records)
+        if frames is not None:
+            np.save(stem.with_suffix('.frames.npy'), frames)
+        with open(stem.with_suffix('.actions.bin'), 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+            f.write(actions.tobytes())
+        with open(stem.with_suffix('.json'), 'w') as f:
+            json.dump(meta, f, indent=1)
+
+    def wait(self, timeout=None):
+        """Wait for a dump in progress to be written."""
+        if self._writer is not None:
+            self._writer.join(timeout)
+            self._writer = None
+
+
+class AnomalyTrigger:
+    """Decides when the loop state looks wrong enough to dump automatically."""
+
+    def __init__(self, stuck_drag_time=8.0, min_interval=30.0):
+        """
+        Args:
+            stuck_drag_time: Seconds a drag may be held before it counts as stuck
+            min_interval: Minimum seconds between two automatic dumps
+        """
+        self.stuck_drag_time = stuck_drag_time
+        self.min_interval = min_interval
+        self._drag_start = None
+        self._drag_reported = False
+        self._timeouts = 0
+        self._last_dump = None
+
+    def update(self, now, pipeline, continuity, slow_frame=False):
+        """
+        Check one frame.
+
+        Args:
+            now: Pipeline clock time of the frame
+            pipeline: GesturePipeline
+            continuity: TrackingContinuity (its timeouts that released a
+                held button or drag count)
+            slow_frame: True if the frame profiler wrote an incident
+
+        Returns:
+            Reason string when a dump should be made, else None
+        """
+        reason = None
+        if pipeline.is_dragging:
+            if self._drag_start is None:
+                self._drag_start = now
+            elif not self._drag_reported and now - self._drag_start > self.stuck_drag_time:
+                self._drag_reported = True
+                reason = 'stuck_drag'
+        else:
+            self._drag_start = None
+            self._drag_reported = False
+
+        timeouts = continuity.stats.timeouts
+        if timeouts > self._timeouts:
+            reason = reason or 'release_timeout'
+        self._timeouts = timeouts
+        if slow_frame:
+            reason = reason or 'slow_frame'
+
+        if reason is None:
+            return None
+        if self._last_dump is not None and now - self._last_dump < self.min_interval:
+            return None
+        self._last_dump = now
+        return reason
@@ -0,0 +1,67 @@
+"""
+Preallocated capture buffers for AI Virtual Mouse.
+
+``cv2.VideoCapture.read()`` returns a freshly allocated frame every call;
+at 640x480 that is almost a megabyte per frame for the allocator and, with
+the other per-frame temporaries, the garbage collector to churn through.
+``FramePool`` keeps a few frame buffers and passes them to
+``read(image=...)`` in turn, so the capture backend decodes into memory
+that already exists. The camera loop then mirrors the frame in place and
+hands it to ``FramePreprocessor``, whose outputs are reused as well.
+
+More than one slot keeps the previous frame intact while the next one is
+read, for code that holds on to a frame for one extra iteration.
+"""
+
+import numpy as np
+
+
+class FramePool:
+    """Round-robin set of reusable capture buffers."""
+
+    def __init__(self, slots=2):
+        """
+        Args:
+            slots: Number of frame buffers
+        """
+        self.slots = max(1, slots)
+        self._buffers = [None] * self.slots
+        self._next = 0
+        self.reads = 0
+        self.reallocations = 0   # Reads where the backend returned a new array
+
+    def read(self, capture):
+        """
+        Read the next frame from a VideoCapture into a pool buffer.
+
+        The first read of each slot, or a read after the frame size
+        changed, lets the backend allocate; that array is kept and reused.
+
+        Args:
+            capture: Object with ``read(image)`` like cv2.VideoCapture
+
+        Returns:
+            Tuple of (success, frame); the frame stays valid for ``slots``
+            reads
+        """
+        slot = self._next
+        self._next = (slot + 1) % self.slots
+        buffer = self._buffers[slot]
+        success, frame = capture.read(buffer) if buffer is not None else capture.read()
+        if not success or frame is None:
+            return False, None
+        self.reads += 1
+        if frame is not buffer:
+            if buffer is not None:
+                self.reallocations += 1
+            self._buffers[slot] = frame
+        return True, frame
+
+    @property
+    def nbytes(self):
+        """Memory held by the pool buffers in bytes."""
+        return sum(buffer.nbytes for buffer in self._buffers if buffer is not None)
+
+    def allocate(self, shape, dtype=np.uint8):
+        """Preallocate every slot for a known frame shape."""
+        self._buffers = [np.zeros(shape, dtype=dtype) for _ in range(self.slots)]
@@ -0,0 +1,110 @@
+"""
+Frame preprocessing for hand detection.
+
+Hand detection cost scales with the input image, but the gesture math only
+needs normalized landmarks. ``FramePreprocessor`` produces the detector
+input at a reduced inference resolution in one step: the camera frame is
+read once by an area resize into a small buffer, and the mirror and BGR to
+RGB conversion then run on the small image. All outputs are buffers that
+are reused every frame, so nothing is allocated per frame.
+
+Landmarks are normalized (0-1), so they map back onto the full-resolution
+preview and the screen unchanged. The mirrored full-resolution preview is
+written into its own reused buffer, or flipped in place when the camera
+frame itself is a reused buffer (see ``frame_pool.py``).
+"""
+
+import cv2
+import numpy as np
+
+
+class FramePreprocessor:
+    """Resize + mirror + BGR->RGB into reused buffers."""
+
+    def __init__(self, inference_width=0, mirror=True):
+        """
+        Args:
+            inference_width: Width of the detector input; the height keeps
+                the frame's aspect ratio. 0 (or a width larger than the
+                frame) keeps the full resolution
+            mirror: Flip horizontally, like a mirror
+        """
+        self.inference_width = inference_width
+        self.mirror = mirror
+        self._shape = None
+        self.rgb = None
+        self.preview = None
+
+    def set_inference_width(self, inference_width):
+        """Change the detector input width; buffers are reallocated on the next frame."""
+        if inference_width != self.inference_width:
+            self.inference_width = inference_width
+            self._shape = None
+
+    def inference_size(self, width, height):
+        """(width, height) of the detector input for a frame size."""
+        if not self.inference_width or self.inference_width >= width:
+            return width, height
+        return self.inference_width, max(1, int(round(height * self.inference_width / width)))
+
+    def _allocate(self, shape):
+        height, width = shape[:2]
+        self._size = self.inference_size(width, height)
+        self._resize = self._size != (width, height)
+        self.rgb = np.empty((self._size[1], self._size[0], 3), dtype=np.uint8)
+        # Resized BGR image, before mirroring and color conversion
+        self._scratch = np.empty_like(self.rgb)
+        self.preview = None          # Only needed when not mirroring in place
+        self._shape = shape
+
+    def inference_frame(self, frame, mirrored=False):
+        """
+        Detector input for a BGR camera frame.
+
+        Args:
+            frame: BGR camera frame
+            mirrored: The frame was already mirrored (by ``preview_frame``
+                with ``in_place=True``)
+
+        Returns:
+            Reused (h, w, 3) RGB array; overwritten by the next call
+        """
+        if frame.shape != self._shape:
+            self._allocate(frame.shape)
+        source = frame
+        if self._resize:
+            cv2.resize(frame, self._size, dst=self._scratch, interpolation=cv2.INTER_AREA)
+            source = self._scratch
+        if self.mirror and not mirrored:
+            cv2.flip(source, 1, dst=self.rgb)
+            cv2.cvtColor(self.rgb, cv2.COLOR_BGR2RGB, dst=self.rgb)   # In place
+        else:
+            cv2.cvtColor(source, cv2.COLOR_BGR2RGB, dst=self.rgb)
+        return self.rgb
+
+    def preview_frame(self, frame, in_place=False):
+        """
+        Full-resolution BGR preview, mirrored like the detector input.
+
+        Args:
+            frame: BGR camera frame
+            in_place: Mirror the camera frame itself instead of copying it;
+                pass ``mirrored=True`` to ``inference_frame`` afterwards
+
+        Returns:
+            Reused (H, W, 3) BGR array (overwritten by the next call), or
+            the camera frame when ``in_place`` is set
+        """
+        if frame.shape != self._shape:
+            self._allocate(frame.shape)
+        if in_place:
+            if self.mirror:
+                cv2.flip(frame, 1, dst=frame)
+            return frame
+        if self.preview is None:
+            self.preview = np.empty(frame.shape, dtype=np.uint8)
+        if self.mirror:
+            cv2.flip(frame, 1, dst=self.preview)
+        else:
+            np.copyto(self.preview, frame)
+        return self.preview
@@ -0,0 +1,384 @@
+"""
+Slow-frame forensics for AI Virtual Mouse.
+
+``FrameProfiler`` times the stages of each camera loop iteration. When a
+frame takes longer than its budget it writes an incident file with
+
+- the per-stage timings of that frame
+- a stack sample of every thread, taken by a watchdog thread while the
+  frame was still overdue (so it shows what the loop was stuck in), and
+  another one when the frame ended
+- garbage collector statistics and any collections during the frame
+- the landmarks, caller context and a small JPEG of the frame
+
+Incidents are rate-limited and the directory keeps only the newest
+``max_incidents``, so a bad session cannot fill the disk. Between slow
+frames the cost is a few clock reads and list appends per frame.
+
+``SamplingProfiler`` is a low-rate statistical profiler for whole
+sessions. It samples every thread's stack on a timer and writes collapsed
+stacks (``thread;module:function;... count``) that ``flamegraph.pl`` or
+speedscope turn into flame graphs.
+
+Usage:
+    python src/frame_profiler.py logs/incidents
+"""
+
+import gc
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+
+INCIDENT_PREFIX = 'incident-'
+SNAPSHOT_WIDTH = 320    # Width of the JPEG stored with an incident
+
+
+def _thread_names():
+    return {thread.ident: thread.name for thread in threading.enumerate()}
+
+
+def sample_stacks(exclude=()):
+    """
+    Capture the current stack of every thread.
+
+    Args:
+        exclude: Thread idents to skip
+
+    Returns:
+        Dictionary of thread name -> list of "file:line function" strings,
+        outermost call first
+    """
+    names = _thread_names()
+    stacks = {}
+    for ident, frame in sys._current_frames().items():
+        if ident in exclude:
+            continue
+        calls = []
+        while frame is not None:
+            code = frame.f_code
+            calls.append(f"{Path(code.co_filename).name}:{frame.f_lineno} {code.co_name}")
+            frame = frame.f_back
+        calls.reverse()
+        stacks[names.get(ident, f"thread-{ident}")] = calls
+    return stacks
+
+
+def collapse_stack(frame):
+    """Collapsed-stack form (``module:function;...``) of a frame, outermost first."""
+    calls = []
+    while frame is not None:
+        code = frame.f_code
+        calls.append(f"{Path(code.co_filename).stem}:{code.co_name}")
+        frame = frame.f_back
+    calls.reverse()
+    return ';'.join(calls)
+
+
+class FrameProfiler:
+    """Per-frame stage timing with incident capture for frames over budget."""
+
+    def __init__(self, budget=0.1, incident_dir='logs/incidents', max_incidents=20,
+                 cooldown=5.0, watchdog=True, enabled=True, clock=time.perf_counter):
+        """
+        Args:
+            budget: Seconds a frame may take before it is an incident
+            incident_dir: Directory for incident files
+            max_incidents: Incident files kept; older ones are deleted
+            cooldown: Minimum seconds between two incident files
+            watchdog: Sample stacks from a background thread while a frame
+                is overdue
+            enabled: Disabled profilers do nothing
+            clock: Time source in seconds
+        """
+        self.budget = budget
+        self.incident_dir = Path(incident_dir)
+        self.max_incidents = max_incidents
+        self.cooldown = cooldown
+        self.enabled = enabled
+        self.clock = clock
+
+        self.frames = 0
+        self.slow_frames = 0
+        self.incidents = 0
+        self.suppressed = 0         # Slow frames inside the cooldown since the last incident
+        self.worst = 0.0
+
+        self._marks = []
+        self._frame_start = None
+        self._allowance = 0.0       # Intentional waiting in the current frame
+        self._last_incident = None
+        self._overdue = None        # (frame, seconds into the frame, stacks) from the watchdog
+        self._gc_start = None
+        self._gc_events = []
+
+        self._stop = threading.Event()
+        self._watchdog = None
+        if enabled:
+            gc.callbacks.append(self._gc_callback)
+            if watchdog:
+                self._watchdog = threading.Thread(target=self._watch, name='FrameWatchdog', daemon=True)
+                self._watchdog.start()
+
+    @classmethod
+    def from_config(cls, config):
+        """Create from the ``profiling`` section of a ConfigManager (or None)."""
+        if config is None:
+            return cls(enabled=False)
+        settings = config.get_profiling_settings()
+        return cls(
+            budget=settings['frame_budget_ms'] / 1000.0,
+            incident_dir=settings['incident_dir'],
+            max_incidents=settings['max_incidents'],
+            cooldown=settings['cooldown'],
+            enabled=settings['enabled'],
+        )
+
+    def start_frame(self):
+        """Start timing a frame."""
+        if not self.enabled:
+            return
+        self._marks.clear()
+        self._gc_events.clear()
+        self._allowance = 0.0
+        self.frames += 1
+        self._frame_start = self.clock()
+
+    def mark(self, stage):
+        """End a stage of the current frame (it started at the previous mark)."""
+        if self._frame_start is not None:
+            self._marks.append((stage, self.clock()))
+
+    def allow(self, seconds):
+        """
+        Add intentional waiting (e.g. idle throttling) to the current frame's budget.
+
+        Call it before the wait, so the watchdog does not sample stacks
+        during it either.
+        """
+        if self._frame_start is not None:
+            self._allowance += seconds
+
+    def end_frame(self, frame=None, landmarks=None, context=None, allowance=0.0):
+        """
+        Finish the current frame and write an incident if it was too slow.
+
+        Args:
+            frame: Optional BGR frame stored as a small JPEG with an incident
+            landmarks: Optional (21, 3) landmarks of the frame
+            context: Optional dictionary of JSON-serializable loop state
+            allowance: Seconds of intentional waiting (e.g. idle throttling)
+                added to the budget for this frame, on top of ``allow``
+
+        Returns:
+            Path of the incident file, or None
+        """
+        start = self._frame_start
+        if start is None:
+            return None
+        self._frame_start = None
+        allowance += self._allowance
+        total = self.clock() - start
+        if total <= self.budget + allowance:
+            return None
+
+        self.slow_frames += 1
+        self.worst = max(self.worst, total)
+        if self._last_incident is not None and start - self._last_incident < self.cooldown:
+            self.suppressed += 1
+            return None
+        self._last_incident = start
+
+        try:
+            return self._write_incident(start, total, frame, landmarks, context, allowance)
+        except OSError:
+            return None
+
+    def _stage_times(self, start):
+        times = []
+        previous = start
+        for stage, t in self._marks:
+            times.append((stage, t - previous))
+            previous = t
+        return times
+
+    def _write_incident(self, start, total, frame, landmarks, context, allowance):
+        stages = self._stage_times(start)
+        overdue = self._overdue if self._overdue is not None and self._overdue[0] == self.frames else None
+        incident = {
+            'time': datetime.now().isoformat(timespec='milliseconds'),
+            'frame': self.frames,
+            'total_ms': round(total * 1000, 3),
+            'budget_ms': round((self.budget + allowance) * 1000, 3),
+            'stages_ms': [[stage, round(seconds * 1000, 3)] for stage, seconds in stages],
+            'unaccounted_ms': round((total - sum(seconds for _, seconds in stages)) * 1000, 3),
+            'suppressed_since_last': self.suppressed,
+            'overdue_stacks': None if overdue is None else {
+                'at_ms': round(overdue[1] * 1000, 3), 'threads': overdue[2],
+            },
+            'stacks': sample_stacks(),
+            'gc': {
+                'collections_in_frame': [[generation, round(ms, 3)] for generation, ms in self._gc_events],
+                'counts': list(gc.get_count()),
+                'stats': gc.get_stats(),
+            },
+            'landmarks': None if landmarks is None else np.round(np.asarray(landmarks, dtype=float), 5).tolist(),
+            'context': context or {},
+        }
+        self.suppressed = 0
+
+        self.incident_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"{INCIDENT_PREFIX}{datetime.now().strftime('%Y%m%d-%H%M%S')}-{self.frames:07d}"
+        path = self.incident_dir / f"{stem}.json"
+        if frame is not None:
+            scale = SNAPSHOT_WIDTH / frame.shape[1]
+            small = cv2.resize(frame, (SNAPSHOT_WIDTH, max(1, int(frame.shape[0] * scale))),
+                               interpolation=cv2.INTER_AREA)
+            ok, jpeg = cv2.imencode('.jpg', small, [cv2.IMWRITE_JPEG_QUALITY, 70])
+            if ok:
+                (self.incident_dir / f"{stem}.jpg").write_bytes(jpeg.tobytes())
+                incident['snapshot'] = f"{stem}.jpg"
+        with open(path, 'w') as f:
+            json.dump(incident, f, indent=1)
+
+        self.incidents += 1
+        self._prune()
+        return path
+
+    def _prune(self):
+        incidents = sorted(self.incident_dir.glob(f"{INCIDENT_PREFIX}*.json"))
+        for old in incidents[:max(0, len(incidents) - self.max_incidents)]:
+            old.unlink(missing_ok=True)
+            old.with_suffix('.jpg').unlink(missing_ok=True)
+
+    def _gc_callback(self, phase, info):
+        if self._frame_start is None:
+            return
+        if phase == 'start':
+            self._gc_start = self.clock()
+        elif self._gc_start is not None:
+            self._gc_events.append((info['generation'], (self.clock() - self._gc_start) * 1000))
+            self._gc_start = None
+
+    def _watch(self):
+        own = threading.get_ident()
+        interval = max(0.005, self.budget / 4)
+        sampled = 0
+        while not self._stop.wait(interval):
+            start, frame_number = self._frame_start, self.frames
+            if start is None or frame_number == sampled:
+                continue
+            late = self.clock() - start
+            if late > self.budget + self._allowance:
+                sampled = frame_number
+                self._overdue = (frame_number, late, sample_stacks(exclude=(own,)))
+
+    def close(self):
+        """Stop the watchdog and remove the GC hook."""
+        self._stop.set()
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1.0)
+            self._watchdog = None
+        if self._gc_callback in gc.callbacks:
+            gc.callbacks.remove(self._gc_callback)
+
+
+class SamplingProfiler:
+    """Timer-driven stack sampler that aggregates collapsed stacks."""
+
+    def __init__(self, interval=0.02):
+        """
+        Args:
+            interval: Seconds between samples (0.02 = 50 Hz)
+        """
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start sampling in a background thread."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='SamplingProfiler', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop sampling (the collected stacks are kept)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def sample(self, exclude=()):
+        """Take one sample of every thread except ``exclude``."""
+        names = _thread_names()
+        for ident, frame in sys._current_frames().items():
+            if ident not in exclude:
+                self.stacks[f"{names.get(ident, f'thread-{ident}')};{collapse_stack(frame)}"] += 1
+        self.samples += 1
+
+    def _run(self):
+        own = (threading.get_ident(),)
+        while not self._stop.wait(self.interval):
+            self.sample(own)
+
+    def top(self, count=10):
+        """Most frequent leaf functions as (function, fraction of samples)."""
+        leaves = Counter()
+        for stack, hits in self.stacks.items():
+            leaves[stack.rsplit(';', 1)[-1]] += hits
+        total = sum(leaves.values()) or 1
+        return [(function, hits / total) for function, hits in leaves.most_common(count)]
+
+    def write_collapsed(self, path):
+        """Write ``stack count`` lines for flame graph tools."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            for stack, hits in sorted(self.stacks.items()):
+                f.write(f"{stack} {hits}\n")
+
+
+def load_incidents(incident_dir):
+    """Load all incident files in a directory, oldest first."""
+    incidents = []
+    for path in sorted(Path(incident_dir).glob(f"{INCIDENT_PREFIX}*.json")):
+        with open(path) as f:
+            incidents.append((path, json.load(f)))
+    return incidents
+
+
+def main():
+    """Summarize slow-frame incidents from the command line."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarize slow-frame incidents")
+    parser.add_argument('incident_dir', nargs='?', default='logs/incidents')
+    args = parser.parse_args()
+
+    incidents = load_incidents(args.incident_dir)
+    if not incidents:
+        print(f"No incidents in {args.incident_dir}")
+        return 0
+    for path, incident in incidents:
+        stages = incident['stages_ms'] or [['?', 0.0]]
+        stage, ms = max(stages, key=lambda item: item[1])
+        print(f"{path.name}: {incident['total_ms']:.0f} ms (budget {incident['budget_ms']:.0f} ms), "
+              f"slowest stage {stage} {ms:.0f} ms, {len(incident['gc']['collections_in_frame'])} GC runs")
+        overdue = incident.get('overdue_stacks')
+        if overdue and 'MainThread' in overdue['threads']:
+            print(f"  main thread at {overdue['at_ms']:.0f} ms: {overdue['threads']['MainThread'][-1]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
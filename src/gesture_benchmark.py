@@ -0,0 +1,417 @@
+"""
+Gesture accuracy and latency benchmark for AI Virtual Mouse.
+
+Runs labelled synthetic hand sequences through the gesture pipeline with a
+recording output backend and scores the result:
+
+- precision and recall per gesture
+- click timing error against the labelled pinch time
+- cursor lag behind the ground-truth fingertip path
+- pipeline frames per second
+
+Results are written as JSON and compared against a stored baseline so
+accuracy regressions show up in CI.
+
+Usage:
+    python src/gesture_benchmark.py
+    python src/gesture_benchmark.py --update-baseline
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from clock import SimulatedClock
+    from gesture_pipeline import GesturePipeline
+    from output_backend import RecordingBackend
+    from synthetic_hands import standard_session
+    from tracking_continuity import TrackingContinuity
+except ImportError:
+    sys.path.append(str(Path(__file__).parent))
+    from clock import SimulatedClock
+    from gesture_pipeline import GesturePipeline
+    from output_backend import RecordingBackend
+    from synthetic_hands import standard_session
+    from tracking_continuity import TrackingContinuity
+
+
+BENCHMARK_DIR = Path(__file__).parent.parent / "benchmarks"
+BASELINE_PATH = BENCHMARK_DIR / "gesture_baseline.json"
+RESULTS_PATH = BENCHMARK_DIR / "results" / "gesture_latest.json"
+
+SCREEN_SIZE = (1920, 1080)
+
+# Scenario name -> build() arguments
+SCENARIOS = {
+    'clean': {'noise_px': 0.0, 'dropout': 0.0},
+    'noisy': {'noise_px': 2.0, 'dropout': 0.0},
+    'dropout': {'noise_px': 1.0, 'dropout': 0.05},
+    'gaps': {'noise_px': 1.0, 'gap_rate': 0.02, 'max_gap': 0.3},
+}
+
+# Label kind -> actions it must produce, in order
+EXPECTED_ACTIONS = {
+    'click': ('click',),
+    'double_click': ('click', 'double_click'),
+    'right_click': ('right_click',),
+    'hold': ('click', 'mouse_down', 'mouse_up'),
+    'drag': ('click', 'mouse_down', 'mouse_up'),
+    'scroll_up': ('scroll',),
+    'scroll_down': ('scroll',),
+    'fist': ('pause_toggle',),
+}
+
+MATCH_SLACK = 0.35      # Seconds an action may fall outside its label window
+MAX_LAG_FRAMES = 30     # Frames a movement may take to settle
+
+
+class PauseTrackingBackend(RecordingBackend):
+    """Recording backend that also logs pipeline pause toggles."""
+
+    def pause_changed(self, paused):
+        self._record('pause_toggle', 1 if paused else 0)
+
+
+def replay(trace, settings=None, screen_size=SCREEN_SIZE, continuity=None):
+    """
+    Run a synthetic trace through a fresh gesture pipeline.
+
+    Frames without a hand go through the tracking continuity layer like in
+    the camera loop.
+
+    Args:
+        trace: SyntheticTrace from ``SyntheticSequence.build``
+        settings: Optional pipeline settings overrides
+        screen_size: Screen size reported by the recording backend
+        continuity: Optional TrackingContinuity keyword arguments
+
+    Returns:
+        Tuple of (backend, per-frame cursor positions (N, 2) with NaN where
+        the cursor was not updated, seconds spent in the pipeline,
+        TrackingContinuity)
+    """
+    clock = SimulatedClock()
+    backend = PauseTrackingBackend(screen_size, clock=clock, record_moves=False)
+    pipeline = GesturePipeline(backend, settings, screen_size, clock=clock)
+    tracker = TrackingContinuity(pipeline, **(continuity or {}))
+    cursor = np.full((len(trace.timestamps), 2), np.nan)
+
+    elapsed = 0.0
+    for i, now in enumerate(trace.timestamps):
+        clock.set(now)
+        was_paused = pipeline.is_paused
+        position = backend.position
+        landmarks = trace.landmarks[i] if trace.has_hand[i] else None
+
+        start = time.perf_counter()
+        tracker.update(landmarks, trace.width, trace.height)
+        elapsed += time.perf_counter() - start
+        if landmarks is None and not tracker.is_coasting:
+            continue
+
+        if pipeline.is_paused != was_paused:
+            backend.pause_changed(pipeline.is_paused)
+        if backend.position != position or not (pipeline.is_paused or pipeline.scroll_mode_active):
+            cursor[i] = backend.position
+
+    return backend, cursor, elapsed, tracker
+
+
+def match_actions(labels, actions):
+    """
+    Greedily match recorded actions to labelled gestures.
+
+    Each action can satisfy at most one label. A label counts as detected
+    when every action in ``EXPECTED_ACTIONS`` occurs in order inside its
+    window; scroll labels also require the scroll direction to match and
+    claim every scroll action in the window.
+
+    Returns:
+        Tuple of (list of (label, matched actions or None), set of matched
+        action indices)
+    """
+    used = set()
+    results = []
+    for label in labels:
+        window_start = label.start - MATCH_SLACK
+        window_end = label.end + MATCH_SLACK
+        candidates = [
+            (i, action) for i, action in enumerate(actions)
+            if i not in used and window_start <= action.time <= window_end
+        ]
+
+        if label.kind.startswith('scroll'):
+            sign = 1 if label.kind == 'scroll_up' else -1
+            scrolls = [(i, a) for i, a in candidates if a.name == 'scroll' and a.amount * sign > 0]
+            if scrolls:
+                used.update(i for i, _ in scrolls)
+                results.append((label, [a for _, a in scrolls]))
+            else:
+                results.append((label, None))
+            continue
+
+        matched = []
+        position = 0
+        for name in EXPECTED_ACTIONS[label.kind]:
+            found = next(
+                ((i, a) for i, a in candidates[position:] if a.name == name), None)
+            if found is None:
+                matched = None
+                break
+            matched.append(found)
+            position = candidates.index(found) + 1
+
+        if matched:
+            used.update(i for i, _ in matched)
+            results.append((label, [a for _, a in matched]))
+        else:
+            results.append((label, None))
+
+    return results, used
+
+
+def cursor_lag(trace, cursor, screen_size=SCREEN_SIZE, settings=None):
+    """
+    Estimate how far the emitted cursor trails the ground-truth path.
+
+    The ground truth is the labelled fingertip position mapped through the
+    active area to screen pixels. For every movement the speed profiles of
+    the truth and of the emitted cursor (projected on the movement
+    direction) are compared; the lag is the shift between their centroids,
+    which is the group delay of the smoothing filter.
+
+    Returns:
+        Tuple of (lag in frames, RMS tracking error in screen pixels while
+        the hand moves)
+    """
+    margin = (settings or {}).get('frame_reduction', 100)
+    x = np.interp(trace.target[:, 0] * trace.width, (margin, trace.width - margin), (0, screen_size[0]))
+    y = np.interp(trace.target[:, 1] * trace.height, (margin, trace.height - margin), (0, screen_size[1]))
+    truth = np.stack([x, y], axis=1)
+    valid = np.isfinite(cursor[:, 0])
+
+    truth_step = np.diff(truth, axis=0, prepend=truth[:1])
+    cursor_step = np.nan_to_num(np.diff(cursor, axis=0, prepend=cursor[:1]))
+    moving = np.any(truth_step != 0, axis=1)
+
+    # Contiguous movements, each followed by a settling window
+    edges = np.flatnonzero(np.diff(np.r_[0, moving.astype(np.int8), 0]))
+    starts, ends = edges[::2], edges[1::2]
+    delays, weights = [], []
+    for k, (s, e) in enumerate(zip(starts, ends)):
+        if not valid[s:e].all():
+            continue    # Scroll swipes and paused movements do not move the cursor
+        stop = min(e + MAX_LAG_FRAMES, starts[k + 1] if k + 1 < len(starts) else len(truth))
+        direction = truth[e - 1] - truth[s - 1]
+        length = np.hypot(*direction)
+        if length == 0:
+            continue
+        direction /= length
+        speed_in = truth_step[s:e] @ direction
+        speed_out = cursor_step[s:stop] @ direction
+        if speed_out.sum() <= 0:
+            continue
+        frames = np.arange(s, stop)
+        delays.append(frames @ speed_out / speed_out.sum() - frames[:e - s] @ speed_in / speed_in.sum())
+        weights.append(length)
+
+    lag = float(np.average(delays, weights=weights)) if delays else 0.0
+    tracked = moving & valid
+    error = float(np.sqrt(np.mean(np.sum((cursor[tracked] - truth[tracked]) ** 2, axis=1)))) \
+        if tracked.any() else 0.0
+    return lag, error
+
+
+def score(trace, backend, cursor, elapsed, settings=None, tracker=None):
+    """
+    Score one replay.
+
+    Returns:
+        Result dictionary (JSON serializable)
+    """
+    actions = backend.actions
+    results, used = match_actions(trace.labels, actions)
+
+    gestures = {}
+    for kind in EXPECTED_ACTIONS:
+        detected = [matched is not None for label, matched in results if label.kind == kind]
+        if detected:
+            gestures[kind] = {'labels': len(detected), 'recall': float(np.mean(detected))}
+
+    action_stats = {}
+    for name in ('click', 'double_click', 'right_click', 'mouse_down', 'scroll', 'pause_toggle'):
+        indices = [i for i, a in enumerate(actions) if a.name == name]
+        if indices:
+            action_stats[name] = {
+                'count': len(indices),
+                'precision': float(np.mean([i in used for i in indices])),
+            }
+
+    # Click timing: first action of each click-like label vs labelled contact
+    errors = [
+        matched[0].time - label.start
+        for label, matched in results
+        if matched and label.kind in ('click', 'double_click', 'right_click')
+    ]
+    errors = np.array(errors) * 1000.0
+
+    lag_frames, lag_error = cursor_lag(trace, cursor, backend.size(), settings)
+    frames = len(trace.timestamps)
+    dropouts = tracker.stats.as_dict() if tracker else {}
+
+    return {
+        'frames': frames,
+        'gestures': gestures,
+        'actions': action_stats,
+        'click_timing_ms': {
+            'mean': float(errors.mean()) if len(errors) else None,
+            'mean_abs': float(np.abs(errors).mean()) if len(errors) else None,
+            'max_abs': float(np.abs(errors).max()) if len(errors) else None,
+        },
+        'cursor_lag_ms': lag_frames * 1000.0 / trace.fps,
+        'cursor_error_px': lag_error,
+        'fps': frames / elapsed if elapsed > 0 else None,
+        'dropouts': {
+            'count': dropouts.get('dropouts', 0),
+            'mean_ms': dropouts.get('mean_duration', 0.0) * 1000.0,
+            'longest_ms': dropouts.get('longest', 0.0) * 1000.0,
+            'coasted_frames': dropouts.get('coasted_frames', 0),
+            'timeouts': dropouts.get('timeouts', 0),
+        },
+    }
+
+
+def run_benchmark(scenarios=None, repeats=3, seed=0, settings=None):
+    """
+    Run every scenario and collect the scores.
+
+    Args:
+        scenarios: Scenario name -> build() arguments (default SCENARIOS)
+        repeats: Repetitions of the standard gesture script
+        seed: Random seed for noise and dropouts
+        settings: Optional pipeline settings overrides
+
+    Returns:
+        Dictionary of scenario name -> result dictionary
+    """
+    sequence = standard_session(repeats)
+    results = {}
+    for name, options in (scenarios or SCENARIOS).items():
+        trace = sequence.build(seed=seed, **options)
+        backend, cursor, elapsed, tracker = replay(trace, settings)
+        results[name] = score(trace, backend, cursor, elapsed, settings, tracker)
+    return results
+
+
+def compare_to_baseline(results, baseline, recall_tolerance=0.05,
+                        timing_tolerance_ms=40.0, lag_tolerance_ms=40.0):
+    """
+    List regressions of ``results`` against ``baseline``.
+
+    Frames/sec is machine dependent and is not compared.
+
+    Returns:
+        List of human-readable regression messages (empty if none)
+    """
+    problems = []
+    for scenario, expected in baseline.items():
+        actual = results.get(scenario)
+        if actual is None:
+            problems.append(f"{scenario}: missing from results")
+            continue
+
+        for kind, stats in expected['gestures'].items():
+            recall = actual['gestures'].get(kind, {}).get('recall', 0.0)
+            if recall < stats['recall'] - recall_tolerance:
+                problems.append(f"{scenario}/{kind}: recall {recall:.2f} < baseline {stats['recall']:.2f}")
+
+        for name, stats in expected['actions'].items():
+            precision = actual['actions'].get(name, {}).get('precision', 1.0)
+            if precision < stats['precision'] - recall_tolerance:
+                problems.append(
+                    f"{scenario}/{name}: precision {precision:.2f} < baseline {stats['precision']:.2f}")
+
+        base_timing = expected['click_timing_ms']['mean_abs']
+        timing = actual['click_timing_ms']['mean_abs']
+        if base_timing is not None and (timing is None or timing > base_timing + timing_tolerance_ms):
+            problems.append(f"{scenario}: click timing error {timing} ms > baseline {base_timing:.0f} ms")
+
+        if actual['cursor_lag_ms'] > expected['cursor_lag_ms'] + lag_tolerance_ms:
+            problems.append(
+                f"{scenario}: cursor lag {actual['cursor_lag_ms']:.0f} ms > "
+                f"baseline {expected['cursor_lag_ms']:.0f} ms")
+
+    return problems
+
+
+def save_results(results, path):
+    """Write benchmark results as JSON."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_results(path):
+    """Read benchmark results written by ``save_results``."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def print_results(results):
+    """Print a compact summary table."""
+    for scenario, result in results.items():
+        print("=" * 60)
+        print(f"{scenario}: {result['frames']} frames, {result['fps']:.0f} fps")
+        for kind, stats in result['gestures'].items():
+            print(f"  {kind:<13} recall {stats['recall']:.2f} ({stats['labels']} labels)")
+        for name, stats in result['actions'].items():
+            print(f"  {name:<13} precision {stats['precision']:.2f} ({stats['count']} actions)")
+        timing = result['click_timing_ms']
+        if timing['mean'] is not None:
+            print(f"  click timing  mean {timing['mean']:+.0f} ms, |max| {timing['max_abs']:.0f} ms")
+        print(f"  cursor lag    {result['cursor_lag_ms']:.0f} ms (rms {result['cursor_error_px']:.1f}px)")
+        dropouts = result['dropouts']
+        if dropouts['count']:
+            print(f"  dropouts      {dropouts['count']} (mean {dropouts['mean_ms']:.0f} ms, "
+                  f"longest {dropouts['longest_ms']:.0f} ms), {dropouts['coasted_frames']} frames coasted")
+    print("=" * 60)
+
+
+def main():
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Gesture accuracy and latency benchmark")
+    parser.add_argument('--repeats', type=int, default=3, help="Repetitions of the gesture script")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed")
+    parser.add_argument('--output', default=str(RESULTS_PATH), help="Where to write the results")
+    parser.add_argument('--baseline', default=str(BASELINE_PATH), help="Baseline results to compare against")
+    parser.add_argument('--update-baseline', action='store_true', help="Store these results as the baseline")
+    args = parser.parse_args()
+
+    results = run_benchmark(repeats=args.repeats, seed=args.seed)
+    print_results(results)
+    save_results(results, args.output)
+
+    if args.update_baseline:
+        save_results(results, args.baseline)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if not Path(args.baseline).exists():
+        print("No baseline stored yet (run with --update-baseline)")
+        return 0
+
+    problems = compare_to_baseline(results, load_results(args.baseline))
+    for problem in problems:
+        print(f"REGRESSION: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
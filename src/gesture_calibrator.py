@@ -3,39 +3,64 @@ Gesture Calibration Mode for AI Virtual Mouse
 Helps users calibrate gesture thresholds based on their hand size.
 """
 
+import argparse
 import cv2
 import mediapipe as mp
 import numpy as np
 import yaml
 from pathlib import Path
 import logging
+import sys
+
+try:
+    from landmark_ring import LandmarkRing
+    from landmark_utils import LandmarkArrayView, draw_landmark_array
+    from auto_calibrate import run_calibration
+except ImportError:
+    sys.path.append(str(Path(__file__).parent))
+    from landmark_ring import LandmarkRing
+    from landmark_utils import LandmarkArrayView, draw_landmark_array
+    from auto_calibrate import run_calibration
 
 
 class GestureCalibrator:
     """Calibrate gesture detection thresholds based on user's hand."""
     
-    def __init__(self):
+    def __init__(self, ring_name=None):
+        """
+        Initialize the calibrator.
+        
+        Args:
+            ring_name: Optional landmark ring to read from instead of opening
+                the camera and running a detector of our own
+        """
         self.logger = logging.getLogger("gesture_calibrator")
+        self.ring_name = ring_name
         
         # Storage for measurements
         self.measurements = {
             'pinch_distances': [],
+            'right_pinch_distances': [],
             'open_distances': [],
             'finger_spacings': []
         }
         
         self.calibration_step = 0
         self.max_steps = 5
+        self.samples_per_step = 5
+        self.step_counts = [0] * self.max_steps
         
-        # Setup MediaPipe
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=1,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.7
-        )
-        self.mp_draw = mp.solutions.drawing_utils
+        # Setup MediaPipe (the producer already runs it when using a ring)
+        self.hands = None
+        if ring_name is None:
+            self.mp_hands = mp.solutions.hands
+            self.hands = self.mp_hands.Hands(
+                static_image_mode=False,
+                max_num_hands=1,
+                min_detection_confidence=0.7,
+                min_tracking_confidence=0.7
+            )
+            self.mp_draw = mp.solutions.drawing_utils
     
     def calculate_distance(self, x1, y1, x2, y2):
         """Calculate Euclidean distance between two points."""
@@ -76,6 +101,7 @@ class GestureCalibrator:
             distance = self.calculate_distance(index_x, index_y, thumb_x, thumb_y)
             if distance < 50:  # Only record if actually pinching
                 self.measurements['pinch_distances'].append(distance)
+                self.step_counts[0] += 1
                 cv2.circle(frame, (int(index_x), int(index_y)), 15, (0, 255, 0), cv2.FILLED)
         
         elif self.calibration_step == 1:
@@ -83,13 +109,15 @@ class GestureCalibrator:
             distance = self.calculate_distance(index_x, index_y, thumb_x, thumb_y)
             if distance > 80:  # Only record if spread apart
                 self.measurements['open_distances'].append(distance)
+                self.step_counts[1] += 1
                 cv2.circle(frame, (int(index_x), int(index_y)), 15, (255, 0, 0), cv2.FILLED)
         
         elif self.calibration_step == 2:
             # Right-click pinch measurement
             distance = self.calculate_distance(middle_x, middle_y, thumb_x, thumb_y)
             if distance < 60:
-                self.measurements['pinch_distances'].append(distance)
+                self.measurements['right_pinch_distances'].append(distance)
+                self.step_counts[2] += 1
                 cv2.circle(frame, (int(middle_x), int(middle_y)), 15, (0, 0, 255), cv2.FILLED)
         
         elif self.calibration_step == 3:
@@ -97,6 +125,7 @@ class GestureCalibrator:
             distance = self.calculate_distance(middle_x, middle_y, ring_x, ring_y)
             if distance < 50:
                 self.measurements['finger_spacings'].append(distance)
+                self.step_counts[3] += 1
                 avg_x = int((middle_x + ring_x) / 2)
                 avg_y = int((middle_y + ring_y) / 2)
                 cv2.circle(frame, (avg_x, avg_y), 15, (0, 255, 255), cv2.FILLED)
@@ -105,6 +134,7 @@ class GestureCalibrator:
             # Wide open hand
             distance = self.calculate_distance(index_x, index_y, thumb_x, thumb_y)
             self.measurements['open_distances'].append(distance)
+            self.step_counts[4] += 1
     
     def calculate_thresholds(self):
         """Calculate recommended thresholds based on measurements."""
@@ -116,12 +146,11 @@ class GestureCalibrator:
             std_pinch = np.std(self.measurements['pinch_distances'])
             results['left_click_distance'] = int(avg_pinch + std_pinch * 1.5)
         
-        # Calculate right click distance
-        if len(self.measurements['pinch_distances']) > 5:
-            # Use later measurements (from step 2) for right-click
-            right_click_pinches = self.measurements['pinch_distances'][5:]
-            avg_right = np.mean(right_click_pinches) if right_click_pinches else avg_pinch
-            results['right_click_distance'] = int(avg_right + std_pinch * 1.5)
+        # Calculate right click distance from the middle+thumb pinches (calibration_step 2)
+        if self.measurements['right_pinch_distances']:
+            avg_right = np.mean(self.measurements['right_pinch_distances'])
+            std_right = np.std(self.measurements['right_pinch_distances'])
+            results['right_click_distance'] = int(avg_right + std_right * 1.5)
         
         # Calculate scroll activation distance
         if self.measurements['finger_spacings']:
@@ -164,9 +193,17 @@ class GestureCalibrator:
     
     def run(self):
         """Run the calibration process."""
-        cap = cv2.VideoCapture(0)
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        cap = None
+        ring = None
+        if self.ring_name is not None:
+            ring = LandmarkRing.attach(self.ring_name)
+            ring_seq = 0
+            shared_landmarks = np.empty((21, 3), dtype=np.float32)
+            shared_view = LandmarkArrayView(shared_landmarks)
+        else:
+            cap = cv2.VideoCapture(0)
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
         
         print("=" * 60)
         print("GESTURE CALIBRATION MODE")
@@ -179,16 +216,26 @@ class GestureCalibrator:
         
         try:
             while True:
-                success, frame = cap.read()
-                if not success:
-                    break
-                
-                frame = cv2.flip(frame, 1)
+                if ring is not None:
+                    ring_frame = ring.wait_next(ring_seq, timeout=2.0)
+                    if ring_frame is None:
+                        break
+                    ring_seq = ring_frame.seq
+                    frame = ring_frame.frame.copy()
+                    np.copyto(shared_landmarks, ring_frame.landmarks)
+                    has_hand = ring_frame.has_hand and ring.is_current(ring_frame)
+                else:
+                    success, frame = cap.read()
+                    if not success:
+                        break
+                    
+                    frame = cv2.flip(frame, 1)
                 h, w, _ = frame.shape
                 
                 # Process frame
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                output = self.hands.process(rgb_frame)
+                if ring is None:
+                    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                    output = self.hands.process(rgb_frame)
                 
                 # Display instruction
                 instruction = self.get_instruction()
@@ -202,18 +249,17 @@ class GestureCalibrator:
                 
                 # Display measurement count for current step
                 if self.calibration_step < self.max_steps:
-                    if self.calibration_step in [0, 2]:
-                        count = len(self.measurements['pinch_distances']) % 5
-                    elif self.calibration_step in [1, 4]:
-                        count = len(self.measurements['open_distances']) % 5
-                    elif self.calibration_step == 3:
-                        count = len(self.measurements['finger_spacings'])
+                    count = min(self.step_counts[self.calibration_step], self.samples_per_step)
                     
-                    cv2.putText(frame, f"Measurements: {count}/5", (10, 120), 
+                    cv2.putText(frame, f"Measurements: {count}/{self.samples_per_step}", (10, 120), 
                                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
                 
                 # Process hand landmarks
-                if output.multi_hand_landmarks:
+                if ring is not None:
+                    if has_hand:
+                        draw_landmark_array(frame, shared_landmarks)
+                        self.process_frame(frame, shared_view, w, h)
+                elif output.multi_hand_landmarks:
                     for hand_landmarks in output.multi_hand_landmarks:
                         self.mp_draw.draw_landmarks(
                             frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
@@ -251,15 +297,37 @@ class GestureCalibrator:
                         print("Complete all calibration steps first!")
         
         finally:
-            cap.release()
+            if cap is not None:
+                cap.release()
+            if ring is not None:
+                ring.close()
             cv2.destroyAllWindows()
-            self.hands.close()
+            if self.hands is not None:
+                self.hands.close()
 
 
 def main():
     """Run calibration tool."""
+    parser = argparse.ArgumentParser(description="Calibrate gesture thresholds")
+    parser.add_argument('--ring', default=None,
+                        help="Read frames from a running landmark producer instead of the camera")
+    parser.add_argument('--traces', nargs='+', default=None,
+                        help="Calibrate offline from recorded landmark traces instead")
+    parser.add_argument('--apply', action='store_true',
+                        help="With --traces: write the fitted thresholds to config.yaml "
+                             "(default: only print them)")
+    args = parser.parse_args()
+    
     logging.basicConfig(level=logging.INFO)
-    calibrator = GestureCalibrator()
+    if args.traces:
+        # Offline calibration fits enter/exit thresholds from whole sessions;
+        # a dry run unless --apply is given
+        run_calibration(args.traces, apply=args.apply)
+        if not args.apply:
+            print("Dry run: config.yaml not changed (use --apply to write these thresholds)")
+        return
+    
+    calibrator = GestureCalibrator(ring_name=args.ring)
     calibrator.run()
 
 
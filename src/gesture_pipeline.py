@@ -0,0 +1,603 @@
+"""
+Gesture pipeline for AI Virtual Mouse.
+
+Turns one normalized (21, 3) landmark array per frame into mouse actions:
+pause/resume, scroll, cursor mapping and smoothing, drag, right click and
+left/double click, plus thumbs-up and two-finger swipe poses and open-hand
+swipes and flicks. The landmarks are denoised first (``LandmarkFilter``), so
+every gesture check sees the same filtered hand. The cursor is mapped from
+the raw index fingertip, since the cursor smoothing already filters it.
+What each gesture does is looked up in an ``ActionBindings`` table; the
+actions go to an output backend and the visual feedback for the frame is
+returned as a list of circles, so the same pipeline runs in the camera
+loop, in trace replays and in benchmarks without a display.
+"""
+
+import sys
+from pathlib import Path
+
+try:
+    from pointer_mapping import create_mapper, is_clutch_pose
+    from pose_descriptor import describe, is_fist
+    from action_bindings import ActionBindings
+    from clock import MonotonicClock
+    from temporal_gestures import GESTURES as MOTION_GESTURES, TemporalGestures
+    from dwell_click import DwellClicker
+    from click_onset import PinchOnset
+    from landmark_filter import LandmarkFilter
+except ImportError:
+    sys.path.append(str(Path(__file__).parent))
+    from pointer_mapping import create_mapper, is_clutch_pose
+    from pose_descriptor import describe, is_fist
+    from action_bindings import ActionBindings
+    from clock import MonotonicClock
+    from temporal_gestures import GESTURES as MOTION_GESTURES, TemporalGestures
+    from dwell_click import DwellClicker
+    from click_onset import PinchOnset
+    from landmark_filter import LandmarkFilter
+
+
+# Landmark indices used by the gestures
+WRIST = 0
+THUMB_TIP = 4
+INDEX_TIP = 8
+MIDDLE_TIP = 12
+RING_TIP = 16
+PINKY_TIP = 20
+FINGERTIPS = (INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP)
+
+FIST_THRESHOLD = 80  # Pixel distance from palm to every fingertip (is_fist_gesture)
+
+# Default colors (BGR), overridden by visual.colors in config.yaml
+DEFAULT_COLORS = {
+    'left_click': (0, 255, 0),
+    'right_click': (0, 0, 255),
+    'double_click': (255, 0, 0),
+    'scroll_mode': (0, 255, 255),
+    'drag_mode': (255, 0, 0),
+    'dwell': (255, 255, 0),
+}
+
+
+def calculate_distance(x1, y1, x2, y2):
+    """Calculate Euclidean distance between two points."""
+    return ((x1 - x2)**2 + (y1 - y2)**2) ** 0.5
+
+
+def is_fist_gesture(landmarks, w, h):
+    """
+    Detect fist gesture for pause/resume.
+    Returns True if all fingertips are close to palm.
+    """
+    # Get palm center (landmark 0)
+    palm_x = landmarks[0].x * w
+    palm_y = landmarks[0].y * h
+
+    # Check if all fingertips (8, 12, 16, 20) are close to palm
+    for tip_id in FINGERTIPS:
+        tip_x = landmarks[tip_id].x * w
+        tip_y = landmarks[tip_id].y * h
+        distance = calculate_distance(palm_x, palm_y, tip_x, tip_y)
+        if distance > FIST_THRESHOLD:
+            return False
+
+    return True
+
+
+def is_fist_array(landmarks, w, h):
+    """
+    Fist detection for a (21, 3) landmark array.
+
+    Uses joint angles (see ``pose_descriptor``) rather than a fixed pixel
+    distance, so it works at any hand size and requires the thumb to be
+    tucked in as well.
+    """
+    return bool(is_fist(describe(landmarks, w, h)))
+
+
+def default_settings():
+    """Settings used when no configuration file is available."""
+    return {
+        'smoothening': 5,
+        'frame_reduction': 100,
+        'denoise': True,
+        'denoise_min_cutoff': 1.0,
+        'denoise_beta': 40.0,
+        'cursor_mode': 'absolute',
+        'acceleration_curve': 'precision',
+        'pointer_gain': 1.0,
+        'clutch_enabled': True,
+        'click_distance': 30,
+        'right_click_distance': 40,
+        'click_release_distance': 30,
+        'right_click_release_distance': 40,
+        'double_click_time': 0.3,
+        'onset_detection': True,
+        'onset_lead_time': 0.15,
+        'onset_click_lead': 0.04,
+        'onset_min_speed': 150,
+        'scroll_threshold': 20,
+        'scroll_sensitivity': 10,
+        'scroll_activation_distance': 30,
+        'scroll_release_distance': 30,
+        'drag_hold_duration': 1.0,
+        'pause_gesture_enabled': True,
+        'pause_detection_time': 2.0,
+        'dwell_click': False,
+        'dwell_time': 1.0,
+        'dwell_radius': 30,
+        'pose_hold_time': 0.5,
+        'swipe_distance': 0.25,
+        'swipe_time': 0.5,
+        'palm_swipe_distance': 0.3,
+        'palm_swipe_time': 0.15,
+        'flick_distance': 0.18,
+        'flick_time': 0.12,
+        'flick_scroll': 5,
+        'motion_cooldown': 0.5,
+        'bindings': {},
+        'colors': dict(DEFAULT_COLORS),
+    }
+
+
+def settings_from_config(config):
+    """
+    Build pipeline settings from a ConfigManager.
+
+    Args:
+        config: ConfigManager instance, or None for defaults
+
+    Returns:
+        Settings dictionary for GesturePipeline
+    """
+    settings = default_settings()
+    if config is None:
+        return settings
+
+    cursor = config.get_cursor_settings()
+    clicks = config.get_click_settings()
+    scroll = config.get_scroll_settings()
+    drag = config.get_drag_settings()
+    accessibility = config.get_accessibility_settings()
+    gestures = config.get_gesture_settings()
+    tracking = config.get_tracking_settings()
+    colors = config.get_visual_settings().get('colors') or {}
+
+    settings.update({
+        'smoothening': cursor['smoothening'],
+        'frame_reduction': cursor['frame_reduction'],
+        'denoise': tracking['denoise'],
+        'denoise_min_cutoff': tracking['denoise_min_cutoff'],
+        'denoise_beta': tracking['denoise_beta'],
+        'cursor_mode': cursor['mode'],
+        'acceleration_curve': cursor['acceleration_curve'],
+        'pointer_gain': cursor['pointer_gain'],
+        'clutch_enabled': cursor['clutch_enabled'],
+        'click_distance': clicks['left_click_distance'],
+        'right_click_distance': clicks['right_click_distance'],
+        'double_click_time': clicks['double_click_time'],
+        'onset_detection': clicks['onset_detection'],
+        'onset_lead_time': clicks['onset_lead_time'],
+        'onset_click_lead': clicks['onset_click_lead'],
+        'onset_min_speed': clicks['onset_min_speed'],
+        'scroll_threshold': scroll['threshold'],
+        'scroll_sensitivity': scroll['sensitivity'],
+        'scroll_activation_distance': scroll['activation_distance'],
+        'drag_hold_duration': drag['hold_duration'],
+        'pause_gesture_enabled': accessibility['enable_pause_gesture'],
+        'pause_detection_time': accessibility['pause_detection_time'],
+        'dwell_click': accessibility['dwell_click'],
+        'dwell_time': accessibility['dwell_time'],
+        'dwell_radius': accessibility['dwell_radius'],
+        'pose_hold_time': gestures['pose_hold_time'],
+        'swipe_distance': gestures['swipe_distance'],
+        'swipe_time': gestures['swipe_time'],
+        'palm_swipe_distance': gestures['palm_swipe_distance'],
+        'palm_swipe_time': gestures['palm_swipe_time'],
+        'flick_distance': gestures['flick_distance'],
+        'flick_time': gestures['flick_time'],
+        'flick_scroll': gestures['flick_scroll'],
+        'motion_cooldown': gestures['motion_cooldown'],
+        'bindings': gestures['bindings'],
+    })
+    # Release thresholds add hysteresis; they default to the engage thresholds
+    settings['click_release_distance'] = (
+        clicks['left_click_release_distance'] or settings['click_distance'])
+    settings['right_click_release_distance'] = (
+        clicks['right_click_release_distance'] or settings['right_click_distance'])
+    settings['scroll_release_distance'] = (
+        scroll['release_distance'] or settings['scroll_activation_distance'])
+    for name, color in colors.items():
+        settings['colors'][name] = tuple(color)
+
+    return settings
+
+
+class GesturePipeline:
+    """Stateful per-frame gesture recognition driving an output backend."""
+
+    def __init__(self, output, settings=None, screen_size=None, display=None, callables=None, clock=None):
+        """
+        Args:
+            output: OutputBackend receiving mouse actions
+            settings: Settings dictionary (see ``default_settings``)
+            screen_size: (width, height) of the target screen; queried from
+                the backend if omitted
+            display: Optional DisplayTargeting choosing the monitor (or
+                desktop region) the active area maps onto
+            callables: Named callables for ``{call: name}`` bindings
+            clock: Callable returning seconds, read when ``process`` gets
+                no timestamp (default: MonotonicClock)
+
+        Raises:
+            ValueError: If the binding table is invalid
+        """
+        self.output = output
+        self.clock = clock or MonotonicClock()
+        self.settings = default_settings()
+        if settings:
+            self.settings.update(settings)
+        self.screen_width, self.screen_height = screen_size or output.size()
+        self.mapper = create_mapper(self.settings, (self.screen_width, self.screen_height))
+        self.display = display
+        self._region = None
+        self.bindings = ActionBindings(self.settings['bindings'], callables)
+        # Every gesture below sees denoised landmarks
+        self.denoiser = LandmarkFilter.from_settings(self.settings) if self.settings['denoise'] else None
+        # Motion gestures keep a landmark history; only built when bound
+        motions = [g for g in MOTION_GESTURES if self.bindings.is_bound(g)]
+        self.motion = TemporalGestures.from_settings(self.settings, motions) if motions else None
+        # Predict left pinches from the closing speed of the fingers
+        self.onset = PinchOnset.from_settings(self.settings) if self.settings['onset_detection'] else None
+        # Accessibility: click by holding the cursor still
+        self.dwell = (DwellClicker.from_settings(self.settings)
+                      if self.settings['dwell_click'] and self.bindings.is_bound('dwell') else None)
+
+        # Per-frame visual feedback: (x, y, radius, color) circles
+        self.feedback = []
+        # Pose descriptor of the last processed frame
+        self.pose = None
+        # Dwell progress ring for the frame: (x, y, radius, progress, color) or None
+        self.dwell_ring = None
+        self.reset()
+
+    @classmethod
+    def from_config(cls, config, output, screen_size=None, display=None, callables=None, clock=None):
+        """Create a pipeline using settings from a ConfigManager (or None)."""
+        return cls(output, settings_from_config(config), screen_size, display, callables, clock)
+
+    def reset(self):
+        """Reset all gesture state (does not touch the mouse)."""
+        # Variables for smoothing logic
+        self.mapper.reset()
+        if self.mapper.mode == 'relative':
+            # Start from the relative cursor, not glide in from the corner
+            self.ploc_x, self.ploc_y = self.mapper.x, self.mapper.y
+        else:
+            self.ploc_x, self.ploc_y = 0, 0      # Previous Location
+
+        # Variables for pause/resume functionality
+        self.is_paused = False
+
+        self._reset_gestures()
+
+    def _reset_gestures(self):
+        # Variables for double click logic
+        self.last_click_time = 0
+
+        # Variables for scroll logic
+        self.prev_scroll_y = None
+        self.scroll_mode_active = False
+
+        # Variables for drag and drop logic
+        self.pinch_start_time = None
+        self.is_dragging = False
+
+        # Variables for click state tracking
+        self.left_click_prev = False
+        self.right_click_prev = False
+        self.left_pinch_held = False
+        if self.onset is not None:
+            self.onset.reset()
+
+        # Fist timer for pause/resume
+        self.fist_start_time = None
+
+        # Pose gestures: thumbs-up hold timer, two-finger swipe start
+        self.thumbs_up_start = None
+        self.thumbs_up_fired = False
+        self.swipe_start = None           # (time, index x) when the pose began
+        self.swipe_fired = False
+        self.pinch_hold_fired = False
+
+        if self.denoiser is not None:
+            self.denoiser.reset()
+
+        # Open-hand swipes and flicks start from an empty history
+        if self.motion is not None:
+            self.motion.reset()
+        self._cancel_dwell()
+
+    def release_all(self):
+        """Release a held mouse button, e.g. on pause, tracking loss or exit."""
+        if self.is_dragging:
+            self.output.mouse_up()
+            self.is_dragging = False
+        self.pinch_start_time = None
+        self.pinch_hold_fired = False
+
+    def reset_gestures(self):
+        """
+        Release held buttons and forget in-progress gestures after the hand
+        was lost, keeping the cursor position and pause state.
+        """
+        self.release_all()
+        self._reset_gestures()
+        # A hand that comes back already pinched must open before clicking
+        self.left_click_prev = True
+        self.right_click_prev = True
+
+    def toggle_pause(self):
+        """Pause or resume gesture control."""
+        self.is_paused = not self.is_paused
+        self.fist_start_time = None
+        # Release mouse if paused while dragging
+        if self.is_paused:
+            self.release_all()
+        return self.is_paused
+
+    def _pose_gestures(self, landmarks, now):
+        """
+        Thumbs-up and two-finger swipe. Only poses with a bound action are
+        recognized, so unbound poses keep working as ordinary hand poses.
+
+        Returns:
+            True while such a pose is held (the cursor stays put)
+        """
+        s = self.settings
+        pose = self.pose
+
+        if self.bindings.is_bound('thumbs_up') and pose.extended[0] and pose.curled[1:].all():
+            if self.thumbs_up_start is None:
+                self.thumbs_up_start = now
+            elif not self.thumbs_up_fired and now - self.thumbs_up_start >= s['pose_hold_time']:
+                self.bindings.dispatch('thumbs_up', self.output)
+                self.thumbs_up_fired = True  # Once per pose
+            return True
+        self.thumbs_up_start = None
+        self.thumbs_up_fired = False
+
+        swipe_bound = self.bindings.is_bound('swipe_left') or self.bindings.is_bound('swipe_right')
+        if swipe_bound and pose.extended[1:3].all() and pose.curled[3:].all():
+            x = float(landmarks[INDEX_TIP, 0])
+            if self.swipe_start is None or (
+                    not self.swipe_fired and now - self.swipe_start[0] > s['swipe_time']):
+                # Too slow for a swipe: measure again from here
+                self.swipe_start = (now, x)
+            elif not self.swipe_fired:
+                travel = x - self.swipe_start[1]
+                if abs(travel) >= s['swipe_distance']:
+                    self.bindings.dispatch('swipe_right' if travel > 0 else 'swipe_left', self.output)
+                    self.swipe_fired = True  # Once per pose
+            return True
+        self.swipe_start = None
+        self.swipe_fired = False
+        return False
+
+    def _cancel_dwell(self, until_moved=False):
+        if self.dwell is not None:
+            self.dwell.cancel(until_moved)
+        self.dwell_ring = None
+
+    def _circle(self, x, y, radius, color_name):
+        self.feedback.append((int(x), int(y), radius, self.settings['colors'][color_name]))
+
+    def process(self, landmarks, w, h, now=None):
+        """
+        Run gesture recognition for one frame.
+
+        Args:
+            landmarks: (21, 3) normalized landmark array of the tracked hand
+            w: Frame width in pixels
+            h: Frame height in pixels
+            now: Frame timestamp in seconds (default: read the clock)
+
+        Returns:
+            List of (x, y, radius, color) feedback circles for the frame
+        """
+        if now is None:
+            now = self.clock()
+        s = self.settings
+        self.feedback = []
+        self.dwell_ring = None
+        raw = landmarks
+        if self.denoiser is not None:
+            landmarks = self.denoiser.apply(landmarks, now)
+        self.pose = describe(landmarks, w, h)
+
+        # Check for fist gesture (pause/resume)
+        if s['pause_gesture_enabled']:
+            if is_fist(self.pose):
+                if self.fist_start_time is None:
+                    self.fist_start_time = now
+                elif now - self.fist_start_time >= s['pause_detection_time']:
+                    self.toggle_pause()
+            else:
+                self.fist_start_time = None
+
+        # Skip gesture processing if paused
+        if self.is_paused:
+            self._cancel_dwell()
+            self.mapper.lift()
+            return self.feedback
+
+        # Bound pose gestures hold the cursor while they are shown
+        if self._pose_gestures(landmarks, now):
+            self._cancel_dwell()
+            self.release_all()
+            self.mapper.lift()
+            return self.feedback
+
+        # Open-hand swipes and flicks; pinches, drags and scrolling disarm them
+        if self.motion is not None:
+            armed = not (self.is_dragging or self.left_pinch_held or self.scroll_mode_active)
+            motion = self.motion.update(landmarks, w, h, now, armed)
+            if motion is not None:
+                self.bindings.dispatch(motion[0], self.output, motion[1])
+
+        # Get coordinates for all relevant fingers
+        index_x = float(landmarks[INDEX_TIP, 0]) * w
+        index_y = float(landmarks[INDEX_TIP, 1]) * h
+        thumb_x = float(landmarks[THUMB_TIP, 0]) * w
+        thumb_y = float(landmarks[THUMB_TIP, 1]) * h
+        middle_x = float(landmarks[MIDDLE_TIP, 0]) * w
+        middle_y = float(landmarks[MIDDLE_TIP, 1]) * h
+        ring_x = float(landmarks[RING_TIP, 0]) * w
+        ring_y = float(landmarks[RING_TIP, 1]) * h
+        # The cursor smoothing filters the pointer; denoising it as well lags
+        pointer_x = float(raw[INDEX_TIP, 0]) * w
+        pointer_y = float(raw[INDEX_TIP, 1]) * h
+
+        # Calculate distances between fingers
+        index_thumb_distance = calculate_distance(index_x, index_y, thumb_x, thumb_y)
+        middle_thumb_distance = calculate_distance(middle_x, middle_y, thumb_x, thumb_y)
+        middle_ring_distance = calculate_distance(middle_x, middle_y, ring_x, ring_y)
+
+        # Pinch states with hysteresis: engage below the activation
+        # distance, release only once fingers open past the release distance
+        left_pinching = index_thumb_distance < (
+            s['click_release_distance'] if self.left_pinch_held else s['click_distance'])
+        right_pinching = middle_thumb_distance < (
+            s['right_click_release_distance'] if self.right_click_prev else s['right_click_distance'])
+        scroll_engaged = middle_ring_distance < (
+            s['scroll_release_distance'] if self.scroll_mode_active else s['scroll_activation_distance'])
+
+        # Pinch onset: a fast-closing pinch freezes the cursor and may
+        # click a frame before the fingers cross the click distance
+        onset_click = False
+        if self.onset is not None:
+            if self.left_pinch_held or self.is_dragging or right_pinching:
+                self.onset.reset()
+            else:
+                onset_click = self.onset.update(landmarks, w, h, now, index_thumb_distance) == 'click'
+        self.left_pinch_held = left_pinching
+
+        # Check if scroll mode should be activated (middle + ring fingers together)
+        if scroll_engaged:
+            self.scroll_mode_active = True
+            # Disable drag when in scroll mode
+            self.release_all()
+            self._cancel_dwell()
+
+            # Visual feedback for scroll mode (Yellow circle)
+            self._circle((middle_x + ring_x) / 2, (middle_y + ring_y) / 2, 15, 'scroll_mode')
+
+            # Handle scrolling
+            if self.prev_scroll_y is not None:
+                scroll_delta = self.prev_scroll_y - middle_y  # Positive = upward movement
+
+                # Only scroll if movement exceeds threshold
+                if abs(scroll_delta) > s['scroll_threshold']:
+                    scroll_amount = int(scroll_delta / s['scroll_sensitivity'])
+                    if scroll_amount != 0:
+                        self.bindings.dispatch('scroll', self.output, scroll_amount)
+
+            # Update previous position for next scroll calculation
+            self.prev_scroll_y = middle_y
+            self.mapper.lift()  # Scroll motion must not move a relative cursor
+            return self.feedback
+
+        self.scroll_mode_active = False
+        self.prev_scroll_y = None  # Reset for next scroll session
+
+        # --- 1. Convert Coordinates (Mapping) ---
+        # The display region is cached; the mapper is only retargeted when
+        # the monitor layout or the focused monitor changes
+        if self.display is not None:
+            r = s['frame_reduction']
+            region = self.display.update((pointer_x - r) / max(w - 2 * r, 1), now)
+            if region is not self._region:
+                self._region = region
+                self.mapper.set_region(region.x, region.y, region.width, region.height, region.scale)
+
+        if self.onset is not None and self.onset.frozen:
+            # Pinch onset: hold the cursor where the pinch started
+            cloc_x, cloc_y = self.ploc_x, self.ploc_y
+            self.mapper.lift()
+        else:
+            # Absolute: active area stretched over the screen. Relative: hand
+            # movement times an accelerated gain; a curled index finger clutches
+            clutch = s['clutch_enabled'] and is_clutch_pose(landmarks)
+            x3, y3 = self.mapper.map(pointer_x, pointer_y, w, h, now, clutch)
+
+            # --- 2. Apply Smoothing ---
+            # Current = Previous + (Target - Previous) / Smoothing Amount
+            cloc_x = self.ploc_x + (x3 - self.ploc_x) / s['smoothening']
+            cloc_y = self.ploc_y + (y3 - self.ploc_y) / s['smoothening']
+
+            # --- 3. Move Mouse ---
+            self.output.move_to(cloc_x, cloc_y)
+            self.ploc_x, self.ploc_y = cloc_x, cloc_y
+
+        # Dwell click: holding the cursor still clicks; pinches take over
+        if self.dwell is not None:
+            if left_pinching or right_pinching or self.is_dragging:
+                self._cancel_dwell(until_moved=True)
+            elif self.dwell.update(cloc_x, cloc_y, now):
+                self._circle(index_x, index_y, 15, 'left_click')
+                self.bindings.dispatch('dwell', self.output)
+            elif self.dwell.progress > 0:
+                self.dwell_ring = (int(index_x), int(index_y), 20, self.dwell.progress, s['colors']['dwell'])
+
+        # Handle drag and drop functionality
+        if left_pinching:
+            # Visual feedback for pinch (Green Circle)
+            self._circle(index_x, index_y, 15, 'left_click')
+
+            if self.pinch_start_time is None:
+                # Start timing the pinch
+                self.pinch_start_time = now
+            elif (not self.is_dragging and not self.pinch_hold_fired
+                    and (now - self.pinch_start_time) >= s['drag_hold_duration']):
+                if self.bindings.is_drag('pinch_hold'):
+                    # Initiate drag
+                    self.output.mouse_down()
+                    self.is_dragging = True
+                    # Change visual feedback to indicate drag (Blue Circle)
+                    self._circle(index_x, index_y, 20, 'drag_mode')
+                else:
+                    # Held pinch bound to another action: run it once
+                    self.bindings.dispatch('pinch_hold', self.output)
+                    self.pinch_hold_fired = True
+        else:
+            # Not pinching anymore: release the drag
+            self.release_all()
+
+        # Handle right click (only when not dragging)
+        if right_pinching and not self.is_dragging and not self.right_click_prev:
+            # Visual feedback for right click (Red Circle)
+            self._circle(middle_x, middle_y, 15, 'right_click')
+            self.bindings.dispatch('right_click', self.output)
+            self.right_click_prev = True  # Mark as triggered to prevent repeated triggering
+        elif not right_pinching:
+            self.right_click_prev = False  # Reset when fingers are apart
+
+        # Handle left click (only when not dragging and not right clicking)
+        if ((left_pinching or onset_click) and not self.is_dragging and not right_pinching
+                and not self.left_click_prev):
+            # Check for double click
+            if now - self.last_click_time < s['double_click_time']:
+                # Visual feedback for double click (Blue Circle)
+                self._circle(index_x, index_y, 15, 'double_click')
+                self.bindings.dispatch('double_click', self.output)
+                self.last_click_time = 0  # Reset to prevent triple-click
+            else:
+                # Visual feedback for single click (Green Circle)
+                self._circle(index_x, index_y, 15, 'left_click')
+                self.bindings.dispatch('left_click', self.output)
+                self.last_click_time = now
+            self.left_click_prev = True  # Mark as triggered
+        elif not left_pinching and not (self.onset is not None and self.onset.committed):
+            self.left_click_prev = False  # Reset when fingers are apart
+
+        return self.feedback
@@ -0,0 +1,450 @@
+"""
+Hand landmark detector backends for AI Virtual Mouse.
+
+Every backend implements ``HandLandmarkDetector``: it takes an RGB frame
+and returns the first hand as a normalized (21, 3) float32 array (x, y in
+0-1 of the frame, z relative to the wrist), or None. Gesture code only
+ever sees that array, so backends can be swapped from the config:
+
+- ``solutions``: legacy ``mediapipe.solutions.hands`` (deprecated upstream)
+- ``tasks``: MediaPipe Tasks ``HandLandmarker`` in VIDEO mode, or
+  LIVE_STREAM mode with an async result callback
+- ``onnx`` / ``tflite``: a raw hand landmark model (e.g. MediaPipe's
+  ``hand_landmark_full``) on ONNX Runtime or the TFLite interpreter with a
+  configurable CPU thread count. The hand region is tracked from the
+  previous frame's landmarks; while no hand is tracked the whole frame is
+  used, so the hand has to be reasonably large in the image to be picked up
+
+Usage (benchmark on recorded video):
+    python src/hand_detector.py videos/session.mp4 --backends solutions tasks onnx \\
+        --tasks-model models/hand_landmarker.task --landmark-model models/hand_landmark_full.onnx
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+try:
+    from landmark_utils import NUM_LANDMARKS, landmarks_to_array
+except ImportError:
+    sys.path.append(str(Path(__file__).parent))
+    from landmark_utils import NUM_LANDMARKS, landmarks_to_array
+
+
+BACKENDS = ('solutions', 'tasks', 'onnx', 'tflite')
+
+ROI_SCALE = 2.0           # Tracked hand region size relative to the landmark bounding box
+RESULTS_PATH = Path(__file__).parent.parent / 'benchmarks' / 'results' / 'detectors_latest.json'
+
+
+class HandLandmarkDetector:
+    """Interface of a hand landmark detector backend."""
+
+    name = 'detector'
+
+    def detect(self, rgb_frame, timestamp):
+        """
+        Detect the first hand in a frame.
+
+        Args:
+            rgb_frame: (H, W, 3) uint8 RGB image
+            timestamp: Frame time in seconds (monotonically increasing)
+
+        Returns:
+            (21, 3) float32 array of normalized landmarks, or None. The
+            array may be reused by the next call
+        """
+        raise NotImplementedError
+
+    def __call__(self, rgb_frame):
+        # Callable form used by batch extraction (frames are in order, so a
+        # frame counter serves as the timestamp)
+        self._calls = getattr(self, '_calls', 0) + 1
+        return self.detect(rgb_frame, self._calls / 30.0)
+
+    def reset(self):
+        """Forget tracking state, e.g. before a new video."""
+
+    def close(self):
+        """Release the backend's resources."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+
+class SolutionsDetector(HandLandmarkDetector):
+    """Legacy ``mediapipe.solutions.hands`` backend."""
+
+    name = 'solutions'
+
+    def __init__(self, model_complexity=1, min_detection_confidence=0.7,
+                 min_tracking_confidence=0.7, max_num_hands=1):
+        import mediapipe as mp
+
+        self._settings = dict(
+            static_image_mode=False,
+            max_num_hands=max_num_hands,
+            model_complexity=model_complexity,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+        )
+        self._hands_cls = mp.solutions.hands.Hands
+        self.hands = self._hands_cls(**self._settings)
+        self._landmarks = np.empty((NUM_LANDMARKS, 3), dtype=np.float32)
+
+    def reset(self):
+        self.hands.close()
+        self.hands = self._hands_cls(**self._settings)
+
+    def detect(self, rgb_frame, timestamp=None):
+        output = self.hands.process(rgb_frame)
+        if not output.multi_hand_landmarks:
+            return None
+        return landmarks_to_array(output.multi_hand_landmarks[0].landmark, out=self._landmarks)
+
+    def close(self):
+        self.hands.close()
+
+
+class TasksDetector(HandLandmarkDetector):
+    """MediaPipe Tasks ``HandLandmarker`` backend."""
+
+    name = 'tasks'
+
+    def __init__(self, model_path, live_stream=False, min_detection_confidence=0.7,
+                 min_presence_confidence=0.7, min_tracking_confidence=0.7, max_num_hands=1):
+        """
+        Args:
+            model_path: ``hand_landmarker.task`` model bundle
+            live_stream: Use LIVE_STREAM mode: frames are submitted
+                asynchronously and ``detect`` returns the newest finished
+                result (usually the previous frame's) without waiting
+            min_*_confidence: Detection, presence and tracking thresholds
+        """
+        import mediapipe as mp
+        from mediapipe.tasks.python import BaseOptions
+        from mediapipe.tasks.python import vision
+
+        self._mp = mp
+        self._vision = vision
+        self.live_stream = live_stream
+        self._model_path = str(model_path)
+        self._options = dict(
+            num_hands=max_num_hands,
+            min_hand_detection_confidence=min_detection_confidence,
+            min_hand_presence_confidence=min_presence_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+        )
+        self._base_options = BaseOptions
+        self._landmarks = np.empty((NUM_LANDMARKS, 3), dtype=np.float32)
+        self._lock = threading.Lock()
+        self._latest = None            # Newest async result as an array copy
+        self._last_ms = -1
+        self.landmarker = self._create()
+
+    def _create(self):
+        vision = self._vision
+        mode = vision.RunningMode.LIVE_STREAM if self.live_stream else vision.RunningMode.VIDEO
+        options = vision.HandLandmarkerOptions(
+            base_options=self._base_options(model_asset_path=self._model_path),
+            running_mode=mode,
+            result_callback=self._on_result if self.live_stream else None,
+            **self._options,
+        )
+        return vision.HandLandmarker.create_from_options(options)
+
+    def _result_array(self, result, out):
+        if not result.hand_landmarks:
+            return None
+        return landmarks_to_array(result.hand_landmarks[0], out=out)
+
+    def _on_result(self, result, image, timestamp_ms):
+        # Runs on a MediaPipe thread
+        landmarks = self._result_array(result, np.empty((NUM_LANDMARKS, 3), dtype=np.float32))
+        with self._lock:
+            self._latest = landmarks
+
+    def reset(self):
+        self.landmarker.close()
+        self._latest = None
+        self._last_ms = -1
+        self.landmarker = self._create()
+
+    def detect(self, rgb_frame, timestamp):
+        # Tasks require strictly increasing integer millisecond timestamps
+        timestamp_ms = max(int(timestamp * 1000), self._last_ms + 1)
+        self._last_ms = timestamp_ms
+        image = self._mp.Image(image_format=self._mp.ImageFormat.SRGB,
+                               data=np.ascontiguousarray(rgb_frame))
+        if self.live_stream:
+            self.landmarker.detect_async(image, timestamp_ms)
+            with self._lock:
+                latest = self._latest
+            if latest is None:
+                return None
+            np.copyto(self._landmarks, latest)
+            return self._landmarks
+        return self._result_array(self.landmarker.detect_for_video(image, timestamp_ms), self._landmarks)
+
+    def close(self):
+        self.landmarker.close()
+
+
+class OnnxRuntimeModel:
+    """Run a single-input model with ONNX Runtime on the CPU."""
+
+    def __init__(self, model_path, num_threads=2):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = num_threads
+        options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(str(model_path), options, providers=['CPUExecutionProvider'])
+        self._input = self.session.get_inputs()[0].name
+        self.input_shape = tuple(self.session.get_inputs()[0].shape)
+
+    def run(self, tensor):
+        return self.session.run(None, {self._input: tensor})
+
+
+class TFLiteModel:
+    """Run a single-input model with the TFLite interpreter."""
+
+    def __init__(self, model_path, num_threads=2):
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            from tensorflow.lite import Interpreter
+
+        self.interpreter = Interpreter(model_path=str(model_path), num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]['index']
+        self._outputs = [d['index'] for d in self.interpreter.get_output_details()]
+        self.input_shape = tuple(self.interpreter.get_input_details()[0]['shape'])
+
+    def run(self, tensor):
+        self.interpreter.set_tensor(self._input, tensor)
+        self.interpreter.invoke()
+        return [self.interpreter.get_tensor(index) for index in self._outputs]
+
+
+class LandmarkModelDetector(HandLandmarkDetector):
+    """
+    Raw hand landmark model (224x224 input, 21 x/y/z outputs in input pixels
+    plus a hand presence score), run on a square region around the hand.
+    """
+
+    name = 'onnx'
+
+    def __init__(self, model, min_presence=0.5, input_size=None, name=None):
+        """
+        Args:
+            model: Object with ``input_shape`` and ``run(tensor)`` returning
+                the output list (OnnxRuntimeModel, TFLiteModel)
+            min_presence: Hand presence score needed to accept a result
+            input_size: Model input size (default: from ``input_shape``)
+            name: Backend name for reports
+        """
+        self.model = model
+        self.min_presence = min_presence
+        shape = tuple(model.input_shape)
+        self.channels_first = len(shape) == 4 and shape[1] == 3
+        self.input_size = input_size or int(shape[2] if self.channels_first else shape[1])
+        if name:
+            self.name = name
+
+        size = self.input_size
+        self._crop = np.empty((size, size, 3), dtype=np.uint8)
+        batch_shape = (1, 3, size, size) if self.channels_first else (1, size, size, 3)
+        self._tensor = np.empty(batch_shape, dtype=np.float32)
+        self._landmarks = np.empty((NUM_LANDMARKS, 3), dtype=np.float32)
+        self._roi = None            # (center_x, center_y, size) in frame pixels
+
+    @classmethod
+    def from_path(cls, model_path, num_threads=2, min_presence=0.5):
+        """Load an ``.onnx`` (ONNX Runtime) or ``.tflite`` (TFLite) model."""
+        model_path = Path(model_path)
+        if model_path.suffix == '.tflite':
+            return cls(TFLiteModel(model_path, num_threads), min_presence, name='tflite')
+        return cls(OnnxRuntimeModel(model_path, num_threads), min_presence, name='onnx')
+
+    def reset(self):
+        self._roi = None
+
+    def _region(self, width, height):
+        if self._roi is not None:
+            return self._roi
+        return (width / 2.0, height / 2.0, float(max(width, height)))
+
+    def detect(self, rgb_frame, timestamp=None):
+        height, width = rgb_frame.shape[:2]
+        cx, cy, roi_size = self._region(width, height)
+        size = self.input_size
+
+        # Crop the square region (zero padded outside the frame) into the
+        # reused input buffer
+        scale = size / roi_size
+        transform = np.array([[scale, 0.0, size / 2.0 - cx * scale],
+                              [0.0, scale, size / 2.0 - cy * scale]])
+        cv2.warpAffine(rgb_frame, transform, (size, size), dst=self._crop,
+                       flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT)
+        tensor = self._crop.transpose(2, 0, 1) if self.channels_first else self._crop
+        np.multiply(tensor[None], 1.0 / 255.0, out=self._tensor, casting='unsafe')
+
+        points, presence = self._parse(self.model.run(self._tensor))
+        if presence < self.min_presence:
+            self._roi = None
+            return None
+
+        # Input pixels -> frame pixels -> normalized
+        out = self._landmarks
+        out[:, 0] = ((points[:, 0] - size / 2.0) / scale + cx) / width
+        out[:, 1] = ((points[:, 1] - size / 2.0) / scale + cy) / height
+        out[:, 2] = points[:, 2] / scale / width
+
+        xs, ys = out[:, 0] * width, out[:, 1] * height
+        box = max(xs.max() - xs.min(), ys.max() - ys.min())
+        self._roi = ((xs.max() + xs.min()) / 2.0, (ys.max() + ys.min()) / 2.0, max(box * ROI_SCALE, 32.0))
+        return out
+
+    @staticmethod
+    def _parse(outputs):
+        """Find the 63-value landmark output and the presence score."""
+        points = presence = None
+        for output in outputs:
+            flat = np.asarray(output, dtype=np.float32).reshape(-1)
+            if flat.size == NUM_LANDMARKS * 3 and points is None:
+                points = flat.reshape(NUM_LANDMARKS, 3)
+            elif flat.size == 1 and presence is None:
+                presence = float(flat[0])
+        if points is None or presence is None:
+            raise ValueError("Landmark model must output 63 landmark values and a presence score")
+        if not 0.0 <= presence <= 1.0:
+            presence = 1.0 / (1.0 + np.exp(-presence))      # Raw logit
+        return points, presence
+
+
+def create_detector(settings):
+    """
+    Create the detector backend selected by hand detection settings.
+
+    Args:
+        settings: Dictionary with ``backend`` and the backend's options
+            (see ``ConfigManager.get_hand_detection_settings``)
+
+    Returns:
+        HandLandmarkDetector
+    """
+    backend = settings.get('backend', 'solutions')
+    detection = settings.get('min_detection_confidence', 0.7)
+    tracking = settings.get('min_tracking_confidence', 0.7)
+    if backend == 'solutions':
+        return SolutionsDetector(settings.get('model_complexity', 1), detection, tracking,
+                                 settings.get('max_num_hands', 1))
+    if backend == 'tasks':
+        return TasksDetector(settings['tasks_model'], settings.get('live_stream', False),
+                             detection, detection, tracking, settings.get('max_num_hands', 1))
+    if backend in ('onnx', 'tflite'):
+        return LandmarkModelDetector.from_path(settings['landmark_model'],
+                                               settings.get('num_threads', 2), detection)
+    raise ValueError(f"Unknown detector backend '{backend}' (choose from {', '.join(BACKENDS)})")
+
+
+def benchmark_detector(detector, frames, fps=30.0, warmup=5):
+    """
+    Measure one backend on preprocessed RGB frames.
+
+    Returns:
+        Dictionary with latency (mean, p50, p95 in ms), throughput (frames
+        per second of detector time) and detection rate
+    """
+    detector.reset()
+    for i in range(min(warmup, len(frames))):
+        detector.detect(frames[i], i / fps)
+    detector.reset()
+
+    latencies = np.empty(len(frames))
+    found = 0
+    start = time.perf_counter()
+    for i, frame in enumerate(frames):
+        frame_start = time.perf_counter()
+        if detector.detect(frame, (warmup + i) / fps) is not None:
+            found += 1
+        latencies[i] = time.perf_counter() - frame_start
+    total = time.perf_counter() - start
+    return {
+        'latency_ms': float(latencies.mean() * 1000),
+        'p50_ms': float(np.percentile(latencies, 50) * 1000),
+        'p95_ms': float(np.percentile(latencies, 95) * 1000),
+        'throughput_fps': len(frames) / total if total > 0 else 0.0,
+        'detection_rate': found / len(frames),
+    }
+
+
+def main():
+    """Compare detector backends on the same recorded video."""
+    try:
+        from frame_preprocess import FramePreprocessor
+        from inference_benchmark import load_frames
+    except ImportError:
+        sys.path.append(str(Path(__file__).parent))
+        from frame_preprocess import FramePreprocessor
+        from inference_benchmark import load_frames
+
+    parser = argparse.ArgumentParser(description="Compare hand detector backends on a recorded video")
+    parser.add_argument('video', help="Recorded video")
+    parser.add_argument('--backends', nargs='+', default=['solutions'], choices=BACKENDS)
+    parser.add_argument('--tasks-model', help="hand_landmarker.task bundle for the tasks backend")
+    parser.add_argument('--landmark-model', help=".onnx / .tflite hand landmark model")
+    parser.add_argument('--live-stream', action='store_true', help="Run the tasks backend in LIVE_STREAM mode")
+    parser.add_argument('--threads', type=int, default=2, help="CPU threads for onnx/tflite")
+    parser.add_argument('--inference-width', type=int, default=0, help="Detector input width (0 = full)")
+    parser.add_argument('--max-frames', type=int, default=300)
+    parser.add_argument('--output', default=str(RESULTS_PATH), help="JSON results file")
+    args = parser.parse_args()
+
+    preprocessor = FramePreprocessor(args.inference_width)
+    frames = [preprocessor.inference_frame(f).copy() for f in load_frames(args.video, args.max_frames)]
+    if not frames:
+        print(f"{args.video}: no frames")
+        return
+
+    results = {}
+    print(f"{'backend':<12} {'latency':>9} {'p50':>8} {'p95':>8} {'throughput':>11} {'detected':>9}")
+    for backend in args.backends:
+        settings = {
+            'backend': backend,
+            'tasks_model': args.tasks_model,
+            'landmark_model': args.landmark_model,
+            'live_stream': args.live_stream,
+            'num_threads': args.threads,
+        }
+        try:
+            detector = create_detector(settings)
+        except Exception as e:
+            print(f"{backend:<12} unavailable: {e}")
+            continue
+        with detector:
+            r = benchmark_detector(detector, frames)
+        results[backend] = r
+        print(f"{backend:<12} {r['latency_ms']:>7.2f}ms {r['p50_ms']:>6.2f}ms {r['p95_ms']:>6.2f}ms "
+              f"{r['throughput_fps']:>7.1f} fps {r['detection_rate']:>8.1%}")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({'video': str(args.video), 'frames': len(frames), 'results': results}, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Idle power saving benchmark for AI Virtual Mouse.
+
+Plays a synthetic camera (textured background with sensor noise, and a
+bright "hand" blob during scheduled intervals) through the capture loop
+twice - always active, and with the idle monitor - and reports:
+
+- CPU: process CPU seconds per wall-clock second
+- detector calls: full hand detection runs
+- wake latency: time from the hand appearing to its first detection
+
+The detector is a stand-in that burns a fixed amount of CPU per call, so
+results do not depend on a camera or a model being available.
+
+Usage:
+    python src/idle_benchmark.py
+    python src/idle_benchmark.py --duration 30 --idle-after 5 --idle-fps 4 --detector-ms 20
+"""
+
+import argparse
+import time
+import sys
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from idle_monitor import IdleMonitor, MotionDetector
+    from landmark_utils import NUM_LANDMARKS
+except ImportError:
+    sys.path.append(str(Path(__file__).parent))
+    from idle_monitor import IdleMonitor, MotionDetector
+    from landmark_utils import NUM_LANDMARKS
+
+
+class SyntheticFrameSource:
+    """Camera stand-in: noisy static scene, hand blob during given intervals."""
+
+    def __init__(self, hand_intervals, size=(640, 480), noise=3, seed=0):
+        """
+        Args:
+            hand_intervals: (start, end) seconds during which a hand is in view
+            size: Frame (width, height)
+            noise: Peak sensor noise in gray levels
+            seed: Random seed for the scene and the noise
+        """
+        self.hand_intervals = list(hand_intervals)
+        width, height = size
+        rng = np.random.RandomState(seed)
+        scene = rng.randint(40, 160, (height // 8, width // 8, 3)).astype(np.uint8)
+        self.background = np.repeat(np.repeat(scene, 8, axis=0), 8, axis=1)
+        # A few precomputed noise fields keep frame generation cheap
+        self._noise = [rng.randint(-noise, noise + 1, self.background.shape).astype(np.int16)
+                       for _ in range(4)]
+        self._frame = np.empty_like(self.background)
+        self._count = 0
+
+    def hand_visible(self, now):
+        """True if the hand is in view at ``now``."""
+        return any(start <= now < end for start, end in self.hand_intervals)
+
+    def read(self, now):
+        """BGR frame at ``now`` (the same buffer is reused)."""
+        noisy = self.background + self._noise[self._count % len(self._noise)]
+        np.clip(noisy, 0, 255, out=noisy)
+        self._frame[:] = noisy
+        self._count += 1
+        if self.hand_visible(now):
+            height, width = self._frame.shape[:2]
+            self._frame[height // 3:2 * height // 3, width // 3:width // 2] = (120, 170, 230)
+        return self._frame
+
+
+class BusyDetector:
+    """Detector stand-in with a fixed CPU cost per call."""
+
+    def __init__(self, cost=0.015):
+        """
+        Args:
+            cost: CPU seconds spent per call
+        """
+        self.cost = cost
+        self.calls = 0
+        self._landmarks = np.full((NUM_LANDMARKS, 3), 0.4, dtype=np.float32)
+
+    def detect(self, frame, timestamp):
+        """Return landmarks if the hand blob is in the frame."""
+        self.calls += 1
+        end = time.perf_counter() + self.cost
+        while time.perf_counter() < end:
+            pass
+        height, width = frame.shape[:2]
+        if frame[height // 2, width // 3 + 5, 2] == 230:
+            return self._landmarks
+        return None
+
+
+def run_session(source, detector, monitor, duration, fps=30, clock=time.perf_counter, sleep=time.sleep):
+    """
+    Run the capture loop on a synthetic source.
+
+    Args:
+        source: SyntheticFrameSource
+        detector: Object with ``detect(frame, timestamp)``
+        monitor: IdleMonitor, or None to stay active
+        duration: Session length in seconds
+        fps: Camera frame rate while active
+        clock: Callable returning seconds
+        sleep: Callable that waits a number of seconds
+
+    Returns:
+        Dictionary with CPU load, frame and detector counts, wake latencies
+        and idle statistics
+    """
+    start = clock()
+    cpu_start = time.process_time()
+    frames = 0
+    hand_since = None       # Time the current hand appearance started
+    detected = False
+    latencies = []
+
+    while True:
+        loop_start = clock()
+        now = loop_start - start
+        if now >= duration:
+            break
+        frame = source.read(now)
+        frames += 1
+
+        visible = source.hand_visible(now)
+        if visible and hand_since is None:
+            # Latency counts from the hand appearing, not from the next
+            # frame polled, so the gap between idle polls is included
+            hand_since = max(start_ for start_, end in source.hand_intervals if start_ <= now < end)
+            detected = False
+        elif not visible:
+            hand_since = None
+
+        if monitor is not None and monitor.idle and not monitor.motion_seen(frame, now):
+            has_hand = False
+        else:
+            has_hand = detector.detect(frame, now) is not None
+            if monitor is not None:
+                monitor.hand_seen(has_hand, now, frame)
+        if has_hand and hand_since is not None and not detected:
+            latencies.append(now - hand_since)
+            detected = True
+
+        elapsed = clock() - loop_start
+        delay = monitor.frame_delay(elapsed) if monitor is not None and monitor.idle else 1.0 / fps - elapsed
+        if delay > 0:
+            sleep(delay)
+
+    wall = clock() - start
+    if monitor is not None:
+        monitor.close(wall)
+    return {
+        'wall_seconds': wall,
+        'cpu_load': (time.process_time() - cpu_start) / wall if wall > 0 else 0.0,
+        'frames': frames,
+        'detector_calls': getattr(detector, 'calls', None),
+        'wake_latency_mean': float(np.mean(latencies)) if latencies else None,
+        'wake_latency_max': float(np.max(latencies)) if latencies else None,
+        'missed_appearances': sum(1 for start_, end in source.hand_intervals if start_ < duration) - len(latencies),
+        'idle': monitor.stats.as_dict() if monitor is not None else None,
+    }
+
+
+def compare_modes(duration=30.0, hand_intervals=((2.0, 4.0), (21.0, 23.0)), idle_after=3.0,
+                  idle_fps=4.0, detector_cost=0.015, fps=30, clock=time.perf_counter, sleep=time.sleep):
+    """
+    Run the same scene always-active and with idle mode.
+
+    Returns:
+        Dictionary: 'active' and 'idle' session results
+    """
+    results = {}
+    for mode in ('active', 'idle'):
+        source = SyntheticFrameSource(hand_intervals)
+        monitor = None
+        if mode == 'idle':
+            monitor = IdleMonitor(idle_after=idle_after, idle_fps=idle_fps, motion=MotionDetector())
+        results[mode] = run_session(source, BusyDetector(detector_cost), monitor, duration,
+                                    fps=fps, clock=clock, sleep=sleep)
+    return results
+
+
+def print_results(results):
+    """Print the active vs. idle comparison."""
+    print(f"{'mode':>7} {'cpu':>7} {'frames':>7} {'detects':>8} {'wake ms':>8} {'max ms':>8} {'missed':>7}")
+    for mode, r in results.items():
+        mean = f"{r['wake_latency_mean'] * 1000:.0f}" if r['wake_latency_mean'] is not None else '-'
+        worst = f"{r['wake_latency_max'] * 1000:.0f}" if r['wake_latency_max'] is not None else '-'
+        print(f"{mode:>7} {r['cpu_load']:>6.1%} {r['frames']:>7} {r['detector_calls']:>8} "
+              f"{mean:>8} {worst:>8} {r['missed_appearances']:>7}")
+
+
+def main():
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Measure idle mode CPU savings and wake-up latency")
+    parser.add_argument('--duration', type=float, default=30.0, help="Seconds per session")
+    parser.add_argument('--idle-after', type=float, default=3.0, help="Seconds without a hand before idling")
+    parser.add_argument('--idle-fps', type=float, default=4.0, help="Frame rate while idle")
+    parser.add_argument('--detector-ms', type=float, default=15.0, help="CPU cost of one detection")
+    parser.add_argument('--fps', type=int, default=30, help="Active frame rate")
+    args = parser.parse_args()
+
+    # The hand shows up twice: once early, once after a long idle stretch
+    intervals = ((2.0, 4.0), (args.duration * 0.7, args.duration * 0.77))
+    results = compare_modes(args.duration, intervals, args.idle_after, args.idle_fps,
+                            args.detector_ms / 1000.0, args.fps)
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Idle power saving for AI Virtual Mouse.
+
+On an unattended kiosk the hand is out of view most of the time, yet the
+loop would keep capturing at full rate and running hand detection on every
+frame. ``IdleMonitor`` adds a second tier:
+
+- active: full frame rate, hand detection on every frame
+- idle: entered after ``idle_after`` seconds without a hand. Frames are
+  read at ``idle_fps`` and only checked for motion inside the active area
+  with a downscaled grayscale frame difference (``MotionDetector``), which
+  costs a small fraction of a detector call
+
+Motion wakes full detection immediately. If the wake-up finds no hand
+(a passer-by, a lighting change) the monitor drops back to idle after
+``wake_grace`` seconds instead of the full ``idle_after``.
+"""
+
+import cv2
+import numpy as np
+
+
+class MotionDetector:
+    """Cheap motion check on a small grayscale copy of the frame."""
+
+    def __init__(self, width=80, threshold=12, min_area=0.01, margin=0):
+        """
+        Args:
+            width: Width of the downscaled frame used for the check
+            threshold: Gray level change that counts a pixel as moving
+            min_area: Fraction of watched pixels that must move
+            margin: Frame pixels ignored along each edge, so only the
+                active area (``frame_reduction``) is watched
+        """
+        self.width = width
+        self.threshold = threshold
+        self.min_area = min_area
+        self.margin = margin
+        self._shape = None
+
+    def _allocate(self, shape):
+        height, width = shape[:2]
+        small_h = max(1, int(round(height * self.width / width)))
+        self._small = np.empty((small_h, self.width, 3), dtype=np.uint8)
+        self._gray = np.empty((small_h, self.width), dtype=np.uint8)
+        self._previous = np.empty_like(self._gray)
+        self._diff = np.empty_like(self._gray)
+        # Watched region in downscaled pixels
+        scale = self.width / width
+        border = min(int(self.margin * scale), (min(small_h, self.width) - 1) // 2)
+        self._rows = slice(border, small_h - border)
+        self._cols = slice(border, self.width - border)
+        self._shape = shape
+        self._has_previous = False
+
+    def reset(self):
+        """Forget the reference frame; the next frame only becomes the reference."""
+        self._has_previous = False
+
+    def update(self, frame):
+        """
+        Compare a BGR frame with the previous one.
+
+        Returns:
+            True if enough of the watched region changed
+        """
+        if frame.shape != self._shape:
+            self._allocate(frame.shape)
+        cv2.resize(frame, (self.width, self._small.shape[0]), dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+
+        moved = False
+        if self._has_previous:
+            cv2.absdiff(self._gray, self._previous, dst=self._diff)
+            watched = self._diff[self._rows, self._cols]
+            moved = np.count_nonzero(watched > self.threshold) >= self.min_area * watched.size
+        self._gray, self._previous = self._previous, self._gray
+        self._has_previous = True
+        return moved
+
+
+class IdleStats:
+    """Time spent idle and wake-up counts."""
+
+    def __init__(self):
+        self.idle_entries = 0
+        self.wakeups = 0
+        self.false_wakeups = 0      # Wake-ups that found no hand
+        self.idle_seconds = 0.0
+        self.motion_checks = 0
+
+    def as_dict(self):
+        return {
+            'idle_entries': self.idle_entries,
+            'wakeups': self.wakeups,
+            'false_wakeups': self.false_wakeups,
+            'idle_seconds': self.idle_seconds,
+            'motion_checks': self.motion_checks,
+        }
+
+
+class IdleMonitor:
+    """Switch between full-rate detection and low-rate motion checks."""
+
+    def __init__(self, idle_after=10.0, idle_fps=4.0, wake_grace=2.0, motion=None, enabled=True):
+        """
+        Args:
+            idle_after: Seconds without a hand before going idle
+            idle_fps: Frame rate while idle
+            wake_grace: Seconds without a hand after a motion wake-up
+                before going idle again
+            motion: MotionDetector (default: whole frame)
+            enabled: False keeps the monitor permanently active
+        """
+        self.idle_after = idle_after
+        self.idle_interval = 1.0 / idle_fps
+        self.wake_grace = wake_grace
+        self.motion = motion or MotionDetector()
+        self.enabled = enabled
+        self.stats = IdleStats()
+
+        self.idle = False
+        self._last_hand = None
+        self._idle_since = None
+        self._woken = False          # Woken by motion, no hand seen since
+
+    @classmethod
+    def from_config(cls, config, frame_reduction=0):
+        """
+        Create from the ``idle`` section of a ConfigManager (or None).
+
+        Args:
+            config: ConfigManager or None for defaults
+            frame_reduction: Active area margin; motion outside it is ignored
+        """
+        settings = config.get_idle_settings() if config else {}
+        motion = MotionDetector(
+            threshold=settings.get('motion_threshold', 12),
+            min_area=settings.get('motion_area', 0.01),
+            margin=frame_reduction,
+        )
+        return cls(
+            idle_after=settings.get('idle_after', 10.0),
+            idle_fps=settings.get('idle_fps', 4.0),
+            wake_grace=settings.get('wake_grace', 2.0),
+            motion=motion,
+            enabled=settings.get('enabled', True),
+        )
+
+    def hand_seen(self, has_hand, now, frame=None):
+        """
+        Report the detection result of a full-rate frame.
+
+        Args:
+            has_hand: Whether the detector found a hand
+            now: Frame time in seconds
+            frame: The BGR frame; on going idle it becomes the motion
+                reference, so a hand entering on the next frame is seen
+
+        Returns:
+            True if the monitor went idle
+        """
+        if self._last_hand is None or has_hand:
+            self._last_hand = now
+            if has_hand:
+                self._woken = False
+            return False
+        if not self.enabled:
+            return False
+
+        timeout = self.wake_grace if self._woken else self.idle_after
+        if now - self._last_hand >= timeout:
+            if self._woken:
+                self.stats.false_wakeups += 1
+                self._woken = False
+            self.idle = True
+            self._idle_since = now
+            self.motion.reset()
+            if frame is not None:
+                self.motion.update(frame)
+            self.stats.idle_entries += 1
+            return True
+        return False
+
+    def motion_seen(self, frame, now):
+        """
+        Run the motion check on an idle frame.
+
+        Returns:
+            True if motion woke full detection
+        """
+        self.stats.motion_checks += 1
+        if not self.motion.update(frame):
+            return False
+        self.idle = False
+        self.stats.idle_seconds += now - self._idle_since
+        self.stats.wakeups += 1
+        self._woken = True
+        self._last_hand = now
+        return True
+
+    def close(self, now):
+        """
+        Count an idle period that is still open, e.g. when the session ends.
+
+        Args:
+            now: Time the session ended, in seconds
+        """
+        if self.idle and self._idle_since is not None:
+            self.stats.idle_seconds += now - self._idle_since
+            self._idle_since = now
+
+    def frame_delay(self, elapsed):
+        """Seconds to wait before the next frame (0 while active)."""
+        if not self.idle:
+            return 0.0
+        return max(0.0, self.idle_interval - elapsed)
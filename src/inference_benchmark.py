@@ -0,0 +1,178 @@
+"""
+Inference resolution benchmark for AI Virtual Mouse.
+
+Runs hand detection over recorded videos at several inference widths and
+compares each against full resolution:
+
+- speed: preprocessing + detection time per frame
+- detection agreement: frames where the hand is found (or missed) exactly
+  when the full-resolution run finds it
+- landmark error: mean landmark distance to the full-resolution result, in
+  full-resolution pixels
+
+Usage:
+    python src/inference_benchmark.py videos/session.mp4
+    python src/inference_benchmark.py videos/*.mp4 --widths 160 256 320 480 --max-frames 600
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+try:
+    from frame_preprocess import FramePreprocessor
+    from landmark_utils import NUM_LANDMARKS
+except ImportError:
+    sys.path.append(str(Path(__file__).parent))
+    from frame_preprocess import FramePreprocessor
+    from landmark_utils import NUM_LANDMARKS
+
+
+DEFAULT_WIDTHS = (160, 256, 320, 480)
+RESULTS_PATH = Path(__file__).parent.parent / 'benchmarks' / 'results' / 'inference_latest.json'
+
+
+def load_frames(video_path, max_frames=None):
+    """Read BGR frames of a video into memory, so decoding is not timed."""
+    cap = cv2.VideoCapture(str(video_path))
+    if not cap.isOpened():
+        raise RuntimeError(f"Cannot open video {video_path}")
+    frames = []
+    try:
+        while max_frames is None or len(frames) < max_frames:
+            success, frame = cap.read()
+            if not success:
+                break
+            frames.append(frame)
+    finally:
+        cap.release()
+    return frames
+
+
+def run_detection(frames, inference_width, detector, mirror=True):
+    """
+    Detect hands in every frame at one inference width.
+
+    Returns:
+        (landmarks, seconds): (N, 21, 3) array with NaN where no hand was
+        found, and the per-frame preprocessing + detection time
+    """
+    preprocessor = FramePreprocessor(inference_width, mirror)
+    landmarks = np.full((len(frames), NUM_LANDMARKS, 3), np.nan, dtype=np.float32)
+    seconds = np.empty(len(frames))
+    for i, frame in enumerate(frames):
+        start = time.perf_counter()
+        result = detector(preprocessor.inference_frame(frame))
+        seconds[i] = time.perf_counter() - start
+        if result is not None:
+            landmarks[i] = result
+    return landmarks, seconds
+
+
+def compare(landmarks, reference, width, height):
+    """Detection agreement and landmark error against the reference run."""
+    found = ~np.isnan(landmarks[:, 0, 0])
+    reference_found = ~np.isnan(reference[:, 0, 0])
+    both = found & reference_found
+    error = None
+    if both.any():
+        delta = (landmarks[both, :, :2] - reference[both, :, :2]) * (width, height)
+        error = float(np.linalg.norm(delta, axis=2).mean())
+    return {
+        'detection_rate': float(found.mean()) if len(found) else 0.0,
+        'agreement': float((found == reference_found).mean()) if len(found) else 0.0,
+        'error_px': error,
+    }
+
+
+def benchmark_frames(frames, detector_factory, widths=DEFAULT_WIDTHS, mirror=True):
+    """
+    Benchmark inference widths on a list of frames.
+
+    Args:
+        frames: BGR frames of one video
+        detector_factory: Callable returning a fresh detector (tracking
+            state must not carry over between runs); a detector takes an
+            RGB frame and returns a (21, 3) array or None
+        widths: Inference widths to compare against full resolution
+
+    Returns:
+        Dictionary: width label ('full' or the width) -> result dictionary
+    """
+    height, width = frames[0].shape[:2]
+    runs = [0] + [w for w in widths if 0 < w < width]
+
+    results = {}
+    reference = None
+    for inference_width in runs:
+        landmarks, seconds = run_detection(frames, inference_width, detector_factory(), mirror)
+        if reference is None:
+            reference = landmarks
+        size = FramePreprocessor(inference_width).inference_size(width, height)
+        result = {
+            'inference_size': list(size),
+            'ms_mean': float(seconds.mean() * 1000),
+            'ms_p95': float(np.percentile(seconds, 95) * 1000),
+        }
+        result.update(compare(landmarks, reference, width, height))
+        results['full' if inference_width == 0 else str(inference_width)] = result
+    return results
+
+
+def print_results(name, results):
+    """Print one video's results as a table."""
+    full_ms = results['full']['ms_mean']
+    print(f"\n{name}")
+    print(f"{'width':>6} {'size':>10} {'ms':>8} {'p95':>8} {'speedup':>8} "
+          f"{'detected':>9} {'agree':>7} {'error':>8}")
+    for label, r in results.items():
+        error = f"{r['error_px']:.2f}px" if r['error_px'] is not None else '-'
+        speedup = full_ms / r['ms_mean'] if r['ms_mean'] > 0 else 0.0
+        print(f"{label:>6} {r['inference_size'][0]:>4}x{r['inference_size'][1]:<5} "
+              f"{r['ms_mean']:>8.2f} {r['ms_p95']:>8.2f} {speedup:>7.2f}x "
+              f"{r['detection_rate']:>8.1%} {r['agreement']:>6.1%} {error:>8}")
+
+
+def main():
+    """Run the benchmark from the command line."""
+    try:
+        from hand_detector import create_detector
+    except ImportError:
+        sys.path.append(str(Path(__file__).parent))
+        from hand_detector import create_detector
+
+    parser = argparse.ArgumentParser(description="Compare hand detection speed and accuracy across inference sizes")
+    parser.add_argument('videos', nargs='+', help="Recorded videos")
+    parser.add_argument('--widths', type=int, nargs='+', default=list(DEFAULT_WIDTHS), help="Inference widths")
+    parser.add_argument('--max-frames', type=int, default=None, help="Frames per video")
+    parser.add_argument('--model-complexity', type=int, default=1, choices=(0, 1))
+    parser.add_argument('--no-mirror', action='store_true', help="Do not mirror frames")
+    parser.add_argument('--output', default=str(RESULTS_PATH), help="JSON results file")
+    args = parser.parse_args()
+
+    settings = {'model_complexity': args.model_complexity}
+    all_results = {}
+    for video in args.videos:
+        frames = load_frames(video, args.max_frames)
+        if not frames:
+            print(f"{video}: no frames")
+            continue
+        results = benchmark_frames(frames, lambda: create_detector(settings),
+                                   args.widths, not args.no_mirror)
+        print_results(video, results)
+        all_results[str(video)] = results
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(all_results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Landmark denoising for AI Virtual Mouse.
+
+Only the cursor used to be smoothed. Every threshold check (pinches, scroll
+activation, fist, poses) ran on raw landmarks, whose frame-to-frame jitter
+flips a gesture on and off when a distance sits near its threshold.
+
+``LandmarkFilter`` runs a One Euro filter on every coordinate of the
+(21, 3) landmark array before any gesture logic sees it. The filter is a
+low-pass whose cutoff rises with the coordinate's speed. A still hand is
+smoothed heavily, and a moving hand hardly lags. The whole array is
+filtered with a handful of in-place NumPy operations per frame, with the
+filter state in preallocated arrays, so the cost does not depend on
+Python loops over landmarks.
+
+Usage (per-frame cost and mode flicker on replayed synthetic sessions):
+    python src/landmark_filter.py
+    python src/landmark_filter.py --noise 1.5 3 5
+"""
+
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from landmark_utils import NUM_LANDMARKS
+except ImportError:
+    sys.path.append(str(Path(__file__).parent))
+    from landmark_utils import NUM_LANDMARKS
+
+
+class LandmarkFilter:
+    """Vectorized One Euro filter over a (21, 3) landmark array."""
+
+    def __init__(self, min_cutoff=1.0, beta=40.0, d_cutoff=10.0, max_gap=0.2):
+        """
+        Args:
+            min_cutoff: Cutoff frequency (Hz) for a still hand; lower is
+                smoother
+            beta: Cutoff increase per unit of speed (normalized
+                coordinates per second); higher lags less when moving
+            d_cutoff: Cutoff frequency (Hz) of the speed estimate
+            max_gap: Seconds between frames after which the filter restarts
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.max_gap = max_gap
+        shape = (NUM_LANDMARKS, 3)
+        self._value = np.zeros(shape, dtype=np.float32)    # Filtered landmarks (returned)
+        self._slope = np.zeros(shape, dtype=np.float32)    # Filtered speed
+        self._delta = np.zeros(shape, dtype=np.float32)
+        self._alpha = np.zeros(shape, dtype=np.float32)
+        self._scratch = np.zeros(shape, dtype=np.float32)
+        self._last_time = None
+
+    @classmethod
+    def from_settings(cls, settings):
+        """Create from GesturePipeline settings."""
+        return cls(settings.get('denoise_min_cutoff', 1.0), settings.get('denoise_beta', 40.0))
+
+    def reset(self):
+        """Restart from the next frame, e.g. after the hand was lost."""
+        self._last_time = None
+
+    def apply(self, landmarks, now):
+        """
+        Filter one frame.
+
+        Args:
+            landmarks: (21, 3) normalized landmark array
+            now: Frame time in seconds
+
+        Returns:
+            The filtered (21, 3) array. It is reused on the next call, so
+            copy it to keep it.
+        """
+        last = self._last_time
+        self._last_time = now
+        if last is None or not 0 < now - last <= self.max_gap:
+            np.copyto(self._value, landmarks)
+            self._slope.fill(0.0)
+            return self._value
+
+        dt = now - last
+        delta, alpha, scratch, slope = self._delta, self._alpha, self._scratch, self._slope
+        np.subtract(landmarks, self._value, out=delta)
+
+        # Speed estimate, low-passed at d_cutoff
+        np.multiply(delta, 1.0 / dt, out=scratch)
+        scratch -= slope
+        scratch *= _smoothing_factor(self.d_cutoff, dt)
+        slope += scratch
+
+        # Per-coordinate cutoff and smoothing factor:
+        # cutoff / (cutoff + 1 / (2 pi dt)) == 1 / (1 + tau / dt)
+        np.abs(slope, out=alpha)
+        alpha *= self.beta
+        alpha += self.min_cutoff
+        np.add(alpha, 1.0 / (2 * math.pi * dt), out=scratch)
+        alpha /= scratch
+
+        delta *= alpha
+        self._value += delta
+        return self._value
+
+
+def _smoothing_factor(cutoff, dt):
+    return 1.0 / (1.0 + 1.0 / (2 * math.pi * cutoff * dt))
+
+
+def measure_cost(landmark_filter, frames=2000, seed=0):
+    """
+    Per-frame cost of ``apply`` in microseconds (best of 3 passes).
+
+    Args:
+        landmark_filter: LandmarkFilter to time
+        frames: Frames per pass
+        seed: Random seed for the input landmarks
+    """
+    rng = np.random.default_rng(seed)
+    inputs = (0.5 + rng.normal(0, 0.01, (frames, NUM_LANDMARKS, 3))).astype(np.float32)
+    best = float('inf')
+    for _ in range(3):
+        landmark_filter.reset()
+        start = time.perf_counter()
+        for i in range(frames):
+            landmark_filter.apply(inputs[i], i / 30.0)
+        best = min(best, (time.perf_counter() - start) / frames)
+    return best * 1e6
+
+
+def mode_changes(trace, settings=None):
+    """
+    Replay a trace and count how often each gesture mode switches.
+
+    Args:
+        trace: SyntheticTrace
+        settings: Pipeline settings overrides
+
+    Returns:
+        Dictionary of mode name -> number of on/off switches
+    """
+    try:
+        from clock import SimulatedClock
+        from flight_recorder import STATE_BITS, gesture_state
+        from gesture_pipeline import GesturePipeline
+        from output_backend import RecordingBackend
+        from tracking_continuity import TrackingContinuity
+    except ImportError:
+        sys.path.append(str(Path(__file__).parent))
+        from clock import SimulatedClock
+        from flight_recorder import STATE_BITS, gesture_state
+        from gesture_pipeline import GesturePipeline
+        from output_backend import RecordingBackend
+        from tracking_continuity import TrackingContinuity
+
+    clock = SimulatedClock()
+    backend = RecordingBackend(clock=clock, record_moves=False)
+    pipeline = GesturePipeline(backend, settings, clock=clock)
+    tracker = TrackingContinuity(pipeline)
+    modes = ('paused', 'dragging', 'scrolling', 'pinch_held')
+    changes = dict.fromkeys(modes, 0)
+    previous = 0
+    for i, now in enumerate(trace.timestamps):
+        clock.set(now)
+        tracker.update(trace.landmarks[i] if trace.has_hand[i] else None, trace.width, trace.height)
+        state = gesture_state(pipeline)
+        for bit, name in enumerate(STATE_BITS):
+            if name in changes and (state ^ previous) & (1 << bit):
+                changes[name] += 1
+        previous = state
+    return changes
+
+
+def main():
+    """Report the filter's per-frame cost and its effect on mode flicker."""
+    try:
+        from synthetic_hands import standard_session
+    except ImportError:
+        sys.path.append(str(Path(__file__).parent))
+        from synthetic_hands import standard_session
+
+    parser = argparse.ArgumentParser(description="Landmark denoising cost and mode flicker")
+    parser.add_argument('--noise', type=float, nargs='+', default=[1.5, 3.0, 4.5],
+                        help="Landmark jitter levels in pixels")
+    parser.add_argument('--seeds', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Per-frame cost of the (21, 3) filter: {measure_cost(LandmarkFilter()):.1f} us\n")
+
+    sequence = standard_session()
+    expected = mode_changes(sequence.build(), {'denoise': False})
+    print("Mode switches on the standard session (clean trace: "
+          + ", ".join(f"{name} {count}" for name, count in expected.items()) + ")")
+    print(f"{'noise':>6} {'denoise':>8} " + " ".join(f"{name:>10}" for name in expected) + f" {'extra':>6}")
+    for noise in args.noise:
+        for denoise in (False, True):
+            totals = dict.fromkeys(expected, 0)
+            for seed in range(args.seeds):
+                changes = mode_changes(sequence.build(noise_px=noise, seed=seed), {'denoise': denoise})
+                for name, count in changes.items():
+                    totals[name] += count
+            mean = {name: count / args.seeds for name, count in totals.items()}
+            extra = sum(max(0.0, mean[name] - expected[name]) for name in expected)
+            print(f"{noise:>5.1f}px {'on' if denoise else 'off':>8} "
+                  + " ".join(f"{mean[name]:>10.1f}" for name in expected) + f" {extra:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
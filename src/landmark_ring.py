@@ -0,0 +1,367 @@
+"""
+Shared-memory landmark ring for AI Virtual Mouse.
+
+A single producer process owns the camera and the hand detector and
+publishes every frame together with its landmark array into a ring of
+slots in ``multiprocessing.shared_memory``. The mouse, the calibrator and
+recorders attach as readers and get NumPy views straight into the ring,
+so the camera is opened once and inference runs once per frame.
+
+Each slot carries a sequence number. The writer marks a slot as busy
+(negative sequence) before filling it and publishes the real sequence
+afterwards, so readers can tell whether the data they are looking at was
+overwritten while they used it.
+"""
+
+import argparse
+import logging
+import os
+import time
+from collections import namedtuple
+from multiprocessing import shared_memory
+from pathlib import Path
+import sys
+
+import numpy as np
+
+try:
+    from landmark_utils import NUM_LANDMARKS
+except ImportError:
+    sys.path.append(str(Path(__file__).parent))
+    from landmark_utils import NUM_LANDMARKS
+
+
+RING_MAGIC = 0x474E524D  # "MRNG"
+
+STATE_RUNNING = 1
+STATE_CLOSED = 2
+
+_HEADER_DTYPE = np.dtype([
+    ('magic', '<u4'),
+    ('slots', '<u4'),
+    ('height', '<u4'),
+    ('width', '<u4'),
+    ('write_seq', '<i8'),
+    ('state', '<i8'),
+    ('producer_pid', '<i8'),
+])
+
+_ALIGN = 64
+
+RingFrame = namedtuple('RingFrame', ['seq', 'timestamp', 'has_hand', 'landmarks', 'frame'])
+
+
+def _align(offset):
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _layout(slots, height, width):
+    """Return (offsets, total_size) of the ring sections."""
+    offsets = {}
+    offset = _align(_HEADER_DTYPE.itemsize)
+    for name, nbytes in (
+        ('slot_seq', slots * 8),
+        ('timestamps', slots * 8),
+        ('has_hand', slots),
+        ('landmarks', slots * NUM_LANDMARKS * 3 * 4),
+        ('frames', slots * height * width * 3),
+    ):
+        offsets[name] = offset
+        offset = _align(offset + nbytes)
+    return offsets, offset
+
+
+def _attach_shared_memory(name):
+    """Attach to an existing block without letting this process unlink it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 registers every attach with the resource tracker,
+        # which would destroy the block when a reader exits.
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        except Exception:
+            pass
+        return shm
+
+
+class LandmarkRing:
+    """Fixed-size ring of frames and landmark arrays in shared memory."""
+
+    def __init__(self, shm, owner=False):
+        """
+        Wrap a shared memory block. Use ``create`` or ``attach`` instead.
+
+        Args:
+            shm: SharedMemory block holding the ring
+            owner: Whether this instance unlinks the block on close
+        """
+        self.shm = shm
+        self.owner = owner
+        self.header = np.ndarray((), dtype=_HEADER_DTYPE, buffer=shm.buf)
+
+        if int(self.header['magic']) != RING_MAGIC:
+            raise ValueError(f"Shared memory '{shm.name}' is not a landmark ring")
+
+        self.slots = int(self.header['slots'])
+        self.height = int(self.header['height'])
+        self.width = int(self.header['width'])
+
+        offsets, _ = _layout(self.slots, self.height, self.width)
+        buf = shm.buf
+        self.slot_seq = np.ndarray((self.slots,), np.int64, buf, offsets['slot_seq'])
+        self.timestamps = np.ndarray((self.slots,), np.float64, buf, offsets['timestamps'])
+        self.has_hand = np.ndarray((self.slots,), np.uint8, buf, offsets['has_hand'])
+        self.landmarks = np.ndarray(
+            (self.slots, NUM_LANDMARKS, 3), np.float32, buf, offsets['landmarks'])
+        self.frames = np.ndarray(
+            (self.slots, self.height, self.width, 3), np.uint8, buf, offsets['frames'])
+
+    @classmethod
+    def create(cls, name, frame_shape, slots=8):
+        """
+        Create a new ring.
+
+        Args:
+            name: Shared memory name readers attach to
+            frame_shape: (height, width) of published frames
+            slots: Number of frames kept in the ring
+
+        Returns:
+            LandmarkRing owning the shared memory block
+        """
+        height, width = int(frame_shape[0]), int(frame_shape[1])
+        _, size = _layout(slots, height, width)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        header = np.ndarray((), dtype=_HEADER_DTYPE, buffer=shm.buf)
+        header['magic'] = RING_MAGIC
+        header['slots'] = slots
+        header['height'] = height
+        header['width'] = width
+        header['write_seq'] = 0
+        header['state'] = STATE_RUNNING
+        header['producer_pid'] = 0
+        del header
+
+        ring = cls(shm, owner=True)
+        ring.slot_seq[:] = 0
+        return ring
+
+    @classmethod
+    def attach(cls, name):
+        """Attach to an existing ring by name."""
+        return cls(_attach_shared_memory(name))
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def write_seq(self):
+        """Sequence number of the most recently published frame."""
+        return int(self.header['write_seq'])
+
+    @property
+    def closed(self):
+        return int(self.header['state']) == STATE_CLOSED
+
+    def publish(self, frame, landmarks, timestamp=None):
+        """
+        Publish a frame and its landmarks.
+
+        Args:
+            frame: BGR image matching the ring's frame shape, or None
+            landmarks: (21, 3) normalized landmark array, or None if no hand
+            timestamp: Capture time (defaults to now)
+
+        Returns:
+            Sequence number assigned to the frame
+        """
+        seq = self.write_seq + 1
+        slot = seq % self.slots
+
+        self.slot_seq[slot] = -seq
+        self.timestamps[slot] = time.time() if timestamp is None else timestamp
+        if frame is not None:
+            np.copyto(self.frames[slot], frame)
+        if landmarks is None:
+            self.has_hand[slot] = 0
+        else:
+            self.landmarks[slot] = landmarks
+            self.has_hand[slot] = 1
+        self.slot_seq[slot] = seq
+        self.header['write_seq'] = seq
+
+        return seq
+
+    def read(self, seq):
+        """
+        Get zero-copy views of a published frame.
+
+        The arrays point into shared memory; call ``is_current`` after using
+        them to make sure the writer did not reuse the slot meanwhile.
+
+        Returns:
+            RingFrame, or None if the frame is not available (yet or anymore)
+        """
+        if seq <= 0:
+            return None
+        slot = seq % self.slots
+        if int(self.slot_seq[slot]) != seq:
+            return None
+        return RingFrame(
+            seq,
+            float(self.timestamps[slot]),
+            bool(self.has_hand[slot]),
+            self.landmarks[slot],
+            self.frames[slot],
+        )
+
+    def is_current(self, ring_frame):
+        """Check that a frame returned by ``read`` has not been overwritten."""
+        return int(self.slot_seq[ring_frame.seq % self.slots]) == ring_frame.seq
+
+    def latest(self):
+        """Return the most recently published frame, or None."""
+        return self.read(self.write_seq)
+
+    def wait_next(self, last_seq, timeout=1.0, latest=True, poll_interval=0.001):
+        """
+        Wait for a frame newer than ``last_seq``.
+
+        Args:
+            last_seq: Sequence number of the last frame the reader handled
+            timeout: Seconds to wait before giving up
+            latest: Jump to the newest frame (live consumers) instead of the
+                next one in order (recorders)
+            poll_interval: Sleep between checks of the write sequence
+
+        Returns:
+            RingFrame, or None on timeout or when the producer has closed
+        """
+        deadline = time.time() + timeout
+        while True:
+            write_seq = self.write_seq
+            if write_seq > last_seq:
+                if latest:
+                    ring_frame = self.read(write_seq)
+                else:
+                    # Fall forward if the reader lagged a full ring behind
+                    seq = max(last_seq + 1, write_seq - self.slots + 1)
+                    ring_frame = self.read(seq)
+                if ring_frame is not None:
+                    return ring_frame
+            elif self.closed or time.time() >= deadline:
+                return None
+            time.sleep(poll_interval)
+
+    def mark_closed(self):
+        """Tell readers that no more frames will be published."""
+        self.header['state'] = STATE_CLOSED
+
+    def close(self):
+        """Detach from the ring, unlinking it if this instance created it."""
+        # Drop views before closing, otherwise the buffer cannot be released
+        self.header = self.slot_seq = self.timestamps = None
+        self.has_hand = self.landmarks = self.frames = None
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def run_producer(ring_name, config_path=None, slots=8):
+    """
+    Capture frames, run hand detection and publish into a new ring.
+
+    Args:
+        ring_name: Shared memory name for the ring
+        config_path: Optional config file for camera and detector settings
+        slots: Ring size in frames
+    """
+    try:
+        from camera_setup import open_camera
+        from config_manager import ConfigManager
+        from detector_warmup import DetectorWarmup
+        from frame_pool import FramePool
+        from frame_preprocess import FramePreprocessor
+        from hand_detector import create_detector
+    except ImportError:
+        sys.path.append(str(Path(__file__).parent))
+        from camera_setup import open_camera
+        from config_manager import ConfigManager
+        from detector_warmup import DetectorWarmup
+        from frame_pool import FramePool
+        from frame_preprocess import FramePreprocessor
+        from hand_detector import create_detector
+
+    logger = logging.getLogger("landmark_ring")
+    config = ConfigManager(config_path)
+    camera_settings = config.get_camera_settings()
+    hand_settings = config.get_hand_detection_settings()
+
+    # Warm the detector up on synthetic frames while the camera opens
+    detector = create_detector(hand_settings)
+    preprocessor = FramePreprocessor(hand_settings['inference_width'])
+    warmup = DetectorWarmup.from_settings(
+        detector, hand_settings, preprocessor.inference_size(camera_settings['width'], camera_settings['height'])
+    ).start()
+
+    try:
+        cap, _ = open_camera(camera_settings)
+        success, frame = cap.read()
+        if not success:
+            cap.release()
+            raise RuntimeError("Failed to read first frame from camera")
+    except Exception:
+        warmup.wait()
+        detector.close()
+        raise
+    warmup.wait()
+
+    ring = LandmarkRing.create(ring_name, frame.shape[:2], slots=slots)
+    ring.header['producer_pid'] = os.getpid()
+    logger.info(f"Publishing {frame.shape[1]}x{frame.shape[0]} frames to ring '{ring_name}'")
+
+    frame_pool = FramePool()
+
+    try:
+        while True:
+            success, frame = frame_pool.read(cap)
+            if not success:
+                logger.warning("Failed to read frame from camera")
+                break
+            timestamp = time.time()
+
+            # publish copies the frame into the ring, so it is mirrored in place
+            frame = preprocessor.preview_frame(frame, in_place=True)
+            landmarks = detector.detect(preprocessor.inference_frame(frame, mirrored=True), timestamp)
+            ring.publish(frame, landmarks, timestamp)
+    except KeyboardInterrupt:
+        logger.info("Producer interrupted by user")
+    finally:
+        ring.mark_closed()
+        cap.release()
+        detector.close()
+        ring.close()
+
+
+def main():
+    """Run the landmark producer from the command line."""
+    parser = argparse.ArgumentParser(description="Publish camera frames and hand landmarks to shared memory")
+    parser.add_argument('--name', default='ai_mouse_ring', help="Shared memory name")
+    parser.add_argument('--slots', type=int, default=8, help="Number of frames kept in the ring")
+    parser.add_argument('--config', default=None, help="Path to config.yaml")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    run_producer(args.name, args.config, args.slots)
+
+
+if __name__ == "__main__":
+    main()
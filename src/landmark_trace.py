@@ -0,0 +1,244 @@
+"""
+Compact landmark trace format for AI Virtual Mouse.
+
+A trace is a small fixed header followed by fixed-size binary records, one
+per frame: capture timestamp, frame index, flags, gesture code and the
+(21, 3) normalized landmark array. Records are written in batches and can
+be memory-mapped back as a NumPy structured array, so hours of recordings
+load instantly and stay vectorizable.
+"""
+
+import os
+import sys
+import time
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+
+TRACE_MAGIC = b'AIMTRACE'
+TRACE_VERSION = 1
+
+FLAG_HAND = 0x01
+
+_HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u2'),
+    ('reserved', '<u2'),
+    ('width', '<u4'),
+    ('height', '<u4'),
+    ('fps', '<f4'),
+    ('padding', 'V8'),
+])
+
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('frame', '<u4'),
+    ('flags', 'u1'),
+    ('gesture', 'u1'),
+    ('padding', 'V2'),
+    ('landmarks', '<f4', (21, 3)),
+])
+
+TraceInfo = namedtuple('TraceInfo', ['version', 'width', 'height', 'fps'])
+
+
+class TraceWriter:
+    """Append frames to a trace file with batched writes."""
+
+    def __init__(self, path, width, height, fps=0.0, buffer_frames=256):
+        """
+        Create a trace file and write its header.
+
+        Args:
+            path: Output file path
+            width: Source frame width in pixels
+            height: Source frame height in pixels
+            fps: Nominal source frame rate (0 if unknown)
+            buffer_frames: Number of records buffered between disk writes
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.frames_written = 0
+
+        self._file = open(self.path, 'wb')
+        header = np.zeros((), dtype=_HEADER_DTYPE)
+        header['magic'] = TRACE_MAGIC
+        header['version'] = TRACE_VERSION
+        header['width'] = width
+        header['height'] = height
+        header['fps'] = fps
+        self._file.write(header.tobytes())
+
+        self._buffer = np.zeros(buffer_frames, dtype=RECORD_DTYPE)
+        self._count = 0
+
+    def write(self, timestamp, frame_index, landmarks, gesture=0):
+        """
+        Buffer one frame.
+
+        Args:
+            timestamp: Capture time in seconds
+            frame_index: Frame number within the source
+            landmarks: (21, 3) normalized landmarks, or None if no hand
+            gesture: Optional gesture/state code for the frame
+        """
+        record = self._buffer[self._count]
+        record['timestamp'] = timestamp
+        record['frame'] = frame_index
+        record['gesture'] = gesture
+        if landmarks is None:
+            record['flags'] = 0
+            record['landmarks'] = 0
+        else:
+            record['flags'] = FLAG_HAND
+            record['landmarks'] = landmarks
+
+        self._count += 1
+        if self._count == len(self._buffer):
+            self.flush()
+
+    def write_records(self, records):
+        """Write an array of RECORD_DTYPE records directly."""
+        self.flush()
+        self._file.write(np.ascontiguousarray(records, dtype=RECORD_DTYPE).tobytes())
+        self.frames_written += len(records)
+
+    def flush(self):
+        """Write buffered records to disk."""
+        if self._count:
+            self._file.write(self._buffer[:self._count].tobytes())
+            self.frames_written += self._count
+            self._count = 0
+        self._file.flush()
+
+    def close(self):
+        """Flush and close the file."""
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def read_trace_info(path):
+    """Read only the header of a trace file."""
+    with open(path, 'rb') as f:
+        raw = f.read(_HEADER_DTYPE.itemsize)
+    if len(raw) < _HEADER_DTYPE.itemsize:
+        raise ValueError(f"Trace file too short: {path}")
+
+    header = np.frombuffer(raw, dtype=_HEADER_DTYPE)[0]
+    if header['magic'] != TRACE_MAGIC:
+        raise ValueError(f"Not a landmark trace: {path}")
+    if header['version'] > TRACE_VERSION:
+        raise ValueError(f"Unsupported trace version {header['version']}: {path}")
+
+    return TraceInfo(int(header['version']), int(header['width']),
+                     int(header['height']), float(header['fps']))
+
+
+def read_trace(path, mmap=False):
+    """
+    Load a trace file.
+
+    Args:
+        path: Trace file path
+        mmap: Memory-map the records instead of reading them into memory
+
+    Returns:
+        Tuple of (TraceInfo, structured array of RECORD_DTYPE records)
+    """
+    info = read_trace_info(path)
+    offset = _HEADER_DTYPE.itemsize
+    count = (os.path.getsize(path) - offset) // RECORD_DTYPE.itemsize
+
+    if mmap:
+        if count == 0:
+            return info, np.zeros(0, dtype=RECORD_DTYPE)
+        records = np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=offset, shape=(count,))
+    else:
+        records = np.fromfile(path, dtype=RECORD_DTYPE, count=count, offset=offset)
+
+    return info, records
+
+
+def hand_present(records):
+    """Boolean mask of records that contain a detected hand."""
+    return (records['flags'] & FLAG_HAND) != 0
+
+
+def record_from_ring(ring_name, path, duration=None):
+    """
+    Record every frame published to a landmark ring into a trace file.
+
+    Args:
+        ring_name: Shared memory name of a running landmark producer
+        path: Output trace file
+        duration: Optional recording length in seconds (None = until the
+            producer stops)
+
+    Returns:
+        Number of frames written
+    """
+    try:
+        from landmark_ring import LandmarkRing
+    except ImportError:
+        sys.path.append(str(Path(__file__).parent))
+        from landmark_ring import LandmarkRing
+
+    ring = LandmarkRing.attach(ring_name)
+    last_seq = 0
+    deadline = None if duration is None else time.time() + duration
+    try:
+        with TraceWriter(path, ring.width, ring.height) as writer:
+            while deadline is None or time.time() < deadline:
+                ring_frame = ring.wait_next(last_seq, timeout=2.0, latest=False)
+                if ring_frame is None:
+                    break
+                landmarks = ring_frame.landmarks.copy() if ring_frame.has_hand else None
+                if ring.is_current(ring_frame):
+                    writer.write(ring_frame.timestamp, ring_frame.seq, landmarks)
+                last_seq = ring_frame.seq
+    finally:
+        ring.close()
+
+    return writer.frames_written
+
+
+def main():
+    """Inspect or record landmark traces from the command line."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Landmark trace tools")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    info_parser = subparsers.add_parser('info', help="Print a summary of a trace file")
+    info_parser.add_argument('trace')
+
+    record_parser = subparsers.add_parser('record', help="Record a running landmark producer")
+    record_parser.add_argument('trace')
+    record_parser.add_argument('--ring', default='ai_mouse_ring', help="Shared memory name")
+    record_parser.add_argument('--duration', type=float, default=None, help="Seconds to record")
+
+    args = parser.parse_args()
+
+    if args.command == 'info':
+        info, records = read_trace(args.trace, mmap=True)
+        hands = int(hand_present(records).sum())
+        span = float(records['timestamp'][-1] - records['timestamp'][0]) if len(records) > 1 else 0.0
+        print(f"{args.trace}: v{info.version} {info.width}x{info.height} @ {info.fps:.1f} fps")
+        print(f"  {len(records)} frames, {hands} with a hand, {span:.1f} s")
+    else:
+        frames = record_from_ring(args.ring, args.trace, args.duration)
+        print(f"Recorded {frames} frames to {args.trace}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Landmark array helpers for AI Virtual Mouse.
+Converts MediaPipe hand landmarks into plain NumPy arrays so that the
+camera loop, shared-memory readers and recorders all use one layout.
+"""
+
+import cv2
+import numpy as np
+
+
+NUM_LANDMARKS = 21
+
+# Same topology as mediapipe.solutions.hands.HAND_CONNECTIONS
+HAND_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12),
+    (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),
+)
+
+
+def landmarks_to_array(landmarks, out=None):
+    """
+    Copy MediaPipe landmarks into a (21, 3) float32 array.
+
+    Args:
+        landmarks: Sequence of objects with x, y and z attributes
+        out: Optional preallocated (21, 3) array to fill in place
+
+    Returns:
+        Array of normalized (x, y, z) coordinates
+    """
+    if out is None:
+        out = np.empty((NUM_LANDMARKS, 3), dtype=np.float32)
+
+    for i, lm in enumerate(landmarks):
+        out[i, 0] = lm.x
+        out[i, 1] = lm.y
+        out[i, 2] = lm.z
+
+    return out
+
+
+class LandmarkPoint:
+    """Read-only x/y/z accessor over one row of a landmark array."""
+
+    __slots__ = ('_row',)
+
+    def __init__(self, row):
+        self._row = row
+
+    @property
+    def x(self):
+        return float(self._row[0])
+
+    @property
+    def y(self):
+        return float(self._row[1])
+
+    @property
+    def z(self):
+        return float(self._row[2])
+
+
+class LandmarkArrayView:
+    """
+    Expose a (21, 3) array with the same indexing as MediaPipe's
+    ``hand_landmarks.landmark`` so existing gesture code can read it.
+
+    The view keeps references to the array rows, so filling the array in
+    place updates every point without creating new objects.
+    """
+
+    def __init__(self, array):
+        self.array = array
+        self._points = [LandmarkPoint(array[i]) for i in range(len(array))]
+
+    def __len__(self):
+        return len(self._points)
+
+    def __getitem__(self, index):
+        return self._points[index]
+
+    def __iter__(self):
+        return iter(self._points)
+
+
+def draw_landmark_array(frame, landmarks, point_color=(0, 0, 255),
+                        line_color=(255, 255, 255)):
+    """
+    Draw a hand skeleton from a normalized (21, 3) array onto a BGR frame.
+
+    Args:
+        frame: BGR image to draw on
+        landmarks: Normalized landmark array
+        point_color: BGR color of the joints
+        line_color: BGR color of the connections
+    """
+    h, w = frame.shape[:2]
+    points = [(int(x * w), int(y * h)) for x, y in landmarks[:, :2]]
+
+    for start, end in HAND_CONNECTIONS:
+        cv2.line(frame, points[start], points[end], line_color, 2)
+    for point in points:
+        cv2.circle(frame, point, 4, point_color, cv2.FILLED)
@@ -1,21 +1,33 @@
 """
 Logging setup for AI Virtual Mouse application.
+
+By default log records are handed to a queue and formatted and written by a
+background listener thread, so the frame loop never waits on disk or console
+I/O even with DEBUG enabled.
 """
 
+import atexit
 import logging
 import os
+import queue
+import time
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from typing import Optional
 
 
+# Running queue listeners by logger name
+_listeners = {}
+
+
 def setup_logger(
     name: str = "ai_virtual_mouse",
     log_file: Optional[str] = None,
     level: str = "INFO",
     max_bytes: int = 10485760,  # 10MB
     backup_count: int = 3,
-    console: bool = True
+    console: bool = True,
+    use_queue: bool = True
 ) -> logging.Logger:
     """
     Setup logger with file and console handlers.
@@ -27,6 +39,8 @@ def setup_logger(
         max_bytes: Maximum log file size before rotation
         backup_count: Number of backup files to keep
         console: Whether to also log to console
+        use_queue: Write through a background thread (QueueHandler) instead
+            of formatting and writing in the calling thread
     
     Returns:
         Configured logger instance
@@ -34,6 +48,7 @@ def setup_logger(
     logger = logging.getLogger(name)
     
     # Clear existing handlers to avoid duplicates
+    shutdown_logger(name)
     logger.handlers.clear()
     
     # Set logging level
@@ -49,6 +64,8 @@ def setup_logger(
         '%(levelname)s - %(message)s'
     )
     
+    handlers = []
+    
     # File handler with rotation
     if log_file:
         log_path = Path(log_file)
@@ -61,18 +78,50 @@ def setup_logger(
         )
         file_handler.setLevel(log_level)
         file_handler.setFormatter(detailed_formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
     
     # Console handler
     if console:
         console_handler = logging.StreamHandler()
         console_handler.setLevel(log_level)
         console_handler.setFormatter(simple_formatter)
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
+    
+    if use_queue and handlers:
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        _listeners[name] = listener
+        logger.addHandler(QueueHandler(log_queue))
+    else:
+        for handler in handlers:
+            logger.addHandler(handler)
     
     return logger
 
 
+def shutdown_logger(name: str = "ai_virtual_mouse"):
+    """
+    Stop the background listener of a logger, writing out queued records.
+    
+    Args:
+        name: Logger name passed to setup_logger
+    """
+    listener = _listeners.pop(name, None)
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+def _shutdown_all():
+    for name in list(_listeners):
+        shutdown_logger(name)
+
+
+atexit.register(_shutdown_all)
+
+
 class PerformanceLogger:
     """Logger for tracking performance metrics."""
     
@@ -94,12 +143,50 @@ class PerformanceLogger:
                 f"Avg time: {avg_time*1000:.2f}ms, FPS: {fps:.2f}"
             )
     
+    def log_governor(self, state: dict):
+        """Log the performance governor's state after a quality change."""
+        self.logger.info(f"Governor state: {state}")
+
     def reset(self):
         """Reset performance counters."""
         self.frame_count = 0
         self.total_processing_time = 0.0
 
 
+class StartupTimer:
+    """Breakdown of where startup time goes, logged once as one line."""
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.start = clock()
+        self._last = self.start
+        self.stages = []   # (name, seconds, parallel)
+
+    def mark(self, name: str) -> float:
+        """Record the time since the previous mark as stage ``name``."""
+        now = self.clock()
+        seconds = now - self._last
+        self._last = now
+        self.stages.append((name, seconds, False))
+        return seconds
+
+    def add(self, name: str, seconds: float, parallel: bool = True):
+        """Record a stage that ran alongside the others (e.g. on a thread)."""
+        self.stages.append((name, seconds, parallel))
+
+    @property
+    def total(self) -> float:
+        """Seconds from creation to the last mark."""
+        return self._last - self.start
+
+    def summary(self) -> str:
+        """One-line breakdown, e.g. ``detector 850 ms, camera 1200 ms, total 2.1 s``."""
+        parts = [f"{name} {seconds * 1000:.0f} ms" + (" (parallel)" if parallel else "")
+                 for name, seconds, parallel in self.stages]
+        parts.append(f"total {self.total:.1f} s")
+        return ", ".join(parts)
+
+
 if __name__ == "__main__":
     # Test the logger
     logger = setup_logger(
@@ -0,0 +1,275 @@
+"""
+Mouse output backends for AI Virtual Mouse.
+
+The gesture pipeline never calls PyAutoGUI directly; it talks to an output
+backend. ``PyAutoGUIBackend`` drives the real cursor, ``RecordingBackend``
+records every action with a timestamp so tests and benchmarks can run
+without a display. ``ThreadedBackend`` runs another backend's actions on a
+worker thread, so slow calls (PyAutoGUI sleeps ``PAUSE`` seconds after
+every call, typing a macro takes longer) never hold up the frame loop.
+Failed actions are logged; a fatal error of the wrapped backend (PyAutoGUI's
+fail-safe) is raised again in the caller's thread on its next call, so
+moving the mouse into a corner still stops the application.
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections import namedtuple
+
+
+Action = namedtuple('Action', ['time', 'name', 'x', 'y', 'amount'])
+
+MAX_QUEUED_ACTIONS = 256  # ThreadedBackend blocks the caller beyond this backlog
+
+logger = logging.getLogger("output_backend")
+
+
+class OutputBackend:
+    """Interface for everything the gesture pipeline can do to the mouse."""
+
+    # Exceptions that must stop the application rather than skip one action
+    fatal_errors = ()
+
+    def size(self):
+        """Return (width, height) of the target screen area."""
+        raise NotImplementedError
+
+    def move_to(self, x, y):
+        raise NotImplementedError
+
+    def click(self):
+        raise NotImplementedError
+
+    def double_click(self):
+        raise NotImplementedError
+
+    def right_click(self):
+        raise NotImplementedError
+
+    def mouse_down(self):
+        raise NotImplementedError
+
+    def mouse_up(self):
+        raise NotImplementedError
+
+    def scroll(self, amount):
+        raise NotImplementedError
+
+    def hotkey(self, *keys):
+        """Press a key chord, e.g. ``hotkey('ctrl', 'z')``."""
+        raise NotImplementedError
+
+    def write(self, text):
+        """Type a text macro."""
+        raise NotImplementedError
+
+
+class PyAutoGUIBackend(OutputBackend):
+    """Send actions to the real mouse through PyAutoGUI."""
+
+    def __init__(self):
+        # Imported lazily: PyAutoGUI needs a display as soon as it is imported
+        import pyautogui
+        self._pyautogui = pyautogui
+        self.fatal_errors = (pyautogui.FailSafeException,)
+
+    def size(self):
+        return tuple(self._pyautogui.size())
+
+    def move_to(self, x, y):
+        self._pyautogui.moveTo(x, y)
+
+    def click(self):
+        self._pyautogui.click()
+
+    def double_click(self):
+        self._pyautogui.doubleClick()
+
+    def right_click(self):
+        self._pyautogui.rightClick()
+
+    def mouse_down(self):
+        self._pyautogui.mouseDown()
+
+    def mouse_up(self):
+        self._pyautogui.mouseUp()
+
+    def scroll(self, amount):
+        self._pyautogui.scroll(amount)
+
+    def hotkey(self, *keys):
+        self._pyautogui.hotkey(*keys)
+
+    def write(self, text):
+        self._pyautogui.write(text)
+
+
+class RecordingBackend(OutputBackend):
+    """Record actions instead of performing them."""
+
+    def __init__(self, screen_size=(1920, 1080), clock=time.time, record_moves=True):
+        """
+        Args:
+            screen_size: (width, height) reported by ``size``
+            clock: Callable returning the timestamp stored with each action
+            record_moves: Keep cursor moves in ``actions`` (they are always
+                tracked in ``position``)
+        """
+        self.screen_size = tuple(screen_size)
+        self.clock = clock
+        self.record_moves = record_moves
+        self.actions = []
+        self.position = (0.0, 0.0)
+        self.button_down = False
+
+    def _record(self, name, amount=0):
+        x, y = self.position
+        self.actions.append(Action(self.clock(), name, x, y, amount))
+
+    def size(self):
+        return self.screen_size
+
+    def move_to(self, x, y):
+        self.position = (float(x), float(y))
+        if self.record_moves:
+            self._record('move')
+
+    def click(self):
+        self._record('click')
+
+    def double_click(self):
+        self._record('double_click')
+
+    def right_click(self):
+        self._record('right_click')
+
+    def mouse_down(self):
+        self.button_down = True
+        self._record('mouse_down')
+
+    def mouse_up(self):
+        self.button_down = False
+        self._record('mouse_up')
+
+    def scroll(self, amount):
+        self._record('scroll', amount)
+
+    def hotkey(self, *keys):
+        self._record('hotkey', '+'.join(keys))
+
+    def write(self, text):
+        self._record('write', text)
+
+    def of_type(self, name):
+        """Return recorded actions with the given name."""
+        return [action for action in self.actions if action.name == name]
+
+    def clear(self):
+        self.actions = []
+
+
+class ThreadedBackend(OutputBackend):
+    """Queue actions for another backend and perform them on a worker thread."""
+
+    def __init__(self, output, max_queued=MAX_QUEUED_ACTIONS):
+        """
+        Args:
+            output: Backend that performs the actions
+            max_queued: Queued actions after which the caller blocks
+        """
+        self.output = output
+        self.fatal_errors = tuple(getattr(output, 'fatal_errors', ()))
+        self._size = tuple(output.size())
+        self._queue = queue.Queue(max_queued)
+        self._error = None           # Fatal error from the worker, raised in the caller
+        self._thread = threading.Thread(target=self._run, name='mouse-output', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while True:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            for i, item in enumerate(batch):
+                if item is None:
+                    # Account for anything queued behind the sentinel, so
+                    # wait() after close() cannot hang
+                    for _ in batch[i:]:
+                        self._queue.task_done()
+                    return
+                try:
+                    if self._error is not None:
+                        continue     # Stopped by a fatal error: drop the backlog
+                    name, args = item
+                    # Of consecutive moves only the newest one is performed
+                    if name == 'move_to' and i + 1 < len(batch) and batch[i + 1] is not None \
+                            and batch[i + 1][0] == 'move_to':
+                        continue
+                    getattr(self.output, name)(*args)
+                except self.fatal_errors as e:
+                    self._error = e
+                except Exception as e:
+                    # A failed action must not stop the worker
+                    logger.warning(f"Mouse action {item[0]} failed: {e}")
+                finally:
+                    self._queue.task_done()
+
+    def _check(self):
+        if self._error is not None:
+            raise self._error
+
+    def _put(self, name, *args):
+        self._check()
+        self._queue.put((name, args))
+
+    def size(self):
+        return self._size
+
+    def move_to(self, x, y):
+        self._put('move_to', x, y)
+
+    def click(self):
+        self._put('click')
+
+    def double_click(self):
+        self._put('double_click')
+
+    def right_click(self):
+        self._put('right_click')
+
+    def mouse_down(self):
+        self._put('mouse_down')
+
+    def mouse_up(self):
+        self._put('mouse_up')
+
+    def scroll(self, amount):
+        self._put('scroll', amount)
+
+    def hotkey(self, *keys):
+        self._put('hotkey', *keys)
+
+    def write(self, text):
+        self._put('write', text)
+
+    def wait(self):
+        """
+        Block until every queued action has been performed.
+
+        Raises:
+            The wrapped backend's fatal error (e.g. PyAutoGUI's fail-safe)
+        """
+        if self._thread.is_alive():      # Nothing is performed after close()
+            self._queue.join()
+        self._check()
+
+    def close(self):
+        """Perform the remaining actions and stop the worker."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
@@ -0,0 +1,295 @@
+"""
+Closed-loop performance governor for AI Virtual Mouse.
+
+One ``config.yaml`` has to run on old dual-core thin clients and on
+workstations. ``PerformanceGovernor`` measures what each frame costs and
+steps through a ladder of quality levels to hold a target:
+
+- ``fps`` mode: mean frame processing time against ``1 / target_fps``
+- ``cpu`` mode: process CPU time (all threads, percent of one core)
+  against ``target_cpu_percent``
+
+The ladder trades the cheapest-to-lose quality first: the preview is shown
+on every other frame, then the landmark overlay is dropped, then the
+detector input shrinks, then MediaPipe's lite model (``model_complexity``
+0) is used, then the input shrinks further.
+
+Hysteresis keeps it from oscillating:
+
+- the load is judged over a ``window`` of frames, not per frame, and the
+  window right after a change is discarded (new buffers, new model)
+- quality drops when the load exceeds the target, but only rises when the
+  load stays below ``upgrade_margin`` of the target for
+  ``upgrade_windows`` windows in a row
+- the load last measured at each level is remembered; a level that was
+  too expensive is not retried until that measurement is ``memory``
+  seconds old
+"""
+
+import logging
+import time
+from collections import namedtuple
+
+
+logger = logging.getLogger("performance_governor")
+
+MODES = ('fps', 'cpu')
+WIDTH_STEPS = (480, 320, 256, 192, 160)
+
+
+class QualityLevel(namedtuple('QualityLevel', 'inference_width model_complexity preview_interval draw_landmarks')):
+    """
+    Knob settings of one rung of the ladder.
+
+    inference_width: Detector input width (0 = full resolution)
+    model_complexity: MediaPipe solutions model (1 = full, 0 = lite)
+    preview_interval: Show the preview on every n-th frame
+    draw_landmarks: Draw the hand skeleton on the preview
+    """
+
+    def changes(self, other):
+        """Describe the knobs that differ from another level, e.g. ``inference_width 320 -> 256``."""
+        return ", ".join(f"{name} {old} -> {new}" for name, old, new in zip(self._fields, self, other)
+                         if old != new)
+
+
+def quality_levels(inference_width=320, model_complexity=1, min_width=160, detector_knobs=True):
+    """
+    Build the quality ladder below the configured settings.
+
+    Args:
+        inference_width: Configured detector input width (0 = full)
+        model_complexity: Configured model complexity (None for backends
+            without one)
+        min_width: Smallest detector input width to use
+        detector_knobs: False when the detector runs elsewhere (shared
+            ring producer), leaving only preview knobs
+
+    Returns:
+        List of QualityLevel, best first
+    """
+    level = QualityLevel(inference_width, model_complexity, 1, True)
+    levels = [level]
+
+    def step(**changes):
+        nonlocal level
+        level = level._replace(**changes)
+        levels.append(level)
+
+    step(preview_interval=2)
+    step(draw_landmarks=False)
+    if detector_knobs:
+        widths = [width for width in WIDTH_STEPS
+                  if width >= min_width and (not inference_width or width < inference_width)]
+        if widths:
+            step(inference_width=widths.pop(0))
+        if model_complexity:
+            step(model_complexity=0)
+        for width in widths:
+            step(inference_width=width)
+    step(preview_interval=3)
+    return levels
+
+
+class GovernorStats:
+    """Quality changes and time spent at each level."""
+
+    def __init__(self, levels):
+        self.downgrades = 0
+        self.upgrades = 0
+        self.windows = 0
+        self.last_load = None
+        self.seconds_at_level = [0.0] * levels
+
+    def as_dict(self):
+        return {
+            'downgrades': self.downgrades,
+            'upgrades': self.upgrades,
+            'windows': self.windows,
+            'last_load': self.last_load,
+            'seconds_at_level': self.seconds_at_level,
+        }
+
+
+class PerformanceGovernor:
+    """Adjust quality levels to hold a target frame rate or CPU budget."""
+
+    def __init__(self, levels, mode='fps', target_fps=30.0, target_cpu_percent=50.0, window=2.0,
+                 upgrade_margin=0.75, upgrade_windows=2, memory=60.0, enabled=True,
+                 cpu_clock=time.process_time):
+        """
+        Args:
+            levels: Quality ladder, best first (see ``quality_levels``)
+            mode: 'fps' (frame time) or 'cpu' (process CPU)
+            target_fps: Frame rate to hold in fps mode
+            target_cpu_percent: Process CPU to stay under in cpu mode
+                (percent of one core)
+            window: Seconds of frames per load measurement
+            upgrade_margin: Load (fraction of the target) that must not be
+                exceeded before quality is raised again
+            upgrade_windows: Consecutive calm windows before raising quality
+            memory: Seconds a level's measured load is trusted
+            enabled: False keeps the best level
+            cpu_clock: Process CPU time source in seconds
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown governor mode '{mode}' (choose from {', '.join(MODES)})")
+        self.levels = list(levels)
+        self.mode = mode
+        self.target_fps = target_fps
+        self.target_cpu_percent = target_cpu_percent
+        self.window = window
+        self.upgrade_margin = upgrade_margin
+        self.upgrade_windows = upgrade_windows
+        self.memory = memory
+        self.enabled = enabled
+        self.cpu_clock = cpu_clock
+        self.stats = GovernorStats(len(self.levels))
+
+        self.level = 0
+        self._measured = {}          # level -> (load, time measured)
+        self._window_start = None
+        self._cpu_start = None
+        self._cost = 0.0
+        self._frames = 0
+        self._calm = 0
+        self._settling = False       # Discard the window after a change
+        self._held = False           # Keep settling until end_settling()
+
+    @classmethod
+    def from_config(cls, config, detector_knobs=True):
+        """
+        Create from the ``governor`` section of a ConfigManager (or None).
+
+        Args:
+            config: ConfigManager or None for defaults (disabled)
+            detector_knobs: Whether this process runs the detector
+        """
+        settings = config.get_governor_settings() if config else {'enabled': False}
+        hand_settings = config.get_hand_detection_settings() if config else {}
+        # Only the solutions backend has a model complexity
+        solutions = hand_settings.get('backend', 'solutions') == 'solutions'
+        levels = quality_levels(
+            hand_settings.get('inference_width', 320),
+            hand_settings.get('model_complexity', 1) if solutions else None,
+            settings.get('min_inference_width', 160),
+            detector_knobs=detector_knobs,
+        )
+        return cls(
+            levels,
+            mode=settings.get('mode', 'fps'),
+            target_fps=settings.get('target_fps', 30),
+            target_cpu_percent=settings.get('target_cpu_percent', 50),
+            window=settings.get('window', 2.0),
+            upgrade_margin=settings.get('upgrade_margin', 0.75),
+            upgrade_windows=settings.get('upgrade_windows', 2),
+            memory=settings.get('memory', 60.0),
+            enabled=settings.get('enabled', False),
+        )
+
+    @property
+    def quality(self):
+        """Current QualityLevel."""
+        return self.levels[self.level]
+
+    def target(self):
+        """Human-readable target, e.g. ``30 fps``."""
+        return f"{self.target_fps:g} fps" if self.mode == 'fps' else f"{self.target_cpu_percent:g}% CPU"
+
+    def reset_window(self, now):
+        """Start a new measurement window, e.g. after idle or a reconnect."""
+        self._window_start = now
+        self._cpu_start = self.cpu_clock()
+        self._cost = 0.0
+        self._frames = 0
+
+    def hold_settling(self):
+        """Keep discarding windows after a change until ``end_settling``.
+
+        Use this while a change takes effect later than it is returned,
+        e.g. while a detector with the new model complexity loads.
+        """
+        self._settling = True
+        self._held = True
+
+    def end_settling(self, now):
+        """The change took effect: measure from ``now`` on."""
+        if self._held:
+            self._held = False
+            self._settling = False
+            self.reset_window(now)
+
+    def frame(self, cost, now):
+        """
+        Report one processed frame.
+
+        Only report frames that ran the full pipeline (not idle or
+        reconnecting frames), so the load reflects the quality knobs.
+
+        Args:
+            cost: Seconds the frame took, excluding waiting for the camera
+            now: Frame time in seconds
+
+        Returns:
+            The new QualityLevel if the level changed, else None
+        """
+        if not self.enabled:
+            return None
+        if self._window_start is None:
+            self.reset_window(now)
+        self._cost += cost
+        self._frames += 1
+        elapsed = now - self._window_start
+        if elapsed < self.window or not self._frames:
+            return None
+
+        if self.mode == 'fps':
+            load = self._cost / self._frames * self.target_fps
+        else:
+            load = (self.cpu_clock() - self._cpu_start) / elapsed * 100.0 / self.target_cpu_percent
+        self.stats.seconds_at_level[self.level] += elapsed
+        self.reset_window(now)
+        if self._settling:
+            self._settling = self._held
+            return None
+        return self._decide(load, now)
+
+    def _decide(self, load, now):
+        self.stats.windows += 1
+        self.stats.last_load = load
+        self._measured[self.level] = (load, now)
+
+        if load > 1.0:
+            self._calm = 0
+            if self.level + 1 < len(self.levels):
+                return self._change(self.level + 1, load)
+            return None
+        if load >= self.upgrade_margin or self.level == 0:
+            self._calm = 0
+            return None
+
+        self._calm += 1
+        if self._calm < self.upgrade_windows:
+            return None
+        known = self._measured.get(self.level - 1)
+        if known is not None and known[0] > 1.0 and now - known[1] < self.memory:
+            return None              # Was too expensive a moment ago
+        return self._change(self.level - 1, load)
+
+    def _change(self, level, load):
+        old = self.quality
+        if level > self.level:
+            self.stats.downgrades += 1
+        else:
+            self.stats.upgrades += 1
+        self.level = level
+        self._calm = 0
+        self._settling = True
+        logger.info(f"Quality level {self.levels.index(old)} -> {level} "
+                    f"(load {load:.0%} of {self.target()}): {old.changes(self.quality)}")
+        return self.quality
+
+    def as_dict(self):
+        """Current level, knob values and counters as a plain dictionary."""
+        return dict(self.stats.as_dict(), level=self.level, mode=self.mode, target=self.target(),
+                    quality=self.quality._asdict())
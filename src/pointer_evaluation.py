@@ -0,0 +1,176 @@
+"""
+Pointer mapping evaluation for AI Virtual Mouse.
+
+Replays landmark traces (recorded ``.trace`` files, or a synthetic pointing
+session with noise) through the gesture pipeline once per cursor mapping and
+reports:
+
+- pointing precision: RMS cursor movement per frame while the hand is held
+  still (landmark noise that reaches the screen; lower is better)
+- travel speed: mean and 95th percentile cursor speed while the hand moves
+- hand travel needed to cross the screen width
+
+Usage:
+    python src/pointer_evaluation.py                      # Synthetic session
+    python src/pointer_evaluation.py traces/*.trace       # Recorded traces
+    python src/pointer_evaluation.py --screen 3840 2160
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from gesture_pipeline import GesturePipeline, INDEX_TIP
+    from landmark_trace import read_trace, hand_present
+    from output_backend import RecordingBackend
+    from synthetic_hands import pointing_session
+    from tracking_continuity import TrackingContinuity
+except ImportError:
+    sys.path.append(str(Path(__file__).parent))
+    from gesture_pipeline import GesturePipeline, INDEX_TIP
+    from landmark_trace import read_trace, hand_present
+    from output_backend import RecordingBackend
+    from synthetic_hands import pointing_session
+    from tracking_continuity import TrackingContinuity
+
+
+# Mapping name -> pipeline settings overrides
+MAPPINGS = {
+    'absolute': {'cursor_mode': 'absolute'},
+    'relative-linear': {'cursor_mode': 'relative', 'acceleration_curve': 'linear'},
+    'relative-precision': {'cursor_mode': 'relative', 'acceleration_curve': 'precision'},
+    'relative-power': {'cursor_mode': 'relative', 'acceleration_curve': 'power'},
+}
+
+SPEED_WINDOW = 5          # Frames over which hand speed is measured
+STILL_SPEED = 60.0        # Hand speed (camera px/s) below which the hand is still
+MOVING_SPEED = 120.0      # Hand speed above which the hand is moving
+SETTLE_FRAMES = 15        # Still frames skipped while the smoothed cursor settles
+
+
+def load_sessions(trace_paths=None, noise_px=1.5, seed=0):
+    """
+    Load traces as (timestamps, landmarks, has_hand, width, height) tuples.
+
+    Without trace paths a synthetic pointing session is generated.
+    """
+    if not trace_paths:
+        trace = pointing_session(seed=seed).build(noise_px=noise_px, seed=seed)
+        return [(trace.timestamps, trace.landmarks, trace.has_hand, trace.width, trace.height)]
+
+    sessions = []
+    for path in trace_paths:
+        info, records = read_trace(path)
+        sessions.append((records['timestamp'], records['landmarks'], hand_present(records),
+                         info.width, info.height))
+    return sessions
+
+
+def hand_speed(timestamps, landmarks, width, height):
+    """Index fingertip speed in camera px/s, measured over SPEED_WINDOW frames."""
+    tip = landmarks[:, INDEX_TIP, :2] * (width, height)
+    speed = np.full(len(tip), np.nan)
+    if len(tip) > SPEED_WINDOW:
+        delta = tip[SPEED_WINDOW:] - tip[:-SPEED_WINDOW]
+        dt = timestamps[SPEED_WINDOW:] - timestamps[:-SPEED_WINDOW]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            speed[SPEED_WINDOW:] = np.hypot(delta[:, 0], delta[:, 1]) / dt
+    return speed
+
+
+def run_lengths(mask):
+    """Length of the current run of True values at every index."""
+    index = np.arange(len(mask))
+    last_false = np.maximum.accumulate(np.where(mask, -1, index))
+    return np.where(mask, index - last_false, 0)
+
+
+def replay_cursor(session, settings, screen_size):
+    """Replay one session; return the cursor position after every frame."""
+    timestamps, landmarks, has_hand, width, height = session
+    backend = RecordingBackend(screen_size, record_moves=False)
+    tracker = TrackingContinuity(GesturePipeline(backend, settings, screen_size))
+    cursor = np.full((len(timestamps), 2), np.nan)
+    for i, now in enumerate(timestamps):
+        tracker.update(landmarks[i] if has_hand[i] else None, width, height, float(now))
+        cursor[i] = backend.position
+    return cursor
+
+
+def evaluate(sessions, settings, screen_size=(1920, 1080)):
+    """
+    Evaluate one mapping over all sessions.
+
+    Returns:
+        Dictionary with ``precision_px``, ``travel_speed``, ``peak_speed``
+        and ``hand_px_per_screen``
+    """
+    still_steps, moving_speeds = [], []
+    hand_travel = cursor_travel = 0.0
+
+    for session in sessions:
+        timestamps, landmarks, has_hand, width, height = session
+        cursor = replay_cursor(session, settings, screen_size)
+        speed = hand_speed(timestamps, landmarks, width, height)
+
+        step = np.hypot(*np.diff(cursor, axis=0).T)
+        dt = np.diff(timestamps)
+        tracked = has_hand[1:] & has_hand[:-1]
+        # Still frames count once the smoothed cursor had time to settle
+        still = tracked & (speed[1:] < STILL_SPEED)
+        still &= run_lengths(still) > SETTLE_FRAMES
+        moving = tracked & (speed[1:] > MOVING_SPEED)
+
+        still_steps.append(step[still])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            moving_speeds.append(step[moving] / dt[moving])
+
+        tip = landmarks[:, INDEX_TIP, :2] * (width, height)
+        hand_travel += float(np.hypot(*np.diff(tip, axis=0).T)[moving].sum())
+        cursor_travel += float(step[moving].sum())
+
+    still_steps = np.concatenate(still_steps)
+    moving_speeds = np.concatenate(moving_speeds)
+    gain = cursor_travel / hand_travel if hand_travel else 0.0
+    return {
+        'precision_px': float(np.sqrt(np.mean(still_steps ** 2))) if len(still_steps) else None,
+        'travel_speed': float(moving_speeds.mean()) if len(moving_speeds) else None,
+        'peak_speed': float(np.percentile(moving_speeds, 95)) if len(moving_speeds) else None,
+        'hand_px_per_screen': screen_size[0] / gain if gain else None,
+    }
+
+
+def run_evaluation(sessions, mappings=None, screen_size=(1920, 1080)):
+    """Evaluate every mapping; returns mapping name -> result dictionary."""
+    return {
+        name: evaluate(sessions, settings, screen_size)
+        for name, settings in (mappings or MAPPINGS).items()
+    }
+
+
+def main():
+    """Run the evaluation from the command line."""
+    parser = argparse.ArgumentParser(description="Compare cursor mappings on replayed landmark traces")
+    parser.add_argument('traces', nargs='*', help="Trace files (default: synthetic pointing session)")
+    parser.add_argument('--screen', type=int, nargs=2, default=(1920, 1080), metavar=('W', 'H'),
+                        help="Screen size")
+    parser.add_argument('--noise', type=float, default=1.5, help="Landmark noise (px) for the synthetic session")
+    args = parser.parse_args()
+
+    sessions = load_sessions(args.traces, args.noise)
+    results = run_evaluation(sessions, screen_size=tuple(args.screen))
+
+    print(f"{'mapping':<20} {'precision':>10} {'speed':>10} {'peak':>10} {'hand px/screen':>15}")
+    for name, result in results.items():
+        def fmt(value, pattern):
+            return pattern.format(value) if value is not None else '-'
+        print(f"{name:<20} {fmt(result['precision_px'], '{:.2f}px'):>10} "
+              f"{fmt(result['travel_speed'], '{:.0f}/s'):>10} {fmt(result['peak_speed'], '{:.0f}/s'):>10} "
+              f"{fmt(result['hand_px_per_screen'], '{:.0f}'):>15}")
+
+
+if __name__ == "__main__":
+    main()
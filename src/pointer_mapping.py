@@ -0,0 +1,232 @@
+"""
+Pointer mapping for AI Virtual Mouse.
+
+Turns the index fingertip position in the camera frame into a cursor target
+on the screen. Two modes are available:
+
+- ``absolute``: the active area (frame minus ``frame_reduction``) is
+  stretched over the whole screen, as before. Simple, but on large screens
+  one pixel of landmark noise becomes several screen pixels.
+- ``relative``: the hand moves the cursor like a finger on a trackpad.
+  Each frame's fingertip movement is multiplied by a gain that depends on
+  the hand speed (pointer acceleration): slow movements are precise, fast
+  movements cover the screen. Curling the index finger engages the clutch,
+  so the hand can be repositioned without moving the cursor.
+
+Acceleration curves are precomputed into lookup tables; per frame the gain is
+a single table lookup.
+"""
+
+import numpy as np
+
+
+# Landmarks used for the clutch check
+WRIST = 0
+INDEX_PIP = 6
+INDEX_TIP = 8
+
+LUT_SIZE = 1024           # Entries in an acceleration lookup table
+LUT_MAX_SPEED = 3000.0    # Hand speed (camera px/s) covered by the table
+REFERENCE_WIDTH = 1920    # Screen width the curve gains are defined for
+MAX_FRAME_GAP = 0.25      # Longer gaps restart relative tracking instead of moving
+
+
+def power_curve(exponent=1.5, knee=200.0, base=1.0, limit=10.0, steps=64):
+    """Control points for a gain of ``base * (1 + (speed / knee) ** exponent)``, capped at ``limit``."""
+    speeds = np.linspace(0.0, LUT_MAX_SPEED, steps)
+    gains = np.minimum(base * (1.0 + (speeds / knee) ** exponent), limit)
+    return tuple(zip(speeds.tolist(), gains.tolist()))
+
+
+# Acceleration curves: (hand speed in camera px/s, gain in screen px per
+# camera px) control points, for a 1920 px wide screen
+CURVES = {
+    'linear': ((0, 4.0), (LUT_MAX_SPEED, 4.0)),
+    'precision': ((0, 0.6), (100, 1.2), (300, 4.0), (800, 8.0), (1500, 9.0)),
+    'power': power_curve(),
+}
+
+
+class AccelerationCurve:
+    """Hand speed to gain lookup table."""
+
+    def __init__(self, points, gain=1.0, size=LUT_SIZE, max_speed=LUT_MAX_SPEED):
+        """
+        Args:
+            points: (speed, gain) control points, linearly interpolated
+            gain: Multiplier applied to the whole curve
+            size: Number of table entries
+            max_speed: Highest speed in the table; faster movements use the
+                last entry
+        """
+        points = np.asarray(points, dtype=np.float64)
+        speeds = np.linspace(0.0, max_speed, size)
+        self.table = (np.interp(speeds, points[:, 0], points[:, 1]) * gain).tolist()
+        self.size = size
+        self.scale = (size - 1) / max_speed
+
+    @classmethod
+    def named(cls, name, gain=1.0):
+        """Create one of the curves in ``CURVES``."""
+        if name not in CURVES:
+            raise ValueError(f"Unknown acceleration curve '{name}' (choose from {', '.join(CURVES)})")
+        return cls(CURVES[name], gain)
+
+    def __call__(self, speed):
+        """Return the gain for a hand speed in camera px/s."""
+        index = int(speed * self.scale)
+        return self.table[index if index < self.size else -1]
+
+
+class AbsoluteMapper:
+    """Map the active area of the frame linearly onto the screen."""
+
+    mode = 'absolute'
+
+    def __init__(self, screen_size, frame_reduction=100):
+        self.frame_reduction = frame_reduction
+        self.set_region(0, 0, *screen_size)
+
+    def set_region(self, x, y, width, height, scale=1.0):
+        """
+        Target a rectangle of the desktop (e.g. one monitor).
+
+        Args:
+            x, y: Top-left corner in desktop pixels
+            width, height: Size in desktop pixels
+            scale: DPI scale of the region (unused in absolute mode)
+        """
+        self.left, self.top = x, y
+        self.screen_width, self.screen_height = width, height
+
+    def reset(self):
+        pass
+
+    def lift(self):
+        pass
+
+    def map(self, x, y, w, h, now, clutch=False):
+        """
+        Args:
+            x, y: Index fingertip in frame pixels
+            w, h: Frame size
+            now: Frame timestamp (unused)
+            clutch: Ignored in absolute mode
+
+        Returns:
+            Cursor target (x, y) in screen pixels
+        """
+        r = self.frame_reduction
+        x3 = np.interp(x, (r, w - r), (self.left, self.left + self.screen_width))
+        y3 = np.interp(y, (r, h - r), (self.top, self.top + self.screen_height))
+        return x3, y3
+
+
+class RelativeMapper:
+    """Trackpad-like mapping with pointer acceleration and a clutch."""
+
+    mode = 'relative'
+
+    def __init__(self, screen_size, curve=None, start=None):
+        """
+        Args:
+            screen_size: (width, height) of the screen
+            curve: AccelerationCurve (default: 'precision' scaled to the screen)
+            start: Initial cursor position (default: screen center)
+        """
+        self.curve = curve or AccelerationCurve.named(
+            'precision', gain=screen_size[0] / REFERENCE_WIDTH)
+        self._start = start
+        self.left, self.top = 0, 0
+        self.screen_width, self.screen_height = screen_size
+        self.scale = 1.0
+        self.reset()
+
+    def set_region(self, x, y, width, height, scale=1.0):
+        """
+        Confine the cursor to a rectangle of the desktop (e.g. one monitor).
+
+        Args:
+            x, y: Top-left corner in desktop pixels
+            width, height: Size in desktop pixels
+            scale: DPI scale of the region; the gain is multiplied by it so
+                a hand movement covers the same physical distance on every
+                monitor
+        """
+        self.left, self.top = x, y
+        self.screen_width, self.screen_height = width, height
+        self.scale = scale
+        self._clamp()
+
+    def reset(self):
+        if self._start is None:
+            self.x = self.left + self.screen_width / 2
+            self.y = self.top + self.screen_height / 2
+        else:
+            self.x, self.y = self._start
+        self._last = None     # (x, y, time) of the last fingertip sample
+
+    def _clamp(self):
+        self.x = min(max(self.x, self.left), self.left + self.screen_width - 1)
+        self.y = min(max(self.y, self.top), self.top + self.screen_height - 1)
+
+    def lift(self):
+        """Forget the last sample, like lifting a finger off the trackpad."""
+        self._last = None
+
+    def map(self, x, y, w, h, now, clutch=False):
+        """
+        Args:
+            x, y: Index fingertip in frame pixels
+            w, h: Frame size (unused)
+            now: Frame timestamp in seconds
+            clutch: True while the hand should move without the cursor
+
+        Returns:
+            Cursor target (x, y) in screen pixels
+        """
+        last = self._last
+        self._last = (x, y, now)
+        if clutch or last is None:
+            return self.x, self.y
+
+        dt = now - last[2]
+        if dt <= 0 or dt > MAX_FRAME_GAP:
+            return self.x, self.y
+
+        dx = x - last[0]
+        dy = y - last[1]
+        gain = self.curve((dx * dx + dy * dy) ** 0.5 / dt) * self.scale
+        self.x += dx * gain
+        self.y += dy * gain
+        self._clamp()
+        return self.x, self.y
+
+
+def is_clutch_pose(landmarks):
+    """True when the index finger is curled (tip closer to the wrist than its middle joint)."""
+    tip = landmarks[INDEX_TIP, :2] - landmarks[WRIST, :2]
+    pip = landmarks[INDEX_PIP, :2] - landmarks[WRIST, :2]
+    return float(tip @ tip) < float(pip @ pip)
+
+
+def create_mapper(settings, screen_size):
+    """
+    Create the mapper selected by pipeline settings.
+
+    Args:
+        settings: Dictionary with ``cursor_mode``, ``frame_reduction``,
+            ``acceleration_curve`` and ``pointer_gain``
+        screen_size: (width, height) of the screen
+
+    Returns:
+        AbsoluteMapper or RelativeMapper
+    """
+    mode = settings.get('cursor_mode', 'absolute')
+    if mode == 'absolute':
+        return AbsoluteMapper(screen_size, settings.get('frame_reduction', 100))
+    if mode == 'relative':
+        gain = settings.get('pointer_gain', 1.0) * screen_size[0] / REFERENCE_WIDTH
+        curve = AccelerationCurve.named(settings.get('acceleration_curve', 'precision'), gain)
+        return RelativeMapper(screen_size, curve)
+    raise ValueError(f"Unknown cursor mode '{mode}' (absolute or relative)")
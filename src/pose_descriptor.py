@@ -0,0 +1,196 @@
+"""
+Hand pose descriptor for AI Virtual Mouse.
+
+Describes a (21, 3) landmark array - or a whole (N, 21, 3) trace at once -
+with joint angles instead of pixel distances, so poses are recognized the
+same way whatever the distance between hand and camera:
+
+- flexion: bend angle in degrees at the three joints of every finger
+  (thumb: CMC, MCP, IP; fingers: MCP, PIP, DIP), 0 = straight
+- curl: summed flexion per finger (the thumb CMC is left out, as the
+  wrist-to-CMC segment is not a finger bone)
+- extended / curled: curl below / above per-finger thresholds; a finger
+  in between is neither
+- palm_normal: unit normal of the wrist/index MCP/pinky MCP triangle
+- palm_angle: in-image rotation of the wrist -> middle MCP direction in
+  degrees, 0 = fingers up, positive = leaning towards the image right
+
+Everything is computed with a fixed set of broadcast NumPy operations over
+the leading axes: tens of microseconds for a single frame, and a few
+microseconds per frame when a whole trace is described in one call.
+
+Usage (benchmark on recorded traces):
+    python src/pose_descriptor.py traces/session.trace
+"""
+
+import argparse
+import sys
+import time
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+
+FINGER_NAMES = ('thumb', 'index', 'middle', 'ring', 'pinky')
+
+# Wrist followed by the four landmarks of each finger, base to tip
+FINGER_CHAINS = np.array([
+    (0, 1, 2, 3, 4),
+    (0, 5, 6, 7, 8),
+    (0, 9, 10, 11, 12),
+    (0, 13, 14, 15, 16),
+    (0, 17, 18, 19, 20),
+])
+
+# Joints summed into a finger's curl (thumb CMC excluded)
+CURL_JOINTS = np.array([
+    (0, 1, 1),
+    (1, 1, 1),
+    (1, 1, 1),
+    (1, 1, 1),
+    (1, 1, 1),
+], dtype=np.float64)
+
+# Curl thresholds in degrees: thumb first, then index..pinky
+EXTENDED_BELOW = np.array((40.0, 60.0, 60.0, 60.0, 60.0))
+CURLED_ABOVE = np.array((80.0, 120.0, 120.0, 120.0, 120.0))
+
+# Component orders for the cross product (np.cross is slow on single vectors)
+_YZX = np.array((1, 2, 0))
+_ZXY = np.array((2, 0, 1))
+
+HandPose = namedtuple('HandPose', [
+    'flexion',      # (..., 5, 3) joint angles in degrees
+    'curl',         # (..., 5) summed flexion in degrees
+    'extended',     # (..., 5) bool
+    'curled',       # (..., 5) bool
+    'palm_normal',  # (..., 3) unit vector
+    'palm_angle',   # (...) degrees
+])
+
+
+def describe(landmarks, w=1.0, h=1.0, extended_below=EXTENDED_BELOW, curled_above=CURLED_ABOVE):
+    """
+    Describe one hand pose or a batch of them.
+
+    Args:
+        landmarks: (21, 3) or (N, 21, 3) normalized landmark array
+        w: Frame width in pixels (angles need square pixels)
+        h: Frame height in pixels
+        extended_below: Per-finger curl below which a finger is extended
+        curled_above: Per-finger curl above which a finger is curled
+
+    Returns:
+        HandPose with arrays shaped after the leading axes of ``landmarks``
+    """
+    points = np.asarray(landmarks, dtype=np.float64) * (w, h, w)
+
+    # Bone vectors along each finger and the angle between consecutive bones
+    chains = points[..., FINGER_CHAINS, :]
+    bones = chains[..., 1:, :] - chains[..., :-1, :]
+    length2 = (bones * bones).sum(axis=-1)
+    dot = (bones[..., :-1, :] * bones[..., 1:, :]).sum(axis=-1)
+    cosine = dot / np.sqrt(np.maximum(length2[..., :-1] * length2[..., 1:], 1e-24))
+    flexion = np.degrees(np.arccos(np.maximum(np.minimum(cosine, 1.0), -1.0)))
+
+    curl = (flexion * CURL_JOINTS).sum(axis=-1)
+
+    # The first bones of the index and pinky chains are the palm edges
+    # from the wrist to their MCP joints; the middle one points "up"
+    a = bones[..., 1, 0, :]
+    b = bones[..., 4, 0, :]
+    normal = a[..., _YZX] * b[..., _ZXY] - a[..., _ZXY] * b[..., _YZX]
+    normal /= np.sqrt(np.maximum((normal * normal).sum(axis=-1, keepdims=True), 1e-24))
+    up = bones[..., 2, 0, :]
+    palm_angle = np.degrees(np.arctan2(up[..., 0], -up[..., 1]))
+
+    return HandPose(flexion, curl, curl < extended_below, curl > curled_above, normal, palm_angle)
+
+
+def is_fist(pose):
+    """Fist: index to pinky curled and the thumb not stretched out."""
+    return np.all(pose.curled[..., 1:], axis=-1) & ~pose.extended[..., 0]
+
+
+def extended_count(pose):
+    """Number of extended fingers, thumb included."""
+    return np.count_nonzero(pose.extended, axis=-1)
+
+
+def benchmark_landmarks(landmarks, w, h, repeats=3):
+    """
+    Time the descriptor on a batch of landmark arrays.
+
+    Args:
+        landmarks: (N, 21, 3) array of frames with a hand
+        w: Frame width in pixels
+        h: Frame height in pixels
+        repeats: Timing repeats (the best run is reported)
+
+    Returns:
+        Dictionary with per-frame and batched microseconds per frame, and
+        the fraction of frames each finger is extended / a fist is shown
+    """
+    try:
+        from gesture_pipeline import FINGERTIPS, FIST_THRESHOLD, WRIST
+    except ImportError:
+        sys.path.append(str(Path(__file__).parent))
+        from gesture_pipeline import FINGERTIPS, FIST_THRESHOLD, WRIST
+
+    count = len(landmarks)
+    per_frame = batched = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for frame in landmarks:
+            describe(frame, w, h)
+        per_frame = min(per_frame, time.perf_counter() - start)
+        start = time.perf_counter()
+        pose = describe(landmarks, w, h)
+        batched = min(batched, time.perf_counter() - start)
+
+    # Previous rule: every fingertip within a fixed pixel distance of the wrist
+    delta = (landmarks[:, FINGERTIPS, :2] - landmarks[:, None, WRIST, :2]) * (w, h)
+    distance_fist = np.all(np.hypot(delta[..., 0], delta[..., 1]) <= FIST_THRESHOLD, axis=-1)
+    fist = is_fist(pose)
+
+    return {
+        'frames': count,
+        'us_per_frame': per_frame / count * 1e6,
+        'us_per_frame_batched': batched / count * 1e6,
+        'extended': {name: float(pose.extended[:, i].mean()) for i, name in enumerate(FINGER_NAMES)},
+        'fist_rate': float(fist.mean()),
+        'distance_fist_rate': float(distance_fist.mean()),
+        'fist_disagreement': float((fist != distance_fist).mean()),
+    }
+
+
+def main():
+    """Benchmark the descriptor on recorded landmark traces."""
+    try:
+        from landmark_trace import hand_present, read_trace
+    except ImportError:
+        sys.path.append(str(Path(__file__).parent))
+        from landmark_trace import hand_present, read_trace
+
+    parser = argparse.ArgumentParser(description="Benchmark the hand pose descriptor on landmark traces")
+    parser.add_argument('traces', nargs='+', help="Trace files")
+    parser.add_argument('--repeats', type=int, default=3, help="Timing repeats")
+    args = parser.parse_args()
+
+    for path in args.traces:
+        info, records = read_trace(path)
+        landmarks = np.asarray(records['landmarks'][hand_present(records)], dtype=np.float32)
+        if len(landmarks) == 0:
+            print(f"{path}: no frames with a hand")
+            continue
+        r = benchmark_landmarks(landmarks, info.width, info.height, args.repeats)
+        print(f"\n{path}: {r['frames']} frames")
+        print(f"  per frame {r['us_per_frame']:.1f} us, batched {r['us_per_frame_batched']:.2f} us/frame")
+        print("  extended: " + ", ".join(f"{name} {rate:.0%}" for name, rate in r['extended'].items()))
+        print(f"  fist {r['fist_rate']:.1%} (distance rule {r['distance_fist_rate']:.1%}, "
+              f"disagree on {r['fist_disagreement']:.1%} of frames)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Deterministic replay of recorded landmark traces for AI Virtual Mouse.
+
+A trace recorded from the camera loop (see ``landmark_trace.py``) is fed
+frame by frame through a fresh gesture pipeline and tracking continuity
+layer. The pipeline reads a ``SimulatedClock`` that is set from each
+record's timestamp, so every timing-based gesture sees exactly the
+intervals of the live session while the replay runs as fast as the CPU
+allows. The resulting actions are hashed; two replays of the same trace
+with the same settings must produce the same digest.
+
+Usage:
+    python src/session_replay.py session.trace
+    python src/session_replay.py session.trace --config config.yaml
+"""
+
+import argparse
+import hashlib
+import struct
+import sys
+import time
+from pathlib import Path
+
+try:
+    from clock import SimulatedClock
+    from gesture_pipeline import GesturePipeline
+    from landmark_trace import hand_present, read_trace
+    from output_backend import RecordingBackend
+    from tracking_continuity import TrackingContinuity
+except ImportError:
+    sys.path.append(str(Path(__file__).parent))
+    from clock import SimulatedClock
+    from gesture_pipeline import GesturePipeline
+    from landmark_trace import hand_present, read_trace
+    from output_backend import RecordingBackend
+    from tracking_continuity import TrackingContinuity
+
+
+SCREEN_SIZE = (1920, 1080)
+
+
+def replay_records(records, width, height, settings=None, screen_size=SCREEN_SIZE,
+                   config=None, record_moves=True):
+    """
+    Replay trace records through the gesture pipeline on a simulated clock.
+
+    Args:
+        records: Structured array from ``read_trace``
+        width: Frame width the landmarks were captured at
+        height: Frame height the landmarks were captured at
+        settings: Optional pipeline settings overrides (ignored with ``config``)
+        screen_size: Screen size reported by the recording backend
+        config: Optional ConfigManager for pipeline and tracking settings
+        record_moves: Also record cursor moves
+
+    Returns:
+        List of recorded Action tuples, timed with the trace timestamps
+    """
+    clock = SimulatedClock(records['timestamp'][0] if len(records) else 0.0)
+    backend = RecordingBackend(screen_size, clock=clock, record_moves=record_moves)
+    if config is not None:
+        pipeline = GesturePipeline.from_config(config, backend, screen_size, clock=clock)
+    else:
+        pipeline = GesturePipeline(backend, settings, screen_size, clock=clock)
+    tracker = TrackingContinuity.from_config(pipeline, config)
+
+    timestamps = records['timestamp']
+    landmarks = records['landmarks']
+    present = hand_present(records)
+    for i in range(len(records)):
+        clock.set(timestamps[i])
+        tracker.update(landmarks[i] if present[i] else None, width, height)
+
+    return backend.actions
+
+
+def action_digest(actions):
+    """
+    SHA-256 over the recorded actions.
+
+    Times and positions are hashed as their exact binary values, so any
+    difference in when or where an action happened changes the digest.
+
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.sha256()
+    for action in actions:
+        amount = action.amount if isinstance(action.amount, str) else repr(action.amount)
+        digest.update(struct.pack('<d', action.time))
+        digest.update(f"{action.name}|{action.x}|{action.y}|{amount}\n".encode())
+    return digest.hexdigest()
+
+
+def replay_file(path, config=None, screen_size=SCREEN_SIZE):
+    """
+    Replay one trace file.
+
+    Returns:
+        Dictionary with frames, actions, session and replay seconds, speedup
+        and digest
+    """
+    info, records = read_trace(path)
+    start = time.perf_counter()
+    actions = replay_records(records, info.width, info.height, screen_size=screen_size, config=config)
+    replay_seconds = time.perf_counter() - start
+
+    session_seconds = float(records['timestamp'][-1] - records['timestamp'][0]) if len(records) > 1 else 0.0
+    return {
+        'frames': len(records),
+        'actions': len(actions),
+        'gestures': sum(1 for action in actions if action.name != 'move'),
+        'session_seconds': session_seconds,
+        'replay_seconds': replay_seconds,
+        'speedup': session_seconds / replay_seconds if replay_seconds > 0 else 0.0,
+        'digest': action_digest(actions),
+    }
+
+
+def main():
+    """Replay recorded traces from the command line."""
+    parser = argparse.ArgumentParser(description="Deterministic replay of landmark traces")
+    parser.add_argument('traces', nargs='+', help="Trace files recorded with landmark_trace.py")
+    parser.add_argument('--config', default=None, help="Config file for the pipeline settings")
+    args = parser.parse_args()
+
+    config = None
+    if args.config:
+        try:
+            from config_manager import ConfigManager
+        except ImportError:
+            sys.path.append(str(Path(__file__).parent))
+            from config_manager import ConfigManager
+        config = ConfigManager(args.config)
+
+    for path in args.traces:
+        result = replay_file(path, config)
+        print(f"{path}: {result['frames']} frames, {result['actions']} actions "
+              f"({result['gestures']} gestures)")
+        print(f"  session {result['session_seconds']:.1f} s replayed in "
+              f"{result['replay_seconds']:.2f} s ({result['speedup']:.0f}x)")
+        print(f"  digest {result['digest']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
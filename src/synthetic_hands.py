@@ -0,0 +1,367 @@
+"""
+Synthetic hand motion generator for AI Virtual Mouse.
+
+Builds parametric landmark sequences (moves, pinches, holds, drags, scroll
+swipes, fists, thumbs-up, two-finger swipes) with optional noise and
+tracking dropouts. Every gesture is labelled with its ground-truth timing
+and target position, so the gesture pipeline can be scored without a
+camera.
+
+Poses are defined as pixel offsets from the wrist for a 640x480 frame and
+scaled by ``hand_scale``. The cursor position of a sequence is where the
+index fingertip would be in the open pose, so pinching does not move the
+ground-truth target even when the fingertip itself drifts.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+
+# (x, y) offsets from the wrist in pixels, open hand pointing up
+OPEN_HAND = np.array([
+    (0, 0),
+    (-32, -20), (-56, -40), (-72, -64), (-84, -88),       # Thumb
+    (-28, -88), (-32, -128), (-34, -156), (-36, -180),    # Index
+    (0, -92), (0, -136), (0, -168), (0, -196),            # Middle
+    (26, -84), (36, -124), (44, -152), (52, -176),        # Ring
+    (44, -72), (56, -104), (62, -124), (68, -144),        # Pinky
+], dtype=np.float64)
+
+
+def _pose(changes):
+    offsets = OPEN_HAND.copy()
+    for index, point in changes.items():
+        offsets[index] = point
+    return offsets
+
+
+POSES = {
+    'open': OPEN_HAND.copy(),
+    # Thumb and index tips meet a little below the open index tip
+    'left_pinch': _pose({3: (-60, -120), 4: (-44, -150), 7: (-38, -140), 8: (-40, -154)}),
+    # Middle finger folds down onto the thumb tip
+    'right_pinch': _pose({10: (-20, -130), 11: (-50, -118), 12: (-78, -92)}),
+    # Ring fingertip moves next to the middle fingertip
+    'scroll': _pose({15: (28, -164), 16: (10, -190)}),
+    # All fingers curled into the palm, thumb across them
+    'fist': _pose({
+        3: (-40, -66), 4: (-10, -70),
+        6: (-32, -100), 7: (-30, -80), 8: (-20, -60),
+        10: (0, -104), 11: (0, -84), 12: (0, -64),
+        14: (32, -100), 15: (26, -80), 16: (18, -60),
+        18: (52, -84), 19: (46, -68), 20: (36, -52),
+    }),
+    # Fingers curled as in the fist, thumb stretched upwards
+    'thumbs_up': _pose({
+        2: (-50, -50), 3: (-60, -85), 4: (-66, -118),
+        6: (-32, -100), 7: (-30, -80), 8: (-20, -60),
+        10: (0, -104), 11: (0, -84), 12: (0, -64),
+        14: (32, -100), 15: (26, -80), 16: (18, -60),
+        18: (52, -84), 19: (46, -68), 20: (36, -52),
+    }),
+    # Index and middle finger extended, ring, pinky and thumb curled
+    'two_finger': _pose({
+        3: (-40, -66), 4: (-10, -70),
+        14: (32, -100), 15: (26, -80), 16: (18, -60),
+        18: (52, -84), 19: (46, -68), 20: (36, -52),
+    }),
+}
+
+Label = namedtuple('Label', ['kind', 'start', 'end', 'x', 'y'])
+
+SyntheticTrace = namedtuple('SyntheticTrace', [
+    'timestamps',   # (N,) seconds
+    'landmarks',    # (N, 21, 3) normalized, float32
+    'has_hand',     # (N,) bool, False where tracking dropped out
+    'target',       # (N, 2) normalized ground-truth cursor (noise free)
+    'pose',         # (N,) pose name per frame
+    'labels',       # list of Label
+    'width',
+    'height',
+    'fps',
+])
+
+
+class SyntheticSequence:
+    """Script a hand motion frame by frame and render it to landmarks."""
+
+    def __init__(self, fps=30, width=640, height=480, hand_scale=0.75,
+                 start=(0.5, 0.5), transition=0.1):
+        """
+        Args:
+            fps: Frame rate of the generated sequence
+            width: Frame width in pixels
+            height: Frame height in pixels
+            hand_scale: Hand size relative to the 200px reference pose
+            start: Initial normalized cursor position
+            transition: Seconds a pose change takes
+        """
+        self.fps = fps
+        self.width = width
+        self.height = height
+        self.hand_scale = hand_scale
+        self.transition = transition
+
+        self._position = np.array(start, dtype=np.float64)
+        self._pose_name = 'open'
+        self._offsets = POSES['open'].copy()
+        self._frames = []      # (position, offsets, pose name, visible)
+        self.labels = []
+
+    @property
+    def time(self):
+        """Timestamp of the next frame."""
+        return len(self._frames) / self.fps
+
+    def _frame_count(self, duration):
+        return max(1, int(round(duration * self.fps)))
+
+    def _emit(self, visible=True):
+        self._frames.append((self._position.copy(), self._offsets.copy(), self._pose_name, visible))
+
+    def hold(self, duration):
+        """Keep the current pose and position."""
+        for _ in range(self._frame_count(duration)):
+            self._emit()
+        return self
+
+    def move(self, to, duration):
+        """Move the cursor linearly to a normalized position."""
+        start = self._position.copy()
+        target = np.array(to, dtype=np.float64)
+        steps = self._frame_count(duration)
+        for i in range(1, steps + 1):
+            self._position = start + (target - start) * (i / steps)
+            self._emit()
+        return self
+
+    def set_pose(self, name, duration=None):
+        """Blend into another pose over ``duration`` (default: transition)."""
+        start = self._offsets.copy()
+        target = POSES[name]
+        steps = self._frame_count(self.transition if duration is None else duration)
+        for i in range(1, steps + 1):
+            self._offsets = start + (target - start) * (i / steps)
+            self._pose_name = name if i == steps else self._pose_name
+            self._emit()
+        return self
+
+    def gap(self, duration):
+        """Lose tracking for ``duration`` seconds (hand keeps still)."""
+        for _ in range(self._frame_count(duration)):
+            self._emit(visible=False)
+        return self
+
+    def _label(self, kind, start, end):
+        self.labels.append(Label(kind, start, end, float(self._position[0]), float(self._position[1])))
+
+    # --- Labelled gestures -------------------------------------------------
+
+    def click(self, hold=0.15):
+        """Quick index+thumb pinch."""
+        self.set_pose('left_pinch')
+        start = self.time
+        self.hold(hold)
+        self._label('click', start, self.time)
+        return self.set_pose('open')
+
+    def near_click(self, closeness=0.6, hold=0.1):
+        """Start a pinch but open again before the fingers meet (no click)."""
+        start = self.time
+        first = self._offsets.copy()
+        target = first + (POSES['left_pinch'] - first) * closeness
+        steps = self._frame_count(self.transition * closeness)
+        for i in range(1, steps + 1):
+            self._offsets = first + (target - first) * (i / steps)
+            self._emit()
+        self.hold(hold)
+        self._label('near_click', start, self.time)
+        return self.set_pose('open')
+
+    def double_click(self, hold=0.08, gap=0.08):
+        """Two quick pinches within the double-click window."""
+        self.set_pose('left_pinch', duration=0.05)
+        start = self.time
+        self.hold(hold)
+        self.set_pose('open', duration=0.05)
+        self.hold(gap)
+        self.set_pose('left_pinch', duration=0.05)
+        self.hold(hold)
+        self._label('double_click', start, self.time)
+        return self.set_pose('open', duration=0.05)
+
+    def right_click(self, hold=0.15):
+        """Quick middle+thumb pinch."""
+        self.set_pose('right_pinch')
+        start = self.time
+        self.hold(hold)
+        self._label('right_click', start, self.time)
+        return self.set_pose('open')
+
+    def press_and_hold(self, duration=1.6):
+        """Pinch held in place long enough to start a drag."""
+        self.set_pose('left_pinch')
+        start = self.time
+        self.hold(duration)
+        self._label('hold', start, self.time)
+        return self.set_pose('open')
+
+    def drag(self, to, hold=1.2, duration=0.8):
+        """Pinch, wait for the drag to engage, move and release."""
+        self.set_pose('left_pinch')
+        start = self.time
+        self.hold(hold)
+        self.move(to, duration)
+        self.hold(0.1)
+        self._label('drag', start, self.time)
+        return self.set_pose('open')
+
+    def scroll(self, direction='up', distance=0.35, duration=0.2):
+        """Scroll pose flicked vertically; ``up`` moves the hand up."""
+        self.set_pose('scroll')
+        start = self.time
+        sign = -1 if direction == 'up' else 1
+        self.move((self._position[0], self._position[1] + sign * distance), duration)
+        self._label(f'scroll_{direction}', start, self.time)
+        return self.set_pose('open')
+
+    def fist(self, hold=2.4):
+        """Hold a fist long enough to toggle pause."""
+        self.set_pose('fist')
+        start = self.time
+        self.hold(hold)
+        self._label('fist', start, self.time)
+        return self.set_pose('open')
+
+    def thumbs_up(self, hold=0.8):
+        """Hold a thumbs-up."""
+        self.set_pose('thumbs_up')
+        start = self.time
+        self.hold(hold)
+        self._label('thumbs_up', start, self.time)
+        return self.set_pose('open')
+
+    def swipe(self, direction='left', distance=0.35, duration=0.25):
+        """Two-finger swipe sideways; ``left`` moves the hand to the frame's left."""
+        self.set_pose('two_finger')
+        start = self.time
+        sign = -1 if direction == 'left' else 1
+        self.move((self._position[0] + sign * distance, self._position[1]), duration)
+        self._label(f'swipe_{direction}', start, self.time)
+        return self.set_pose('open')
+
+    def palm_swipe(self, direction='left', distance=0.4, duration=0.15):
+        """Fast sideways sweep of the open hand; ``left`` moves it to the frame's left."""
+        start = self.time
+        sign = -1 if direction == 'left' else 1
+        self.move((self._position[0] + sign * distance, self._position[1]), duration)
+        self._label(f'palm_swipe_{direction}', start, self.time)
+        return self
+
+    def flick(self, direction='up', distance=0.3, duration=0.1):
+        """Short, fast vertical flick of the open hand; ``up`` moves it up."""
+        start = self.time
+        sign = -1 if direction == 'up' else 1
+        self.move((self._position[0], self._position[1] + sign * distance), duration)
+        self._label(f'flick_{direction}', start, self.time)
+        return self
+
+    # --- Rendering ---------------------------------------------------------
+
+    def build(self, noise_px=0.0, dropout=0.0, gap_rate=0.0, max_gap=0.3, seed=0):
+        """
+        Render the scripted motion.
+
+        Args:
+            noise_px: Standard deviation of per-landmark jitter in pixels
+            dropout: Probability that tracking drops any single frame
+            gap_rate: Probability per frame that a multi-frame gap starts
+            max_gap: Longest random gap in seconds
+            seed: Random seed for noise and dropouts
+
+        Returns:
+            SyntheticTrace
+        """
+        rng = np.random.default_rng(seed)
+        count = len(self._frames)
+        size = np.array([self.width, self.height], dtype=np.float64)
+        anchor = OPEN_HAND[8] * self.hand_scale
+
+        landmarks = np.zeros((count, 21, 3), dtype=np.float32)
+        target = np.zeros((count, 2), dtype=np.float64)
+        has_hand = np.zeros(count, dtype=bool)
+        poses = []
+
+        for i, (position, offsets, pose_name, visible) in enumerate(self._frames):
+            wrist = position * size - anchor
+            pixels = wrist + offsets * self.hand_scale
+            if noise_px:
+                pixels = pixels + rng.normal(0, noise_px, pixels.shape)
+            landmarks[i, :, :2] = pixels / size
+            target[i] = position
+            has_hand[i] = visible
+            poses.append(pose_name)
+
+        if dropout:
+            has_hand &= rng.random(count) >= dropout
+        if gap_rate:
+            longest = max(2, int(round(max_gap * self.fps)))
+            for start in np.flatnonzero(rng.random(count) < gap_rate):
+                has_hand[start:start + rng.integers(2, longest + 1)] = False
+
+        return SyntheticTrace(
+            timestamps=np.arange(count) / self.fps,
+            landmarks=landmarks,
+            has_hand=has_hand,
+            target=target,
+            pose=np.array(poses),
+            labels=list(self.labels),
+            width=self.width,
+            height=self.height,
+            fps=self.fps,
+        )
+
+
+def standard_session(repeats=3):
+    """
+    A mixed session covering every labelled gesture.
+
+    Args:
+        repeats: Number of times the gesture script is repeated
+
+    Returns:
+        SyntheticSequence ready to ``build``
+    """
+    seq = SyntheticSequence()
+    seq.hold(0.5)
+    for _ in range(repeats):
+        seq.move((0.3, 0.35), 0.6).hold(0.3).click().hold(0.5)
+        seq.move((0.65, 0.45), 0.5).hold(0.3).double_click().hold(0.5)
+        seq.move((0.55, 0.6), 0.4).hold(0.3).right_click().hold(0.5)
+        seq.move((0.4, 0.5), 0.4).hold(0.3).press_and_hold().hold(0.5)
+        seq.move((0.35, 0.4), 0.4).hold(0.3).drag((0.6, 0.55)).hold(0.5)
+        seq.move((0.5, 0.65), 0.4).hold(0.3).scroll('up').hold(0.5)
+        seq.move((0.5, 0.35), 0.4).hold(0.3).scroll('down').hold(0.5)
+        seq.move((0.5, 0.5), 0.4).hold(0.3).fist().hold(0.5).fist().hold(0.5)
+    return seq
+
+
+def pointing_session(targets=12, seed=0):
+    """
+    Pointing movements between random targets, each followed by a still hold.
+
+    Args:
+        targets: Number of movements
+        seed: Random seed for target positions and movement durations
+
+    Returns:
+        SyntheticSequence ready to ``build``
+    """
+    rng = np.random.default_rng(seed)
+    seq = SyntheticSequence()
+    seq.hold(1.0)
+    for _ in range(targets):
+        target = rng.uniform((0.25, 0.3), (0.75, 0.7))
+        seq.move(target, float(rng.uniform(0.3, 0.9))).hold(1.0)
+    return seq
@@ -0,0 +1,402 @@
+"""
+Temporal (motion) gestures for AI Virtual Mouse.
+
+Every other gesture is a distance check on the current frame. Swipes and
+flicks are defined by how the hand moves over the last few hundred
+milliseconds instead:
+
+- ``palm_swipe_left`` / ``palm_swipe_right``: the open hand sweeps sideways
+  (e.g. bound to back/forward)
+- ``flick_up`` / ``flick_down``: a short, fast vertical flick; its amount
+  grows with the flick speed, so binding it to ``scroll`` scrolls further
+  for a harder flick
+
+``LandmarkHistory`` is a fixed-size NumPy ring buffer of the recent
+landmark arrays, their timestamps and the palm center track (wrist, index
+and pinky knuckles). ``MotionWindow`` keeps the displacement, path length
+and duration of the last ``seconds`` of that track. Each new frame adds one
+step at the head and drops expired steps at the tail, so the features cost
+O(1) per frame (amortized) no matter how long the window is.
+
+A motion fires when, within its window, the palm travelled far enough, in
+a straight line, mostly along one axis, with no finger curled (the thumb
+may tuck). Pointing moves are slower than a swipe and pinches, drags and
+scrolling disarm the recognizer. After a motion fires, the recognizer
+waits for ``cooldown`` seconds, so the hand moving back does not fire the
+opposite gesture.
+
+Usage (recall on labelled synthetic motions and per-frame cost):
+    python src/temporal_gestures.py
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from landmark_utils import NUM_LANDMARKS
+    from pose_descriptor import describe
+except ImportError:
+    sys.path.append(str(Path(__file__).parent))
+    from landmark_utils import NUM_LANDMARKS
+    from pose_descriptor import describe
+
+
+GESTURES = ('palm_swipe_left', 'palm_swipe_right', 'flick_up', 'flick_down')
+
+PALM_POINTS = (0, 5, 17)       # Wrist, index and pinky knuckles
+
+
+class LandmarkHistory:
+    """Ring buffer of recent landmark arrays, timestamps and palm positions."""
+
+    def __init__(self, capacity=64, max_gap=0.2):
+        """
+        Args:
+            capacity: Frames kept
+            max_gap: Seconds between two frames that start a new track
+                (the hand may have reappeared elsewhere)
+        """
+        self.capacity = capacity
+        self.max_gap = max_gap
+        self.landmarks = np.zeros((capacity, NUM_LANDMARKS, 3), dtype=np.float32)
+        self.timestamps = np.zeros(capacity)
+        # Palm center in frame widths (x and y share a scale) and the
+        # distance from the previous frame's palm center
+        self.points = np.zeros((capacity, 2))
+        self.steps = np.zeros(capacity)
+        self.head = -1
+        self.count = 0
+        self.tracks = 0               # Incremented whenever the track restarts
+
+    def clear(self):
+        """Forget the history; the next frame starts a new track."""
+        self.count = 0
+        self.tracks += 1
+
+    def push(self, landmarks, timestamp, w, h):
+        """
+        Add a frame.
+
+        Args:
+            landmarks: (21, 3) normalized landmark array
+            timestamp: Frame time in seconds
+            w: Frame width in pixels
+            h: Frame height in pixels
+        """
+        if self.count and timestamp - self.timestamps[self.head] > self.max_gap:
+            self.clear()
+        head = (self.head + 1) % self.capacity
+        np.copyto(self.landmarks[head], landmarks)
+        self.timestamps[head] = timestamp
+        a, b, c = PALM_POINTS
+        x = (float(landmarks[a, 0]) + float(landmarks[b, 0]) + float(landmarks[c, 0])) / 3.0
+        y = (float(landmarks[a, 1]) + float(landmarks[b, 1]) + float(landmarks[c, 1])) / 3.0 * h / w
+        self.points[head, 0] = x
+        self.points[head, 1] = y
+        if self.count:
+            previous = self.points[self.head]
+            self.steps[head] = ((x - previous[0]) ** 2 + (y - previous[1]) ** 2) ** 0.5
+        else:
+            self.steps[head] = 0.0
+        self.head = head
+        self.count = min(self.count + 1, self.capacity)
+
+
+class MotionWindow:
+    """Palm displacement, path length and duration over the last ``seconds``."""
+
+    def __init__(self, history, seconds):
+        """
+        Args:
+            history: LandmarkHistory the window slides over
+            seconds: Window length
+        """
+        self.history = history
+        self.seconds = seconds
+        self.reset()
+
+    def reset(self):
+        """Empty the window; it refills from the next frame."""
+        self.tail = None
+        self.samples = 0
+        self.path = 0.0
+        self._track = None
+
+    def update(self):
+        """Slide the window after ``history.push``: O(1) amortized."""
+        history = self.history
+        head = history.head
+        if self._track != history.tracks or self.samples == 0:
+            # New track: the window restarts at the newest frame
+            self._track = history.tracks
+            self.tail = head
+            self.samples = 1
+            self.path = 0.0
+            return
+        self.samples += 1
+        self.path += history.steps[head]
+        newest = history.timestamps[head]
+        capacity = history.capacity
+        while self.samples > 1 and (newest - history.timestamps[self.tail] > self.seconds
+                                    or self.samples > capacity):
+            self.tail = (self.tail + 1) % capacity
+            self.path -= history.steps[self.tail]
+            self.samples -= 1
+        if self.samples == 1:
+            self.path = 0.0           # No rounding drift across restarts
+
+    @property
+    def displacement(self):
+        """(dx, dy) from the oldest to the newest frame, in frame widths."""
+        if self.samples < 2:
+            return 0.0, 0.0
+        points = self.history.points
+        head, tail = self.history.head, self.tail
+        return float(points[head, 0] - points[tail, 0]), float(points[head, 1] - points[tail, 1])
+
+    @property
+    def duration(self):
+        """Seconds between the oldest and the newest frame."""
+        if self.samples < 2:
+            return 0.0
+        return float(self.history.timestamps[self.history.head] - self.history.timestamps[self.tail])
+
+    @property
+    def speed(self):
+        """Palm speed over the newest frame step, in frame widths per second."""
+        if self.samples < 2:
+            return 0.0
+        history = self.history
+        head = history.head
+        dt = history.timestamps[head] - history.timestamps[(head - 1) % history.capacity]
+        return float(history.steps[head] / dt) if dt > 0 else 0.0
+
+    @property
+    def straightness(self):
+        """Displacement over path length (1 = straight line)."""
+        dx, dy = self.displacement
+        return (dx * dx + dy * dy) ** 0.5 / self.path if self.path > 1e-9 else 0.0
+
+
+class TemporalGestures:
+    """Recognize swipes and flicks from a landmark history."""
+
+    def __init__(self, swipe_distance=0.3, swipe_time=0.15, flick_distance=0.18, flick_time=0.12,
+                 flick_scroll=5.0, min_straightness=0.8, dominance=2.0, cooldown=0.5,
+                 gestures=GESTURES, capacity=64):
+        """
+        Args:
+            swipe_distance: Sideways palm travel for a swipe, in frame widths
+            swipe_time: Window the swipe travel has to happen in (seconds)
+            flick_distance: Vertical palm travel for a flick, in frame widths
+            flick_time: Window the flick travel has to happen in (seconds)
+            flick_scroll: Flick amount per frame width per second of palm
+                speed when the flick is recognized
+            min_straightness: Displacement / path length needed
+            dominance: How much larger the main axis travel has to be than
+                the other axis
+            cooldown: Seconds after a motion before the next can fire
+            gestures: Gestures to recognize (e.g. only the bound ones)
+            capacity: Frames kept in the history
+        """
+        self.swipe_distance = swipe_distance
+        self.flick_distance = flick_distance
+        self.flick_scroll = flick_scroll
+        self.min_straightness = min_straightness
+        self.dominance = dominance
+        self.cooldown = cooldown
+        self.gestures = frozenset(gestures)
+        self.swipes = bool(self.gestures & {'palm_swipe_left', 'palm_swipe_right'})
+        self.flicks = bool(self.gestures & {'flick_up', 'flick_down'})
+
+        self.history = LandmarkHistory(capacity)
+        self.swipe_window = MotionWindow(self.history, swipe_time)
+        self.flick_window = MotionWindow(self.history, flick_time)
+        self._quiet_until = None
+
+    @classmethod
+    def from_settings(cls, settings, gestures=GESTURES):
+        """Create from GesturePipeline settings."""
+        return cls(
+            swipe_distance=settings.get('palm_swipe_distance', 0.3),
+            swipe_time=settings.get('palm_swipe_time', 0.15),
+            flick_distance=settings.get('flick_distance', 0.18),
+            flick_time=settings.get('flick_time', 0.12),
+            flick_scroll=settings.get('flick_scroll', 5.0),
+            cooldown=settings.get('motion_cooldown', 0.5),
+            gestures=gestures,
+        )
+
+    def reset(self):
+        """Forget the history, e.g. after the hand was lost."""
+        self.history.clear()
+        self.swipe_window.reset()
+        self.flick_window.reset()
+
+    def update(self, landmarks, w, h, now, armed=True):
+        """
+        Add a frame and check for a motion gesture.
+
+        Args:
+            landmarks: (21, 3) normalized landmark array
+            w: Frame width in pixels
+            h: Frame height in pixels
+            now: Frame time in seconds
+            armed: False while another gesture (pinch, drag, scroll) owns
+                the hand; the history is still updated
+
+        Returns:
+            (gesture, amount) or None
+        """
+        self.history.push(landmarks, now, w, h)
+        self.swipe_window.update()
+        self.flick_window.update()
+        if not armed or (self._quiet_until is not None and now < self._quiet_until):
+            return None
+
+        motion = None
+        if self.flicks:
+            motion = self._check(self.flick_window, 1, self.flick_distance)
+        if motion is None and self.swipes:
+            motion = self._check(self.swipe_window, 0, self.swipe_distance)
+        if motion is None or motion[0] not in self.gestures:
+            return None
+        if describe(landmarks, w, h).curled[1:].any():
+            return None              # Only the open hand (thumb may tuck) swipes and flicks
+        self._quiet_until = now + self.cooldown
+        self.swipe_window.reset()
+        self.flick_window.reset()
+        return motion
+
+    def _check(self, window, axis, distance):
+        if window.samples < 3:
+            return None
+        displacement = window.displacement
+        travel = displacement[axis]
+        if abs(travel) < distance or abs(travel) < self.dominance * abs(displacement[1 - axis]):
+            return None
+        if window.straightness < self.min_straightness:
+            return None
+        if axis == 0:
+            return ('palm_swipe_right' if travel > 0 else 'palm_swipe_left'), 0
+        # Image y grows downwards; the amount is positive for scrolling up
+        amount = max(1, int(round(window.speed * self.flick_scroll)))
+        return ('flick_up', amount) if travel < 0 else ('flick_down', -amount)
+
+
+def recognize_trace(recognizer, trace):
+    """
+    Run a recognizer over a synthetic trace.
+
+    Returns:
+        List of (timestamp, gesture, amount)
+    """
+    detections = []
+    for i, timestamp in enumerate(trace.timestamps):
+        if not trace.has_hand[i]:
+            recognizer.reset()
+            continue
+        motion = recognizer.update(trace.landmarks[i], trace.width, trace.height, float(timestamp))
+        if motion is not None:
+            detections.append((float(timestamp), motion[0], motion[1]))
+    return detections
+
+
+def match_labels(trace, detections, tolerance=0.2):
+    """
+    Pair labelled motions with detections.
+
+    Returns:
+        (hits, misses, false_positives): labels that were detected, labels
+        that were not, detections matching no label
+    """
+    labels = [label for label in trace.labels if label.kind in GESTURES]
+    unmatched = list(detections)
+    hits, misses = [], []
+    for label in labels:
+        match = next((d for d in unmatched
+                      if d[1] == label.kind and label.start <= d[0] <= label.end + tolerance), None)
+        if match is None:
+            misses.append(label)
+        else:
+            hits.append(label)
+            unmatched.remove(match)
+    return hits, misses, unmatched
+
+
+def measure_update_cost(recognizer, trace, repeats=3):
+    """
+    Per-frame cost of ``update`` in microseconds (best of ``repeats``).
+
+    Args:
+        recognizer: TemporalGestures
+        trace: SyntheticTrace
+        repeats: Passes over the trace
+    """
+    frames = [(trace.landmarks[i], float(t)) for i, t in enumerate(trace.timestamps)]
+    best = float('inf')
+    for _ in range(repeats):
+        recognizer.reset()
+        start = time.perf_counter()
+        for landmarks, timestamp in frames:
+            recognizer.update(landmarks, trace.width, trace.height, timestamp)
+        best = min(best, (time.perf_counter() - start) / len(frames))
+    return best * 1e6
+
+
+def motion_session(repeats=3):
+    """Labelled swipes and flicks between ordinary pointing moves."""
+    try:
+        from synthetic_hands import SyntheticSequence
+    except ImportError:
+        sys.path.append(str(Path(__file__).parent))
+        from synthetic_hands import SyntheticSequence
+
+    seq = SyntheticSequence()
+    seq.hold(0.5)
+    for _ in range(repeats):
+        seq.move((0.7, 0.5), 0.4).hold(0.4).palm_swipe('left').hold(0.6)
+        seq.move((0.3, 0.5), 0.4).hold(0.4).palm_swipe('right').hold(0.6)
+        seq.move((0.5, 0.7), 0.4).hold(0.4).flick('up').hold(0.6)
+        seq.move((0.5, 0.3), 0.4).hold(0.4).flick('down').hold(0.6)
+    return seq
+
+
+def main():
+    """Report recall, false positives and per-frame cost on synthetic sessions."""
+    try:
+        from synthetic_hands import pointing_session, standard_session
+    except ImportError:
+        sys.path.append(str(Path(__file__).parent))
+        from synthetic_hands import pointing_session, standard_session
+
+    parser = argparse.ArgumentParser(description="Evaluate swipe/flick recognition on synthetic motions")
+    parser.add_argument('--noise', type=float, default=1.5, help="Landmark jitter in pixels")
+    parser.add_argument('--fps', type=int, default=30)
+    args = parser.parse_args()
+
+    motions = motion_session()
+    motions.fps = args.fps
+    sessions = {
+        'motions': motions.build(noise_px=args.noise, seed=1),
+        'pointing': pointing_session(targets=30).build(noise_px=args.noise, seed=2),
+        'standard': standard_session().build(noise_px=args.noise, seed=3),
+    }
+    print(f"{'session':<10} {'labels':>6} {'hits':>5} {'false':>6}")
+    for name, trace in sessions.items():
+        hits, misses, false = match_labels(trace, recognize_trace(TemporalGestures(), trace))
+        print(f"{name:<10} {len(hits) + len(misses):>6} {len(hits):>5} {len(false):>6}")
+
+    print("\nPer-frame update cost by window length:")
+    trace = sessions['pointing']
+    for seconds in (0.1, 0.3, 1.0, 3.0):
+        recognizer = TemporalGestures(swipe_time=seconds, flick_time=seconds, capacity=256)
+        print(f"  {seconds:>4.1f} s window: {measure_update_cost(recognizer, trace):6.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Tracking continuity for AI Virtual Mouse.
+
+MediaPipe loses the hand for a frame or two on motion blur or brief
+occlusions. Instead of skipping those frames, ``TrackingContinuity`` sits in
+front of the gesture pipeline and:
+
+- coasts the cursor on the hand's recent velocity for a short grace period,
+  translating the last landmarks so pinch/scroll state stays unchanged
+- keeps drag and scroll state alive while the hand is missing
+- releases held buttons and forgets in-progress gestures only after a
+  release timeout
+
+Dropout counts and durations are collected in ``DropoutStats``.
+"""
+
+import numpy as np
+
+try:
+    from gesture_pipeline import INDEX_TIP
+except ImportError:
+    import sys
+    from pathlib import Path
+    sys.path.append(str(Path(__file__).parent))
+    from gesture_pipeline import INDEX_TIP
+
+
+# Upper bounds (seconds) of the dropout duration histogram buckets
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, float('inf'))
+
+
+class DropoutStats:
+    """Counts and durations of tracking dropouts."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.dropouts = 0            # Dropouts that ended with the hand coming back
+        self.total_duration = 0.0
+        self.longest = 0.0
+        self.histogram = [0] * len(DURATION_BUCKETS)
+        self.coasted_frames = 0      # Frames filled with predicted motion
+        self.missing_frames = 0      # All frames without a hand (coasted or not)
+        self.timeouts = 0            # Dropouts that released buttons
+
+    def record(self, duration):
+        """Record a finished dropout of ``duration`` seconds."""
+        self.dropouts += 1
+        self.total_duration += duration
+        self.longest = max(self.longest, duration)
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if duration < bound:
+                self.histogram[i] += 1
+                break
+
+    @property
+    def mean_duration(self):
+        return self.total_duration / self.dropouts if self.dropouts else 0.0
+
+    def as_dict(self):
+        """Return the metrics as a plain dictionary."""
+        return {
+            'dropouts': self.dropouts,
+            'total_duration': self.total_duration,
+            'mean_duration': self.mean_duration,
+            'longest': self.longest,
+            'histogram': {
+                (f"<{bound * 1000:.0f}ms" if bound != float('inf') else "longer"): count
+                for bound, count in zip(DURATION_BUCKETS, self.histogram)
+            },
+            'coasted_frames': self.coasted_frames,
+            'missing_frames': self.missing_frames,
+            'timeouts': self.timeouts,
+        }
+
+
+class TrackingContinuity:
+    """Bridge short tracking dropouts in front of a GesturePipeline."""
+
+    def __init__(self, pipeline, grace_period=0.15, release_timeout=0.5,
+                 velocity_smoothing=0.5, enabled=True):
+        """
+        Args:
+            pipeline: GesturePipeline fed with real or predicted landmarks
+            grace_period: Seconds the cursor coasts on predicted motion
+            release_timeout: Seconds without a hand before held buttons are
+                released and gesture state is reset
+            velocity_smoothing: Weight of the newest velocity sample (0-1]
+            enabled: If False, missing frames are skipped and buttons are
+                released at the timeout only
+        """
+        self.pipeline = pipeline
+        self.grace_period = grace_period
+        self.release_timeout = max(release_timeout, grace_period)
+        self.velocity_smoothing = velocity_smoothing
+        self.enabled = enabled
+        self.stats = DropoutStats()
+
+        self._last = np.zeros((21, 3), dtype=np.float32)
+        self._predicted = np.zeros((21, 3), dtype=np.float32)
+        self._velocity = np.zeros(2, dtype=np.float64)   # Normalized units per second
+        self._last_time = None
+        self._lost_since = None
+        self._released = False
+        self._coasting = False
+
+    @classmethod
+    def from_config(cls, pipeline, config):
+        """Create from the ``tracking`` section of a ConfigManager (or None)."""
+        if config is None:
+            return cls(pipeline)
+        settings = config.get_tracking_settings()
+        return cls(
+            pipeline,
+            grace_period=settings['grace_period'],
+            release_timeout=settings['release_timeout'],
+            enabled=settings['enable_coasting'],
+        )
+
+    @property
+    def is_lost(self):
+        """True while the hand is missing."""
+        return self._lost_since is not None
+
+    @property
+    def is_coasting(self):
+        """True while missing frames are being filled with predicted motion."""
+        return self._coasting
+
+    def update(self, landmarks, w, h, now=None):
+        """
+        Process one frame.
+
+        Args:
+            landmarks: (21, 3) normalized landmark array, or None if no hand
+                was detected in this frame
+            w: Frame width in pixels
+            h: Frame height in pixels
+            now: Frame timestamp in seconds (default: the pipeline's clock)
+
+        Returns:
+            Feedback circles from the pipeline (empty if nothing was processed)
+        """
+        if now is None:
+            now = self.pipeline.clock()
+        if landmarks is None:
+            return self._missing(w, h, now)
+        return self._tracked(landmarks, w, h, now)
+
+    def _tracked(self, landmarks, w, h, now):
+        if self._lost_since is not None:
+            self.stats.record(now - self._lost_since)
+            self._lost_since = None
+            self._released = False
+            self._coasting = False
+            self._velocity[:] = 0
+        elif self._last_time is not None and now > self._last_time:
+            sample = (landmarks[INDEX_TIP, :2] - self._last[INDEX_TIP, :2]) / (now - self._last_time)
+            a = self.velocity_smoothing
+            self._velocity = a * sample + (1 - a) * self._velocity
+
+        np.copyto(self._last, landmarks)
+        self._last_time = now
+        return self.pipeline.process(landmarks, w, h, now)
+
+    def _missing(self, w, h, now):
+        if self._last_time is None:
+            return []   # Never saw a hand; nothing to continue
+
+        self.stats.missing_frames += 1
+        if self._lost_since is None:
+            self._lost_since = self._last_time   # Lost since the last tracked frame
+        self._coasting = False
+        elapsed = now - self._lost_since
+
+        if elapsed >= self.release_timeout:
+            if not self._released:
+                held = self.pipeline.is_dragging or self.pipeline.left_pinch_held
+                self.pipeline.reset_gestures()
+                self._released = True
+                if held:
+                    self.stats.timeouts += 1
+            return []
+
+        pipeline = self.pipeline
+        if not self.enabled or elapsed > self.grace_period or pipeline.is_paused:
+            return []
+        if pipeline.scroll_mode_active:
+            return []   # Hold scroll mode; predicted motion must not scroll
+
+        # Shift the whole hand so finger distances (and gestures) stay the same
+        np.copyto(self._predicted, self._last)
+        self._predicted[:, :2] += (self._velocity * (now - self._last_time)).astype(np.float32)
+        self.stats.coasted_frames += 1
+        self._coasting = True
+        return pipeline.process(self._predicted, w, h, now)
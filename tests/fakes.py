@@ -0,0 +1,153 @@
+"""
+Test doubles shared by the unit tests.
+"""
+
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from camera_setup import CameraMode, fourcc_code, fourcc_name
+
+
+class FakeTopologyProvider:
+    """In-memory display topology provider."""
+
+    def __init__(self, monitors):
+        self._monitors = list(monitors)
+        self._changed = False
+        self.queries = 0
+
+    def set_monitors(self, monitors):
+        """Replace the layout, as if a monitor was plugged in or rearranged."""
+        self._monitors = list(monitors)
+        self._changed = True
+
+    def monitors(self):
+        self.queries += 1
+        return list(self._monitors)
+
+    def changed(self):
+        changed, self._changed = self._changed, False
+        return changed
+
+    def close(self):
+        pass
+
+
+class FakeCapture:
+    """
+    In-memory stand-in for a V4L2 ``cv2.VideoCapture``.
+
+    Like a V4L2 driver it only accepts supported pixel formats, snaps the
+    size and frame rate to the nearest supported mode, and ignores manual
+    exposure while auto exposure is on. ``read`` advances a simulated clock
+    by one frame interval (pass ``clock`` to ``open_camera``); exposures
+    longer than the frame interval slow the delivered frame rate down.
+    """
+
+    def __init__(self, modes, supported_props=None, exposure_unit=1e-4):
+        """
+        Args:
+            modes: Supported CameraMode list
+            supported_props: Property ids that can be set (default: all)
+            exposure_unit: Seconds per exposure step (V4L2 uses 100 us)
+        """
+        self.modes = list(modes)
+        self.supported_props = supported_props
+        self.exposure_unit = exposure_unit
+        self.opened = True
+        self.time = 0.0
+        self.auto_exposure_time = 0.0    # Frame time added by auto exposure (dim room)
+
+        first = self.modes[0]
+        self.props = {
+            cv2.CAP_PROP_FOURCC: float(fourcc_code(first.fourcc)),
+            cv2.CAP_PROP_FRAME_WIDTH: float(first.width),
+            cv2.CAP_PROP_FRAME_HEIGHT: float(first.height),
+            cv2.CAP_PROP_FPS: first.fps,
+            cv2.CAP_PROP_BUFFERSIZE: 4.0,
+            cv2.CAP_PROP_AUTO_EXPOSURE: 3.0,
+            cv2.CAP_PROP_EXPOSURE: 166.0,
+            cv2.CAP_PROP_AUTOFOCUS: 1.0,
+            cv2.CAP_PROP_FOCUS: 0.0,
+        }
+        self.set_calls = []
+
+    def isOpened(self):
+        return self.opened
+
+    def getBackendName(self):
+        return 'V4L2'
+
+    def release(self):
+        self.opened = False
+
+    def clock(self):
+        return self.time
+
+    def _current(self):
+        return CameraMode(
+            fourcc_name(self.props[cv2.CAP_PROP_FOURCC]),
+            int(self.props[cv2.CAP_PROP_FRAME_WIDTH]),
+            int(self.props[cv2.CAP_PROP_FRAME_HEIGHT]),
+            self.props[cv2.CAP_PROP_FPS],
+        )
+
+    def _snap(self, width, height, fps):
+        current = self._current()
+        same_format = [m for m in self.modes if m.fourcc == current.fourcc]
+        size = min(same_format, key=lambda m: abs(m.width - width) + abs(m.height - height))
+        rates = [m for m in same_format if (m.width, m.height) == (size.width, size.height)]
+        rate = min(rates, key=lambda m: abs(m.fps - fps))
+        self.props[cv2.CAP_PROP_FRAME_WIDTH] = float(rate.width)
+        self.props[cv2.CAP_PROP_FRAME_HEIGHT] = float(rate.height)
+        self.props[cv2.CAP_PROP_FPS] = rate.fps
+
+    def set(self, prop, value):
+        self.set_calls.append((prop, value))
+        if self.supported_props is not None and prop not in self.supported_props:
+            return False
+        current = self._current()
+        if prop == cv2.CAP_PROP_FOURCC:
+            if fourcc_name(value) not in {m.fourcc for m in self.modes}:
+                return False
+            self.props[prop] = float(value)
+            self._snap(current.width, current.height, current.fps)
+        elif prop == cv2.CAP_PROP_FRAME_WIDTH:
+            self._snap(value, current.height, current.fps)
+        elif prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            self._snap(current.width, value, current.fps)
+        elif prop == cv2.CAP_PROP_FPS:
+            self._snap(current.width, current.height, value)
+        elif prop == cv2.CAP_PROP_EXPOSURE:
+            if self.props[cv2.CAP_PROP_AUTO_EXPOSURE] != 1:
+                return False
+            self.props[prop] = float(value)
+        elif prop in self.props:
+            self.props[prop] = float(value)
+        else:
+            return False
+        return True
+
+    def get(self, prop):
+        return self.props.get(prop, 0.0)
+
+    def read(self, image=None):
+        if not self.opened:
+            return False, None
+        interval = 1.0 / self.props[cv2.CAP_PROP_FPS]
+        if self.props[cv2.CAP_PROP_AUTO_EXPOSURE] == 1:
+            interval = max(interval, self.props[cv2.CAP_PROP_EXPOSURE] * self.exposure_unit)
+        else:
+            interval = max(interval, self.auto_exposure_time)
+        self.time += interval
+        shape = (int(self.props[cv2.CAP_PROP_FRAME_HEIGHT]), int(self.props[cv2.CAP_PROP_FRAME_WIDTH]), 3)
+        if image is not None and image.shape == shape:
+            image[:] = 0      # Decoded into the caller's buffer, like OpenCV
+            return True, image
+        return True, np.zeros(shape, dtype=np.uint8)
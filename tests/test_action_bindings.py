@@ -0,0 +1,238 @@
+"""
+Unit tests for gesture-to-action bindings and the threaded output backend.
+"""
+
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from action_bindings import ActionBindings, compile_action
+from gesture_benchmark import replay
+from output_backend import RecordingBackend, ThreadedBackend
+from synthetic_hands import SyntheticSequence
+
+
+def names(backend, ignore=('move',)):
+    """Recorded action names, without cursor moves."""
+    return [action.name for action in backend.actions if action.name not in ignore]
+
+
+class TestActionBindings(unittest.TestCase):
+    """Test compiling and dispatching the binding table."""
+
+    def setUp(self):
+        self.output = RecordingBackend()
+
+    def test_defaults_match_built_in_gestures(self):
+        """Test that the default table performs the classic mouse actions."""
+        bindings = ActionBindings()
+        for gesture in ('left_click', 'double_click', 'right_click'):
+            self.assertTrue(bindings.dispatch(gesture, self.output))
+        bindings.dispatch('scroll', self.output, -3)
+        self.assertEqual(names(self.output), ['click', 'double_click', 'right_click', 'scroll'])
+        self.assertEqual(self.output.actions[-1].amount, -3)
+        self.assertTrue(bindings.is_drag('pinch_hold'))
+        self.assertFalse(bindings.is_bound('thumbs_up'))
+        self.assertFalse(bindings.dispatch('thumbs_up', self.output))
+
+    def test_keys_text_scroll_and_macros(self):
+        """Test key chords, text, fixed scroll and action lists."""
+        bindings = ActionBindings({
+            'thumbs_up': {'keys': 'ctrl + shift+t'},
+            'swipe_left': [{'keys': 'ctrl+l'}, {'text': 'hello\n'}],
+            'swipe_right': {'scroll': 5},
+            'left_click': 'none',
+        })
+        bindings.dispatch('thumbs_up', self.output)
+        bindings.dispatch('swipe_left', self.output)
+        bindings.dispatch('swipe_right', self.output, 1)
+        self.assertFalse(bindings.dispatch('left_click', self.output))
+        self.assertEqual([(a.name, a.amount) for a in self.output.actions], [
+            ('hotkey', 'ctrl+shift+t'), ('hotkey', 'ctrl+l'), ('write', 'hello\n'), ('scroll', 5),
+        ])
+
+    def test_callables(self):
+        """Test registered callables and module:function references."""
+        calls = []
+        bindings = ActionBindings(
+            {'thumbs_up': {'call': 'record'}},
+            callables={'record': lambda output, gesture, amount: calls.append((output, gesture))},
+        )
+        bindings.dispatch('thumbs_up', self.output)
+        self.assertEqual(calls, [(self.output, 'thumbs_up')])
+
+        self.assertIs(compile_action({'call': 'action_bindings:compile_action'}), compile_action)
+
+    def test_invalid_tables_fail_at_load(self):
+        """Test that mistakes are reported when the table is compiled."""
+        for table in (
+            {'wave': 'click'},
+            {'left_click': 'middle_click'},
+            {'left_click': {'keys': ''}},
+            {'right_click': 'drag'},
+            {'thumbs_up': {'call': 'no_such_module:function'}},
+            {'thumbs_up': {'call': 'unregistered'}},
+            {'thumbs_up': {'keys': 'a', 'text': 'b'}},
+        ):
+            with self.assertRaises(ValueError, msg=str(table)):
+                ActionBindings(table)
+
+
+class TestPipelineBindings(unittest.TestCase):
+    """Test bound gestures end to end on synthetic hands."""
+
+    def test_rebound_click(self):
+        """Test that a pinch runs the bound key chord instead of clicking."""
+        trace = SyntheticSequence().hold(0.3).click().hold(0.5).build()
+        backend = replay(trace, {'bindings': {'left_click': {'keys': 'ctrl+c'}}})[0]
+        self.assertEqual([(a.name, a.amount) for a in backend.of_type('hotkey')], [('hotkey', 'ctrl+c')])
+        self.assertEqual(backend.of_type('click'), [])
+
+    def test_thumbs_up_fires_once(self):
+        """Test that a held thumbs-up runs its action once per pose."""
+        trace = SyntheticSequence().hold(0.3).thumbs_up(hold=1.5).hold(0.5).build()
+        backend = replay(trace, {'bindings': {'thumbs_up': {'keys': 'ctrl+z'}}})[0]
+        self.assertEqual(len(backend.of_type('hotkey')), 1)
+
+        # Unbound (the default), the pose runs no action of its own
+        backend = replay(trace)[0]
+        self.assertEqual(backend.of_type('hotkey'), [])
+
+    def test_two_finger_swipes(self):
+        """Test swipe direction and that slow moves are not swipes."""
+        sequence = SyntheticSequence(start=(0.5, 0.5)).hold(0.3)
+        sequence.swipe('left', duration=0.25).hold(0.3).swipe('right', duration=0.25).hold(0.3)
+        sequence.swipe('left', distance=0.3, duration=1.5).hold(0.3)
+        bindings = {'swipe_left': {'keys': 'alt+left'}, 'swipe_right': {'keys': 'alt+right'}}
+        backend = replay(sequence.build(), {'bindings': bindings})[0]
+        self.assertEqual([a.amount for a in backend.of_type('hotkey')], ['alt+left', 'alt+right'])
+
+    def test_pinch_hold_bound_to_action(self):
+        """Test that a held pinch runs its action once instead of dragging."""
+        trace = SyntheticSequence().hold(0.3).press_and_hold(duration=2.5).hold(0.5).build()
+        backend = replay(trace, {'bindings': {'pinch_hold': {'text': 'held'}}})[0]
+        self.assertEqual(names(backend), ['click', 'write'])
+
+        backend = replay(trace)[0]
+        self.assertEqual(names(backend), ['click', 'mouse_down', 'mouse_up'])
+
+
+class SlowBackend(RecordingBackend):
+    """Recording backend whose clicks take a while, like PyAutoGUI's PAUSE."""
+
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+        self.release = threading.Event()
+
+    def click(self):
+        time.sleep(self.delay)
+        super().click()
+
+    def move_to(self, x, y):
+        self.release.wait(1.0)
+        super().move_to(x, y)
+
+
+class TestThreadedBackend(unittest.TestCase):
+    """Test the worker-thread output backend."""
+
+    def test_calls_return_immediately_and_keep_order(self):
+        """Test that slow actions do not block the caller and run in order."""
+        inner = SlowBackend(delay=0.2)
+        inner.release.set()
+        output = ThreadedBackend(inner)
+        try:
+            start = time.perf_counter()
+            output.click()
+            output.hotkey('ctrl', 'z')
+            output.scroll(2)
+            self.assertLess(time.perf_counter() - start, 0.1)
+            output.wait()
+            self.assertEqual([(a.name, a.amount) for a in inner.actions],
+                             [('click', 0), ('hotkey', 'ctrl+z'), ('scroll', 2)])
+            self.assertEqual(output.size(), inner.size())
+        finally:
+            output.close()
+
+    def test_consecutive_moves_coalesce(self):
+        """Test that queued moves collapse to the latest position, around clicks."""
+        inner = SlowBackend(delay=0.0)
+        output = ThreadedBackend(inner)
+        try:
+            output.move_to(0, 0)           # Worker blocks in this move until released
+            time.sleep(0.05)
+            for x in range(1, 6):
+                output.move_to(x, x)
+            output.click()
+            output.move_to(10, 10)
+            output.move_to(11, 11)
+            inner.release.set()
+            output.wait()
+        finally:
+            output.close()
+        moves = [(a.x, a.y) for a in inner.actions if a.name == 'move']
+        self.assertEqual(moves, [(0, 0), (5, 5), (11, 11)])
+        click = next(a for a in inner.actions if a.name == 'click')
+        self.assertEqual((click.x, click.y), (5, 5))
+
+    def test_fatal_error_reaches_caller(self):
+        """Test that a fail-safe style error is raised again in the caller's thread."""
+        class FailSafe(Exception):
+            pass
+
+        class CornerBackend(RecordingBackend):
+            fatal_errors = (FailSafe,)
+
+            def move_to(self, x, y):
+                if (x, y) == (0, 0):
+                    raise FailSafe("cursor in the corner")
+                super().move_to(x, y)
+
+        output = ThreadedBackend(CornerBackend())
+        try:
+            output.move_to(0, 0)
+            with self.assertRaises(FailSafe):
+                output.wait()
+            with self.assertRaises(FailSafe):
+                output.click()
+        finally:
+            output.close()
+        self.assertEqual(output.output.actions, [])
+
+    def test_other_errors_are_logged(self):
+        """Test that an ordinary failure is logged and later actions still run."""
+        class BrokenHotkey(RecordingBackend):
+            def hotkey(self, *keys):
+                raise OSError("no keyboard")
+
+        inner = BrokenHotkey()
+        output = ThreadedBackend(inner)
+        try:
+            with self.assertLogs('output_backend', 'WARNING'):
+                output.hotkey('ctrl', 'z')
+                output.click()
+                output.wait()
+        finally:
+            output.close()
+        self.assertEqual([a.name for a in inner.actions], ['click'])
+
+    def test_bounded_queue_and_close(self):
+        """Test that the queue is bounded and wait() after close() returns."""
+        inner = SlowBackend(delay=0.0)
+        output = ThreadedBackend(inner, max_queued=4)
+        self.assertEqual(output._queue.maxsize, 4)
+        inner.release.set()
+        output.click()
+        output.close()
+        output.wait()
+        self.assertEqual([a.name for a in inner.actions], ['click'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+"""
+Unit tests for the binary action log and background logging.
+"""
+
+import logging
+import shutil
+import sys
+import tempfile
+import unittest
+from logging.handlers import QueueHandler
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from action_log import (
+    HEADER, RECORD, ActionLog, ActionLoggingBackend, log_files, read_records,
+)
+from logger_setup import setup_logger, shutdown_logger
+from output_backend import RecordingBackend
+
+
+class TestActionLog(unittest.TestCase):
+    """Test record encoding, batching and rotation."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = Path(self.temp_dir) / 'logs' / 'actions.bin'
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_records_round_trip(self):
+        """Test that records decode to what was logged."""
+        with ActionLog(self.path, flush_interval=60) as log:
+            log.record('click', 100.5, 200.25, latency_ms=12.5, timestamp=1000.0)
+            log.record('scroll', 10, 20, amount=-3, timestamp=1000.1)
+        records = list(read_records(self.path))
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0].event, 'click')
+        self.assertEqual((records[0].time, records[0].x, records[0].y), (1000.0, 100.5, 200.25))
+        self.assertAlmostEqual(records[0].latency_ms, 12.5)
+        self.assertEqual((records[1].event, records[1].amount), ('scroll', -3))
+        self.assertEqual(self.path.stat().st_size, HEADER.size + 2 * RECORD.size)
+
+    def test_record_only_queues(self):
+        """Test that record() does no I/O; the writer writes batches."""
+        log = ActionLog(self.path, flush_interval=60)
+        try:
+            for i in range(100):
+                log.record('move', i, i)
+            self.assertEqual(log.written, 0)
+            self.assertEqual(self.path.stat().st_size, HEADER.size)
+        finally:
+            log.close()
+        self.assertEqual(log.written, 100)
+        self.assertEqual(len(list(read_records(self.path))), 100)
+
+    def test_size_rotation(self):
+        """Test that files rotate by size and decode oldest first."""
+        max_bytes = HEADER.size + 10 * RECORD.size
+        with ActionLog(self.path, max_bytes=max_bytes, backup_count=2, flush_interval=60) as log:
+            for i in range(25):
+                log.record('move', i, 0, timestamp=float(i))
+        self.assertEqual(log.rotations, 2)
+
+        files = log_files(self.path)
+        self.assertEqual([f.name for f in files], ['actions.bin.2', 'actions.bin.1', 'actions.bin'])
+        times = [r.time for f in files for r in read_records(f)]
+        self.assertEqual(times, [float(i) for i in range(25)])
+        for f in files:
+            self.assertLessEqual(f.stat().st_size, max_bytes)
+
+    def test_overflow_drops_oldest(self):
+        """Test that a full buffer drops the oldest records and counts them."""
+        with ActionLog(self.path, flush_interval=60, max_pending=10) as log:
+            for i in range(15):
+                log.record('move', i, 0)
+        self.assertEqual(log.dropped, 5)
+        self.assertEqual([r.x for r in read_records(self.path)], [float(i) for i in range(5, 15)])
+
+    def test_torn_record_and_bad_file(self):
+        """Test that a partial last record is ignored and foreign files rejected."""
+        with ActionLog(self.path, flush_interval=60) as log:
+            log.record('click')
+        with open(self.path, 'ab') as f:
+            f.write(b'\x00' * 5)
+        self.assertEqual(len(list(read_records(self.path))), 1)
+
+        other = Path(self.temp_dir) / 'other.bin'
+        other.write_bytes(b'not an action log at all')
+        with self.assertRaises(ValueError):
+            list(read_records(other))
+
+
+class TestActionLoggingBackend(unittest.TestCase):
+    """Test the logging output backend wrapper."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = Path(self.temp_dir) / 'actions.bin'
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_forwards_and_logs_with_latency(self):
+        """Test that actions reach the inner backend and are logged with latency."""
+        now = [10.0]
+        inner = RecordingBackend(clock=lambda: now[0])
+        with ActionLog(self.path, flush_interval=60) as log:
+            backend = ActionLoggingBackend(inner, log, log_moves=False, clock=lambda: now[0])
+            backend.mark_frame(9.98)
+            backend.move_to(300, 400)
+            backend.click()
+            backend.scroll(5)
+            self.assertEqual(backend.size(), inner.size())
+
+        self.assertEqual([a.name for a in inner.actions], ['move', 'click', 'scroll'])
+        records = list(read_records(self.path))
+        self.assertEqual([r.event for r in records], ['click', 'scroll'])
+        self.assertEqual((records[0].x, records[0].y), (300.0, 400.0))
+        self.assertAlmostEqual(records[0].latency_ms, 20.0, places=3)
+        self.assertEqual(records[1].amount, 5)
+
+
+class TestBackgroundLogging(unittest.TestCase):
+    """Test that setup_logger writes through a queue listener."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutdown_logger('test_background')
+        shutil.rmtree(self.temp_dir)
+
+    def test_queue_handler_writes_file(self):
+        """Test that records reach the file after shutdown_logger."""
+        log_file = Path(self.temp_dir) / 'test.log'
+        logger = setup_logger('test_background', str(log_file), level='DEBUG', console=False)
+        self.assertEqual(len(logger.handlers), 1)
+        self.assertIsInstance(logger.handlers[0], QueueHandler)
+
+        logger.debug("frame %d", 42)
+        shutdown_logger('test_background')
+        text = log_file.read_text()
+        self.assertIn("DEBUG", text)
+        self.assertIn("frame 42", text)
+
+    def test_synchronous_mode(self):
+        """Test that use_queue=False keeps the handlers on the logger."""
+        logger = setup_logger('test_background', None, console=True, use_queue=False)
+        self.assertIsInstance(logger.handlers[0], logging.StreamHandler)
+
+
+if __name__ == '__main__':
+    unittest.main()
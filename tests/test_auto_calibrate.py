@@ -0,0 +1,140 @@
+"""
+Unit tests for offline auto-calibration.
+"""
+
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from auto_calibrate import calibrate, fit_gesture, otsu_threshold, segment_runs
+from landmark_trace import TraceWriter, RECORD_DTYPE, FLAG_HAND
+
+
+WIDTH, HEIGHT = 640, 480
+
+
+def gesture_distances(rng, num_frames, closed_px, open_px, noise_px):
+    """Alternate open/closed segments of 20-60 frames; return (distances, closed mask)."""
+    distances = np.empty(num_frames, dtype=np.float32)
+    closed = np.zeros(num_frames, dtype=bool)
+    i = 0
+    state = False
+    while i < num_frames:
+        length = min(int(rng.integers(20, 60)), num_frames - i)
+        closed[i:i + length] = state
+        distances[i:i + length] = (closed_px if state else open_px) + rng.normal(0, noise_px, length)
+        state = not state
+        i += length
+    return np.abs(distances), closed
+
+
+def write_synthetic_trace(path, rng, num_frames):
+    """Write a trace where the three gesture distances follow known classes."""
+    left, left_closed = gesture_distances(rng, num_frames, 15, 90, 4)
+    right, _ = gesture_distances(rng, num_frames, 20, 100, 5)
+    scroll, _ = gesture_distances(rng, num_frames, 12, 45, 3)
+
+    records = np.zeros(num_frames, dtype=RECORD_DTYPE)
+    records['timestamp'] = np.arange(num_frames) / 30.0
+    records['frame'] = np.arange(num_frames)
+    records['flags'] = FLAG_HAND
+    landmarks = records['landmarks']
+    landmarks[:, :, :2] = 0.5
+    landmarks[:, 8, 0] += left / WIDTH            # Index tip right of the thumb
+    landmarks[:, 12, 1] += right / HEIGHT         # Middle tip below the thumb
+    landmarks[:, 16, 1] = landmarks[:, 12, 1]     # Ring tip beside the middle tip
+    landmarks[:, 16, 0] = landmarks[:, 12, 0] + scroll / WIDTH
+
+    with TraceWriter(path, WIDTH, HEIGHT, fps=30) as writer:
+        writer.write_records(records)
+    return left_closed
+
+
+class TestCalibrationMath(unittest.TestCase):
+    """Test the vectorized building blocks."""
+
+    def test_otsu_splits_bimodal_data(self):
+        """Test that the threshold falls between two clusters."""
+        rng = np.random.default_rng(0)
+        values = np.r_[rng.normal(10, 2, 1000), rng.normal(50, 5, 3000)]
+        threshold, separation = otsu_threshold(values)
+        self.assertGreater(threshold, 16)
+        self.assertLess(threshold, 38)
+        self.assertGreater(separation, 0.8)
+
+    def test_segment_runs_absorbs_noise(self):
+        """Test that short runs merge into the surrounding segment."""
+        closed = np.array([0, 0, 0, 0, 1, 0, 0, 0, 1, 1, 1, 1, 0, 1, 1, 1], dtype=bool)
+        starts, labels = segment_runs(closed, min_frames=3)
+        np.testing.assert_array_equal(starts, [0, 8])
+        np.testing.assert_array_equal(labels, [False, True])
+
+    def test_segment_runs_split_at_gaps(self):
+        """Test that closed runs in two recordings are not joined across the gap."""
+        closed = np.array([0, 0, 0, 1, 1, 1, 0, 1, 1, 1, 0, 0, 0], dtype=bool)
+        gaps = np.zeros(len(closed), dtype=bool)
+        gaps[6] = True
+        starts, labels = segment_runs(closed, min_frames=3, gaps=gaps)
+        np.testing.assert_array_equal(starts, [0, 3, 6, 7, 10])
+        np.testing.assert_array_equal(labels, [False, True, False, True, False])
+
+        rng = np.random.default_rng(1)
+        recording = np.r_[rng.normal(80, 3, 200), rng.normal(15, 2, 50)]
+        values = np.r_[recording, np.nan, recording[::-1]]
+        self.assertEqual(fit_gesture(values)['closed_segments'], 2)
+
+    def test_fit_rejects_unimodal_data(self):
+        """Test that data without a closed class is not calibrated."""
+        values = np.full(500, 80.0)
+        self.assertIsNone(fit_gesture(values))
+
+
+class TestAutoCalibrate(unittest.TestCase):
+    """Test calibration on recorded traces."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(42)
+        self.paths = []
+        for i in range(2):
+            path = Path(self.temp_dir) / f"session{i}.trace"
+            write_synthetic_trace(path, rng, 25000)
+            self.paths.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_thresholds_separate_classes(self):
+        """Test that enter/exit thresholds sit between the classes."""
+        patch, report = calibrate(self.paths)
+
+        left = report['left_click']
+        self.assertGreater(left['enter'], 25)
+        self.assertLess(left['enter'], 75)
+        self.assertGreaterEqual(left['exit'], left['enter'])
+        self.assertLess(left['false_trigger_rate'], 0.01)
+        self.assertLess(left['miss_rate'], 0.01)
+        self.assertGreater(left['closed_segments'], 500)
+
+        self.assertEqual(patch['clicks']['left_click_distance'], int(round(left['enter'])))
+        self.assertIn('right_click_release_distance', patch['clicks'])
+        self.assertIn('release_distance', patch['scroll'])
+        self.assertLess(patch['scroll']['activation_distance'], 45)
+
+    def test_tens_of_thousands_of_frames_in_seconds(self):
+        """Test that 50k frames calibrate quickly."""
+        start = time.perf_counter()
+        calibrate(self.paths)
+        self.assertLess(time.perf_counter() - start, 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+"""
+Unit tests for camera mode negotiation against a fake V4L2 capture.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+import cv2
+
+# Add src and the test helpers to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from camera_setup import (
+    CameraMode, StaticProber, V4L2CtlProber, choose_mode,
+    default_camera_settings, fourcc_code, fourcc_name, measure_fps, negotiate, open_camera,
+)
+from fakes import FakeCapture
+
+
+# A typical UVC webcam: YUYV is limited by USB bandwidth, MJPG is not
+WEBCAM_MODES = [
+    CameraMode('YUYV', 640, 480, 15.0),
+    CameraMode('YUYV', 640, 480, 5.0),
+    CameraMode('YUYV', 1280, 720, 5.0),
+    CameraMode('MJPG', 640, 480, 30.0),
+    CameraMode('MJPG', 640, 480, 15.0),
+    CameraMode('MJPG', 1280, 720, 30.0),
+]
+
+V4L2_OUTPUT = """ioctl: VIDIOC_ENUM_FMT
+\tType: Video Capture
+
+\t[0]: 'MJPG' (Motion-JPEG, compressed)
+\t\tSize: Discrete 1280x720
+\t\t\tInterval: Discrete 0.033s (30.000 fps)
+\t\tSize: Discrete 640x480
+\t\t\tInterval: Discrete 0.033s (30.000 fps)
+\t\t\tInterval: Discrete 0.067s (15.000 fps)
+\t[1]: 'YUYV' (YUYV 4:2:2)
+\t\tSize: Discrete 640x480
+\t\t\tInterval: Discrete 0.067s (15.000 fps)
+"""
+
+
+def settings(**overrides):
+    result = default_camera_settings()
+    result.update(probe=False, verify_frames=0)
+    result.update(overrides)
+    return result
+
+
+class TestProbing(unittest.TestCase):
+    """Test capability probing and mode selection."""
+
+    def test_fourcc_round_trip(self):
+        """Test FOURCC conversion both ways."""
+        self.assertEqual(fourcc_name(fourcc_code('MJPG')), 'MJPG')
+        self.assertEqual(fourcc_code('MJPG'), cv2.VideoWriter_fourcc(*'MJPG'))
+
+    def test_parse_v4l2_ctl(self):
+        """Test parsing of v4l2-ctl --list-formats-ext output."""
+        def runner(args, **kwargs):
+            self.assertEqual(args[:3], ['v4l2-ctl', '-d', '/dev/video2'])
+            return SimpleNamespace(returncode=0, stdout=V4L2_OUTPUT)
+
+        modes = V4L2CtlProber(2, runner=runner).probe(None)
+        self.assertEqual(modes, [
+            CameraMode('MJPG', 1280, 720, 30.0),
+            CameraMode('MJPG', 640, 480, 30.0),
+            CameraMode('MJPG', 640, 480, 15.0),
+            CameraMode('YUYV', 640, 480, 15.0),
+        ])
+
+    def test_missing_v4l2_ctl(self):
+        """Test that a missing v4l2-ctl binary means no probed modes."""
+        def runner(args, **kwargs):
+            raise FileNotFoundError(args[0])
+
+        self.assertEqual(V4L2CtlProber(0, runner=runner).probe(None), [])
+
+    def test_choose_mode(self):
+        """Test that a mode reaching the requested FPS wins over the preferred format."""
+        self.assertEqual(choose_mode(WEBCAM_MODES, 640, 480, 30, 'YUYV'),
+                         CameraMode('MJPG', 640, 480, 30.0))
+        self.assertEqual(choose_mode(WEBCAM_MODES, 640, 480, 15, 'YUYV'),
+                         CameraMode('YUYV', 640, 480, 15.0))
+        self.assertEqual(choose_mode(WEBCAM_MODES, 1200, 700, 30), CameraMode('MJPG', 1280, 720, 30.0))
+        self.assertEqual(choose_mode([], 640, 480, 30), CameraMode('MJPG', 640, 480, 30.0))
+
+
+class TestNegotiation(unittest.TestCase):
+    """Test applying and verifying settings on the fake capture."""
+
+    def test_mjpg_30fps_negotiated(self):
+        """Test that a camera starting in YUYV ends up in MJPG at 30 fps."""
+        cap = FakeCapture(WEBCAM_MODES)
+        report = negotiate(cap, settings(), StaticProber(WEBCAM_MODES))
+
+        self.assertTrue(report.ok, report.refused)
+        self.assertEqual(report.actual['fourcc'], 'MJPG')
+        self.assertEqual(report.actual['fps'], 30.0)
+        self.assertEqual(report.actual['buffer_size'], 1)
+        # The pixel format must be set before the size
+        props = [prop for prop, _ in cap.set_calls]
+        self.assertLess(props.index(cv2.CAP_PROP_FOURCC), props.index(cv2.CAP_PROP_FRAME_WIDTH))
+
+    def test_manual_exposure_and_focus(self):
+        """Test that manual exposure disables auto exposure first and focus is fixed."""
+        cap = FakeCapture(WEBCAM_MODES)
+        report = negotiate(cap, settings(exposure=150, autofocus=False, focus=30))
+
+        self.assertTrue(report.ok, report.refused)
+        self.assertEqual(cap.get(cv2.CAP_PROP_AUTO_EXPOSURE), 1)
+        self.assertEqual(report.actual['exposure'], 150)
+        self.assertFalse(report.actual['autofocus'])
+        self.assertEqual(report.actual['focus'], 30)
+        self.assertIn('exposure 150', report.describe())
+
+    def test_driver_exposure_left_alone(self):
+        """Test that exposure is not touched when none is configured."""
+        cap = FakeCapture(WEBCAM_MODES)
+        cap.props[cv2.CAP_PROP_AUTO_EXPOSURE] = 1.0     # User set manual exposure in the driver
+        negotiate(cap, settings(), StaticProber(WEBCAM_MODES))
+        props = [prop for prop, _ in cap.set_calls]
+        self.assertNotIn(cv2.CAP_PROP_AUTO_EXPOSURE, props)
+        self.assertNotIn(cv2.CAP_PROP_EXPOSURE, props)
+        self.assertEqual(cap.get(cv2.CAP_PROP_AUTO_EXPOSURE), 1.0)
+
+    def test_refused_settings_reported(self):
+        """Test that properties the driver ignores are reported, not assumed."""
+        yuyv_only = [m for m in WEBCAM_MODES if m.fourcc == 'YUYV']
+        cap = FakeCapture(yuyv_only, supported_props={
+            cv2.CAP_PROP_FOURCC, cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT, cv2.CAP_PROP_FPS,
+        })
+        with self.assertLogs('camera_setup', level='WARNING'):
+            report = negotiate(cap, settings())
+
+        self.assertIn('fourcc', report.refused)
+        self.assertIn('fps', report.refused)
+        self.assertIn('buffer_size', report.refused)
+        self.assertEqual(report.actual['fps'], 15.0)
+
+    def test_open_camera_measures_fps(self):
+        """Test that the delivered frame rate is measured and a slow camera is flagged."""
+        cap = FakeCapture(WEBCAM_MODES)
+        cap.auto_exposure_time = 1 / 12.0     # Dim room: auto exposure caps at 12 fps
+
+        with self.assertLogs('camera_setup', level='WARNING') as logs:
+            opened, report = open_camera(settings(verify_frames=24), lambda device: cap,
+                                         StaticProber(WEBCAM_MODES), clock=cap.clock)
+        self.assertIs(opened, cap)
+        self.assertAlmostEqual(report.measured_fps, 12.0, places=6)
+        self.assertTrue(any('delivers 12.0 fps' in line for line in logs.output))
+
+        cap = FakeCapture(WEBCAM_MODES)
+        _, report = open_camera(settings(verify_frames=24), lambda device: cap, StaticProber(WEBCAM_MODES),
+                                clock=cap.clock)
+        self.assertAlmostEqual(measure_fps(cap, 10, cap.clock), 30.0, places=6)
+        self.assertAlmostEqual(report.measured_fps, 30.0, places=6)
+
+    def test_open_failure(self):
+        """Test that a camera that cannot be opened raises."""
+        cap = FakeCapture(WEBCAM_MODES)
+        cap.release()
+        with self.assertRaises(RuntimeError):
+            open_camera(settings(), lambda device: cap)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+"""
+Unit tests for camera disconnect/reconnect handling.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add src and the test helpers to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from camera_setup import CameraMode
+from fakes import FakeCapture
+from capture_supervisor import CaptureSupervisor
+from clock import SimulatedClock
+from frame_pool import FramePool
+from gesture_pipeline import GesturePipeline
+from output_backend import RecordingBackend
+
+
+MODES = [CameraMode('MJPG', 640, 480, 30.0)]
+
+
+class FlakyCapture(FakeCapture):
+    """FakeCapture whose reads fail or block on demand."""
+
+    def __init__(self, clock, fail_after=None, read_time=1 / 30):
+        super().__init__(MODES)
+        self.sim_clock = clock
+        self.fail_after = fail_after     # Reads that succeed before the device "unplugs"
+        self.read_time = read_time
+        self.reads = 0
+
+    def read(self, image=None):
+        self.sim_clock.advance(self.read_time)
+        self.reads += 1
+        if self.fail_after is not None and self.reads > self.fail_after:
+            return False, None
+        return super().read(image)
+
+
+class FakeDevices:
+    """Opens FlakyCaptures; devices listed in ``unplugged`` fail to open."""
+
+    def __init__(self, clock, fail_after=None):
+        self.clock = clock
+        self.fail_after = dict(fail_after or {})
+        self.unplugged = set()
+        self.opened = []
+
+    def __call__(self, device, reconnect):
+        self.clock.advance(0.005)        # Opening takes a few milliseconds
+        if device in self.unplugged:
+            raise RuntimeError(f"Cannot access camera {device}")
+        self.opened.append((device, reconnect))
+        return FlakyCapture(self.clock, self.fail_after.pop(device, None))
+
+
+class TestCaptureSupervisor(unittest.TestCase):
+    """Test failure detection, backoff, fallback devices and recovery."""
+
+    def setUp(self):
+        self.clock = SimulatedClock()
+        self.lost = []
+        self.restored = []
+
+    def supervisor(self, devices, **kwargs):
+        kwargs.setdefault('stall_timeout', 2.0)
+        return CaptureSupervisor(devices, pool=FramePool(), clock=self.clock,
+                                 on_lost=self.lost.append,
+                                 on_restored=lambda device, outage: self.restored.append((device, outage)),
+                                 **kwargs)
+
+    def read_until(self, supervisor, condition, limit=10000):
+        for _ in range(limit):
+            if condition():
+                return
+            if not supervisor.read()[0]:
+                self.clock.advance(0.1)   # The loop waits while the camera is away
+        self.fail("condition not reached")
+
+    def test_reconnects_same_device_after_unplug(self):
+        """Test loss after repeated failures, backoff while unplugged and a fast reopen."""
+        devices = FakeDevices(self.clock, fail_after={0: 30})
+        supervisor = self.supervisor(devices, max_read_failures=5)
+        supervisor.open()
+        frames = [supervisor.read() for _ in range(30)]
+        self.assertTrue(all(success for success, _ in frames))
+
+        devices.unplugged.add(0)
+        for _ in range(5):
+            self.assertEqual(supervisor.read(), (False, None))
+        self.assertFalse(supervisor.connected)
+        self.assertEqual(self.lost, ['read_failures'])
+
+        # While unplugged, attempts back off exponentially up to backoff_max
+        for _ in range(100):
+            supervisor.read()
+            self.clock.advance(0.1)
+        self.assertLess(supervisor.stats.failed_opens, 15)
+        self.assertGreaterEqual(supervisor.stats.failed_opens, 5)
+
+        devices.unplugged.clear()
+        self.read_until(supervisor, lambda: supervisor.connected)
+        self.assertTrue(supervisor.read()[0])
+        self.assertEqual(devices.opened[-1], (0, True))
+        self.assertEqual(supervisor.stats.reconnects, 1)
+        self.assertLess(supervisor.stats.last_reopen, 0.05)
+        self.assertEqual(len(self.restored), 1)
+
+    def test_fallback_device(self):
+        """Test that a missing primary switches to the fallback device."""
+        devices = FakeDevices(self.clock, fail_after={0: 10})
+        supervisor = self.supervisor(devices, max_read_failures=3)
+        supervisor.devices = [0, 2]
+        supervisor.open()
+        devices.unplugged.add(0)
+        self.read_until(supervisor, lambda: supervisor.stats.reconnects == 1)
+        self.assertEqual(supervisor.device, 2)
+        self.assertTrue(supervisor.read()[0])
+
+    def test_device_that_opens_but_stays_dark(self):
+        """Test that a device delivering no frames is skipped on the next loss."""
+        devices = FakeDevices(self.clock, fail_after={0: 5})
+        supervisor = self.supervisor(devices, max_read_failures=3)
+        supervisor.devices = [0, 1]
+        supervisor.open()
+        devices.fail_after[0] = 0        # Reopens, but never delivers
+        self.read_until(supervisor, lambda: supervisor.device == 1 and supervisor.connected)
+        self.assertTrue(supervisor.read()[0])
+
+    def test_stall_and_startup(self):
+        """Test stall detection, max_outage and startup failures."""
+        devices = FakeDevices(self.clock, fail_after={0: 1})
+        supervisor = self.supervisor(devices, max_read_failures=1000, stall_timeout=0.5, max_outage=3.0)
+        supervisor.open()
+        supervisor.read()
+        devices.unplugged.add(0)
+        self.read_until(supervisor, lambda: not supervisor.connected)
+        self.assertEqual(self.lost, ['stall'])
+        self.read_until(supervisor, lambda: supervisor.failed)
+        self.assertGreater(supervisor.outage, 3.0)
+
+        with self.assertRaises(RuntimeError):
+            self.supervisor(devices).open()
+
+    def test_blocked_read_is_counted(self):
+        """Test that a frame that took too long still arrives and is counted."""
+        devices = FakeDevices(self.clock)
+        supervisor = self.supervisor(devices)
+        supervisor.open()
+        supervisor.capture.read_time = 2.5
+        self.assertTrue(supervisor.read()[0])
+        self.assertEqual(supervisor.stats.stalls, 1)
+        self.assertTrue(supervisor.connected)
+
+
+class TestStatePreservation(unittest.TestCase):
+    """Test what the camera loop does on a disconnect."""
+
+    def test_held_button_released_and_state_kept(self):
+        """Test that a drag is released while the pause state and cursor stay."""
+        clock = SimulatedClock()
+        output = RecordingBackend(clock=clock, record_moves=False)
+        pipeline = GesturePipeline(output, clock=clock)
+        pipeline.is_dragging = True
+        pipeline.ploc_x, pipeline.ploc_y = 400.0, 300.0
+        output.mouse_down()
+
+        devices = FakeDevices(clock, fail_after={0: 3})
+        supervisor = CaptureSupervisor(devices, max_read_failures=2, clock=clock,
+                                       on_lost=lambda reason: pipeline.reset_gestures())
+        supervisor.open()
+        for _ in range(5):
+            supervisor.read()
+
+        self.assertEqual([action.name for action in output.actions], ['mouse_down', 'mouse_up'])
+        self.assertFalse(pipeline.is_dragging)
+        self.assertFalse(pipeline.is_paused)
+        self.assertEqual((pipeline.ploc_x, pipeline.ploc_y), (400.0, 300.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Unit tests for pinch onset detection.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from click_onset import PinchOnset, click_session, evaluate
+from gesture_benchmark import replay
+from synthetic_hands import SyntheticSequence
+
+W, H = 640, 480
+
+
+def fingers(distance, depth=0.0):
+    """Landmarks with the index tip ``distance`` pixels right of the thumb tip and ``depth`` pixels behind it."""
+    landmarks = np.full((21, 3), 0.5, dtype=np.float32)
+    landmarks[:, 2] = 0.0
+    landmarks[8, 0] = 0.5 + distance / W
+    landmarks[8, 2] = depth / W
+    return landmarks
+
+
+def feed(onset, distances, fps=30, depth=None):
+    """Feed index-thumb distances frame by frame; return the events."""
+    events = []
+    for i, distance in enumerate(distances):
+        if depth is None:
+            landmarks = fingers(distance)
+        else:
+            landmarks = fingers(distance, depth[i])
+        events.append(onset.update(landmarks, W, H, i / fps, distance))
+    return events
+
+
+class TestPinchOnset(unittest.TestCase):
+    """Test onset, early click and cancellation."""
+
+    def test_fast_pinch_freezes_then_clicks_early(self):
+        """Test that a closing pinch freezes the cursor before it clicks."""
+        onset = PinchOnset(click_distance=30)
+        events = feed(onset, [78] * 5 + [66, 54, 42, 34, 22, 10])
+        self.assertEqual(events.index('onset'), 6)
+        self.assertEqual(events.index('click'), 8)            # One frame before 'pinch'
+        self.assertEqual(events[9], 'pinch')
+        self.assertTrue(onset.frozen and onset.committed)
+        self.assertEqual(onset.as_dict()['unconfirmed'], 0)
+
+    def test_aborted_pinch_cancels(self):
+        """Test that fingers opening again release the cursor without a click."""
+        onset = PinchOnset(click_distance=30)
+        events = feed(onset, [78] * 5 + [66, 54, 50, 58, 70, 78])
+        self.assertIn('onset', events)
+        self.assertNotIn('click', events)
+        self.assertIn('cancel', events)
+        self.assertFalse(onset.frozen)
+
+    def test_jittery_frame_keeps_onset(self):
+        """Test that one frame of the fingers opening slightly does not cancel the onset."""
+        onset = PinchOnset(click_distance=30)
+        events = feed(onset, [78] * 5 + [66, 54, 42, 44, 22, 10])
+        self.assertEqual(events.index('onset'), 6)
+        self.assertNotIn('cancel', events)
+        self.assertEqual(events[9], 'pinch')
+        self.assertEqual(onset.cancels, 0)
+
+    def test_stalled_pinch_times_out(self):
+        """Test that a pinch that stops short is cancelled after twice the lead time."""
+        onset = PinchOnset(click_distance=30, lead_time=0.15)
+        distances = [78] * 5 + [66, 54, 46] + [45.5 - 0.2 * i for i in range(15)]
+        events = feed(onset, distances)
+        start = events.index('onset')
+        self.assertIn('cancel', events[start:start + 11])
+
+    def test_slow_and_still_hands(self):
+        """Test that slowly closing or jittering fingers never start an onset."""
+        self.assertEqual(set(feed(PinchOnset(), np.linspace(78, 40, 60))), {None})
+        jitter = 78 + np.random.default_rng(0).normal(0, 1.5, 300)
+        self.assertEqual(set(feed(PinchOnset(), jitter)), {None})
+
+    def test_depth_closing(self):
+        """Test that a pinch closing along the camera axis is seen through z."""
+        onset = PinchOnset(click_distance=30)
+        depth = [60] * 5 + [48, 36, 24, 12, 0, 0]
+        events = feed(onset, [40] * 11, depth=depth)
+        self.assertIn('onset', events)
+        # The 2D distance alone does not change
+        self.assertEqual(set(feed(PinchOnset(click_distance=30), [40] * 11)), {None})
+
+    def test_depth_gap_delays_early_click(self):
+        """Test that the time to the crossing uses the 3D gap, like the closing speed."""
+        onset = PinchOnset(click_distance=30)
+        # Just outside the click distance in 2D, but still far apart in depth
+        events = feed(onset, [32] * 8, depth=[120] * 5 + [100, 80, 60])
+        self.assertEqual(events[6], 'onset')
+        self.assertNotIn('click', events)
+        self.assertFalse(onset.committed)
+
+
+class TestPipelineOnset(unittest.TestCase):
+    """Test onset detection on replayed synthetic clicks."""
+
+    def test_lower_latency_and_no_drift(self):
+        """Test click latency and wrong-target rate with and without onset detection."""
+        trace = click_session(targets=12, seed=1, pinch_time=0.2).build(noise_px=1.5, seed=1)
+        off = evaluate(trace, {'onset_detection': False}, pinch_time=0.2)
+        on = evaluate(trace, {'onset_detection': True}, pinch_time=0.2)
+        self.assertEqual(off['miss_rate'], 0.0)
+        self.assertEqual(on['miss_rate'], 0.0)
+        self.assertLess(on['latency_ms'], off['latency_ms'])
+        self.assertGreater(off['wrong_target_rate'], 0.5)      # The fingertip drags the cursor
+        self.assertEqual(on['wrong_target_rate'], 0.0)
+        self.assertEqual(on['near_miss_click_rate'], 0.0)
+        self.assertEqual(on['extra_clicks'], 0)
+
+    def test_cursor_resumes_after_cancel(self):
+        """Test that the cursor follows the hand again after a pinch stops short."""
+        sequence = SyntheticSequence(transition=0.2).hold(1.0).near_click(closeness=0.5)
+        sequence.move((0.7, 0.5), 0.5).hold(0.5)
+        backend, cursor, _, _ = replay(sequence.build(), {'onset_detection': True})
+        self.assertEqual(backend.of_type('click'), [])
+        self.assertGreater(cursor[-1, 0] - cursor[30, 0], 300)
+
+    def test_double_click_with_onset(self):
+        """Test that quick double pinches still double click."""
+        trace = SyntheticSequence(transition=0.1).hold(0.5).double_click().hold(0.5).build()
+        backend = replay(trace, {'onset_detection': True})[0]
+        self.assertEqual([a.name for a in backend.actions if a.name != 'move'], ['click', 'double_click'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+"""
+Unit tests for detector warm-up and keep-warm passes.
+"""
+
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from detector_warmup import DetectorWarmup, first_call_latencies, summarize_latencies, warmup_frames
+from logger_setup import StartupTimer
+
+
+class LazyDetector:
+    """Detector stand-in whose first calls pay for lazy setup."""
+
+    name = 'lazy'
+
+    def __init__(self, cold_calls=3, cold_time=0.03):
+        self.cold_calls = cold_calls
+        self.cold_time = cold_time
+        self.calls = []           # (timestamp, thread name, frame had content)
+        self.tracking = False
+
+    def detect(self, rgb_frame, timestamp):
+        if len(self.calls) < self.cold_calls:
+            time.sleep(self.cold_time)
+        has_content = bool(rgb_frame.std(axis=(0, 1)).max() > 0)
+        self.calls.append((timestamp, threading.current_thread().name, has_content))
+        self.tracking = has_content
+        return np.zeros((21, 3), dtype=np.float32) if has_content else None
+
+    def close(self):
+        pass
+
+
+class TestWarmupFrames(unittest.TestCase):
+    """Test the synthetic detector inputs."""
+
+    def test_hand_frames_end_blank(self):
+        """Test sizes and that only the last frame is blank."""
+        frames = warmup_frames(320, 240, 5)
+        self.assertEqual(len(frames), 5)
+        self.assertTrue(all(frame.shape == (240, 320, 3) and frame.dtype == np.uint8 for frame in frames))
+        self.assertTrue(all(frame.std(axis=(0, 1)).max() > 0 for frame in frames[:-1]))
+        self.assertEqual(frames[-1].std(axis=(0, 1)).max(), 0)
+        self.assertEqual(len(warmup_frames(320, 240, 0)), 1)
+
+
+class TestDetectorWarmup(unittest.TestCase):
+    """Test startup warm-up and keep-warm passes."""
+
+    def test_background_warmup_overlaps_camera_open(self):
+        """Test that the warm-up runs on a thread alongside other startup work."""
+        detector = LazyDetector(cold_calls=3, cold_time=0.05)
+        warmup = DetectorWarmup(detector, (160, 120), frames=6)
+        start = time.perf_counter()
+        warmup.start()
+        time.sleep(0.15)                    # Opening the camera
+        self.assertTrue(warmup.wait(timeout=5))
+        elapsed = time.perf_counter() - start
+        self.assertLess(elapsed, 0.28)      # Sequential would be >= 0.3 s
+        self.assertEqual(len(warmup.latencies), 6)
+        self.assertGreater(warmup.latencies[0], 40)
+        self.assertEqual({name for _, name, _ in detector.calls}, {'detector-warmup'})
+
+    def test_leaves_detector_ready_for_real_frames(self):
+        """Test increasing timestamps before real frames and no synthetic hand left tracked."""
+        detector = LazyDetector(cold_time=0.0)
+        DetectorWarmup(detector, (160, 120), frames=4).run()
+        timestamps = [t for t, _, _ in detector.calls]
+        self.assertEqual(timestamps, sorted(timestamps))
+        self.assertLess(timestamps[-1], 1.0)
+        self.assertFalse(detector.tracking)
+        self.assertTrue(detector.calls[0][2])
+
+    def test_first_calls_are_fast_after_warmup(self):
+        """Test the latency benchmark with and without warm-up."""
+        frames = warmup_frames(160, 120, 4)
+        cold = summarize_latencies(first_call_latencies(LazyDetector(cold_time=0.06), frames, count=10))
+        warm_detector = LazyDetector(cold_time=0.06)
+        warmup = DetectorWarmup(warm_detector, (160, 120), frames=5)
+        warm = summarize_latencies(first_call_latencies(warm_detector, frames, 10, warmup))
+        self.assertGreater(cold['first_ms'], 55)
+        self.assertGreater(cold['first5_mean_ms'], 30)
+        self.assertLess(warm['max_ms'], 30)
+        self.assertEqual(len(warm['latencies_ms']), 10)
+
+    def test_failing_backend_does_not_stop_startup(self):
+        """Test that a detector error is recorded instead of raised."""
+        class Broken:
+            def detect(self, frame, timestamp):
+                raise RuntimeError("model missing")
+
+        warmup = DetectorWarmup(Broken(), (64, 48), frames=3).start()
+        self.assertTrue(warmup.wait(timeout=5))
+        self.assertIsInstance(warmup.error, RuntimeError)
+
+    def test_keep_warm_while_unused(self):
+        """Test keep-warm passes only after the interval without detection."""
+        detector = LazyDetector(cold_time=0.0)
+        warmup = DetectorWarmup(detector, (160, 120), frames=0, keep_warm_interval=2.0)
+        warmup.mark_used(10.0)
+        self.assertFalse(warmup.keep_warm(11.0))
+        self.assertTrue(warmup.keep_warm(12.0))
+        self.assertEqual([has for _, _, has in detector.calls], [True, False])
+        self.assertFalse(detector.tracking)
+        self.assertFalse(warmup.keep_warm(13.5))
+        self.assertTrue(warmup.keep_warm(14.0))
+        warmup.mark_used(15.0)
+        self.assertFalse(warmup.keep_warm(16.0))
+        self.assertEqual(warmup.rewarms, 2)
+
+        disabled = DetectorWarmup(detector, (160, 120), frames=0, keep_warm_interval=0)
+        self.assertFalse(disabled.keep_warm(100.0))
+
+
+class TestStartupTimer(unittest.TestCase):
+    """Test the startup breakdown line."""
+
+    def test_summary(self):
+        """Test sequential and parallel stages."""
+        times = iter([0.0, 0.2, 1.5])
+        timer = StartupTimer(clock=lambda: next(times))
+        timer.mark('detector')
+        timer.mark('camera')
+        timer.add('warm-up', 0.4)
+        self.assertEqual(timer.summary(),
+                         "detector 200 ms, camera 1300 ms, warm-up 400 ms (parallel), total 1.5 s")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Unit tests for multi-monitor display targeting, using a fake topology provider.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add src and the test helpers to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from display_topology import DisplayTargeting, DisplayTopology, Monitor, scale_from_dpi
+from fakes import FakeTopologyProvider
+from gesture_pipeline import GesturePipeline
+from output_backend import RecordingBackend
+from synthetic_hands import SyntheticSequence
+
+
+# A 4K laptop panel at 2x on the left, a 1080p primary monitor on the right
+LAPTOP = Monitor('eDP-1', 0, 0, 3840, 2160, 2.0, False)
+EXTERNAL = Monitor('HDMI-1', 3840, 0, 1920, 1080, 1.0, True)
+
+
+class TestDisplayTopology(unittest.TestCase):
+    """Test the cached monitor layout."""
+
+    def test_desktop_bounds_and_primary(self):
+        """Test that the desktop covers all monitors and the primary is found."""
+        topology = DisplayTopology(FakeTopologyProvider([EXTERNAL, LAPTOP]))
+        self.assertEqual(topology.primary.name, 'HDMI-1')
+        self.assertEqual(tuple(topology.desktop[1:5]), (0, 0, 5760, 2160))
+        self.assertEqual([m.name for m in topology.monitors], ['eDP-1', 'HDMI-1'])
+        self.assertEqual(topology.find('1').name, 'HDMI-1')
+        self.assertEqual(topology.monitor_at(4000, 100).name, 'HDMI-1')
+        self.assertEqual(topology.monitor_at(5000, 1500).name, 'HDMI-1')
+
+    def test_scale_overrides_and_dpi(self):
+        """Test DPI scale detection and configured overrides."""
+        self.assertEqual(scale_from_dpi(3840, 344), 3.0)
+        self.assertEqual(scale_from_dpi(1920, 527), 1.0)
+        self.assertEqual(scale_from_dpi(1920, 0), 1.0)
+        topology = DisplayTopology(FakeTopologyProvider([LAPTOP, EXTERNAL]), {'eDP-1': 1.5})
+        self.assertEqual(topology.find('eDP-1').scale, 1.5)
+
+
+class TestDisplayTargeting(unittest.TestCase):
+    """Test region selection and cache invalidation."""
+
+    def test_targets(self):
+        """Test primary, desktop and named monitor targets."""
+        provider = FakeTopologyProvider([LAPTOP, EXTERNAL])
+        topology = DisplayTopology(provider)
+        self.assertEqual(DisplayTargeting(topology, 'primary').region.name, 'HDMI-1')
+        self.assertEqual(DisplayTargeting(topology, 'desktop').region.width, 5760)
+        self.assertEqual(DisplayTargeting(topology, 'eDP-1').region.scale, 2.0)
+        self.assertEqual(DisplayTargeting(topology, 'missing').region.name, 'HDMI-1')
+
+    def test_layout_cached_until_change(self):
+        """Test that frames reuse the cached region and a change event refreshes it."""
+        provider = FakeTopologyProvider([LAPTOP, EXTERNAL])
+        display = DisplayTargeting(DisplayTopology(provider), 'desktop', poll_interval=0.5)
+        region = display.update(0.5, 0.0)
+        for i in range(100):
+            self.assertIs(display.update(0.5, i / 30), region)
+        self.assertEqual(provider.queries, 1)
+
+        provider.set_monitors([EXTERNAL])
+        self.assertIs(display.update(0.5, 3.4), region)      # Not polled yet
+        updated = display.update(0.5, 3.5)
+        self.assertEqual(tuple(updated[1:5]), (3840, 0, 1920, 1080))
+        self.assertEqual(provider.queries, 2)
+
+    def test_focus_edge_switch(self):
+        """Test that holding past an edge moves the focus to the neighbouring monitor."""
+        display = DisplayTargeting(DisplayTopology(FakeTopologyProvider([LAPTOP, EXTERNAL])),
+                                   'focus', edge_switch_time=0.5)
+        self.assertEqual(display.update(-0.1, 0.0).name, 'HDMI-1')
+        self.assertEqual(display.update(-0.1, 0.4).name, 'HDMI-1')
+        self.assertEqual(display.update(-0.1, 0.5).name, 'eDP-1')
+        # No monitor further left; a brief excursion right does not switch
+        self.assertEqual(display.update(-0.1, 1.5).name, 'eDP-1')
+        self.assertEqual(display.update(1.1, 1.6).name, 'eDP-1')
+        self.assertEqual(display.update(0.5, 1.7).name, 'eDP-1')
+
+        display.set_focus_point(5000, 500)
+        self.assertEqual(display.region.name, 'HDMI-1')
+
+
+class TestPipelineDisplay(unittest.TestCase):
+    """Test the gesture pipeline mapping onto a chosen monitor."""
+
+    def replay_positions(self, settings, target, end=0.8):
+        trace = SyntheticSequence(start=(0.2, 0.5)).hold(0.5).move((end, 0.5), 1.0).hold(0.5).build()
+        display = DisplayTargeting(DisplayTopology(FakeTopologyProvider([LAPTOP, EXTERNAL])), target)
+        backend = RecordingBackend((5760, 2160), record_moves=False)
+        pipeline = GesturePipeline(backend, settings, display=display)
+
+        positions = []
+        for now, landmarks in zip(trace.timestamps, trace.landmarks):
+            pipeline.process(landmarks, trace.width, trace.height, now)
+            positions.append(backend.position)
+        return positions
+
+    def test_absolute_stays_on_target_monitor(self):
+        """Test that absolute mode maps the active area onto the target monitor only."""
+        positions = self.replay_positions({'smoothening': 1}, 'HDMI-1')
+        for x, y in positions:
+            self.assertTrue(3840 <= x <= 5760 and 0 <= y <= 1080)
+
+    def test_relative_gain_follows_dpi_scale(self):
+        """Test that a 2x monitor gets twice the relative cursor travel."""
+        def travel(target):
+            positions = self.replay_positions({'cursor_mode': 'relative', 'smoothening': 1}, target, end=0.35)
+            return positions[-1][0] - positions[0][0]
+
+        self.assertAlmostEqual(travel('eDP-1'), 2 * travel('HDMI-1'), delta=1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+"""
+Unit tests for dwell clicking.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from clock import SimulatedClock
+from dwell_click import DwellClicker, RunningStats
+from gesture_benchmark import replay
+from gesture_pipeline import GesturePipeline
+from output_backend import RecordingBackend
+from synthetic_hands import SyntheticSequence
+
+DWELL = {'dwell_click': True, 'dwell_time': 0.6, 'dwell_radius': 30}
+
+
+def run(clicker, points, fps=30):
+    """Feed (x, y) cursor positions at a frame rate; return the click times."""
+    return [i / fps for i, (x, y) in enumerate(points) if clicker.update(x, y, i / fps)]
+
+
+class TestRunningStats(unittest.TestCase):
+    """Test the Welford accumulator."""
+
+    def test_matches_batch_statistics(self):
+        """Test mean and spread against NumPy."""
+        points = np.random.default_rng(0).normal((500, 300), 4, (200, 2))
+        stats = RunningStats()
+        for x, y in points:
+            stats.add(x, y)
+        self.assertAlmostEqual(stats.mean_x, points[:, 0].mean())
+        self.assertAlmostEqual(stats.mean_y, points[:, 1].mean())
+        spread = np.sqrt(((points - points.mean(axis=0)) ** 2).sum(axis=1).mean())
+        self.assertAlmostEqual(stats.spread, spread)
+        stats.reset()
+        self.assertEqual((stats.count, stats.spread), (0, 0.0))
+
+
+class TestDwellClicker(unittest.TestCase):
+    """Test dwell timing, cancellation and re-arming."""
+
+    def test_still_cursor_clicks_once(self):
+        """Test one click after the dwell time, then none while resting."""
+        jitter = np.random.default_rng(1).normal(0, 3, (120, 2))
+        clicks = run(DwellClicker(radius=30, dwell_time=1.0), (400, 300) + jitter)
+        self.assertEqual(len(clicks), 1)
+        self.assertAlmostEqual(clicks[0], 1.0, delta=1 / 30 + 1e-9)
+
+    def test_movement_cancels(self):
+        """Test that leaving the radius restarts the dwell."""
+        clicker = DwellClicker(radius=30, dwell_time=1.0)
+        points = [(400, 300)] * 25 + [(480, 300)] * 25 + [(480, 300)] * 10
+        clicks = run(clicker, points)
+        self.assertEqual(clicks, [55 / 30])
+        self.assertEqual(clicker.cancels, 1)
+
+    def test_moving_cursor_never_clicks(self):
+        """Test that a cursor moving faster than the radius per dwell does not click."""
+        points = [(100 + 4 * i, 300) for i in range(300)]      # 120 px/s
+        clicker = DwellClicker(radius=30, dwell_time=1.0)
+        self.assertEqual(run(clicker, points), [])
+        self.assertLess(clicker.progress, 1.0)
+
+    def test_slow_drift_never_clicks(self):
+        """Test that a drift the running mean keeps up with does not click."""
+        points = [(100 + 50 * i / 30, 300) for i in range(90)]  # 50 px/s
+        clicker = DwellClicker(radius=30, dwell_time=1.0)
+        self.assertEqual(run(clicker, points), [])
+        self.assertGreater(clicker.cancels, 0)
+
+    def test_rearm_after_moving(self):
+        """Test that a second click needs the cursor to move away first."""
+        clicker = DwellClicker(radius=30, dwell_time=0.5)
+        points = [(400, 300)] * 40 + [(600, 300)] * 40
+        self.assertEqual(len(run(clicker, points)), 2)
+
+        clicker = DwellClicker(radius=30, dwell_time=0.5)
+        clicker.update(400, 300, 0.0)
+        clicker.cancel(until_moved=True)      # E.g. a pinch click here
+        self.assertEqual(run(clicker, [(400, 300)] * 60), [])
+        self.assertFalse(clicker.armed)
+
+    def test_progress(self):
+        """Test progress values for the ring."""
+        clicker = DwellClicker(radius=30, dwell_time=1.0)
+        clicker.update(400, 300, 0.0)
+        clicker.update(401, 300, 0.25)
+        self.assertAlmostEqual(clicker.progress, 0.25)
+        clicker.cancel()
+        self.assertEqual(clicker.progress, 0.0)
+
+
+class TestPipelineDwell(unittest.TestCase):
+    """Test dwell clicking in the gesture pipeline on synthetic traces."""
+
+    def test_dwell_clicks_after_pointing(self):
+        """Test one click per hold after a pointing move."""
+        # The cursor first catches up with the hand (smoothing), then dwells
+        sequence = SyntheticSequence(start=(0.3, 0.4)).hold(1.3)
+        sequence.move((0.6, 0.5), 0.4).hold(1.0).move((0.4, 0.6), 0.4).hold(0.3)
+        backend = replay(sequence.build(noise_px=1.5, seed=2), DWELL)[0]
+        clicks = [a.time for a in backend.of_type('click')]
+        self.assertEqual(len(clicks), 2)
+        self.assertTrue(0.6 <= clicks[0] < 1.3)
+        self.assertTrue(2.3 <= clicks[1] < 2.7)
+
+        # Off by default
+        self.assertEqual(replay(sequence.build(noise_px=1.5, seed=2))[0].of_type('click'), [])
+
+    def test_pinch_click_does_not_dwell_again(self):
+        """Test that a pinch click at rest is not followed by a dwell click."""
+        sequence = SyntheticSequence().hold(0.3).click().hold(1.5)
+        backend = replay(sequence.build(), dict(DWELL, dwell_time=1.0))[0]
+        self.assertEqual(len(backend.of_type('click')), 1)
+
+    def test_rebound_and_progress_ring(self):
+        """Test the dwell binding and the progress ring with a simulated clock."""
+        clock = SimulatedClock()
+        backend = RecordingBackend((1920, 1080))
+        pipeline = GesturePipeline(backend, dict(DWELL, bindings={'dwell': 'right_click'}),
+                                   (1920, 1080), clock=clock)
+        trace = SyntheticSequence().hold(1.5).build()
+        progress = []
+        for i, now in enumerate(trace.timestamps):
+            clock.set(now)
+            pipeline.process(trace.landmarks[i], trace.width, trace.height)
+            progress.append(pipeline.dwell_ring[3] if pipeline.dwell_ring else 0.0)
+        self.assertEqual(len(backend.of_type('right_click')), 1)
+        self.assertEqual(backend.of_type('click'), [])
+        # The ring closes steadily up to the click
+        peak = progress.index(max(progress))
+        self.assertGreater(progress[peak], 0.9)
+        self.assertEqual(progress[peak - 10:peak + 1], sorted(progress[peak - 10:peak + 1]))
+        self.assertIsNone(pipeline.dwell_ring)           # Disarmed after the click
+
+        pipeline = GesturePipeline(backend, dict(DWELL, bindings={'dwell': 'none'}), (1920, 1080))
+        self.assertIsNone(pipeline.dwell)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+"""
+Unit tests for the in-memory flight recorder.
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from action_log import read_records
+from clock import SimulatedClock
+from flight_recorder import AnomalyTrigger, FlightRecorder, gesture_state, state_names
+from gesture_pipeline import GesturePipeline
+from landmark_trace import hand_present, read_trace
+from output_backend import RecordingBackend
+from session_replay import replay_records
+from synthetic_hands import SyntheticSequence
+from tracking_continuity import TrackingContinuity
+
+
+def solid(value, size=(640, 480)):
+    """Uniform BGR frame."""
+    return np.full((size[1], size[0], 3), value, dtype=np.uint8)
+
+
+class TestRingBuffers(unittest.TestCase):
+    """Test the fixed-size history."""
+
+    def test_keeps_last_frames_in_order(self):
+        """Test wrap-around, chronological snapshots and frame downscaling."""
+        recorder = FlightRecorder(seconds=1.0, fps=10, frame_width=64)
+        landmarks = np.full((21, 3), 0.25, dtype=np.float32)
+        for i in range(25):
+            recorder.record_frame(i * 0.1, solid(i * 10), landmarks if i % 2 else None, state=i % 4)
+
+        records, frames, actions = recorder.snapshot()
+        self.assertEqual(len(records), 10)
+        np.testing.assert_allclose(records['timestamp'], np.arange(15, 25) * 0.1)
+        self.assertEqual(list(records['frame']), list(range(15, 25)))
+        self.assertEqual(list(hand_present(records)), [i % 2 == 1 for i in range(15, 25)])
+        self.assertTrue((records['landmarks'][~hand_present(records)] == 0).all())
+        self.assertEqual(frames.shape, (10, 48, 64, 3))
+        self.assertEqual([int(frame.mean()) for frame in frames], [i * 10 for i in range(15, 25)])
+        self.assertEqual(len(actions), 0)
+
+    def test_memory_is_bounded(self):
+        """Test that recording never grows or reallocates the buffers."""
+        recorder = FlightRecorder(seconds=2.0, fps=30, frame_width=160)
+        recorder.record_frame(0.0, solid(1), None)
+        size = recorder.nbytes
+        buffers = (recorder.records, recorder.frames, recorder.actions)
+        for i in range(1, 500):
+            recorder.record_frame(i / 30, solid(i % 255), None)
+            recorder.record('move', i, i)
+        self.assertEqual(recorder.nbytes, size)
+        self.assertTrue(all(a is b for a, b in zip(buffers, (recorder.records, recorder.frames, recorder.actions))))
+        self.assertEqual(recorder.frames.shape, (60, 120, 160, 3))
+        self.assertLess(recorder.nbytes, 5e6)
+
+    def test_disabled(self):
+        """Test that a disabled recorder holds and writes nothing."""
+        recorder = FlightRecorder(enabled=False)
+        recorder.record_frame(0.0, solid(1), None)
+        recorder.record('click')
+        self.assertEqual(recorder.nbytes, 0)
+        self.assertIsNone(recorder.dump())
+
+
+class TestDump(unittest.TestCase):
+    """Test dumps of a recorded gesture."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_dump_is_replayable(self):
+        """Test that a dumped click replays to the same click and its actions decode."""
+        clock = SimulatedClock()
+        recorder = FlightRecorder(seconds=5.0, fps=30, frame_width=80, dump_dir=self.tmpdir, clock=clock)
+        inner = RecordingBackend(clock=clock, record_moves=False)
+        pipeline = GesturePipeline(recorder.wrap_output(inner), clock=clock)
+
+        trace = SyntheticSequence().hold(0.3).click().hold(0.5).build()
+        frame = solid(90, (trace.width, trace.height))
+        for i, timestamp in enumerate(trace.timestamps):
+            clock.set(timestamp)
+            pipeline.process(trace.landmarks[i], trace.width, trace.height)
+            recorder.record_frame(timestamp, frame, trace.landmarks[i], gesture_state(pipeline))
+
+        path = recorder.dump('test')
+        recorder.wait()
+        info, records = read_trace(path)
+        self.assertEqual((info.width, info.height), (trace.width, trace.height))
+        self.assertEqual(len(records), len(trace.timestamps))
+        replayed = [action.name for action in replay_records(records, info.width, info.height, record_moves=False)]
+        self.assertEqual(replayed, [action.name for action in inner.actions])
+        self.assertIn('click', replayed)
+
+        actions = list(read_records(path.with_suffix('.actions.bin')))
+        self.assertEqual([a.event for a in actions if a.event != 'move'], ['click'])
+        # Actions are on the frames' time base: the click lands on a frame timestamp
+        click = next(a for a in actions if a.event == 'click')
+        self.assertAlmostEqual(np.abs(records['timestamp'] - click.time).min(), 0.0, places=5)
+        meta = json.loads(path.with_suffix('.json').read_text())
+        self.assertEqual(meta['reason'], 'test')
+        self.assertGreater(meta['clock_offset'], 1e9)      # Wall clock minus simulated time
+        self.assertEqual(np.load(path.with_suffix('.frames.npy')).shape, (len(records), 60, 80, 3))
+
+    def test_state_bits(self):
+        """Test packing and naming the gesture state."""
+        pipeline = SimpleNamespace(is_paused=False, is_dragging=True, scroll_mode_active=False,
+                                   left_pinch_held=True)
+        code = gesture_state(pipeline, coasting=True)
+        self.assertEqual(state_names(code), ['dragging', 'pinch_held', 'coasting'])
+
+
+class TestAnomalyTrigger(unittest.TestCase):
+    """Test automatic dump decisions."""
+
+    def setUp(self):
+        self.pipeline = SimpleNamespace(is_dragging=False)
+        self.continuity = SimpleNamespace(stats=SimpleNamespace(timeouts=0))
+        self.trigger = AnomalyTrigger(stuck_drag_time=8.0, min_interval=30.0)
+
+    def test_stuck_drag_reported_once(self):
+        """Test that a drag held too long triggers one dump."""
+        self.pipeline.is_dragging = True
+        reasons = [self.trigger.update(t * 0.5, self.pipeline, self.continuity) for t in range(40)]
+        self.assertEqual([r for r in reasons if r], ['stuck_drag'])
+        self.assertEqual(reasons.index('stuck_drag'), 17)
+
+    def test_release_timeout_slow_frame_and_rate_limit(self):
+        """Test the other triggers and the minimum interval between dumps."""
+        self.continuity.stats.timeouts = 1
+        self.assertEqual(self.trigger.update(1.0, self.pipeline, self.continuity), 'release_timeout')
+        self.assertIsNone(self.trigger.update(2.0, self.pipeline, self.continuity))
+        self.assertIsNone(self.trigger.update(10.0, self.pipeline, self.continuity, slow_frame=True))
+        self.assertEqual(self.trigger.update(40.0, self.pipeline, self.continuity, slow_frame=True), 'slow_frame')
+
+    def test_release_timeout_only_when_something_was_held(self):
+        """Test that a hand leaving with nothing held does not dump, and a lost drag does."""
+        def reasons(sequence):
+            clock = SimulatedClock()
+            pipeline = GesturePipeline(RecordingBackend((1920, 1080), clock=clock), None,
+                                       (1920, 1080), clock=clock)
+            continuity = TrackingContinuity(pipeline, release_timeout=0.5)
+            trigger = AnomalyTrigger(min_interval=0.0)
+            trace = sequence.build()
+            found = []
+            for i, now in enumerate(trace.timestamps):
+                clock.set(now)
+                continuity.update(trace.landmarks[i] if trace.has_hand[i] else None,
+                                  trace.width, trace.height)
+                found.append(trigger.update(now, pipeline, continuity))
+            return [reason for reason in found if reason]
+
+        hand_exits = SyntheticSequence().hold(0.5)
+        for _ in range(3):
+            hand_exits.gap(1.0).hold(1.0)
+        self.assertEqual(reasons(hand_exits), [])
+
+        lost_drag = SyntheticSequence().hold(0.5).set_pose('left_pinch').hold(1.2).gap(1.0).hold(0.5)
+        self.assertEqual(reasons(lost_drag), ['release_timeout'])
+
+
+if __name__ == '__main__':
+    unittest.main()
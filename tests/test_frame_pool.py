@@ -0,0 +1,158 @@
+"""
+Unit tests for the capture buffer pool and the steady-state frame loop.
+"""
+
+import sys
+import tracemalloc
+import unittest
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from clock import SimulatedClock
+from frame_pool import FramePool
+from frame_preprocess import FramePreprocessor
+from gesture_pipeline import GesturePipeline
+from landmark_utils import draw_landmark_array
+from output_backend import RecordingBackend
+from synthetic_hands import SyntheticSequence
+from tracking_continuity import TrackingContinuity
+
+
+FRAME_BYTES = 480 * 640 * 3
+
+
+class SyntheticCapture:
+    """VideoCapture stand-in that decodes into the array it is given."""
+
+    def __init__(self, size=(640, 480), honor_buffer=True):
+        self.size = size
+        self.honor_buffer = honor_buffer
+        self.scene = np.random.RandomState(0).randint(0, 255, (size[1], size[0], 3)).astype(np.uint8)
+        self.count = 0
+
+    def read(self, image=None):
+        if image is None or not self.honor_buffer or image.shape[:2] != self.size[::-1]:
+            image = np.empty((self.size[1], self.size[0], 3), dtype=np.uint8)
+        np.copyto(image, self.scene)
+        image[0, 0, 0] = self.count % 256
+        self.count += 1
+        return True, image
+
+
+class TestFramePool(unittest.TestCase):
+    """Test buffer reuse."""
+
+    def test_slots_are_reused_round_robin(self):
+        """Test that reads alternate between the same buffers."""
+        pool = FramePool(slots=2)
+        capture = SyntheticCapture()
+        frames = [pool.read(capture)[1] for _ in range(6)]
+        self.assertIs(frames[0], frames[2])
+        self.assertIs(frames[1], frames[5])
+        self.assertIsNot(frames[0], frames[1])
+        self.assertEqual(pool.reallocations, 0)
+        self.assertEqual(pool.nbytes, 2 * FRAME_BYTES)
+
+    def test_backend_that_ignores_buffers(self):
+        """Test that a backend returning new arrays still works and is counted."""
+        pool = FramePool(slots=1)
+        capture = SyntheticCapture(honor_buffer=False)
+        for _ in range(4):
+            success, frame = pool.read(capture)
+            self.assertTrue(success)
+        self.assertEqual(pool.reallocations, 3)
+        self.assertEqual(frame[0, 0, 0], 3)
+
+    def test_in_place_mirror_matches_copy(self):
+        """Test that mirroring the pooled frame gives the same images as copying."""
+        capture = SyntheticCapture()
+        frame = capture.read()[1]
+        copied = FramePreprocessor(320)
+        expected_preview = copied.preview_frame(frame).copy()
+        expected_rgb = copied.inference_frame(frame).copy()
+
+        in_place = FramePreprocessor(320)
+        preview = in_place.preview_frame(frame, in_place=True)
+        self.assertIs(preview, frame)
+        np.testing.assert_array_equal(preview, expected_preview)
+        rgb = in_place.inference_frame(preview, mirrored=True)
+        self.assertLessEqual(int(np.abs(rgb.astype(int) - expected_rgb).max()), 1)
+        self.assertIsNone(in_place.preview)
+
+
+class TestSteadyStateAllocations(unittest.TestCase):
+    """Test that the frame loop allocates no frame-sized memory per frame."""
+
+    def setUp(self):
+        sequence = SyntheticSequence().hold(0.3)
+        for _ in range(5):
+            sequence.move((0.3, 0.3), 0.5).move((0.7, 0.6), 0.5)
+        self.trace = sequence.build(noise_px=1.0, seed=2)
+        self.clock = SimulatedClock()
+        pipeline = GesturePipeline(RecordingBackend(clock=self.clock, record_moves=False), clock=self.clock)
+        self.continuity = TrackingContinuity(pipeline)
+        self.landmarks = np.empty((21, 3), dtype=np.float32)
+
+    def run_loop(self, step, warmup=60):
+        """Run ``step`` per frame; return (net bytes, largest per-frame peak) after warm-up."""
+        for i in range(warmup):
+            step(i)
+        tracemalloc.start()
+        try:
+            start = tracemalloc.get_traced_memory()[0]
+            worst = 0
+            for i in range(warmup, len(self.trace.timestamps)):
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                step(i)
+                worst = max(worst, tracemalloc.get_traced_memory()[1] - before)
+            net = tracemalloc.get_traced_memory()[0] - start
+        finally:
+            tracemalloc.stop()
+        return net, worst
+
+    def gestures(self, i, frame):
+        """Landmarks, gesture pipeline and overlays, as in the camera loop."""
+        self.clock.set(self.trace.timestamps[i])
+        np.copyto(self.landmarks, self.trace.landmarks[i])
+        draw_landmark_array(frame, self.landmarks)
+        for x, y, radius, color in self.continuity.update(self.landmarks, self.trace.width, self.trace.height):
+            cv2.circle(frame, (x, y), radius, color, cv2.FILLED)
+        cv2.putText(frame, "FPS: 30", (520, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+
+    def test_pooled_loop_is_allocation_free(self):
+        """Test near-zero net and per-frame allocations with the pool."""
+        capture = SyntheticCapture()
+        pool = FramePool()
+        preprocessor = FramePreprocessor(320)
+
+        def step(i):
+            frame = preprocessor.preview_frame(pool.read(capture)[1], in_place=True)
+            preprocessor.inference_frame(frame, mirrored=True)
+            self.gestures(i, frame)
+
+        net, worst = self.run_loop(step)
+        self.assertLess(abs(net), 4096)
+        self.assertLess(worst, 32 * 1024)         # Small temporaries only, no frames
+        self.assertEqual(pool.reallocations, 0)
+
+    def test_unpooled_loop_allocates_frames(self):
+        """Test that the measurement catches per-frame frame allocations."""
+        capture = SyntheticCapture()
+
+        def step(i):
+            frame = cv2.flip(capture.read()[1], 1)
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            self.gestures(i, frame)
+
+        worst = self.run_loop(step)[1]
+        self.assertGreater(worst, FRAME_BYTES)
+
+
+if __name__ == '__main__':
+    unittest.main()
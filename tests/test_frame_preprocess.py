@@ -0,0 +1,116 @@
+"""
+Unit tests for detector input preprocessing and the inference size benchmark.
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from frame_preprocess import FramePreprocessor
+from inference_benchmark import benchmark_frames, load_frames
+
+
+def blob_detector():
+    """Fake detector: all landmarks at the centroid of the bright red pixels."""
+    def detect(rgb_frame):
+        ys, xs = np.nonzero(rgb_frame[:, :, 0] > 128)
+        if len(xs) == 0:
+            return None
+        h, w = rgb_frame.shape[:2]
+        point = ((xs.mean() + 0.5) / w, (ys.mean() + 0.5) / h, 0.0)
+        return np.tile(np.array(point, dtype=np.float32), (21, 1))
+    return detect
+
+
+def blob_frames(count=20, size=(640, 480)):
+    """BGR frames with a red square moving right (absent in the last frames)."""
+    frames = []
+    for i in range(count):
+        frame = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+        if i < count - 3:
+            x = 100 + 20 * i
+            frame[200:260, x:x + 60] = (0, 0, 255)
+        frames.append(frame)
+    return frames
+
+
+class TestFramePreprocessor(unittest.TestCase):
+    """Test the resize + mirror + color conversion step."""
+
+    def setUp(self):
+        self.frame = np.random.RandomState(0).randint(0, 256, (480, 640, 3), dtype=np.uint8)
+
+    def test_full_resolution_matches_flip_and_convert(self):
+        """Test that full resolution equals the separate flip and cvtColor calls."""
+        expected = cv2.cvtColor(cv2.flip(self.frame, 1), cv2.COLOR_BGR2RGB)
+        preprocessor = FramePreprocessor(0)
+        np.testing.assert_array_equal(preprocessor.inference_frame(self.frame), expected)
+        np.testing.assert_array_equal(preprocessor.preview_frame(self.frame), cv2.flip(self.frame, 1))
+
+    def test_reduced_resolution_matches_area_resize(self):
+        """Test that a half-size input keeps the aspect ratio and area-averages pixels."""
+        mirrored = cv2.cvtColor(cv2.flip(self.frame, 1), cv2.COLOR_BGR2RGB)
+        expected = cv2.resize(mirrored, (320, 240), interpolation=cv2.INTER_AREA)
+        preprocessor = FramePreprocessor(320)
+        self.assertEqual(preprocessor.inference_size(640, 480), (320, 240))
+        self.assertEqual(preprocessor.inference_size(1280, 720), (320, 180))
+        np.testing.assert_array_equal(preprocessor.inference_frame(self.frame), expected)
+
+        unmirrored = FramePreprocessor(320, mirror=False).inference_frame(self.frame)
+        np.testing.assert_array_equal(unmirrored, cv2.flip(expected, 1))
+
+    def test_buffers_are_reused(self):
+        """Test that no new frame buffers are allocated after the first frame."""
+        preprocessor = FramePreprocessor(320)
+        rgb = preprocessor.inference_frame(self.frame)
+        preview = preprocessor.preview_frame(self.frame)
+        for _ in range(3):
+            self.assertIs(preprocessor.inference_frame(self.frame), rgb)
+            self.assertIs(preprocessor.preview_frame(self.frame), preview)
+
+        # A new camera size reallocates the buffers once
+        smaller = self.frame[:240, :320].copy()
+        self.assertEqual(preprocessor.inference_frame(smaller).shape, (240, 320, 3))
+
+
+class TestInferenceBenchmark(unittest.TestCase):
+    """Test the accuracy vs. speed benchmark on a synthetic video."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_benchmark_recorded_video(self):
+        """Test speed, agreement and landmark error per inference width."""
+        path = Path(self.temp_dir) / "blob.avi"
+        writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), 30, (640, 480))
+        for frame in blob_frames():
+            writer.write(frame)
+        writer.release()
+
+        frames = load_frames(path)
+        self.assertEqual(len(frames), 20)
+        results = benchmark_frames(frames, blob_detector, widths=(160, 320, 1280))
+
+        self.assertEqual(list(results), ['full', '160', '320'])
+        self.assertEqual(results['160']['inference_size'], [160, 120])
+        self.assertEqual(results['full']['error_px'], 0.0)
+        for result in results.values():
+            self.assertEqual(result['agreement'], 1.0)
+            self.assertAlmostEqual(result['detection_rate'], 17 / 20)
+            self.assertLess(result['error_px'], 3.0)
+            self.assertGreater(result['ms_mean'], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+Unit tests for slow-frame incidents and the sampling profiler.
+"""
+
+import gc
+import json
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from frame_profiler import FrameProfiler, SamplingProfiler, load_incidents
+
+
+class FakeClock:
+    """Clock advanced by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def stuck_in_detector(seconds):
+    """Stand-in for a detector call that stalls."""
+    time.sleep(seconds)
+
+
+class TestFrameProfiler(unittest.TestCase):
+    """Test incident capture for frames over budget."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.profilers = []
+
+    def tearDown(self):
+        for profiler in self.profilers:
+            profiler.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def make(self, **kwargs):
+        kwargs.setdefault('incident_dir', self.tmpdir)
+        profiler = FrameProfiler(**kwargs)
+        self.profilers.append(profiler)
+        return profiler
+
+    def run_frame(self, profiler, clock, stages, **kwargs):
+        profiler.start_frame()
+        for stage, seconds in stages:
+            clock.now += seconds
+            profiler.mark(stage)
+        return profiler.end_frame(**kwargs)
+
+    def test_fast_frames_write_nothing(self):
+        """Test that frames within budget leave no incident."""
+        clock = FakeClock()
+        profiler = self.make(budget=0.05, watchdog=False, clock=clock)
+        for _ in range(100):
+            self.assertIsNone(self.run_frame(profiler, clock, [('detect', 0.02), ('draw', 0.01)]))
+        self.assertEqual((profiler.frames, profiler.slow_frames), (100, 0))
+        self.assertEqual(load_incidents(self.tmpdir), [])
+
+    def test_incident_contents(self):
+        """Test stage timings, stacks, GC, landmarks, context and snapshot."""
+        clock = FakeClock()
+        profiler = self.make(budget=0.05, watchdog=False, clock=clock)
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        landmarks = np.full((21, 3), 0.5, dtype=np.float32)
+        path = self.run_frame(profiler, clock, [('capture', 0.01), ('detect', 0.2), ('draw', 0.005)],
+                              frame=frame, landmarks=landmarks, context={'paused': False})
+
+        self.assertIsNotNone(path)
+        incident = json.loads(Path(path).read_text())
+        self.assertEqual([stage for stage, _ in incident['stages_ms']], ['capture', 'detect', 'draw'])
+        self.assertAlmostEqual(incident['stages_ms'][1][1], 200.0, places=3)
+        self.assertAlmostEqual(incident['total_ms'], 215.0, places=3)
+        self.assertIn('MainThread', incident['stacks'])
+        self.assertIn('stats', incident['gc'])
+        self.assertEqual(len(incident['landmarks']), 21)
+        self.assertEqual(incident['context'], {'paused': False})
+        self.assertTrue((Path(self.tmpdir) / incident['snapshot']).exists())
+
+    def test_allowance_cooldown_and_pruning(self):
+        """Test intentional waits, rate limiting and the incident limit."""
+        clock = FakeClock()
+        profiler = self.make(budget=0.05, cooldown=1.0, max_incidents=3, watchdog=False, clock=clock)
+        # An idle frame that waits 250 ms on purpose is not a freeze
+        self.assertIsNone(self.run_frame(profiler, clock, [('display', 0.27)], allowance=0.25))
+
+        written = 0
+        for _ in range(40):
+            if self.run_frame(profiler, clock, [('detect', 0.1)]) is not None:
+                written += 1
+        # 4 s of slow frames with a 1 s cooldown
+        self.assertEqual(written, 4)
+        self.assertEqual(profiler.slow_frames, 40)
+        incidents = load_incidents(self.tmpdir)
+        self.assertEqual(len(incidents), 3)
+        self.assertEqual(incidents[-1][1]['suppressed_since_last'], 9)
+
+    def test_watchdog_samples_overdue_frame(self):
+        """Test that the stack sample shows where a frame was stuck."""
+        profiler = self.make(budget=0.03)
+        profiler.start_frame()
+        stuck_in_detector(0.25)
+        profiler.mark('detect')
+        path = profiler.end_frame()
+
+        incident = json.loads(Path(path).read_text())
+        overdue = incident['overdue_stacks']
+        self.assertIsNotNone(overdue)
+        self.assertGreater(overdue['at_ms'], 30.0)
+        main_stack = overdue['threads'][threading.main_thread().name]
+        self.assertTrue(any('stuck_in_detector' in call for call in main_stack))
+        self.assertNotIn('FrameWatchdog', overdue['threads'])
+
+    def test_watchdog_respects_allowance(self):
+        """Test that an intentional wait is not sampled as an overdue frame."""
+        profiler = self.make(budget=0.03)
+        profiler.start_frame()
+        profiler.allow(0.3)                   # E.g. the idle throttle wait
+        time.sleep(0.15)
+        self.assertIsNone(profiler.end_frame())
+        self.assertIsNone(profiler._overdue)
+
+    def test_gc_during_frame(self):
+        """Test that collections inside a slow frame are recorded."""
+        clock = FakeClock()
+        profiler = self.make(budget=0.05, watchdog=False, clock=clock)
+        profiler.start_frame()
+        gc.collect()
+        clock.now += 0.1
+        incident = json.loads(Path(profiler.end_frame()).read_text())
+        self.assertIn(2, [generation for generation, _ in incident['gc']['collections_in_frame']])
+
+    def test_disabled_and_close(self):
+        """Test that a disabled profiler does nothing and close removes the GC hook."""
+        clock = FakeClock()
+        profiler = self.make(enabled=False, clock=clock)
+        self.assertIsNone(self.run_frame(profiler, clock, [('detect', 1.0)]))
+        self.assertEqual(profiler.frames, 0)
+
+        enabled = self.make(watchdog=False)
+        self.assertIn(enabled._gc_callback, gc.callbacks)
+        enabled.close()
+        self.assertNotIn(enabled._gc_callback, gc.callbacks)
+
+
+class TestSamplingProfiler(unittest.TestCase):
+    """Test collapsed stack aggregation."""
+
+    def test_collapsed_stacks(self):
+        """Test that a busy function dominates the samples and is written out."""
+        sampler = SamplingProfiler(interval=0.005).start()
+        deadline = time.perf_counter() + 0.3
+        try:
+            while time.perf_counter() < deadline:
+                stuck_in_detector(0.01)
+        finally:
+            sampler.stop()
+
+        self.assertGreater(sampler.samples, 10)
+        main = threading.main_thread().name
+        main_stacks = {stack: hits for stack, hits in sampler.stacks.items() if stack.startswith(main + ';')}
+        busy = sum(hits for stack, hits in main_stacks.items() if 'stuck_in_detector' in stack)
+        self.assertGreater(busy / sum(main_stacks.values()), 0.5)
+        self.assertFalse(any('SamplingProfiler' in stack for stack in sampler.stacks))
+
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = Path(tmpdir) / 'profile.collapsed'
+            sampler.write_collapsed(path)
+            lines = path.read_text().splitlines()
+            self.assertEqual(len(lines), len(sampler.stacks))
+            stack, count = lines[0].rsplit(' ', 1)
+            self.assertGreater(int(count), 0)
+            self.assertIn(';', stack)
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Gesture accuracy and latency benchmark, run headless on synthetic hands.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from gesture_benchmark import (
+    BASELINE_PATH, RESULTS_PATH, compare_to_baseline, load_results,
+    replay, run_benchmark, save_results,
+)
+from gesture_pipeline import GesturePipeline
+from output_backend import RecordingBackend
+from synthetic_hands import POSES, SyntheticSequence
+
+
+class TestSyntheticHands(unittest.TestCase):
+    """Test the synthetic sequence generator."""
+
+    def test_labels_and_shapes(self):
+        """Test that gestures are labelled and landmarks are rendered."""
+        seq = SyntheticSequence().hold(0.5).click().move((0.3, 0.3), 0.5).right_click()
+        trace = seq.build()
+        self.assertEqual(trace.landmarks.shape, (len(trace.timestamps), 21, 3))
+        self.assertEqual([label.kind for label in trace.labels], ['click', 'right_click'])
+        self.assertTrue(trace.has_hand.all())
+        np.testing.assert_allclose(trace.target[-1], (0.3, 0.3))
+
+    def test_index_tip_tracks_target_in_open_pose(self):
+        """Test that the open index fingertip sits on the ground-truth cursor."""
+        trace = SyntheticSequence(start=(0.4, 0.6)).hold(0.2).build()
+        np.testing.assert_allclose(trace.landmarks[0, 8, :2], (0.4, 0.6), atol=1e-6)
+
+    def test_dropout_and_noise(self):
+        """Test that dropout hides frames and noise is reproducible."""
+        seq = SyntheticSequence().hold(10)
+        first = seq.build(noise_px=2.0, dropout=0.2, seed=1)
+        second = seq.build(noise_px=2.0, dropout=0.2, seed=1)
+        self.assertLess(first.has_hand.mean(), 0.9)
+        np.testing.assert_array_equal(first.landmarks, second.landmarks)
+
+    def test_fist_pose_is_detected_as_fist(self):
+        """Test that the fist pose satisfies the pipeline's fist check."""
+        from gesture_pipeline import is_fist_array
+        trace = SyntheticSequence().set_pose('fist').build()
+        self.assertTrue(is_fist_array(trace.landmarks[-1], trace.width, trace.height))
+        self.assertIn('fist', POSES)
+
+
+class TestPipelineReplay(unittest.TestCase):
+    """Test the pipeline against labelled gestures."""
+
+    def test_click_produces_one_click_at_target(self):
+        """Test that one pinch gives exactly one click."""
+        trace = SyntheticSequence(start=(0.5, 0.5)).hold(1.0).click().hold(0.5).build()
+        backend, _, _, _ = replay(trace)
+        clicks = backend.of_type('click')
+        self.assertEqual(len(clicks), 1)
+        self.assertLess(abs(clicks[0].time - trace.labels[0].start), 0.15)
+
+    def test_pause_blocks_clicks(self):
+        """Test that no clicks are sent while paused."""
+        trace = SyntheticSequence().hold(0.5).fist().hold(0.5).click().click().build()
+        backend, _, _, _ = replay(trace)
+        self.assertEqual(backend.of_type('pause_toggle')[0].amount, 1)
+        self.assertEqual(backend.of_type('click'), [])
+
+    def test_recording_backend_timestamps(self):
+        """Test that actions carry the backend clock time."""
+        backend = RecordingBackend(clock=lambda: 12.5)
+        GesturePipeline(backend).output.click()
+        self.assertEqual(backend.actions[-1].time, 12.5)
+
+
+class TestGestureBenchmark(unittest.TestCase):
+    """Run the benchmark and compare against the stored baseline."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.results = run_benchmark()
+        save_results(cls.results, RESULTS_PATH)
+
+    def test_reports_all_metrics(self):
+        """Test that every scenario reports the headline metrics."""
+        for result in self.results.values():
+            self.assertIn('recall', result['gestures']['click'])
+            self.assertIn('precision', result['actions']['click'])
+            self.assertIsNotNone(result['click_timing_ms']['mean_abs'])
+            self.assertGreater(result['cursor_lag_ms'], 0)
+            self.assertGreater(result['fps'], 0)          # Throughput depends on the machine
+
+    def test_clean_scenario_detects_everything(self):
+        """Test that noise-free gestures are all recognized."""
+        for kind, stats in self.results['clean']['gestures'].items():
+            self.assertEqual(stats['recall'], 1.0, kind)
+
+    def test_no_regression_against_baseline(self):
+        """Test that accuracy and latency have not regressed."""
+        if not BASELINE_PATH.exists():
+            self.skipTest("No stored baseline")
+        problems = compare_to_baseline(self.results, load_results(BASELINE_PATH))
+        self.assertEqual(problems, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Unit tests for the hand landmark detector backends.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from hand_detector import (
+    HandLandmarkDetector, LandmarkModelDetector, benchmark_detector, create_detector,
+)
+
+
+class FakeLandmarkModel:
+    """
+    Stand-in for a raw landmark model: finds the red square in the input
+    tensor and returns 21 points on its outline, in input pixels.
+    """
+
+    def __init__(self, size=224, channels_first=False, logits=False):
+        self.input_shape = (1, 3, size, size) if channels_first else (1, size, size, 3)
+        self.channels_first = channels_first
+        self.logits = logits
+        self.inputs = []
+
+    def run(self, tensor):
+        image = tensor[0].transpose(1, 2, 0) if self.channels_first else tensor[0]
+        self.inputs.append(image.copy())
+        ys, xs = np.nonzero((image[:, :, 0] > 0.5) & (image[:, :, 2] < 0.5))
+        points = np.zeros((21, 3), dtype=np.float32)
+        presence = 0.0
+        if len(xs):
+            angles = np.linspace(0, 2 * np.pi, 21, endpoint=False)
+            radius = (xs.max() - xs.min() + 1) / 2.0
+            points[:, 0] = xs.mean() + 0.5 + radius * np.cos(angles)
+            points[:, 1] = ys.mean() + 0.5 + radius * np.sin(angles)
+            points[:, 2] = radius
+            presence = 1.0
+        if self.logits:
+            presence = 8.0 if presence else -8.0
+        handedness = np.array([[0.9]], dtype=np.float32)
+        return [points.reshape(1, 63), np.array([[presence]], dtype=np.float32),
+                handedness, np.zeros((1, 63), dtype=np.float32)]
+
+
+def square_frame(center, side=60, size=(640, 480)):
+    """RGB frame with a red square of ``side`` pixels centered at ``center``."""
+    frame = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+    if center is not None:
+        x0, y0 = int(center[0] - side / 2), int(center[1] - side / 2)
+        frame[y0:y0 + side, x0:x0 + side, 0] = 255
+    return frame
+
+
+class TestLandmarkModelDetector(unittest.TestCase):
+    """Test cropping, coordinate mapping and region tracking."""
+
+    def assert_centered(self, landmarks, center, size=(640, 480), delta=2.0):
+        x = landmarks[:, 0].mean() * size[0]
+        y = landmarks[:, 1].mean() * size[1]
+        self.assertAlmostEqual(x, center[0], delta=delta)
+        self.assertAlmostEqual(y, center[1], delta=delta)
+
+    def test_maps_back_to_frame_and_tracks(self):
+        """Test that landmarks come back normalized and the region follows the hand."""
+        model = FakeLandmarkModel()
+        detector = LandmarkModelDetector(model)
+
+        # First frame: the whole frame is letterboxed into the input
+        landmarks = detector.detect(square_frame((200, 300)), 0.0)
+        self.assertEqual(landmarks.shape, (21, 3))
+        self.assert_centered(landmarks, (200, 300), delta=3.0)
+
+        # Next frames: a tracked crop around the hand, so it appears larger
+        landmarks = detector.detect(square_frame((210, 300)), 0.033)
+        self.assert_centered(landmarks, (210, 300))
+        first, second = model.inputs[0], model.inputs[1]
+        self.assertGreater((second[:, :, 0] > 0.5).sum(), 4 * (first[:, :, 0] > 0.5).sum())
+        # Radius of the point ring is half the square's side in frame pixels
+        self.assertAlmostEqual(np.ptp(landmarks[:, 0]) * 640 / 2, 30.0, delta=2.0)
+
+    def test_lost_hand_resets_region(self):
+        """Test that a missing hand returns None and the next search uses the full frame."""
+        detector = LandmarkModelDetector(FakeLandmarkModel())
+        detector.detect(square_frame((200, 300)), 0.0)
+        self.assertIsNone(detector.detect(square_frame(None), 0.033))
+        # The hand reappears far from the old region and is still found
+        landmarks = detector.detect(square_frame((500, 100)), 0.066)
+        self.assert_centered(landmarks, (500, 100), delta=3.0)
+
+    def test_channels_first_and_logits(self):
+        """Test NCHW models and raw presence logits."""
+        model = FakeLandmarkModel(size=192, channels_first=True, logits=True)
+        detector = LandmarkModelDetector(model, min_presence=0.5)
+        self.assertEqual(detector.input_size, 192)
+        self.assert_centered(detector.detect(square_frame((320, 240)), 0.0), (320, 240), delta=3.0)
+        self.assertIsNone(detector.detect(square_frame(None), 0.033))
+
+
+class TestDetectorFactory(unittest.TestCase):
+    """Test backend selection and the benchmark helper."""
+
+    def test_unknown_backend(self):
+        """Test that an unknown backend is rejected."""
+        with self.assertRaises(ValueError):
+            create_detector({'backend': 'opencl'})
+
+    def test_benchmark_reports_latency_and_throughput(self):
+        """Test the per-backend benchmark on a fake model."""
+        frames = [square_frame((200 + 5 * i, 300)) for i in range(10)] + [square_frame(None)] * 2
+        detector = LandmarkModelDetector(FakeLandmarkModel())
+        result = benchmark_detector(detector, frames)
+
+        self.assertAlmostEqual(result['detection_rate'], 10 / 12)
+        self.assertGreater(result['throughput_fps'], 0)
+        self.assertLessEqual(result['p50_ms'], result['p95_ms'])
+
+    def test_callable_interface(self):
+        """Test that detectors work as batch extraction callables."""
+        class Constant(HandLandmarkDetector):
+            def detect(self, rgb_frame, timestamp):
+                self.timestamp = timestamp
+                return np.zeros((21, 3), dtype=np.float32)
+
+        detector = Constant()
+        detector(square_frame(None))
+        first = detector.timestamp
+        detector(square_frame(None))
+        self.assertGreater(detector.timestamp, first)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+Unit tests for idle power saving and its benchmark.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from clock import SimulatedClock
+from idle_monitor import IdleMonitor, MotionDetector
+from idle_benchmark import BusyDetector, SyntheticFrameSource, compare_modes
+
+
+def scene(blob=None, size=(640, 480), seed=0):
+    """Static noisy BGR frame, optionally with a bright block (x0, y0, x1, y1)."""
+    rng = np.random.RandomState(seed)
+    frame = np.full((size[1], size[0], 3), 90, dtype=np.uint8)
+    frame += rng.randint(0, 4, frame.shape).astype(np.uint8)
+    if blob is not None:
+        x0, y0, x1, y1 = blob
+        frame[y0:y1, x0:x1] = (120, 170, 230)
+    return frame
+
+
+class TestMotionDetector(unittest.TestCase):
+    """Test the downscaled frame difference."""
+
+    def test_detects_moving_blob_but_not_noise(self):
+        """Test that sensor noise is ignored and a new object is seen."""
+        motion = MotionDetector()
+        self.assertFalse(motion.update(scene(seed=0)))  # First frame is only the reference
+        self.assertFalse(motion.update(scene(seed=1)))
+        self.assertTrue(motion.update(scene((250, 150, 350, 300), seed=2)))
+        # Still hand: no further motion
+        self.assertFalse(motion.update(scene((250, 150, 350, 300), seed=3)))
+
+    def test_ignores_motion_outside_active_area(self):
+        """Test that the frame_reduction margin is not watched."""
+        motion = MotionDetector(margin=100)
+        motion.update(scene())
+        self.assertFalse(motion.update(scene((0, 0, 90, 480))))
+        self.assertTrue(motion.update(scene((200, 200, 300, 300))))
+
+
+class TestIdleMonitor(unittest.TestCase):
+    """Test the active/idle state machine."""
+
+    def setUp(self):
+        self.monitor = IdleMonitor(idle_after=5.0, idle_fps=4.0, wake_grace=1.0)
+        self.empty = scene()
+        self.hand = scene((250, 150, 350, 300))
+
+    def run_active(self, start, end, has_hand=False, step=1 / 30):
+        """Feed full-rate frames until the monitor goes idle or time runs out."""
+        now = start
+        while now < end:
+            if self.monitor.hand_seen(has_hand, now, self.empty):
+                return now
+            now += step
+        return None
+
+    def test_goes_idle_after_timeout(self):
+        """Test that idle mode starts idle_after seconds after the last hand."""
+        self.monitor.hand_seen(True, 0.0, self.hand)
+        went_idle = self.run_active(0.0, 10.0)
+        self.assertAlmostEqual(went_idle, 5.0, delta=0.05)
+        self.assertTrue(self.monitor.idle)
+        self.assertEqual(self.monitor.stats.idle_entries, 1)
+
+        # Idle frames are throttled to idle_fps
+        self.assertAlmostEqual(self.monitor.frame_delay(0.05), 0.2)
+
+    def test_motion_wakes_and_hand_keeps_active(self):
+        """Test that motion wakes detection and a found hand stays active."""
+        self.run_active(0.0, 10.0)
+        self.assertFalse(self.monitor.motion_seen(scene(seed=1), 5.25))
+        self.assertTrue(self.monitor.motion_seen(self.hand, 5.5))
+        self.assertFalse(self.monitor.idle)
+        self.assertEqual(self.monitor.frame_delay(0.0), 0.0)
+
+        self.monitor.hand_seen(True, 5.5, self.hand)
+        # With a hand found, the full idle_after applies again
+        self.assertIsNone(self.run_active(5.6, 10.0))
+        self.assertEqual(self.monitor.stats.wakeups, 1)
+        self.assertEqual(self.monitor.stats.false_wakeups, 0)
+        self.assertAlmostEqual(self.monitor.stats.idle_seconds, 0.5, delta=0.05)
+
+    def test_close_counts_open_idle_period(self):
+        """Test that a session ending while idle still counts its idle time."""
+        went_idle = self.run_active(0.0, 10.0)
+        self.monitor.close(went_idle + 3.0)
+        self.assertAlmostEqual(self.monitor.stats.idle_seconds, 3.0)
+        self.monitor.close(went_idle + 3.0)              # Closing twice does not count twice
+        self.assertAlmostEqual(self.monitor.stats.idle_seconds, 3.0)
+
+    def test_false_wakeup_returns_quickly(self):
+        """Test that a wake-up without a hand goes idle after wake_grace."""
+        went_idle = self.run_active(0.0, 10.0)
+        self.monitor.motion_seen(self.hand, went_idle + 1.0)
+        again = self.run_active(went_idle + 1.0, 20.0)
+        self.assertAlmostEqual(again - (went_idle + 1.0), 1.0, delta=0.05)
+        self.assertEqual(self.monitor.stats.false_wakeups, 1)
+
+    def test_disabled_never_idles(self):
+        """Test that a disabled monitor stays active."""
+        self.monitor.enabled = False
+        self.assertIsNone(self.run_active(0.0, 20.0))
+        self.assertFalse(self.monitor.idle)
+
+
+class TestIdleBenchmark(unittest.TestCase):
+    """Test the benchmark on a simulated clock."""
+
+    def test_idle_mode_saves_detections_and_wakes_quickly(self):
+        """Test fewer detector calls and a wake latency within one idle frame."""
+        clock = SimulatedClock()
+        results = compare_modes(duration=30.0, hand_intervals=((2.0, 4.0), (21.1, 23.0)),
+                                idle_after=3.0, idle_fps=4.0, detector_cost=0.0,
+                                clock=clock, sleep=clock.sleep)
+        active, idle = results['active'], results['idle']
+
+        self.assertEqual(active['missed_appearances'], 0)
+        self.assertEqual(idle['missed_appearances'], 0)
+        self.assertLess(idle['detector_calls'], active['detector_calls'] / 2)
+        self.assertLessEqual(idle['wake_latency_max'], 0.25 + 1e-6)
+        # 21.1 s falls between two idle polls, so the wake-up waits for one
+        self.assertGreater(idle['wake_latency_max'], 0.0)
+        self.assertLess(active['wake_latency_max'], 1 / 30 + 1e-6)
+        self.assertEqual(idle['idle']['false_wakeups'], 0)
+        self.assertGreaterEqual(idle['idle']['idle_entries'], 2)
+
+    def test_synthetic_source(self):
+        """Test that the blob is visible only during its intervals."""
+        source = SyntheticFrameSource([(1.0, 2.0)])
+        detector = BusyDetector(cost=0.0)
+        self.assertIsNone(detector.detect(source.read(0.5), 0.5))
+        self.assertIsNotNone(detector.detect(source.read(1.5), 1.5))
+        self.assertEqual(detector.calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+"""
+Unit tests for landmark denoising.
+"""
+
+import math
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from gesture_pipeline import GesturePipeline
+from landmark_filter import LandmarkFilter, measure_cost, mode_changes
+from output_backend import RecordingBackend
+from synthetic_hands import SyntheticSequence, standard_session
+
+
+class ScalarOneEuro:
+    """Textbook One Euro filter for one coordinate (reference)."""
+
+    def __init__(self, min_cutoff, beta, d_cutoff):
+        self.min_cutoff, self.beta, self.d_cutoff = min_cutoff, beta, d_cutoff
+        self.x = None
+        self.dx = 0.0
+        self.t = None
+
+    @staticmethod
+    def alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, x, t):
+        if self.x is None:
+            self.x, self.t = x, t
+            return x
+        dt = t - self.t
+        self.t = t
+        dx = (x - self.x) / dt
+        self.dx += self.alpha(self.d_cutoff, dt) * (dx - self.dx)
+        cutoff = self.min_cutoff + self.beta * abs(self.dx)
+        self.x += self.alpha(cutoff, dt) * (x - self.x)
+        return self.x
+
+
+def hand_path(frames, fps=30, speed=0.0, noise=0.0, seed=0):
+    """Landmark frames of a hand moving right at ``speed`` (frame widths/s) with jitter."""
+    rng = np.random.default_rng(seed)
+    base = rng.uniform(0.3, 0.7, (21, 3)).astype(np.float32)
+    frames_out = []
+    for i in range(frames):
+        frame = base.copy()
+        frame[:, 0] += speed * i / fps
+        frame += rng.normal(0, noise, frame.shape).astype(np.float32)
+        frames_out.append(frame)
+    return frames_out
+
+
+class TestLandmarkFilter(unittest.TestCase):
+    """Test the vectorized One Euro filter."""
+
+    def test_matches_scalar_reference(self):
+        """Test every coordinate against a per-coordinate scalar filter."""
+        frames = hand_path(60, speed=0.5, noise=0.003, seed=1)
+        landmark_filter = LandmarkFilter(min_cutoff=1.0, beta=40.0, d_cutoff=10.0)
+        references = [[ScalarOneEuro(1.0, 40.0, 10.0) for _ in range(3)] for _ in range(21)]
+        for i, frame in enumerate(frames):
+            out = landmark_filter.apply(frame, i / 30)
+            expected = [[references[j][k](float(frame[j, k]), i / 30) for k in range(3)] for j in range(21)]
+            np.testing.assert_allclose(out, expected, atol=1e-5)
+
+    def test_reduces_jitter_of_still_hand(self):
+        """Test that frame-to-frame jitter of a still hand is more than halved."""
+        frames = hand_path(150, noise=0.002, seed=2)      # About 1.3 px at 640 px
+        landmark_filter = LandmarkFilter()
+        filtered = np.array([landmark_filter.apply(f, i / 30).copy() for i, f in enumerate(frames)])
+        raw = np.array(frames)
+        raw_jitter = np.diff(raw[30:], axis=0).std()
+        filtered_jitter = np.diff(filtered[30:], axis=0).std()
+        self.assertLess(filtered_jitter, raw_jitter / 2)
+
+    def test_follows_fast_motion(self):
+        """Test that a fast moving hand is tracked within a small lag."""
+        frames = hand_path(30, speed=1.0, seed=3)
+        landmark_filter = LandmarkFilter()
+        for i, frame in enumerate(frames):
+            out = landmark_filter.apply(frame, i / 30)
+        # Under two frames of motion behind at one frame width per second
+        self.assertLess(np.abs(out[:, 0] - frames[-1][:, 0]).max(), 2 / 30)
+
+    def test_restarts_after_gap_and_reset(self):
+        """Test that a gap or a reset passes the next frame through unfiltered."""
+        frames = hand_path(2, seed=4)
+        landmark_filter = LandmarkFilter(max_gap=0.2)
+        landmark_filter.apply(frames[0], 0.0)
+        np.testing.assert_array_equal(landmark_filter.apply(frames[1] + 0.2, 0.5), frames[1] + 0.2)
+        landmark_filter.reset()
+        np.testing.assert_array_equal(landmark_filter.apply(frames[0], 0.53), frames[0])
+
+    def test_reuses_output_buffer(self):
+        """Test that the state arrays are preallocated and reused."""
+        frames = hand_path(3, noise=0.01, seed=5)
+        landmark_filter = LandmarkFilter()
+        outputs = {id(landmark_filter.apply(f, i / 30)) for i, f in enumerate(frames)}
+        self.assertEqual(len(outputs), 1)
+        self.assertEqual(landmark_filter.apply(frames[0], 0.1).dtype, np.float32)
+        self.assertGreater(measure_cost(LandmarkFilter(), frames=50), 0)
+
+
+class TestPipelineDenoise(unittest.TestCase):
+    """Test denoising in the gesture pipeline on replayed traces."""
+
+    def test_less_mode_flicker_on_noisy_trace(self):
+        """Test that noisy landmarks switch gesture modes far less often."""
+        sequence = standard_session()
+        clean = mode_changes(sequence.build(), {'denoise': False})
+        trace = sequence.build(noise_px=4.5, seed=0)
+        raw = mode_changes(trace, {'denoise': False})
+        denoised = mode_changes(trace, {'denoise': True})
+        extra_raw = sum(max(0, raw[name] - clean[name]) for name in clean)
+        extra_denoised = sum(max(0, denoised[name] - clean[name]) for name in clean)
+        self.assertGreater(extra_raw, 20)
+        self.assertLess(extra_denoised, extra_raw / 2)
+
+    def test_enabled_by_default(self):
+        """Test the default and that it can be switched off."""
+        backend = RecordingBackend((1920, 1080))
+        self.assertIsInstance(GesturePipeline(backend, None, (1920, 1080)).denoiser, LandmarkFilter)
+        self.assertIsNone(GesturePipeline(backend, {'denoise': False}, (1920, 1080)).denoiser)
+
+    def test_input_landmarks_untouched(self):
+        """Test that the pipeline does not write into the caller's arrays."""
+        trace = SyntheticSequence().hold(0.3).move((0.7, 0.5), 0.3).build(noise_px=2, seed=1)
+        landmarks = trace.landmarks.copy()
+        pipeline = GesturePipeline(RecordingBackend((1920, 1080)), None, (1920, 1080))
+        for i, now in enumerate(trace.timestamps):
+            pipeline.process(trace.landmarks[i], trace.width, trace.height, now)
+        np.testing.assert_array_equal(trace.landmarks, landmarks)
+
+
+if __name__ == '__main__':
+    unittest.main()
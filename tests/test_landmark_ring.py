@@ -0,0 +1,191 @@
+"""
+Unit tests for the shared-memory landmark ring.
+"""
+
+import multiprocessing
+import os
+import sys
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from landmark_ring import LandmarkRing
+
+
+FRAME_SHAPE = (48, 64)
+NUM_FRAMES = 300
+
+
+def _ring_name(tag):
+    return f"aimtest_{tag}_{os.getpid()}"
+
+
+def synthetic_producer(ring_name, num_frames, start_event):
+    """Publish frames whose pixels and landmarks all encode the sequence number."""
+    ring = LandmarkRing.attach(ring_name)
+    frame = np.zeros(FRAME_SHAPE + (3,), dtype=np.uint8)
+    landmarks = np.zeros((21, 3), dtype=np.float32)
+    start_event.wait(10)
+    try:
+        for i in range(1, num_frames + 1):
+            frame.fill(i % 256)
+            landmarks.fill(i)
+            ring.publish(frame, landmarks if i % 7 else None, timestamp=float(i))
+            time.sleep(0.0005)
+    finally:
+        ring.mark_closed()
+        ring.close()
+
+
+def ring_reader(ring_name, ready_queue, result_queue, in_order):
+    """Consume the ring and report (frames_seen, torn_frames, out_of_order)."""
+    ring = LandmarkRing.attach(ring_name)
+    ready_queue.put(os.getpid())
+    seen = torn = out_of_order = 0
+    last_seq = 0
+    try:
+        while True:
+            ring_frame = ring.wait_next(last_seq, timeout=5.0, latest=not in_order)
+            if ring_frame is None:
+                break
+            if ring_frame.seq <= last_seq:
+                out_of_order += 1
+            consistent = (
+                int(ring_frame.frame[0, 0, 0]) == ring_frame.seq % 256
+                and ring_frame.timestamp == float(ring_frame.seq)
+                and ring_frame.has_hand == bool(ring_frame.seq % 7)
+                and (not ring_frame.has_hand
+                     or float(ring_frame.landmarks[20, 2]) == float(ring_frame.seq))
+            )
+            # A slot reused while we looked at it is a detected overwrite, not
+            # a consistency failure; only count data that claims to be current
+            if ring.is_current(ring_frame):
+                seen += 1
+                if not consistent:
+                    torn += 1
+            last_seq = ring_frame.seq
+        result_queue.put((seen, torn, out_of_order, last_seq))
+    finally:
+        ring.close()
+
+
+class TestLandmarkRing(unittest.TestCase):
+    """Test cases for LandmarkRing in a single process."""
+
+    def setUp(self):
+        self.ring = LandmarkRing.create(_ring_name('single'), FRAME_SHAPE, slots=4)
+
+    def tearDown(self):
+        self.ring.close()
+
+    def test_publish_and_read(self):
+        """Test that a published frame is readable through a second attachment."""
+        frame = np.full(FRAME_SHAPE + (3,), 9, dtype=np.uint8)
+        landmarks = np.arange(63, dtype=np.float32).reshape(21, 3)
+        seq = self.ring.publish(frame, landmarks, timestamp=12.5)
+
+        reader = LandmarkRing.attach(self.ring.name)
+        try:
+            ring_frame = reader.latest()
+            self.assertEqual(ring_frame.seq, seq)
+            self.assertEqual(ring_frame.timestamp, 12.5)
+            self.assertTrue(ring_frame.has_hand)
+            np.testing.assert_array_equal(ring_frame.landmarks, landmarks)
+            np.testing.assert_array_equal(ring_frame.frame, frame)
+            self.assertTrue(reader.is_current(ring_frame))
+        finally:
+            reader.close()
+
+    def test_views_are_zero_copy(self):
+        """Test that reads return views into shared memory."""
+        self.ring.publish(None, np.zeros((21, 3), dtype=np.float32))
+        ring_frame = self.ring.latest()
+        self.assertFalse(ring_frame.landmarks.flags['OWNDATA'])
+        self.assertFalse(ring_frame.frame.flags['OWNDATA'])
+
+    def test_overwritten_slot_detected(self):
+        """Test that readers notice when the writer reuses their slot."""
+        self.ring.publish(None, None)
+        first = self.ring.latest()
+        for _ in range(self.ring.slots):
+            self.ring.publish(None, None)
+
+        self.assertFalse(self.ring.is_current(first))
+        self.assertIsNone(self.ring.read(first.seq))
+
+    def test_no_hand(self):
+        """Test publishing a frame without a detected hand."""
+        self.ring.publish(None, None)
+        self.assertFalse(self.ring.latest().has_hand)
+
+    def test_wait_next_timeout(self):
+        """Test that waiting on an idle ring times out."""
+        self.assertIsNone(self.ring.wait_next(0, timeout=0.01))
+
+    def test_attach_rejects_foreign_memory(self):
+        """Test that a block without the ring header is rejected."""
+        from multiprocessing import shared_memory
+        shm = shared_memory.SharedMemory(name=_ring_name('foreign'), create=True, size=4096)
+        try:
+            with self.assertRaises(ValueError):
+                LandmarkRing.attach(shm.name)
+        finally:
+            shm.close()
+            shm.unlink()
+
+
+class TestLandmarkRingMultiProcess(unittest.TestCase):
+    """Several reader processes fed by one synthetic producer process."""
+
+    def test_multiple_readers(self):
+        """Test that every reader sees consistent, ordered frames."""
+        ring = LandmarkRing.create(_ring_name('multi'), FRAME_SHAPE, slots=64)
+        ready_queue = multiprocessing.Queue()
+        result_queue = multiprocessing.Queue()
+        start_event = multiprocessing.Event()
+
+        readers = [
+            multiprocessing.Process(
+                target=ring_reader,
+                args=(ring.name, ready_queue, result_queue, in_order))
+            for in_order in (True, False, False)
+        ]
+        producer = multiprocessing.Process(
+            target=synthetic_producer, args=(ring.name, NUM_FRAMES, start_event))
+
+        try:
+            for process in readers:
+                process.start()
+            for _ in readers:
+                ready_queue.get(timeout=10)
+            producer.start()
+            start_event.set()
+
+            results = [result_queue.get(timeout=30) for _ in readers]
+            producer.join(10)
+            for process in readers:
+                process.join(10)
+        finally:
+            for process in readers + [producer]:
+                if process.is_alive():
+                    process.terminate()
+            ring.close()
+
+        self.assertEqual(producer.exitcode, 0)
+        for seen, torn, out_of_order, last_seq in results:
+            self.assertGreater(seen, 0)
+            self.assertEqual(torn, 0)
+            self.assertEqual(out_of_order, 0)
+            self.assertEqual(last_seq, NUM_FRAMES)
+
+        # The in-order reader (a recorder) should keep up with this producer
+        self.assertGreater(max(r[0] for r in results), NUM_FRAMES // 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
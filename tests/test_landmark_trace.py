@@ -0,0 +1,157 @@
+"""
+Unit tests for the landmark trace format and batch extraction.
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from landmark_trace import TraceWriter, read_trace, read_trace_info, hand_present
+from batch_extract import extract_video, run_batch, load_checkpoint, CHECKPOINT_NAME
+
+
+def brightness_detector(settings):
+    """Fake detector factory: landmarks encode the mean frame brightness."""
+    def detect(rgb_frame):
+        value = float(rgb_frame.mean())
+        if value < 20:
+            return None
+        return np.full((21, 3), value / 255.0, dtype=np.float32)
+    return detect
+
+
+def write_video(path, num_frames, size=(64, 48)):
+    """Write a short video whose brightness ramps up frame by frame."""
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), 30, size)
+    for i in range(num_frames):
+        writer.write(np.full((size[1], size[0], 3), (i * 8) % 256, dtype=np.uint8))
+    writer.release()
+
+
+class TestTraceFormat(unittest.TestCase):
+    """Test cases for TraceWriter and read_trace."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = Path(self.temp_dir) / "session.trace"
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_round_trip(self):
+        """Test that written frames read back unchanged."""
+        landmarks = np.random.rand(21, 3).astype(np.float32)
+        with TraceWriter(self.path, 640, 480, fps=30, buffer_frames=4) as writer:
+            for i in range(10):
+                writer.write(i / 30.0, i, landmarks if i % 2 else None, gesture=i)
+
+        info, records = read_trace(self.path)
+        self.assertEqual((info.width, info.height), (640, 480))
+        self.assertAlmostEqual(info.fps, 30.0)
+        self.assertEqual(len(records), 10)
+        np.testing.assert_array_equal(records['frame'], np.arange(10))
+        np.testing.assert_array_equal(hand_present(records), np.arange(10) % 2 == 1)
+        np.testing.assert_array_equal(records['landmarks'][1], landmarks)
+        self.assertEqual(int(records['gesture'][7]), 7)
+
+    def test_mmap_matches_read(self):
+        """Test that memory-mapped reads match regular reads."""
+        with TraceWriter(self.path, 320, 240) as writer:
+            for i in range(300):
+                writer.write(float(i), i, np.full((21, 3), i, dtype=np.float32))
+
+        _, records = read_trace(self.path)
+        _, mapped = read_trace(self.path, mmap=True)
+        np.testing.assert_array_equal(records['landmarks'], mapped['landmarks'])
+
+    def test_rejects_other_files(self):
+        """Test that a file without the trace header is rejected."""
+        self.path.write_bytes(b'not a trace file at all, really not')
+        with self.assertRaises(ValueError):
+            read_trace_info(self.path)
+
+
+class TestBatchExtract(unittest.TestCase):
+    """Test cases for batch extraction with a fake detector."""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.videos = self.temp_dir / "videos"
+        self.traces = self.temp_dir / "traces"
+        (self.videos / "user1").mkdir(parents=True)
+        write_video(self.videos / "a.avi", 20)
+        write_video(self.videos / "user1" / "b.avi", 12)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_extract_video_keeps_order(self):
+        """Test that frames are written in temporal order."""
+        trace_path = self.traces / "a.trace"
+        stats = extract_video(brightness_detector(None), self.videos / "a.avi", trace_path)
+
+        self.assertEqual(stats['frames'], 20)
+        self.assertFalse(trace_path.with_name("a.trace.part").exists())
+        _, records = read_trace(trace_path)
+        np.testing.assert_array_equal(records['frame'], np.arange(20))
+        self.assertTrue(np.all(np.diff(records['timestamp']) > 0))
+
+        # Brightness ramps up, so detected landmark values must increase too
+        values = records['landmarks'][hand_present(records), 0, 0]
+        self.assertTrue(np.all(np.diff(values) > 0))
+
+    def test_batch_and_resume(self):
+        """Test the worker pool, checkpointing and resuming."""
+        summary = run_batch(self.videos, self.traces, workers=2,
+                            detector_factory=brightness_detector, show_progress=False)
+        self.assertEqual(summary['videos'], 2)
+        self.assertEqual(summary['frames'], 32)
+        self.assertGreater(summary['fps_per_core'], 0)
+        self.assertTrue((self.traces / "user1" / "b.trace").exists())
+        self.assertEqual(set(load_checkpoint(self.traces)), {"a.avi", "user1/b.avi"})
+
+        # Nothing left to do on a second run
+        summary = run_batch(self.videos, self.traces, workers=2,
+                            detector_factory=brightness_detector, show_progress=False)
+        self.assertEqual(summary['videos'], 0)
+        self.assertEqual(summary['skipped'], 2)
+
+        # A video missing from the checkpoint (killed run) is redone
+        checkpoint_path = self.traces / CHECKPOINT_NAME
+        checkpoint = json.loads(checkpoint_path.read_text())
+        del checkpoint["a.avi"]
+        checkpoint_path.write_text(json.dumps(checkpoint))
+        summary = run_batch(self.videos, self.traces, workers=2,
+                            detector_factory=brightness_detector, show_progress=False)
+        self.assertEqual(summary['videos'], 1)
+        self.assertEqual(summary['frames'], 20)
+
+    def test_unreadable_video_does_not_abort(self):
+        """Test that a broken video is recorded as failed and the rest still finish."""
+        (self.videos / "broken.avi").write_bytes(b"not a video")
+        summary = run_batch(self.videos, self.traces, workers=2,
+                            detector_factory=brightness_detector, show_progress=False)
+        self.assertEqual(summary['videos'], 2)
+        self.assertEqual(list(summary['failed']), ["broken.avi"])
+        self.assertIn('error', load_checkpoint(self.traces)["broken.avi"])
+
+        # A resume skips the failure; --retry-failed tries it again
+        summary = run_batch(self.videos, self.traces, workers=2,
+                            detector_factory=brightness_detector, show_progress=False)
+        self.assertEqual((summary['skipped'], summary['failed']), (3, {}))
+        summary = run_batch(self.videos, self.traces, workers=2, detector_factory=brightness_detector,
+                            show_progress=False, retry_failed=True)
+        self.assertEqual(list(summary['failed']), ["broken.avi"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,246 @@
+"""
+Unit tests for the closed-loop performance governor.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from clock import SimulatedClock
+from detector_warmup import DetectorSwap
+from frame_preprocess import FramePreprocessor
+from performance_governor import PerformanceGovernor, QualityLevel, quality_levels
+
+
+class SyntheticDetector:
+    """Detector stand-in whose cost scales with its input size and model."""
+
+    def __init__(self, clock, ms_per_kilopixel=0.5, model_complexity=1, lite_factor=0.6):
+        self.clock = clock
+        self.ms_per_kilopixel = ms_per_kilopixel
+        self.model_complexity = model_complexity
+        self.lite_factor = lite_factor
+
+    def detect(self, rgb_frame, timestamp):
+        cost = rgb_frame.shape[0] * rgb_frame.shape[1] / 1000 * self.ms_per_kilopixel / 1000
+        if self.model_complexity == 0:
+            cost *= self.lite_factor
+        self.clock.advance(cost)
+        return None
+
+    def close(self):
+        pass
+
+
+class SimulatedLoop:
+    """Camera loop with simulated time: capture, detect, draw, preview."""
+
+    PREVIEW_COST = 0.006
+    LANDMARK_COST = 0.002
+
+    def __init__(self, governor, ms_per_kilopixel, camera_fps=30.0, cpu_threads=1.0):
+        self.clock = SimulatedClock()
+        self.governor = governor
+        self.governor.cpu_clock = lambda: self.cpu
+        self.cpu_threads = cpu_threads     # CPU seconds per second of frame work
+        self.cpu = 0.0
+        self.camera_interval = 1.0 / camera_fps
+        self.preprocessor = FramePreprocessor(governor.quality.inference_width)
+        self.detector = SyntheticDetector(self.clock, ms_per_kilopixel, governor.quality.model_complexity)
+        self.inputs = {}            # Detector input per size (resizing is not simulated)
+        self.changes = []
+        self.frame_index = 0
+
+    def run(self, seconds):
+        end = self.clock() + seconds
+        while self.clock() < end:
+            start = self.clock()
+            quality = self.governor.quality
+            size = self.preprocessor.inference_size(640, 480)
+            if size not in self.inputs:
+                self.inputs[size] = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+            self.detector.detect(self.inputs[size], start)
+            self.frame_index += 1
+            if self.frame_index % quality.preview_interval == 0:
+                self.clock.advance(self.PREVIEW_COST + (self.LANDMARK_COST if quality.draw_landmarks else 0))
+            cost = self.clock() - start
+            self.cpu += cost * self.cpu_threads
+            # The camera delivers the next frame on its own schedule
+            self.clock.advance(max(0.0, self.camera_interval - cost))
+            changed = self.governor.frame(cost, self.clock())
+            if changed is not None:
+                self.preprocessor.set_inference_width(changed.inference_width)
+                self.detector.model_complexity = changed.model_complexity
+                self.changes.append((self.clock(), self.governor.level))
+        return self
+
+    def frame_cost(self, level):
+        """Steady-state cost of one frame at a level (preview averaged)."""
+        quality = self.governor.levels[level]
+        width, height = FramePreprocessor(quality.inference_width).inference_size(640, 480)
+        detect = width * height / 1000 * self.detector.ms_per_kilopixel / 1000
+        if quality.model_complexity == 0:
+            detect *= self.detector.lite_factor
+        preview = self.PREVIEW_COST + (self.LANDMARK_COST if quality.draw_landmarks else 0)
+        return detect + preview / quality.preview_interval
+
+
+class TestQualityLevels(unittest.TestCase):
+    """Test the quality ladder."""
+
+    def test_ladder_order(self):
+        """Test that cosmetic knobs go first and every step changes one knob."""
+        levels = quality_levels(320, 1, min_width=160)
+        self.assertEqual(levels[0], QualityLevel(320, 1, 1, True))
+        self.assertEqual(levels[1].preview_interval, 2)
+        self.assertFalse(levels[2].draw_landmarks)
+        self.assertEqual(levels[3].inference_width, 256)
+        self.assertEqual(levels[4].model_complexity, 0)
+        self.assertEqual([level.inference_width for level in levels[5:7]], [192, 160])
+        self.assertEqual(levels[-1].preview_interval, 3)
+        for better, worse in zip(levels, levels[1:]):
+            self.assertEqual(len(better.changes(worse).split(", ")), 1)
+        self.assertEqual(levels[2].changes(levels[3]), "inference_width 320 -> 256")
+
+    def test_ladder_without_detector_knobs(self):
+        """Test backends without a model complexity and the shared ring consumer."""
+        levels = quality_levels(0, None, min_width=256)
+        self.assertTrue(all(level.model_complexity is None for level in levels))
+        self.assertEqual([level.inference_width for level in levels], [0, 0, 0, 480, 320, 256, 256])
+        consumer = quality_levels(320, 1, detector_knobs=False)
+        self.assertEqual({level.inference_width for level in consumer}, {320})
+        self.assertEqual(len(consumer), 4)
+
+
+class TestPerformanceGovernor(unittest.TestCase):
+    """Test the control loop against a synthetic detector."""
+
+    def governor(self, **kwargs):
+        return PerformanceGovernor(quality_levels(320, 1), **kwargs)
+
+    def test_fast_machine_keeps_full_quality(self):
+        """Test that a machine with headroom never lowers quality."""
+        loop = SimulatedLoop(self.governor(target_fps=30), ms_per_kilopixel=0.1).run(60)
+        self.assertEqual(loop.changes, [])
+        self.assertEqual(loop.governor.stats.last_load < 0.75, True)
+
+    def test_slow_machine_settles_within_budget(self):
+        """Test stepping down until frames fit the target, then holding."""
+        loop = SimulatedLoop(self.governor(target_fps=30), ms_per_kilopixel=0.45).run(120)
+        level = loop.governor.level
+        self.assertGreater(level, 2)
+        self.assertLessEqual(loop.frame_cost(level), 1 / 30)
+        self.assertGreater(loop.frame_cost(level - 1), 1 / 30)   # Nothing better fits
+        self.assertEqual(loop.governor.stats.upgrades, 0)
+        self.assertLess(loop.changes[-1][0], 30)                # Settled early
+
+    def test_no_oscillation_at_the_boundary(self):
+        """Test that a level just over budget is not retried every window."""
+        governor = self.governor(target_fps=30, upgrade_margin=0.9, memory=60.0)
+        loop = SimulatedLoop(governor, ms_per_kilopixel=0.334)
+        # Level 0 just misses the budget; level 1 is calm enough to try it again
+        self.assertGreater(loop.frame_cost(0), 1 / 30)
+        self.assertLess(loop.frame_cost(1), 0.9 / 30)
+        loop.run(300)
+        # At most one retry of the expensive level per memory period
+        self.assertLessEqual(governor.stats.upgrades, 300 / 60 + 1)
+        self.assertLessEqual(len(loop.changes), 2 * (300 / 60 + 1))
+        self.assertGreater(governor.stats.seconds_at_level[governor.level], 200)
+
+    def test_recovers_when_load_drops(self):
+        """Test stepping back up once the machine has room again."""
+        loop = SimulatedLoop(self.governor(target_fps=30), ms_per_kilopixel=0.6).run(60)
+        self.assertGreater(loop.governor.level, 2)
+        loop.detector.ms_per_kilopixel = 0.1                   # Another process finished
+        loop.run(120)
+        self.assertEqual(loop.governor.level, 0)
+        self.assertGreater(loop.governor.stats.upgrades, 2)
+
+    def test_cpu_budget(self):
+        """Test holding a CPU budget below what the frame rate target would allow."""
+        governor = self.governor(mode='cpu', target_cpu_percent=40)
+        loop = SimulatedLoop(governor, ms_per_kilopixel=0.2, cpu_threads=1.5).run(120)
+        self.assertGreater(governor.level, 0)
+        cpu = loop.frame_cost(governor.level) * 30 * 1.5 * 100
+        self.assertLessEqual(cpu, 40 * 1.05)
+
+    def test_settling_window_and_disabled(self):
+        """Test that the window after a change is discarded and that disabled does nothing."""
+        governor = self.governor(target_fps=30, window=1.0)
+        self.assertIsNone(governor.frame(0.05, 0.0))
+        self.assertIsNotNone(governor.frame(0.05, 1.0))
+        self.assertIsNone(governor.frame(0.05, 2.0))           # Settling
+        self.assertIsNotNone(governor.frame(0.05, 3.0))
+        self.assertEqual(governor.stats.windows, 2)
+        self.assertEqual(governor.as_dict()['level'], 2)
+
+        disabled = self.governor(enabled=False)
+        for i in range(100):
+            self.assertIsNone(disabled.frame(0.5, i * 0.1))
+        self.assertEqual(disabled.level, 0)
+
+        with self.assertRaises(ValueError):
+            self.governor(mode='watts')
+
+    def test_settling_held_until_swap(self):
+        """Test that windows are discarded until a delayed change takes effect."""
+        governor = self.governor(target_fps=30, window=1.0)
+        governor.frame(0.05, 0.0)
+        self.assertIsNotNone(governor.frame(0.05, 1.0))
+        governor.hold_settling()                               # New model still loading
+        for now in (2.0, 3.0, 4.0):
+            self.assertIsNone(governor.frame(0.05, now))
+        self.assertEqual(governor.stats.windows, 1)
+        governor.end_settling(4.5)
+        self.assertIsNone(governor.frame(0.01, 5.0))           # Window restarted at the swap
+        self.assertIsNone(governor.frame(0.01, 5.5))
+        self.assertEqual(governor.stats.windows, 2)
+        self.assertAlmostEqual(governor.stats.last_load, 0.3)
+
+    def test_hysteresis_from_config(self):
+        """Test that the hysteresis settings are read from the config."""
+        class Config:
+            def get_governor_settings(self):
+                return {'enabled': True, 'upgrade_windows': 5, 'memory': 120.0}
+
+            def get_hand_detection_settings(self):
+                return {}
+
+        governor = PerformanceGovernor.from_config(Config())
+        self.assertEqual((governor.upgrade_windows, governor.memory), (5, 120.0))
+
+
+class TestKnobs(unittest.TestCase):
+    """Test the objects the governor's decisions are applied to."""
+
+    def test_inference_width_change(self):
+        """Test that the preprocessor reallocates for a new width."""
+        preprocessor = FramePreprocessor(320)
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        self.assertEqual(preprocessor.inference_frame(frame).shape, (240, 320, 3))
+        preprocessor.set_inference_width(192)
+        self.assertEqual(preprocessor.inference_frame(frame).shape, (144, 192, 3))
+
+    def test_detector_swap(self):
+        """Test building and warming a replacement detector off the loop."""
+        clock = SimulatedClock()
+        swap = DetectorSwap(lambda: SyntheticDetector(clock, model_complexity=0), (160, 120), frames=3)
+        detector = swap.take()
+        self.assertTrue(swap.ready)
+        self.assertEqual(detector.model_complexity, 0)
+        self.assertGreater(clock(), 0)                          # Warm-up calls ran
+
+        def broken():
+            raise RuntimeError("model missing")
+
+        with self.assertRaises(RuntimeError):
+            DetectorSwap(broken).take()
+
+
+if __name__ == '__main__':
+    unittest.main()
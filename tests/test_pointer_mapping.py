@@ -0,0 +1,149 @@
+"""
+Unit tests for cursor mapping modes and acceleration curves.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from gesture_pipeline import GesturePipeline
+from output_backend import RecordingBackend
+from pointer_evaluation import load_sessions, run_evaluation
+from pointer_mapping import (
+    AbsoluteMapper, AccelerationCurve, RelativeMapper, create_mapper, is_clutch_pose,
+)
+from synthetic_hands import POSES, SyntheticSequence
+
+
+SCREEN = (1920, 1080)
+
+
+class TestAccelerationCurve(unittest.TestCase):
+    """Test the precomputed gain tables."""
+
+    def test_lookup_matches_control_points(self):
+        """Test that table lookups follow the interpolated curve."""
+        curve = AccelerationCurve(((0, 1.0), (1000, 5.0)), size=1001, max_speed=1000)
+        self.assertAlmostEqual(curve(0), 1.0)
+        self.assertAlmostEqual(curve(500), 3.0)
+        self.assertAlmostEqual(curve(10000), 5.0)
+
+    def test_gain_multiplier(self):
+        """Test that the gain scales the whole curve."""
+        base = AccelerationCurve.named('precision')
+        doubled = AccelerationCurve.named('precision', gain=2.0)
+        self.assertAlmostEqual(doubled(400), 2 * base(400))
+
+    def test_unknown_curve(self):
+        """Test that an unknown curve name is rejected."""
+        with self.assertRaises(ValueError):
+            AccelerationCurve.named('turbo')
+
+
+class TestMappers(unittest.TestCase):
+    """Test absolute and relative mapping."""
+
+    def test_absolute_matches_active_area(self):
+        """Test that absolute mode stretches the active area over the screen."""
+        mapper = AbsoluteMapper(SCREEN, frame_reduction=100)
+        self.assertEqual(mapper.map(100, 100, 640, 480, 0), (0, 0))
+        self.assertEqual(mapper.map(540, 380, 640, 480, 0), SCREEN)
+        np.testing.assert_allclose(mapper.map(320, 240, 640, 480, 0), (960, 540))
+
+    def test_relative_accelerates(self):
+        """Test that the same hand distance moves further when fast."""
+        def travel(duration):
+            mapper = RelativeMapper(SCREEN, start=(100, 500))
+            steps = int(duration * 30)
+            for i in range(steps + 1):
+                x, _ = mapper.map(200 + 100 * i / steps, 240, 640, 480, i / 30)
+            return x - 100
+
+        self.assertGreater(travel(0.2), 2 * travel(2.0))
+
+    def test_clutch_and_lift_do_not_move(self):
+        """Test that clutched movement and the first sample after a lift are ignored."""
+        mapper = RelativeMapper(SCREEN, start=(500, 500))
+        mapper.map(100, 100, 640, 480, 0.0)
+        self.assertEqual(mapper.map(200, 100, 640, 480, 0.033, clutch=True), (500, 500))
+        mapper.lift()
+        self.assertEqual(mapper.map(400, 100, 640, 480, 0.066), (500, 500))
+        x, y = mapper.map(410, 100, 640, 480, 0.1)
+        self.assertGreater(x, 500)
+        self.assertEqual(y, 500)
+
+    def test_relative_clamps_to_screen(self):
+        """Test that the cursor stays on screen."""
+        mapper = RelativeMapper(SCREEN, start=(10, 10))
+        mapper.map(300, 300, 640, 480, 0.0)
+        self.assertEqual(mapper.map(0, 0, 640, 480, 0.033), (0.0, 0.0))
+
+    def test_create_mapper(self):
+        """Test mapper selection from settings."""
+        self.assertIsInstance(create_mapper({'cursor_mode': 'absolute'}, SCREEN), AbsoluteMapper)
+        self.assertIsInstance(create_mapper({'cursor_mode': 'relative'}, SCREEN), RelativeMapper)
+        with self.assertRaises(ValueError):
+            create_mapper({'cursor_mode': 'joystick'}, SCREEN)
+
+    def test_clutch_pose(self):
+        """Test that a curled index finger is a clutch and an open hand is not."""
+        self.assertTrue(is_clutch_pose(POSES['fist']))
+        self.assertFalse(is_clutch_pose(POSES['open']))
+        self.assertFalse(is_clutch_pose(POSES['left_pinch']))
+
+
+class TestRelativePipeline(unittest.TestCase):
+    """Test relative mode inside the gesture pipeline."""
+
+    def test_scroll_does_not_move_cursor(self):
+        """Test that a scroll swipe leaves a relative cursor in place."""
+        trace = (SyntheticSequence().hold(0.5).scroll('up').hold(0.1)
+                 .set_pose('open', duration=0.03).build())
+        backend = RecordingBackend(SCREEN, record_moves=False)
+        settings = {'cursor_mode': 'relative', 'smoothening': 1}
+        pipeline = GesturePipeline(backend, settings, SCREEN)
+
+        positions = []
+        for now, landmarks in zip(trace.timestamps, trace.landmarks):
+            pipeline.process(landmarks, trace.width, trace.height, now)
+            positions.append(backend.position)
+        self.assertTrue(backend.of_type('scroll'))
+        self.assertEqual(positions[-1], positions[14])
+
+
+    def test_first_frame_keeps_cursor_in_place(self):
+        """Test that a relative cursor starts where the mapper is, not at the corner."""
+        trace = SyntheticSequence().hold(0.3).build()
+        backend = RecordingBackend(SCREEN)
+        pipeline = GesturePipeline(backend, {'cursor_mode': 'relative'}, SCREEN)
+        for now, landmarks in zip(trace.timestamps, trace.landmarks):
+            pipeline.process(landmarks, trace.width, trace.height, now)
+        moves = [(a.x, a.y) for a in backend.of_type('move')]
+        center = (SCREEN[0] / 2, SCREEN[1] / 2)
+        self.assertEqual(moves[0], center)
+        self.assertEqual(moves[-1], center)
+
+
+class TestPointerEvaluation(unittest.TestCase):
+    """Test the evaluation harness on a noisy synthetic session."""
+
+    def test_precision_curve_reduces_jitter(self):
+        """Test that the precision curve beats absolute mapping on jitter without losing reach."""
+        results = run_evaluation(load_sessions(noise_px=1.5))
+        absolute = results['absolute']
+        precise = results['relative-precision']
+
+        self.assertLess(precise['precision_px'], 0.8 * absolute['precision_px'])
+        self.assertGreater(precise['peak_speed'], 0.8 * absolute['peak_speed'])
+        self.assertLess(precise['hand_px_per_screen'], 2 * absolute['hand_px_per_screen'])
+        for result in results.values():
+            self.assertTrue(np.isfinite(result['travel_speed']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+Unit tests for the joint-angle hand pose descriptor.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from gesture_pipeline import FIST_THRESHOLD, is_fist_array
+from pose_descriptor import benchmark_landmarks, describe, extended_count, is_fist
+from synthetic_hands import POSES, standard_session
+
+
+def hand(offsets, scale=0.75, wrist=(320, 400), angle=0.0, size=(640, 480)):
+    """Normalized (21, 3) landmarks from pixel offsets, rotated by ``angle`` degrees."""
+    theta = np.radians(angle)
+    rotation = np.array([[np.cos(theta), -np.sin(theta)], [np.sin(theta), np.cos(theta)]])
+    pixels = np.asarray(offsets, dtype=np.float64) * scale @ rotation.T + wrist
+    landmarks = np.zeros((21, 3), dtype=np.float32)
+    landmarks[:, :2] = pixels / size
+    return landmarks
+
+
+def thumbs_up():
+    """Fingers curled as in a fist, thumb stretched out sideways."""
+    offsets = POSES['fist'].copy()
+    offsets[1:5] = [(-32, -20), (-60, -30), (-88, -40), (-116, -50)]
+    return offsets
+
+
+def fingertip_distance_rule(landmarks, w=640, h=480):
+    """The earlier fist rule: every fingertip within FIST_THRESHOLD pixels of the wrist."""
+    delta = (landmarks[[8, 12, 16, 20], :2] - landmarks[0, :2]) * (w, h)
+    return bool(np.all(np.hypot(delta[:, 0], delta[:, 1]) <= FIST_THRESHOLD))
+
+
+class TestPoseDescriptor(unittest.TestCase):
+    """Test finger states, scale/rotation invariance and batching."""
+
+    def test_open_hand_and_fist(self):
+        """Test that an open hand has five extended fingers and a fist none."""
+        open_pose = describe(hand(POSES['open']), 640, 480)
+        self.assertTrue(open_pose.extended.all())
+        self.assertEqual(extended_count(open_pose), 5)
+        self.assertFalse(is_fist(open_pose))
+
+        fist = describe(hand(POSES['fist']), 640, 480)
+        self.assertTrue(fist.curled.all())
+        self.assertTrue(is_fist(fist))
+        self.assertEqual(fist.flexion.shape, (5, 3))
+
+    def test_single_finger_states(self):
+        """Test that a pose bending one finger changes only that finger."""
+        pose = describe(hand(POSES['right_pinch']), 640, 480)
+        self.assertEqual(list(pose.curled), [False, False, True, False, False])
+        self.assertEqual(list(pose.extended), [True, True, False, True, True])
+
+    def test_fist_at_any_distance(self):
+        """Test that a fist is found close to and far from the camera."""
+        for scale in (0.3, 0.75, 1.6):
+            landmarks = hand(POSES['fist'], scale=scale)
+            self.assertTrue(is_fist_array(landmarks, 640, 480), scale)
+        # The pixel distance rule misses the close-up fist
+        self.assertFalse(fingertip_distance_rule(hand(POSES['fist'], scale=1.6)))
+
+    def test_thumb_out_is_not_a_fist(self):
+        """Test that curled fingers with the thumb out do not pause."""
+        landmarks = hand(thumbs_up())
+        pose = describe(landmarks, 640, 480)
+        self.assertTrue(pose.extended[0])
+        self.assertTrue(pose.curled[1:].all())
+        self.assertFalse(is_fist(pose))
+        # The pixel distance rule ignores the thumb and reports a fist
+        self.assertTrue(fingertip_distance_rule(landmarks))
+
+    def test_half_curled_is_not_a_fist(self):
+        """Test that loosely bent fingers are neither extended nor curled."""
+        half = POSES['open'] + (POSES['fist'] - POSES['open']) * 0.4
+        pose = describe(hand(half), 640, 480)
+        self.assertFalse(pose.curled[1:].any())
+        self.assertFalse(is_fist(pose))
+
+    def test_rotation(self):
+        """Test that finger states survive hand rotation and palm_angle follows it."""
+        for angle in (-60, 45, 90):
+            pose = describe(hand(POSES['fist'], angle=angle, wrist=(320, 240)), 640, 480)
+            self.assertTrue(is_fist(pose), angle)
+            self.assertAlmostEqual(float(pose.palm_angle), angle, delta=0.5)
+        self.assertAlmostEqual(float(describe(hand(POSES['open']), 640, 480).palm_angle), 0.0, delta=0.5)
+
+    def test_depth_bend(self):
+        """Test that a finger bent towards the camera (z only) counts as curled."""
+        landmarks = hand(POSES['open'])
+        # Fold the index finger straight at the camera past its MCP joint
+        landmarks[6:9, :2] = landmarks[5, :2]
+        landmarks[6:9, 2] = -np.array([40, 70, 95]) / 640.0
+        pose = describe(landmarks, 640, 480)
+        self.assertAlmostEqual(float(pose.flexion[1, 0]), 90.0, delta=15.0)
+        self.assertFalse(pose.extended[1])
+
+    def test_palm_normal(self):
+        """Test that the palm normal is a unit vector that flips with the hand."""
+        front = describe(hand(POSES['open']), 640, 480)
+        np.testing.assert_allclose(front.palm_normal, (0, 0, 1), atol=1e-9)
+        mirrored = POSES['open'] * (-1, 1)
+        back = describe(hand(mirrored), 640, 480)
+        np.testing.assert_allclose(back.palm_normal, (0, 0, -1), atol=1e-9)
+
+    def test_batch_matches_single_frames(self):
+        """Test that a batched call equals per-frame calls."""
+        trace = standard_session(repeats=1).build(noise_px=1.5, seed=3)
+        landmarks = trace.landmarks[::7]
+        batch = describe(landmarks, trace.width, trace.height)
+        self.assertEqual(batch.curl.shape, (len(landmarks), 5))
+        for i in range(len(landmarks)):
+            single = describe(landmarks[i], trace.width, trace.height)
+            np.testing.assert_allclose(batch.curl[i], single.curl, rtol=1e-9, atol=1e-9)
+            np.testing.assert_allclose(batch.palm_normal[i], single.palm_normal, atol=1e-9)
+            self.assertEqual(bool(is_fist(batch)[i]), bool(is_fist(single)))
+
+
+class TestPoseBenchmark(unittest.TestCase):
+    """Test the trace benchmark helper."""
+
+    def test_benchmark_synthetic_trace(self):
+        """Test timings and pose statistics on a synthetic session."""
+        trace = standard_session(repeats=1).build(seed=1)
+        landmarks = trace.landmarks[trace.has_hand]
+        result = benchmark_landmarks(landmarks, trace.width, trace.height, repeats=1)
+
+        self.assertEqual(result['frames'], len(landmarks))
+        self.assertGreater(result['us_per_frame'], 0.0)
+        self.assertLess(result['us_per_frame_batched'], result['us_per_frame'])
+        fist_frames = np.mean(trace.pose[trace.has_hand] == 'fist')
+        self.assertGreater(result['fist_rate'], 0.0)
+        self.assertAlmostEqual(result['fist_rate'], fist_frames, delta=0.02)
+        self.assertEqual(set(result['extended']), {'thumb', 'index', 'middle', 'ring', 'pinky'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Unit tests for the injectable clock and deterministic session replay.
+"""
+
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from clock import MonotonicClock, SimulatedClock
+from gesture_pipeline import GesturePipeline
+from landmark_trace import TraceWriter, read_trace
+from output_backend import RecordingBackend
+from session_replay import action_digest, replay_file, replay_records
+from synthetic_hands import SyntheticSequence, standard_session
+
+
+def write_trace(trace, path):
+    """Store a synthetic trace in the landmark trace format."""
+    with TraceWriter(path, trace.width, trace.height, fps=30) as writer:
+        for i, timestamp in enumerate(trace.timestamps):
+            writer.write(timestamp, i, trace.landmarks[i] if trace.has_hand[i] else None)
+
+
+class TestClocks(unittest.TestCase):
+    """Test the production and simulated clocks."""
+
+    def test_simulated_clock(self):
+        """Test that the simulated clock moves only forward and never sleeps."""
+        clock = SimulatedClock(10.0)
+        self.assertEqual(clock(), 10.0)
+        clock.advance(0.5)
+        clock.set(11.0)
+        self.assertEqual(clock(), 11.0)
+        with self.assertRaises(ValueError):
+            clock.set(10.5)
+
+        start = time.perf_counter()
+        clock.sleep(3600)
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.assertEqual(clock(), 3611.0)
+
+    def test_monotonic_clock(self):
+        """Test that the production clock never goes backwards."""
+        clock = MonotonicClock()
+        first = clock()
+        self.assertGreaterEqual(clock(), first)
+
+    def test_pipeline_reads_injected_clock(self):
+        """Test that a double click is timed by the clock, not the wall clock."""
+        clock = SimulatedClock()
+        backend = RecordingBackend(clock=clock, record_moves=False)
+        pipeline = GesturePipeline(backend, clock=clock)
+        trace = SyntheticSequence().hold(0.3).double_click().hold(0.3).build()
+
+        for i, timestamp in enumerate(trace.timestamps):
+            clock.set(timestamp)
+            pipeline.process(trace.landmarks[i], trace.width, trace.height)
+
+        self.assertEqual([action.name for action in backend.actions], ['click', 'double_click'])
+        self.assertLess(backend.actions[-1].time - backend.actions[0].time, 0.5)
+
+
+class TestSessionReplay(unittest.TestCase):
+    """Test replaying recorded traces."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.mkdtemp()
+        cls.path = str(Path(cls.tmpdir) / 'session.trace')
+        cls.trace = standard_session(repeats=10).build(noise_px=1.0, dropout=0.02, gap_rate=0.01, seed=4)
+        write_trace(cls.trace, cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmpdir, ignore_errors=True)
+
+    def test_replay_is_bit_identical_and_fast(self):
+        """Test that a long session replays in a fraction of its length with the same actions."""
+        first = replay_file(self.path)
+        second = replay_file(self.path)
+
+        self.assertGreater(first['session_seconds'], 180.0)
+        self.assertGreater(first['gestures'], 100)
+        self.assertEqual(first['digest'], second['digest'])
+        self.assertEqual(first['actions'], second['actions'])
+        self.assertGreater(first['speedup'], 20.0)
+
+    def test_digest_reacts_to_settings(self):
+        """Test that changing a timing setting changes the recorded actions."""
+        info, records = read_trace(self.path)
+        default = replay_records(records, info.width, info.height)
+        slower = replay_records(records, info.width, info.height, {'double_click_time': 0.05})
+        self.assertNotEqual(action_digest(default), action_digest(slower))
+
+    def test_actions_use_trace_time(self):
+        """Test that recorded action times fall inside the trace."""
+        info, records = read_trace(self.path)
+        actions = replay_records(records, info.width, info.height, record_moves=False)
+        times = [action.time for action in actions]
+        self.assertEqual(times, sorted(times))
+        self.assertGreaterEqual(times[0], records['timestamp'][0])
+        self.assertLessEqual(times[-1], records['timestamp'][-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,182 @@
+"""
+Unit tests for open-hand swipes and flicks over the landmark history.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from gesture_benchmark import replay
+from synthetic_hands import SyntheticSequence, pointing_session, standard_session
+from temporal_gestures import (
+    LandmarkHistory, MotionWindow, TemporalGestures, match_labels, motion_session, recognize_trace,
+)
+
+
+def palm_at(x, y):
+    """Landmarks whose palm center (wrist, index and pinky knuckles) is at (x, y)."""
+    landmarks = np.zeros((21, 3), dtype=np.float32)
+    landmarks[:, 0] = x
+    landmarks[:, 1] = y
+    return landmarks
+
+
+class TestLandmarkHistory(unittest.TestCase):
+    """Test the ring buffer and the sliding window."""
+
+    def test_ring_wraps_around(self):
+        """Test that the newest frames overwrite the oldest."""
+        history = LandmarkHistory(capacity=4)
+        for i in range(10):
+            history.push(palm_at(i * 0.01, 0.5), i / 30, 640, 480)
+        self.assertEqual(history.count, 4)
+        self.assertAlmostEqual(history.timestamps[history.head], 9 / 30)
+        self.assertAlmostEqual(history.points[history.head, 0], 0.09)
+        self.assertAlmostEqual(sorted(history.timestamps)[0], 6 / 30)
+        self.assertAlmostEqual(history.steps[history.head], 0.01)
+
+    def test_points_share_one_scale(self):
+        """Test that vertical travel is measured in frame widths too."""
+        history = LandmarkHistory()
+        history.push(palm_at(0.5, 0.2), 0.0, 640, 480)
+        history.push(palm_at(0.5, 0.6), 0.03, 640, 480)
+        self.assertAlmostEqual(history.steps[history.head], 0.3)
+
+    def test_window_features(self):
+        """Test displacement, duration and straightness over the window."""
+        history = LandmarkHistory()
+        window = MotionWindow(history, seconds=0.1)
+        for i, x in enumerate((0.5, 0.52, 0.54, 0.56, 0.58, 0.6)):
+            history.push(palm_at(x, 0.5), i * 0.025, 640, 480)
+            window.update()
+        self.assertEqual(window.samples, 5)              # 0.1 s holds five frames
+        self.assertAlmostEqual(window.displacement[0], 0.08)
+        self.assertAlmostEqual(window.duration, 0.1)
+        self.assertAlmostEqual(window.straightness, 1.0)
+
+        # Back and forth: same displacement, longer path
+        for i, x in enumerate((0.5, 0.6, 0.5, 0.6), start=6):
+            history.push(palm_at(x, 0.5), i * 0.025, 640, 480)
+            window.update()
+        self.assertLess(window.straightness, 0.5)
+
+    def test_gap_starts_a_new_track(self):
+        """Test that a long gap between frames empties the window."""
+        history = LandmarkHistory(max_gap=0.2)
+        window = MotionWindow(history, seconds=1.0)
+        for t in (0.0, 0.03, 0.06):
+            history.push(palm_at(0.2, 0.5), t, 640, 480)
+            window.update()
+        history.push(palm_at(0.8, 0.5), 0.5, 640, 480)
+        window.update()
+        self.assertEqual(window.samples, 1)
+        self.assertEqual(window.displacement, (0.0, 0.0))
+
+    def test_update_is_constant_time(self):
+        """Test that each frame touches O(1) samples regardless of window length."""
+        for seconds in (0.1, 1.0, 10.0):
+            history = LandmarkHistory(capacity=512)
+            window = MotionWindow(history, seconds)
+            evictions = 0
+            for i in range(1000):
+                history.push(palm_at(0.5 + 0.1 * np.sin(i / 10), 0.5), i / 30, 640, 480)
+                before = window.samples
+                window.update()
+                evictions += before + 1 - window.samples
+            # Every frame is added once and evicted at most once
+            self.assertLessEqual(evictions, 1000)
+            self.assertLessEqual(window.samples, 512)
+
+
+class TestTemporalGestures(unittest.TestCase):
+    """Test recognition on labelled synthetic motions."""
+
+    def test_labelled_motions(self):
+        """Test that every swipe and flick is recognized in its direction."""
+        for noise in (0.0, 1.5, 3.0):
+            trace = motion_session().build(noise_px=noise, seed=4)
+            hits, misses, false = match_labels(trace, recognize_trace(TemporalGestures(), trace))
+            self.assertEqual(len(hits), 12, f"noise {noise}: missed {misses}")
+            self.assertEqual(false, [])
+
+    def test_flick_amount_follows_speed(self):
+        """Test that a harder flick scrolls further, with the scroll sign."""
+        amounts = []
+        for duration in (0.1, 0.07):
+            trace = SyntheticSequence(start=(0.5, 0.7)).hold(0.3).flick('up', 0.3, duration).hold(0.3).build()
+            amounts.append(recognize_trace(TemporalGestures(), trace)[0][2])
+        self.assertGreater(amounts[1], amounts[0])
+        self.assertGreater(amounts[0], 0)
+        trace = SyntheticSequence(start=(0.5, 0.3)).hold(0.3).flick('down').hold(0.3).build()
+        self.assertLess(recognize_trace(TemporalGestures(), trace)[0][2], 0)
+
+    def test_ordinary_movement_is_not_a_motion(self):
+        """Test that pointing and the other gestures never fire a swipe or flick."""
+        for trace in (pointing_session(targets=40, seed=5).build(noise_px=1.5, seed=5),
+                      standard_session().build(noise_px=1.5, seed=6)):
+            self.assertEqual(recognize_trace(TemporalGestures(), trace), [])
+
+    def test_cooldown_and_return_stroke(self):
+        """Test that moving the hand back after a swipe does not swipe the other way."""
+        sequence = SyntheticSequence(start=(0.7, 0.5)).hold(0.3)
+        sequence.palm_swipe('left').move((0.7, 0.5), 0.15).hold(0.5)
+        detections = recognize_trace(TemporalGestures(), sequence.build())
+        self.assertEqual([d[1] for d in detections], ['palm_swipe_left'])
+
+        sequence = SyntheticSequence(start=(0.7, 0.5)).hold(0.3)
+        sequence.palm_swipe('left').move((0.7, 0.5), 0.15).hold(0.5)
+        detections = recognize_trace(TemporalGestures(cooldown=0.0), sequence.build())
+        self.assertEqual([d[1] for d in detections], ['palm_swipe_left', 'palm_swipe_right'])
+
+    def test_only_open_hand_and_armed(self):
+        """Test that other poses and a disarmed recognizer do not fire."""
+        sequence = SyntheticSequence(start=(0.7, 0.5)).hold(0.3).set_pose('fist')
+        sequence.move((0.3, 0.5), 0.15).hold(0.3)
+        self.assertEqual(recognize_trace(TemporalGestures(), sequence.build()), [])
+
+        trace = SyntheticSequence(start=(0.7, 0.5)).hold(0.3).palm_swipe('left').hold(0.3).build()
+        recognizer = TemporalGestures()
+        fired = [recognizer.update(trace.landmarks[i], 640, 480, t, armed=False)
+                 for i, t in enumerate(trace.timestamps)]
+        self.assertEqual([m for m in fired if m is not None], [])
+
+    def test_only_requested_gestures(self):
+        """Test that unrequested gestures are not reported."""
+        trace = motion_session(repeats=1).build()
+        detections = recognize_trace(TemporalGestures(gestures=('flick_up',)), trace)
+        self.assertEqual([d[1] for d in detections], ['flick_up'])
+
+
+class TestPipelineMotions(unittest.TestCase):
+    """Test swipes and flicks dispatched through the gesture pipeline."""
+
+    def test_bound_motions(self):
+        """Test that bound motions run their actions and unbound ones do nothing."""
+        trace = motion_session(repeats=1).build(noise_px=1.5, seed=7)
+        bindings = {'palm_swipe_left': {'keys': 'alt+left'}, 'palm_swipe_right': {'keys': 'alt+right'},
+                    'flick_up': 'scroll', 'flick_down': 'scroll'}
+        backend = replay(trace, {'bindings': bindings})[0]
+        self.assertEqual([a.amount for a in backend.of_type('hotkey')], ['alt+left', 'alt+right'])
+        scrolls = [a.amount for a in backend.of_type('scroll')]
+        self.assertEqual(len(scrolls), 2)
+        self.assertGreater(scrolls[0], 0)
+        self.assertLess(scrolls[1], 0)
+
+        backend = replay(trace)[0]
+        self.assertEqual(backend.of_type('hotkey') + backend.of_type('scroll'), [])
+
+    def test_scroll_pose_does_not_flick(self):
+        """Test that scrolling with the scroll pose is not also a flick."""
+        trace = SyntheticSequence(start=(0.5, 0.65)).hold(0.3).scroll('up', duration=0.1).hold(0.3).build()
+        backend = replay(trace, {'bindings': {'flick_up': {'keys': 'pageup'}}})[0]
+        self.assertEqual(backend.of_type('hotkey'), [])
+        self.assertGreater(len(backend.of_type('scroll')), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+"""
+Unit tests for tracking-loss recovery, replayed from traces with injected gaps.
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from gesture_pipeline import GesturePipeline
+from landmark_trace import FLAG_HAND, RECORD_DTYPE, TraceWriter, hand_present, read_trace
+from output_backend import RecordingBackend
+from synthetic_hands import SyntheticSequence
+from tracking_continuity import TrackingContinuity
+
+
+SCREEN_SIZE = (1920, 1080)
+
+
+class TestTrackingContinuity(unittest.TestCase):
+    """Replay traces with gaps through the continuity layer."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_trace(self, sequence, name="gaps.trace"):
+        """Render a synthetic sequence and store it as a trace file."""
+        synthetic = sequence.build()
+        records = np.zeros(len(synthetic.timestamps), dtype=RECORD_DTYPE)
+        records['timestamp'] = synthetic.timestamps
+        records['frame'] = np.arange(len(records))
+        records['flags'] = np.where(synthetic.has_hand, FLAG_HAND, 0)
+        records['landmarks'] = synthetic.landmarks
+
+        path = Path(self.temp_dir) / name
+        with TraceWriter(path, synthetic.width, synthetic.height, fps=synthetic.fps) as writer:
+            writer.write_records(records)
+        return path
+
+    def replay(self, path, **options):
+        """Replay a trace; return (backend, tracker, per-frame cursor x)."""
+        info, records = read_trace(path)
+        now = [0.0]
+        backend = RecordingBackend(SCREEN_SIZE, clock=lambda: now[0], record_moves=False)
+        tracker = TrackingContinuity(GesturePipeline(backend, screen_size=SCREEN_SIZE), **options)
+
+        cursor_x = []
+        for record, present in zip(records, hand_present(records)):
+            now[0] = float(record['timestamp'])
+            landmarks = record['landmarks'] if present else None
+            tracker.update(landmarks, info.width, info.height, now[0])
+            cursor_x.append(backend.position[0])
+        return backend, tracker, np.array(cursor_x)
+
+    def test_short_gap_keeps_drag(self):
+        """Test that a drag survives a dropout shorter than the timeout."""
+        seq = SyntheticSequence().hold(0.5).set_pose('left_pinch').hold(1.2)
+        seq.gap(0.2).move((0.7, 0.5), 0.5).set_pose('open').hold(0.3)
+        backend, tracker, _ = self.replay(self.write_trace(seq), release_timeout=0.5)
+
+        self.assertEqual(len(backend.of_type('mouse_down')), 1)
+        self.assertEqual(len(backend.of_type('mouse_up')), 1)
+        self.assertGreater(backend.of_type('mouse_up')[0].time, 2.2)
+        self.assertEqual(tracker.stats.timeouts, 0)
+
+    def test_long_gap_releases_after_timeout(self):
+        """Test that a lost hand releases the drag at the timeout, once."""
+        seq = SyntheticSequence().hold(0.5).set_pose('left_pinch').hold(1.2)
+        gap_start = seq.time
+        seq.gap(1.5).hold(0.5)
+        backend, tracker, _ = self.replay(self.write_trace(seq), release_timeout=0.5)
+
+        releases = backend.of_type('mouse_up')
+        self.assertEqual(len(releases), 1)
+        self.assertAlmostEqual(releases[0].time, gap_start + 0.5, delta=0.05)
+        self.assertFalse(backend.button_down)
+        self.assertEqual(tracker.stats.timeouts, 1)
+        # The hand came back still pinched: no new click until it opens
+        self.assertEqual(len(backend.of_type('click')), 1)
+
+    def test_cursor_coasts_through_gap(self):
+        """Test that the cursor keeps moving during a short dropout."""
+        seq = SyntheticSequence(start=(0.3, 0.5)).hold(0.5).move((0.45, 0.5), 0.5)
+        seq.gap(0.1).move((0.6, 0.5), 0.5).hold(0.5)
+        path = self.write_trace(seq)
+
+        _, tracker, coasted = self.replay(path)
+        _, _, frozen = self.replay(path, enabled=False)
+
+        # Frames 30-32 are missing; frame 29 is the last tracked one
+        self.assertTrue(np.all(np.diff(coasted[29:34]) > 0))
+        self.assertTrue(np.all(np.diff(frozen[29:33]) == 0))
+        self.assertEqual(tracker.stats.coasted_frames, 3)
+        # Less catching up on the first frame after the gap
+        self.assertLess(coasted[33] - coasted[32], frozen[33] - frozen[32])
+
+    def test_scroll_mode_held_without_scrolling(self):
+        """Test that scroll mode survives a dropout and coasting never scrolls."""
+        seq = SyntheticSequence().hold(0.5).set_pose('scroll').hold(0.3)
+        seq.gap(0.2).hold(0.3).set_pose('open').hold(0.3)
+        backend, tracker, _ = self.replay(self.write_trace(seq))
+
+        self.assertEqual(backend.of_type('scroll'), [])
+        self.assertEqual(tracker.stats.coasted_frames, 0)
+        self.assertEqual(tracker.stats.missing_frames, 6)
+
+    def test_dropout_metrics(self):
+        """Test that dropout counts and durations are recorded."""
+        seq = SyntheticSequence().hold(0.5).gap(0.1).hold(0.5).gap(0.3).hold(0.5)
+        _, tracker, _ = self.replay(self.write_trace(seq))
+
+        stats = tracker.stats.as_dict()
+        self.assertEqual(stats['dropouts'], 2)
+        # Measured from the last tracked frame to the first one back
+        self.assertAlmostEqual(stats['longest'], 0.3 + 1 / 30, places=6)
+        self.assertAlmostEqual(stats['mean_duration'], 0.2 + 1 / 30, places=6)
+        self.assertEqual(stats['missing_frames'], 12)
+        self.assertEqual(sum(stats['histogram'].values()), 2)
+
+    def test_timeout_without_held_button(self):
+        """Test that a long dropout with nothing held is not counted as a release."""
+        seq = SyntheticSequence().hold(0.5).gap(1.0).hold(0.5)
+        backend, tracker, _ = self.replay(self.write_trace(seq), release_timeout=0.5)
+
+        self.assertEqual(backend.of_type('mouse_up'), [])
+        self.assertEqual(tracker.stats.timeouts, 0)
+        self.assertEqual(tracker.stats.as_dict()['dropouts'], 1)
+
+    def test_no_hand_yet_is_ignored(self):
+        """Test that frames before the first detection do nothing."""
+        backend = RecordingBackend(SCREEN_SIZE)
+        tracker = TrackingContinuity(GesturePipeline(backend, screen_size=SCREEN_SIZE))
+        self.assertEqual(tracker.update(None, 640, 480, 1.0), [])
+        self.assertEqual(backend.actions, [])
+        self.assertEqual(tracker.stats.missing_frames, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()